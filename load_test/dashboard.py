@@ -129,10 +129,10 @@ class DashboardSimulator:
             logger.info("Dashboard received game reset confirmation")
         
         @self.socket.event
-        async def new_answer_for_dashboard(data):
-            """Handle real-time answer updates."""
+        async def answers_batch(data):
+            """Handle batched real-time answer updates."""
             # Just log for monitoring, don't need to store
-            logger.debug(f"Dashboard received answer from team {data.get('team_name')}")
+            logger.debug(f"Dashboard received {len(data.get('answers', []))} answers")
         
         @self.socket.event
         async def error(data):
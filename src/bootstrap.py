@@ -0,0 +1,156 @@
+"""
+Bootstrap confidence intervals for the CHSH and balanced |<Tr>| scores.
+
+The sigma = 1/sqrt(N) approximation is poor for small N. When enabled
+(BOOTSTRAP_CI_ENABLED), each team's completed rounds are resampled with
+replacement and every resample is scored with the batch statistics engine,
+all resamples in one batch. The percentile interval of the scores is
+reported.
+
+Jobs run one at a time, on a single background worker that hands each one to
+eventlet's native thread pool. The resampling is pure Python and holds the GIL,
+so only one thread ever competes with the event loop, and each job stops at the
+configured resample count or time budget, whichever comes first. Results are
+cached per team until the team completes another round; until the new interval
+is ready, the previous one is served.
+"""
+import logging
+import random
+from time import perf_counter
+from collections import OrderedDict
+from math import floor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eventlet import tpool
+
+from src.stats_engine import compute_classic_statistics_batch
+from src.team_stats import TeamStatsAccumulator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE = 0.95
+RESAMPLE_CHUNK = 50  # resamples scored per batch between time-budget checks
+
+# {team_id: (rounds version, intervals)}
+_results: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+# Jobs waiting for the worker, {team_id: (version, outcome_counts, resamples, time_budget, on_done)},
+# at most one per team (the newest); the job the worker is running as (team_id, version)
+_queue: 'OrderedDict[int, Tuple[Any, List[int], int, float, Callable[[], None]]]' = OrderedDict()
+_running: Optional[Tuple[int, Any]] = None
+_worker_started = False
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """The q-quantile of sorted values, interpolating linearly between neighbours."""
+    position = q * (len(ordered) - 1)
+    below = floor(position)
+    above = min(below + 1, len(ordered) - 1)
+    return ordered[below] + (ordered[above] - ordered[below]) * (position - below)
+
+
+def _percentile_interval(values: List[float], confidence: float) -> Tuple[float, float]:
+    ordered = sorted(values)
+    tail = (1 - confidence) / 2
+    return _percentile(ordered, tail), _percentile(ordered, 1 - tail)
+
+
+def bootstrap_intervals(outcome_counts: List[int], resamples: int, time_budget: float,
+                        confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Percentile bootstrap intervals for the CHSH value (cross-term combination) and the
+    balanced |<Tr>| score ((trace average + same-item balance) / 2) of one team.
+    outcome_counts is the team's flattened 64-cell outcome table. Returns None without rounds.
+    """
+    total_rounds = sum(outcome_counts)
+    if total_rounds == 0 or resamples <= 0:
+        return None
+
+    rng = random.Random(seed)
+    cells = [cell for cell, count in enumerate(outcome_counts) if count]
+    weights = [outcome_counts[cell] for cell in cells]
+    deadline = perf_counter() + time_budget
+
+    chsh_values: List[float] = []
+    balanced_values: List[float] = []
+    while len(chsh_values) < resamples:
+        chunk = []
+        for _ in range(min(RESAMPLE_CHUNK, resamples - len(chsh_values))):
+            resampled = [0] * len(outcome_counts)
+            for cell in rng.choices(cells, weights=weights, k=total_rounds):
+                resampled[cell] += 1
+            chunk.append(TeamStatsAccumulator.from_outcome_counts(resampled))
+
+        for stats in compute_classic_statistics_batch(chunk):
+            chsh_values.append(stats['cross_term_combination_statistic'])
+            balanced_values.append((stats['trace_average_statistic'] + stats['same_item_balance']) / 2)
+
+        if perf_counter() >= deadline:
+            break
+
+    return {
+        'resamples': len(chsh_values),
+        'confidence': confidence,
+        'truncated': len(chsh_values) < resamples,
+        'chsh_value_interval': _percentile_interval(chsh_values, confidence),
+        'balanced_trace_interval': _percentile_interval(balanced_values, confidence),
+    }
+
+
+def get_cached_intervals(team_id: int, version: Any) -> Optional[Dict[str, Any]]:
+    """Intervals computed for this exact rounds version, or None."""
+    cached = _results.get(team_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+
+def latest_intervals(team_id: int) -> Optional[Dict[str, Any]]:
+    """The most recent intervals computed for a team, whatever its version, or None."""
+    cached = _results.get(team_id)
+    return cached[1] if cached is not None else None
+
+
+def schedule_intervals(team_id: int, version: Any, outcome_counts: List[int], resamples: int, time_budget: float,
+                       spawn: Callable[..., Any], on_done: Callable[[], None]) -> bool:
+    """
+    Queue a computation for a team unless one for this version is already queued or
+    running; a queued job for an older version is replaced. spawn starts a background
+    task (socketio.start_background_task) and is used once, to start the worker;
+    on_done() runs after the result is cached. Returns True if a job was queued.
+    """
+    global _worker_started
+    queued = _queue.get(team_id)
+    if _running == (team_id, version) or (queued is not None and queued[0] == version):
+        return False
+    _queue[team_id] = (version, outcome_counts, resamples, time_budget, on_done)
+    if not _worker_started:
+        _worker_started = True
+        spawn(_worker)
+    return True
+
+
+def _worker() -> None:
+    """Run queued jobs one at a time, oldest first, until the queue is empty."""
+    global _running, _worker_started
+    try:
+        while _queue:
+            team_id, (version, outcome_counts, resamples, time_budget, on_done) = _queue.popitem(last=False)
+            _running = (team_id, version)
+            try:
+                intervals = tpool.execute(bootstrap_intervals, outcome_counts, resamples, time_budget)
+            except Exception as e:
+                logger.error(f"Error computing bootstrap intervals for team {team_id}: {str(e)}", exc_info=True)
+                continue
+            finally:
+                _running = None
+            if intervals is not None:
+                _results[team_id] = (version, intervals)
+                on_done()
+    finally:
+        _worker_started = False
+
+
+def clear_intervals() -> None:
+    """Drop all cached intervals and queued jobs (game reset)."""
+    _results.clear()
+    _queue.clear()
@@ -5,6 +5,7 @@ eventlet.monkey_patch()
 from flask import Flask
 from flask_socketio import SocketIO
 from src.models.quiz_models import db
+from src import payload_json
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
@@ -17,8 +18,23 @@ if database_url and database_url.startswith('postgres://'):  # pragma: no cover
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url or 'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'quiz_app.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Optional bootstrap confidence intervals for the dashboard scores (off by default)
+app.config['BOOTSTRAP_CI_ENABLED'] = os.environ.get('BOOTSTRAP_CI_ENABLED', '').lower() in ('1', 'true', 'yes')
+app.config['BOOTSTRAP_RESAMPLES'] = int(os.environ.get('BOOTSTRAP_RESAMPLES', '1000'))
+app.config['BOOTSTRAP_TIME_BUDGET'] = float(os.environ.get('BOOTSTRAP_TIME_BUDGET', '0.5'))  # seconds per team
+
+# Memory budget of the dashboard caches; the Fly VM has 256 MB in total
+app.config['DASHBOARD_CACHE_MAX_BYTES'] = int(float(os.environ.get('DASHBOARD_CACHE_MAX_MB', '32')) * 1024 * 1024)
+
+# Seconds between dashboard cache statistics log lines (0 disables them)
+app.config['CACHE_STATS_LOG_INTERVAL'] = float(os.environ.get('CACHE_STATS_LOG_INTERVAL', '300'))
+
+# Unauthenticated debug endpoints such as /api/debug/cache_stats (off by default)
+app.config['DEBUG_ENDPOINTS_ENABLED'] = os.environ.get('DEBUG_ENDPOINTS_ENABLED', '').lower() in ('1', 'true', 'yes')
+
 db.init_app(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet', ping_timeout=30, ping_interval=5)
+# payload_json lets dashboard payloads be encoded once and shared by every recipient
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet', ping_timeout=30, ping_interval=5, json=payload_json)
 
 # Import routes to register them
 from src.routes import static
@@ -110,10 +110,17 @@ def start_new_round_for_pair(team_name):
         new_round_db = PairQuestionRounds(team_id=team_info['team_id'], round_number_for_team=round_number, player1_item=p1_item, player2_item=p2_item)
         db.session.add(new_round_db)
         db.session.commit()
+
+        # Extend the team's rolling history hash (if built yet; otherwise it is rebuilt from the DB)
+        accumulator = state.team_stats.get(team_info['team_id'])
+        if accumulator is not None:
+            accumulator.history.record_round_started(p1_item.value, p2_item.value)
         
         # Clear caches after database commit
-        from src.sockets.dashboard import invalidate_team_caches
+        from src.sockets.dashboard import invalidate_team_caches, update_team_leaderboard
         invalidate_team_caches(team_name)
+        # The completed round and the combo tracker both feed the team's rank and min_stats_sig
+        update_team_leaderboard(team_name)
 
         team_info['current_db_round_id'] = new_round_db.round_id
         team_info['answered_current_round'] = {}
@@ -125,7 +132,7 @@ def start_new_round_for_pair(team_name):
         
         logger.debug(f"Team {team_name} round {round_number}: Player1({player1_sid}) gets {p1_item.value}, Player2({player2_sid}) gets {p2_item.value}")
         
-        from src.sockets.dashboard import emit_dashboard_team_update
-        emit_dashboard_team_update()
+        from src.sockets.dashboard import schedule_dashboard_team_update
+        schedule_dashboard_team_update()
     except Exception as e:
         logger.error(f"Error in start_new_round_for_pair: {str(e)}", exc_info=True)
\ No newline at end of file
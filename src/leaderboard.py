@@ -0,0 +1,176 @@
+"""
+Incrementally maintained leaderboard for the dashboard.
+
+Teams are kept in two ordered indexes: 'chsh' (the CHSH value in classic mode,
+the success rate otherwise) and 'balanced' (balanced |<Tr>| in classic mode,
+unused otherwise). A team's entry is only moved when its score changes, so an
+update costs O(log n) plus the shift of the sorted list, and produces small
+events instead of a re-sort of every team:
+
+- ``rank_changed``: one team moved; the teams between its previous and new
+  rank shift by one place.
+- ``leader_changed``: the best team that meets ``min_stats_sig`` changed.
+"""
+import bisect
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BOARDS = ('chsh', 'balanced')
+
+# Sort key: highest score first, then team name, then team id for a total order
+_Key = Tuple[float, str, int]
+
+
+class Leaderboard:
+    """Ordered indexes of teams by score, with leader tracking among eligible teams."""
+
+    def __init__(self) -> None:
+        self._order: Dict[str, List[_Key]] = {board: [] for board in BOARDS}
+        self._keys: Dict[str, Dict[int, _Key]] = {board: {} for board in BOARDS}
+        self._eligible: Dict[int, bool] = {}
+        self._names: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, team_id: int) -> bool:
+        return team_id in self._names
+
+    def team_names(self) -> Dict[int, str]:
+        """{team_id: team_name} of every team on the leaderboard."""
+        return dict(self._names)
+
+    def rank(self, board: str, team_id: int) -> Optional[int]:
+        """1-based rank of a team on a board, or None if it has no score there."""
+        key = self._keys[board].get(team_id)
+        if key is None:
+            return None
+        return bisect.bisect_left(self._order[board], key) + 1
+
+    def ordered(self, board: str) -> List[Tuple[int, str, float]]:
+        """(team_id, team_name, score) for every team on a board, best first."""
+        return [(team_id, team_name, -neg_score) for neg_score, team_name, team_id in self._order[board]]
+
+    def leader(self, board: str) -> Optional[Dict[str, Any]]:
+        """The best-ranked team that meets min_stats_sig, or None."""
+        for neg_score, team_name, team_id in self._order[board]:
+            if self._eligible.get(team_id):
+                return {'team_id': team_id, 'team_name': team_name, 'value': -neg_score}
+        return None
+
+    def update(self, team_id: int, team_name: str, scores: Dict[str, Optional[float]], eligible: bool) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Set a team's scores ({board: score or None}) and eligibility.
+        Returns the (event name, payload) pairs to publish; empty if nothing visible changed.
+        """
+        previous_leaders = {board: self._leader_id(board) for board in BOARDS}
+        self._names[team_id] = team_name
+        self._eligible[team_id] = eligible
+
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        for board in BOARDS:
+            score = scores.get(board)
+            new_key = (-score, team_name, team_id) if score is not None else None
+            old_key = self._keys[board].get(team_id)
+            if new_key == old_key:
+                continue
+
+            previous_rank = self._remove_key(board, team_id)
+            rank = None
+            if new_key is not None:
+                self._keys[board][team_id] = new_key
+                order = self._order[board]
+                index = bisect.bisect_left(order, new_key)
+                order.insert(index, new_key)
+                rank = index + 1
+
+            if rank != previous_rank:
+                events.append(('rank_changed', {
+                    'board': board,
+                    'team_id': team_id,
+                    'team_name': team_name,
+                    'rank': rank,
+                    'previous_rank': previous_rank,
+                    'value': score,
+                }))
+
+        events.extend(self._leader_events(previous_leaders))
+        return events
+
+    def remove(self, team_id: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Drop a team from every board. Returns the events to publish."""
+        if team_id not in self._names:
+            return []
+        previous_leaders = {board: self._leader_id(board) for board in BOARDS}
+        team_name = self._names.pop(team_id)
+        self._eligible.pop(team_id, None)
+
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        for board in BOARDS:
+            previous_rank = self._remove_key(board, team_id)
+            if previous_rank is not None:
+                events.append(('rank_changed', {
+                    'board': board,
+                    'team_id': team_id,
+                    'team_name': team_name,
+                    'rank': None,
+                    'previous_rank': previous_rank,
+                    'value': None,
+                }))
+
+        events.extend(self._leader_events(previous_leaders))
+        return events
+
+    def rebuild(self, entries: Iterable[Tuple[int, str, Dict[str, Optional[float]], bool]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Replace every team at once from (team_id, team_name, scores, eligible) entries, e.g.
+        after a game mode change re-scores all teams. Only leader changes are reported, since
+        every rank may have moved.
+        """
+        previous_leaders = {board: self._leader_id(board) for board in BOARDS}
+        self.clear()
+        for team_id, team_name, scores, eligible in entries:
+            self._names[team_id] = team_name
+            self._eligible[team_id] = eligible
+            for board in BOARDS:
+                score = scores.get(board)
+                if score is not None:
+                    self._keys[board][team_id] = (-score, team_name, team_id)
+        for board in BOARDS:
+            self._order[board].extend(sorted(self._keys[board].values()))
+        return self._leader_events(previous_leaders)
+
+    def clear(self) -> None:
+        for board in BOARDS:
+            self._order[board].clear()
+            self._keys[board].clear()
+        self._eligible.clear()
+        self._names.clear()
+
+    def leader_payload(self, board: str, previous_team_id: Optional[int] = None) -> Dict[str, Any]:
+        """leader_changed payload for a board's current leader (team fields are None without one)."""
+        leader = self.leader(board) or {'team_id': None, 'team_name': None, 'value': None}
+        return {'board': board, **leader, 'previous_team_id': previous_team_id}
+
+    def _leader_id(self, board: str) -> Optional[int]:
+        leader = self.leader(board)
+        return leader['team_id'] if leader else None
+
+    def _leader_events(self, previous_leaders: Dict[str, Optional[int]]) -> List[Tuple[str, Dict[str, Any]]]:
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        for board in BOARDS:
+            if self._leader_id(board) != previous_leaders[board]:
+                events.append(('leader_changed', self.leader_payload(board, previous_leaders[board])))
+        return events
+
+    def _remove_key(self, board: str, team_id: int) -> Optional[int]:
+        """Remove a team's key from a board, returning the 1-based rank it had."""
+        key = self._keys[board].pop(team_id, None)
+        if key is None:
+            return None
+        order = self._order[board]
+        index = bisect.bisect_left(order, key)
+        del order[index]
+        return index + 1
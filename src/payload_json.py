@@ -0,0 +1,57 @@
+"""
+JSON module for the Socket.IO server that can splice pre-encoded payloads into
+packets.
+
+Socket.IO encodes an event's payload every time it is emitted, once per recipient
+when emitting to individual clients. A payload wrapped in ``EncodedJSON`` is JSON
+text encoded once by the caller; ``dumps`` below inserts it into the packet as is
+instead of encoding it again. Large payloads can so be assembled from cached
+fragments (``encode_object``/``encode_array``) and shared between all recipients.
+
+EncodedJSON must be an emit argument itself (packet data is ``[event, *args]``),
+or a value inside ``encode_object``/``encode_array``; nested in an ordinary dict
+it would be encoded as a string. Clients receive ordinary JSON either way.
+"""
+import json
+from typing import Any, Dict, Iterable
+
+_SEPARATORS = (',', ':')  # As used by python-socketio for packets
+
+
+class EncodedJSON(str):
+    """JSON text that is spliced into packets without being encoded again."""
+    __slots__ = ()
+
+
+def encode(obj: Any) -> EncodedJSON:
+    """Encode a JSON value once, for splicing."""
+    return EncodedJSON(json.dumps(obj, separators=_SEPARATORS))
+
+
+def _encode_value(value: Any) -> str:
+    return value if isinstance(value, EncodedJSON) else json.dumps(value, separators=_SEPARATORS)
+
+
+def encode_array(items: Iterable[Any]) -> EncodedJSON:
+    """Encode a JSON array, splicing items that are already encoded."""
+    return EncodedJSON('[' + ','.join(_encode_value(item) for item in items) + ']')
+
+
+def encode_object(fields: Dict[str, Any]) -> EncodedJSON:
+    """Encode a JSON object, splicing values that are already encoded."""
+    return EncodedJSON('{' + ','.join(json.dumps(str(key)) + ':' + _encode_value(value)
+                                      for key, value in fields.items()) + '}')
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """json.dumps, except that EncodedJSON values of a top-level array are spliced in."""
+    if isinstance(obj, EncodedJSON):
+        return str(obj)
+    if isinstance(obj, list) and any(isinstance(item, EncodedJSON) for item in obj):
+        return '[' + ','.join(item if isinstance(item, EncodedJSON) else json.dumps(item, **kwargs)
+                              for item in obj) + ']'
+    return json.dumps(obj, **kwargs)
+
+
+def loads(s: Any, **kwargs: Any) -> Any:
+    return json.loads(s, **kwargs)
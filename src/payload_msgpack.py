@@ -0,0 +1,47 @@
+"""
+MessagePack counterpart of payload_json, for dashboard clients that ask for binary
+payloads at dashboard_join.
+
+A payload is encoded once into ``EncodedMsgPack`` bytes and emitted as the event
+argument; Socket.IO sends bytes as a binary attachment, which the client decodes with
+a MessagePack library. Like a JSON array or object, a MessagePack array or map is a
+header followed by its encoded items, so payloads are assembled from cached fragments
+the same way as with payload_json (``encode_object``/``encode_array``).
+"""
+from typing import Any, Dict, Iterable
+
+import msgpack
+
+
+class EncodedMsgPack(bytes):
+    """MessagePack bytes that are spliced into payloads without being encoded again."""
+    __slots__ = ()
+
+
+def encode(obj: Any) -> EncodedMsgPack:
+    """Encode a value once, for splicing."""
+    return EncodedMsgPack(msgpack.packb(obj))
+
+
+def _encode_value(value: Any) -> bytes:
+    return value if isinstance(value, EncodedMsgPack) else msgpack.packb(value)
+
+
+def _header(size: int, fix_type: int, type_16: bytes, type_32: bytes) -> bytes:
+    if size < 16:
+        return bytes((fix_type | size,))
+    if size < 0x10000:
+        return type_16 + size.to_bytes(2, 'big')
+    return type_32 + size.to_bytes(4, 'big')
+
+
+def encode_array(items: Iterable[Any]) -> EncodedMsgPack:
+    """Encode an array, splicing items that are already encoded."""
+    encoded = [_encode_value(item) for item in items]
+    return EncodedMsgPack(_header(len(encoded), 0x90, b'\xdc', b'\xdd') + b''.join(encoded))
+
+
+def encode_object(fields: Dict[str, Any]) -> EncodedMsgPack:
+    """Encode a map with string keys (as JSON has), splicing values that are already encoded."""
+    return EncodedMsgPack(_header(len(fields), 0x80, b'\xde', b'\xdf') + b''.join(
+        msgpack.packb(str(key)) + _encode_value(value) for key, value in fields.items()))
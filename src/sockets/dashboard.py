@@ -1,8 +1,6 @@
 from flask import jsonify, Response
 import math
-from uncertainties import ufloat, UFloat
-import uncertainties.umath as um  # for ufloat‑compatible fabs
-from functools import lru_cache
+from functools import lru_cache, partial
 from sqlalchemy.orm import joinedload
 from src.config import app, socketio, db
 from src.state import state
@@ -10,14 +8,24 @@ from src.models.quiz_models import Teams, Answers, PairQuestionRounds, ItemEnum
 from src.game_logic import QUESTION_ITEMS, TARGET_COMBO_REPEATS, get_effective_combo_repeats
 from flask_socketio import emit
 from src.game_logic import start_new_round_for_pair
+from src.team_stats import TeamStatsAccumulator, TeamHistoryHash, ITEM_VALUES, SuccessTable, iter_completed_rounds
+from src.success_rules import AQMJOE_TABLE, SUCCESS_TABLES, is_successful, success_table_for_mode
+from src.stats_engine import FrozenTeamStats, SuccessView, TeamBatchResult, compute_classic_statistics_batch, compute_success_statistics_batch, compute_team_statistics_batch, freeze_team_statistics
+from src.uncertainty import MIN_STD_DEV, Estimate
+from src import bootstrap, payload_json, payload_msgpack
+from src.payload_json import EncodedJSON
+from src.payload_msgpack import EncodedMsgPack
+from src.leaderboard import BOARDS as LEADERBOARD_BOARDS
+from src.teams_index import FILTERS as TEAMS_WINDOW_FILTERS, SORT_KEYS as TEAMS_WINDOW_SORTS, TeamsIndex
 from time import time
-import hashlib
 import csv
 import io
 import logging
+import sys
+from collections import OrderedDict
 import threading
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Optional, Union, Set
+from typing import Dict, List, Tuple, Any, Optional, Union, Set, Callable, Hashable, NamedTuple
 from flask import request
 from contextlib import contextmanager
 import weakref
@@ -31,11 +39,41 @@ dashboard_last_activity: Dict[str, float] = {}
 # Per-client preference for teams data streaming (enabled/disabled)
 dashboard_teams_streaming: Dict[str, bool] = {}
 
+# Teams each streaming client holds, {sid: ClientTeams}, so updates can be sent as patches
+# against them. A client without an entry gets a full snapshot next.
+dashboard_client_teams: Dict[str, 'ClientTeams'] = {}
+
+# Socket.IO rooms for dashboard broadcasts, so each is encoded once and sent as one room
+# emit. Every dashboard client is in DASHBOARD_ROOM and, following its teams streaming
+# preference, in exactly one of the other two.
+DASHBOARD_ROOM = 'dashboards'
+STREAMING_ROOM = 'dashboards_streaming'
+METRICS_ONLY_ROOM = 'dashboards_metrics_only'
+
+# Encoding of the teams payloads each dashboard client asked for at dashboard_join; JSON
+# unless it asked for 'msgpack' (and the msgpack package is installed)
+PAYLOAD_ENCODINGS = {'json': payload_json, 'msgpack': payload_msgpack}
+dashboard_client_encoding: Dict[str, str] = {}
+
+# Window of the teams list each dashboard client asked for (request_teams_window): a sort
+# key, a filter ('active' or 'all') and an offset/limit. Clients without one get every team.
+class TeamsWindow(NamedTuple):
+    sort: str
+    filter: str
+    offset: int
+    limit: int
+
+dashboard_client_windows: Dict[str, TeamsWindow] = {}
+TEAMS_WINDOW_MAX_LIMIT = 200  # teams - largest window a client may ask for
+
 # Cache configuration and throttling constants
 CACHE_SIZE = 1024  # LRU cache size for team calculations
+SELECTIVE_CACHE_MAX_BYTES = app.config['DASHBOARD_CACHE_MAX_BYTES'] // 6  # Each selective cache's share of the memory budget
+CACHE_PRESSURE_LOG_INTERVAL = 60.0  # seconds - minimum interval between eviction pressure warnings per cache
 REFRESH_DELAY_QUICK = 0.5  # seconds - maximum refresh rate for team updates and data fetching
 REFRESH_DELAY_FULL = 1.0  # seconds - maximum refresh rate for expensive full dashboard updates
-MIN_STD_DEV = 1e-10  # Minimum standard deviation to avoid zero uncertainty warnings
+ANSWER_BATCH_INTERVAL = 0.25  # seconds - maximum delay of an answer on its way to the dashboard answer log
+ANSWER_BATCH_MAX_SIZE = 50  # answers - a batch this full is sent without waiting for the interval
 
 # Single lock for all dashboard operations to prevent deadlocks
 # This lock protects:
@@ -47,15 +85,70 @@ _dashboard_lock = threading.RLock()
 # Global throttling state for get_all_teams function
 _last_refresh_time = 0
 _cached_teams_result: Optional[List[Dict[str, Any]]] = None
-_cached_teams_is_stale = False  # NEW: Track if cached data is stale but still usable
+_cached_teams_version = 0  # Global data version the cached teams were built from (stale once it falls behind)
+# Success view of every cached team under every game mode, {team_id: {mode: (success_matrix, new_stats)}},
+# so a mode change re-derives the cached teams from memory instead of flushing them
+_cached_mode_views: Dict[int, Dict[str, SuccessView]] = {}
+
+# The Teams table as get_all_teams last read it, reloaded only after a membership change
+# (a team created, deactivated, renamed or reactivated) bumps _team_roster_version
+class TeamRow(NamedTuple):
+    team_id: int
+    team_name: str
+    is_active: bool
+    created_at: Optional[str]
+
+_cached_team_roster: Optional[List[TeamRow]] = None
+_cached_team_roster_version = 0
+_team_roster_version = 0
+
+# Last computed dashboard entry of each team, {team_id: TeamEntry}. get_all_teams reuses an
+# entry while the team's row and data version are unchanged and recomputes only the others.
+class TeamEntry(NamedTuple):
+    row: TeamRow
+    data_version: int
+    team: Dict[str, Any]
+
+_team_entries: Dict[int, TeamEntry] = {}
 
 # Global throttling state for dashboard update functions with differentiated timing
 _last_team_update_time = 0
 _last_full_update_time = 0
 _cached_team_metrics: Optional[Dict[str, int]] = None
 _cached_full_metrics: Optional[Dict[str, int]] = None
-_cached_team_metrics_is_stale = False  # NEW: Track staleness for team metrics
-_cached_full_metrics_is_stale = False  # NEW: Track staleness for full metrics
+_cached_team_metrics_version = 0  # Global data version of the cached team metrics
+_cached_full_metrics_version = 0  # Global data version of the cached full metrics
+
+# Encoded JSON of each team's dashboard entry, {team_id: TeamFragment}. A fragment is reused
+# while get_all_teams serves the same team dict in the same game mode. fields is a shallow
+# copy of the entry as encoded, to diff against for patches.
+class TeamFragment(NamedTuple):
+    team: Dict[str, Any]
+    game_mode: Optional[str]
+    json: EncodedJSON
+    fields: Dict[str, Any]
+
+_team_fragments: Dict[Any, TeamFragment] = {}
+
+# MessagePack encoding of team fragments, {team_id: (TeamFragment, encoded)}, for clients
+# that asked for msgpack; reused while the team's fragment is the same
+_team_msgpack_fragments: Dict[Any, Tuple[TeamFragment, EncodedMsgPack]] = {}
+
+# The teams a dashboard client was last sent: the data version and each team's fragment
+class ClientTeams(NamedTuple):
+    data_version: int
+    fragments: Dict[Any, TeamFragment]
+
+# Dashboard team update scheduler: handlers set the flag, the scheduler greenlet emits at
+# most once per REFRESH_DELAY_QUICK tick while it is set
+_team_update_requested = False
+_class_stats_update_requested = False  # Same for the pooled class statistics
+_team_update_scheduler_started = False
+
+# Answers waiting for the next answers_batch event, as (time, team_id, team_name, player,
+# round_id, item, response) tuples; sent every ANSWER_BATCH_INTERVAL or once ANSWER_BATCH_MAX_SIZE are queued
+_pending_answers: List[Tuple[float, int, str, str, int, str, bool]] = []
+_answer_batch_flusher_started = False
 
 # Global computation flags to prevent race conditions
 _teams_computation_in_progress = False
@@ -64,20 +157,136 @@ _full_update_computation_in_progress = False
 
 # --- SELECTIVE CACHE INVALIDATION SYSTEM ---
 
+class CacheKey(NamedTuple):
+    """
+    Typed key of a selective cache entry. The team the entry belongs to is an explicit
+    field, so invalidation never has to parse keys; game_mode is set for results that
+    depend on the game mode.
+    """
+    team_name: Optional[str]
+    args: Tuple[Any, ...] = ()
+    game_mode: Optional[str] = None
+
+class TeamVersions:
+    """
+    Monotonically increasing data version per team, plus a global version that is bumped
+    with every team version (and by changes to the teams view as a whole). Cached values
+    record the version they were built from, so staleness is a single integer comparison.
+    """
+    def __init__(self, initial_global_version: int = 0):
+        self._versions: Dict[str, int] = {}
+        self.global_version = initial_global_version
+    
+    def get(self, team_name: Optional[str]) -> int:
+        """Current data version of a team (0 until it first changes)."""
+        return self._versions.get(team_name, 0) if team_name is not None else 0
+    
+    def bump(self, team_name: Optional[str] = None) -> int:
+        """Bump a team's version and the global version (only the global one without a team). Returns the global version."""
+        if team_name is not None:
+            self._versions[team_name] = self._versions.get(team_name, 0) + 1
+        self.global_version += 1
+        return self.global_version
+    
+    def clear(self) -> None:
+        """Forget per-team versions; the global version keeps counting up."""
+        self._versions.clear()
+        self.global_version += 1
+
+class CacheStats:
+    """
+    Hit/miss counters of one cache. Updating them is a plain integer increment made
+    where the cache already holds its lock, so they cost next to nothing on get/set.
+    """
+    __slots__ = ('hits', 'stale_hits', 'misses', 'evictions', 'invalidations')
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else None,
+        }
+
+def _approx_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate memory footprint of obj in bytes (sys.getsizeof over containers, counting shared objects once)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k, seen) + _approx_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_approx_size(item, seen) for item in obj)
+    return size
+
+# Approximate size of each get_all_teams entry, {team_id: (entry dict, bytes)}; entries are
+# reused while a team is unchanged, so each is measured once rather than on every cache write
+_team_entry_sizes: Dict[Any, Tuple[Dict[str, Any], int]] = {}
+
+def _teams_list_size(teams: List[Dict[str, Any]]) -> int:
+    """Approximate size of a get_all_teams list in bytes, measuring only entries not seen before."""
+    size = sys.getsizeof(teams)
+    for team_data in teams:
+        team_id = team_data.get('team_id')
+        measured = _team_entry_sizes.get(team_id)
+        if measured is None or measured[0] is not team_data:
+            measured = _team_entry_sizes[team_id] = (team_data, _approx_size(team_data))
+        size += measured[1]
+    return size
+
+def _metrics_cache_size(metrics: Dict[str, Any]) -> int:
+    """Approximate size of a metrics throttling cache entry; its team entries are counted under the teams cache."""
+    teams = metrics.get('cached_teams', [])
+    return (_approx_size({key: value for key, value in metrics.items() if key != 'cached_teams'})
+            + sys.getsizeof(teams))
+
 class SelectiveCache:
     """
     Custom cache that supports selective invalidation by team name.
     Preserves cached results for unchanged teams while allowing targeted invalidation.
     Modified to support "stale but usable" invalidation behavior.
+    
+    Entries live in an OrderedDict kept in LRU order, and a secondary index maps each
+    team name to its keys, so a hit, a miss and an eviction are O(1) and invalidating a
+    team is O(keys of that team). Every entry stores the team version it was built from;
+    invalidating a team bumps that version, so an entry is stale exactly when its version
+    is behind.
+    
+    Besides the entry count (maxsize), the cache is bounded by an estimated byte budget
+    (max_bytes): each entry's size is estimated once when it is set, and least recently
+    used entries are evicted until the new one fits. Evictions forced by the budget are
+    logged as warnings, at most once per CACHE_PRESSURE_LOG_INTERVAL.
     """
-    def __init__(self, maxsize: int = CACHE_SIZE):
+    def __init__(self, maxsize: int = CACHE_SIZE, name: Optional[str] = None, max_bytes: Optional[int] = None):
         self.maxsize = maxsize
-        self._cache: Dict[str, Any] = {}
-        self._access_order: List[str] = []  # LRU tracking
-        self._stale_keys: Set[str] = set()  # NEW: Track which keys are stale
+        self.max_bytes = max_bytes
+        self.name = name
+        self.stats = CacheStats()
+        self.current_bytes = 0  # Estimated size of all entries
+        self._pressure_evictions = 0  # Budget evictions not reported yet
+        self._last_pressure_log = 0.0
+        self._cache: OrderedDict[Hashable, Tuple[Any, int, int]] = OrderedDict()  # key -> (value, team version, bytes); LRU first
+        self._versions = TeamVersions()
+        self._team_keys: Dict[str, Set[Hashable]] = {}  # team name -> cache keys of that team
         self._lock = threading.RLock()
     
-    def get(self, key: str, allow_stale: bool = True) -> Optional[Any]:
+    def get(self, key: Hashable, allow_stale: bool = True) -> Optional[Any]:
         """
         Get cached value for key, updating LRU order.
         
@@ -86,129 +295,201 @@ class SelectiveCache:
             allow_stale: If True, return stale data. If False, return None for stale data.
         """
         with self._lock:
-            if key in self._cache:
-                # Check if key is stale and if stale data is allowed
-                if key in self._stale_keys and not allow_stale:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, version, _ = entry
+            # Check if key is stale and if stale data is allowed
+            if version != self._versions.get(self._key_team_name(key)):
+                if not allow_stale:
+                    self.stats.misses += 1
                     return None
-                
-                # Move to end (most recently used)
-                self._access_order.remove(key)
-                self._access_order.append(key)
-                return self._cache[key]
-            return None
+                self.stats.stale_hits += 1
+            else:
+                self.stats.hits += 1
+            
+            # Move to end (most recently used)
+            self._cache.move_to_end(key)
+            return value
     
-    def is_stale(self, key: str) -> bool:
-        """Check if a cache key is marked as stale."""
+    def is_stale(self, key: Hashable) -> bool:
+        """Check if a cached entry was built from an older version of its team's data."""
         with self._lock:
-            return key in self._stale_keys
+            entry = self._cache.get(key)
+            return entry is not None and entry[1] != self._versions.get(self._key_team_name(key))
     
-    def set(self, key: str, value: Any) -> None:
-        """Set cached value for key, evicting LRU items if needed."""
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set cached value for key, evicting LRU items if needed. The entry is current as of now."""
+        nbytes = _approx_size(key) + _approx_size(value)
         with self._lock:
-            if key in self._cache:
-                # Update existing, move to end
-                self._access_order.remove(key)
-            elif len(self._cache) >= self.maxsize:
-                # Evict least recently used
-                lru_key = self._access_order.pop(0)
-                del self._cache[lru_key]
-                self._stale_keys.discard(lru_key)  # Remove from stale set too
+            team_name = self._key_team_name(key)
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                # Replacing an entry: it leaves the LRU order and the footprint, not the index
+                self.current_bytes -= previous[2]
+            
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                # Larger than the whole budget: not cached at all
+                if previous is not None:
+                    self._discard_key(key)
+                self.stats.evictions += 1
+                self._record_pressure(1, nbytes)
+                return
             
-            self._cache[key] = value
-            self._access_order.append(key)
-            # Remove from stale set when setting fresh data
-            self._stale_keys.discard(key)
+            budget_evictions = 0
+            while self._cache and (len(self._cache) >= self.maxsize or
+                                   (self.max_bytes is not None and self.current_bytes + nbytes > self.max_bytes)):
+                # Evict least recently used
+                over_budget = len(self._cache) < self.maxsize
+                lru_key, (_, _, lru_bytes) = self._cache.popitem(last=False)
+                self.current_bytes -= lru_bytes
+                self._discard_key(lru_key)
+                self.stats.evictions += 1
+                budget_evictions += over_budget
+            if budget_evictions:
+                self._record_pressure(budget_evictions, nbytes)
+            
+            if team_name is not None:
+                self._team_keys.setdefault(team_name, set()).add(key)
+            self._cache[key] = (value, self._versions.get(team_name), nbytes)
+            self.current_bytes += nbytes
+    
+    def _record_pressure(self, evictions: int, nbytes: int) -> None:
+        """Note evictions forced by the byte budget and warn about them, rate limited. Call under the lock."""
+        self._pressure_evictions += evictions
+        now = time()
+        if now - self._last_pressure_log >= CACHE_PRESSURE_LOG_INTERVAL:
+            logger.warning(f"Cache {self.name} is over its {self.max_bytes / 1024:.0f}KB budget: "
+                           f"{self._pressure_evictions} entries evicted or refused since the last warning "
+                           f"(now {len(self._cache)} entries, {self.current_bytes / 1024:.0f}KB; "
+                           f"last entry {nbytes / 1024:.1f}KB)")
+            self._pressure_evictions = 0
+            self._last_pressure_log = now
     
     def invalidate_by_team(self, team_name: str) -> int:
         """
-        Mark cache entries for a specific team as stale instead of deleting them.
-        This allows throttling logic to still return stale data within REFRESH_DELAY.
-        Returns number of entries marked as stale.
+        Mark cache entries for a specific team as stale instead of deleting them, by bumping
+        the team's version. This allows throttling logic to still return stale data within
+        REFRESH_DELAY. Returns number of entries marked as stale.
         """
         with self._lock:
-            stale_count = 0
-            
-            for key in self._cache.keys():
-                # Check if this cache key is for the specified team
-                if self._is_team_key(key, team_name):
-                    self._stale_keys.add(key)
-                    stale_count += 1
-            
-            return stale_count
+            self._versions.bump(team_name)
+            invalidated = len(self._team_keys.get(team_name, ()))
+            self.stats.invalidations += invalidated
+            return invalidated
     
     def clear_all(self) -> None:
-        """Clear all cached entries and stale markers."""
+        """Clear all cached entries and team versions."""
         with self._lock:
+            self.stats.invalidations += len(self._cache)
             self._cache.clear()
-            self._access_order.clear()
-            self._stale_keys.clear()
+            self.current_bytes = 0
+            self._team_keys.clear()
+            self._versions.clear()
     
     def remove_stale_entries(self) -> int:
         """Actually remove stale entries from cache. Returns count of removed entries."""
         with self._lock:
-            removed_count = 0
-            keys_to_remove = list(self._stale_keys)
-            
-            for key in keys_to_remove:
-                if key in self._cache:
-                    del self._cache[key]
-                    self._access_order.remove(key)
-                    removed_count += 1
-            
-            self._stale_keys.clear()
-            return removed_count
+            stale_keys = [key for key, (_, version, _) in self._cache.items()
+                          if version != self._versions.get(self._key_team_name(key))]
+            for key in stale_keys:
+                self.current_bytes -= self._cache.pop(key)[2]
+                self._discard_key(key)
+            self.stats.evictions += len(stale_keys)
+            return len(stale_keys)
     
-    def _is_team_key(self, cache_key: str, team_name: str) -> bool:
-        """
-        Check if a cache key belongs to a specific team.
-        Uses precise matching to avoid false positives from substring matches.
-        """
-        # For simple team_name keys (exact match)
-        if cache_key == team_name:
-            return True
-        
-        # For function cache keys in format: (arg1, arg2, ...)
-        # team_name appears as repr(team_name) which is 'team_name'
-        team_name_repr = repr(team_name)
-        
-        # Check if this is a function cache key starting with (team_name, ...)
-        if cache_key.startswith(f"({team_name_repr},") or cache_key == f"({team_name_repr})":
-            return True
-        
-        # Check for team_name as any parameter in the function call
-        # Use regex to match team_name_repr as a complete parameter
-        import re
-        # Pattern matches 'team_name' that is:
-        # - after opening paren: ('team_name'
-        # - after comma and optional space: , 'team_name' or ,  'team_name'
-        # - and followed by comma, closing paren, or end: 'team_name', or 'team_name')
-        pattern = rf"(\(|,\s*){re.escape(team_name_repr)}(\s*,|\s*\)|$)"
-        return bool(re.search(pattern, cache_key))
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, entry count and estimated size of the cache."""
+        with self._lock:
+            return {
+                **self.stats.as_dict(),
+                'entries': len(self._cache),
+                'maxsize': self.maxsize,
+                'approx_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+    
+    def _discard_key(self, key: Hashable) -> None:
+        """Drop a removed key from the team index."""
+        team_name = self._key_team_name(key)
+        team_keys = self._team_keys.get(team_name) if team_name is not None else None
+        if team_keys is not None:
+            team_keys.discard(key)
+            if not team_keys:
+                del self._team_keys[team_name]
+    
+    @staticmethod
+    def _key_team_name(key: Hashable) -> Optional[str]:
+        """The team a key belongs to: the team_name field of a CacheKey, or a simple team_name key itself."""
+        if isinstance(key, CacheKey):
+            return key.team_name
+        if isinstance(key, str):
+            return key
+        return None
 
 # Global selective caches
-_hash_cache = SelectiveCache()
-_correlation_cache = SelectiveCache()
-_success_cache = SelectiveCache()
-_classic_stats_cache = SelectiveCache()
-_new_stats_cache = SelectiveCache()
-_team_process_cache = SelectiveCache()
-
-def _make_cache_key(*args, **kwargs) -> str:
-    """Create a consistent cache key from function arguments."""
-    key_parts = []
-    for arg in args:
-        key_parts.append(repr(arg))
-    for k, v in sorted(kwargs.items()):
-        key_parts.append(f"{k}={repr(v)}")
-    return f"({', '.join(key_parts)})"
-
-def selective_cache(cache_instance: SelectiveCache):
+_hash_cache = SelectiveCache(name='team_hashes', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+_correlation_cache = SelectiveCache(name='correlation_matrix', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+_success_cache = SelectiveCache(name='success_metrics', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+_classic_stats_cache = SelectiveCache(name='classic_stats', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+_new_stats_cache = SelectiveCache(name='success_stats', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+_team_process_cache = SelectiveCache(name='team_process', max_bytes=SELECTIVE_CACHE_MAX_BYTES)
+SELECTIVE_CACHES = (_hash_cache, _correlation_cache, _success_cache, _classic_stats_cache, _new_stats_cache, _team_process_cache)
+
+# Counters of the throttling caches (_cached_teams_result, _cached_team_metrics, _cached_full_metrics).
+# A cached result served at the current data version is a hit, one served behind it a stale hit.
+_throttle_cache_stats: Dict[str, CacheStats] = {
+    'teams': CacheStats(),
+    'team_metrics': CacheStats(),
+    'full_metrics': CacheStats(),
+}
+
+# Approximate bytes of each throttling cache, recorded when the cache is written
+_throttle_cache_bytes: Dict[str, int] = {'teams': 0, 'team_metrics': 0, 'full_metrics': 0}
+
+def _count_throttle_lookup(cache_name: str, cached_version: Optional[int]) -> None:
+    """Count a throttling cache lookup: a miss without a cached version, else a (stale) hit. Call under the dashboard lock."""
+    stats = _throttle_cache_stats[cache_name]
+    if cached_version is None:
+        stats.misses += 1
+    elif cached_version == team_data_versions.global_version:
+        stats.hits += 1
+    else:
+        stats.stale_hits += 1
+
+# Data version of every team, bumped when its answers, rounds or membership change.
+# The global version starts from the clock so it also advances across restarts, and a
+# dashboard holding a version from before a restart never mistakes it for current.
+team_data_versions = TeamVersions(initial_global_version=int(time()))
+
+def _make_cache_key(*args, **kwargs) -> CacheKey:
+    """
+    Default cache key from function arguments: the first positional argument is the
+    team name, the remaining arguments (keyword arguments sorted by name) are kept as-is.
+    """
+    team_name = args[0] if args and isinstance(args[0], str) else None
+    rest = args[1:] if team_name is not None else args
+    if kwargs:
+        rest = rest + tuple(sorted(kwargs.items()))
+    return CacheKey(team_name, rest)
+
+def _process_team_cache_key(team_id: int, team_name: str, *args: Any, **kwargs: Any) -> CacheKey:
+    """Cache key of _process_single_team, whose team name is its second argument."""
+    return CacheKey(team_name, (team_id, *args, *sorted(kwargs.items())))
+
+def selective_cache(cache_instance: SelectiveCache, key: Callable[..., CacheKey] = _make_cache_key, mode_dependent: bool = False):
     """
     Decorator for selective caching that supports team-specific invalidation.
+    key builds the CacheKey from the call arguments (default: the first argument is the
+    team name). Results of mode_dependent functions are cached per game mode, so a mode
+    change selects the other entries instead of requiring a flush.
     """
     def decorator(func):
         def wrapper(*args, **kwargs):
-            cache_key = _make_cache_key(*args, **kwargs)
+            cache_key = key(*args, **kwargs)
+            if mode_dependent:
+                cache_key = cache_key._replace(game_mode=state.game_mode)
             
             # Try to get from cache
             cached_result = cache_instance.get(cache_key)
@@ -223,7 +504,7 @@ def selective_cache(cache_instance: SelectiveCache):
         # Add cache management methods to function
         wrapper.cache_clear = cache_instance.clear_all
         wrapper.cache_invalidate_team = cache_instance.invalidate_by_team
-        wrapper.cache_info = lambda: f"Cache entries: {len(cache_instance._cache)}"
+        wrapper.cache_info = cache_instance.snapshot
         
         return wrapper
     return decorator
@@ -262,14 +543,41 @@ def _atomic_client_update(sid: str, activity_time: Optional[float] = None,
         if remove:
             dashboard_last_activity.pop(sid, None)
             dashboard_teams_streaming.pop(sid, None)
+            dashboard_client_teams.pop(sid, None)
+            dashboard_client_encoding.pop(sid, None)
+            dashboard_client_windows.pop(sid, None)
             logger.debug(f"Atomically removed dashboard client data for {sid}")
         else:
             if activity_time is not None:
                 dashboard_last_activity[sid] = activity_time
             if streaming_enabled is not None:
                 dashboard_teams_streaming[sid] = streaming_enabled
+                # The client's teams may fall out of step while it is not streaming
+                dashboard_client_teams.pop(sid, None)
+                _join_dashboard_rooms(sid, streaming_enabled)
             logger.debug(f"Atomically updated dashboard client data for {sid}")
 
+def _join_dashboard_rooms(sid: str, streaming_enabled: bool) -> None:
+    """Put a dashboard client in the broadcast rooms matching its teams streaming preference."""
+    # Through the server directly, as this also runs outside a request context
+    socketio.server.enter_room(sid, DASHBOARD_ROOM, namespace='/')
+    socketio.server.enter_room(sid, STREAMING_ROOM if streaming_enabled else METRICS_ONLY_ROOM, namespace='/')
+    socketio.server.leave_room(sid, METRICS_ONLY_ROOM if streaming_enabled else STREAMING_ROOM, namespace='/')
+
+def _emit_grouped(event: str, groups: List[Tuple[Any, List[str]]], room: str, skip_sids: List[str]) -> None:
+    """
+    Send each (payload, sids) group of a room's members its payload. The largest group
+    is one room emit skipping everyone else; the rest, usually none, are sent per client.
+    """
+    if not groups:
+        return
+    groups = sorted(groups, key=lambda group: len(group[1]), reverse=True)
+    others = [sid for _, sids in groups[1:] for sid in sids]
+    socketio.emit(event, groups[0][0], to=room, skip_sid=(skip_sids + others) or None)  # type: ignore
+    for payload, sids in groups[1:]:
+        for sid in sids:
+            socketio.emit(event, payload, to=sid)  # type: ignore
+
 def _get_team_id_from_name(team_name: str) -> Optional[int]:
     """Helper function to resolve team_name to team_id from state or database."""
     try:
@@ -299,6 +607,12 @@ def _periodic_cleanup_dashboard_clients() -> None:
             # Clean up tracking dictionaries atomically
             stale_activity_clients = set(dashboard_last_activity.keys()) - active_clients
             stale_streaming_clients = set(dashboard_teams_streaming.keys()) - active_clients
+            for sid in set(dashboard_client_teams.keys()) - active_clients:
+                del dashboard_client_teams[sid]
+            for sid in set(dashboard_client_encoding.keys()) - active_clients:
+                del dashboard_client_encoding[sid]
+            for sid in set(dashboard_client_windows.keys()) - active_clients:
+                del dashboard_client_windows[sid]
             
             # Remove stale clients atomically
             for sid in stale_activity_clients:
@@ -337,17 +651,75 @@ def on_set_teams_streaming(data: Dict[str, Any]) -> None:
         logger.error(f"Error in on_set_teams_streaming: {str(e)}", exc_info=True)
 
 @socketio.on('request_teams_update')
-def on_request_teams_update() -> None:
-    """Handle explicit request for teams data from streaming-enabled clients."""
+def on_request_teams_update(data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Handle explicit request for teams data from streaming-enabled clients.
+    A client may send the data version of the teams it already has; if nothing
+    changed since, no update is sent. Otherwise it gets a full snapshot (this is
+    also how a client that could not apply a patch resyncs).
+    """
     try:
         sid = request.sid  # type: ignore
         if sid in state.dashboard_clients and dashboard_teams_streaming.get(sid, False):
+            if isinstance(data, dict) and data.get('version') == team_data_versions.global_version:
+                logger.debug(f"Dashboard client {sid} already has teams data version {data['version']}")
+                return
+            with _safe_dashboard_operation():
+                dashboard_client_teams.pop(sid, None)
             # Send current teams data to this specific client
             emit_dashboard_full_update(client_sid=sid)
             logger.info(f"Sent teams update to dashboard client {sid}")
     except Exception as e:
         logger.error(f"Error in on_request_teams_update: {str(e)}", exc_info=True)
 
+def _parse_teams_window(data: Any) -> Optional[TeamsWindow]:
+    """Parse a teams window request; None (or an empty request) means every team. Raises ValueError for invalid values."""
+    if not data:
+        return None
+    if not isinstance(data, dict):
+        raise ValueError("teams window must be an object")
+    sort = data.get('sort', 'chsh')
+    if sort not in TEAMS_WINDOW_SORTS:
+        raise ValueError(f"sort must be one of {', '.join(TEAMS_WINDOW_SORTS)}")
+    filter_ = data.get('filter', 'active')
+    if filter_ not in TEAMS_WINDOW_FILTERS:
+        raise ValueError(f"filter must be one of {', '.join(TEAMS_WINDOW_FILTERS)}")
+    offset = _parse_round_limit(data.get('offset'), 'offset', 0) or 0
+    limit = _parse_round_limit(data.get('limit'), 'limit', 1) or TEAMS_WINDOW_MAX_LIMIT
+    if limit > TEAMS_WINDOW_MAX_LIMIT:
+        raise ValueError(f"limit must be at most {TEAMS_WINDOW_MAX_LIMIT}")
+    return TeamsWindow(sort, filter_, offset, limit)
+
+@socketio.on('request_teams_window')
+def on_request_teams_window(data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Set the window of the teams list this client is sent: {'sort', 'filter', 'offset',
+    'limit'} (see TeamsWindow), or nothing for every team. A streaming client gets a
+    snapshot of its window right away; updates after it only cover the teams inside it.
+    """
+    try:
+        sid = request.sid  # type: ignore
+        if sid not in state.dashboard_clients:
+            emit('error', {'message': 'Unauthorized: Not a dashboard client'})  # type: ignore
+            return
+        try:
+            window = _parse_teams_window(data)
+        except ValueError as e:
+            emit('error', {'message': str(e)})  # type: ignore
+            return
+        
+        with _safe_dashboard_operation():
+            if window is None:
+                dashboard_client_windows.pop(sid, None)
+            else:
+                dashboard_client_windows[sid] = window
+            dashboard_client_teams.pop(sid, None)
+        if dashboard_teams_streaming.get(sid, False):
+            emit_dashboard_full_update(client_sid=sid)
+    except Exception as e:
+        logger.error(f"Error in on_request_teams_window: {str(e)}", exc_info=True)
+        emit('error', {'message': 'An error occurred while setting the teams window'})  # type: ignore
+
 @socketio.on('toggle_game_mode')
 def on_toggle_game_mode() -> None:
     """Toggle between 'classic' and 'simplified' game modes with cache invalidation."""
@@ -371,14 +743,14 @@ def on_toggle_game_mode() -> None:
 
         # Do not mutate theme here; IFF linking is handled via set_theme_and_mode and theme change handler
         
-        # Clear caches to recalculate with new mode - use force clear since mode affects all calculations
-        force_clear_all_caches()
+        # Per-mode statistics are kept live, so switch the cached view instead of flushing caches
+        apply_game_mode_change()
         
         # Notify all clients (players and dashboards) about the mode change
         socketio.emit('game_mode_changed', {'mode': new_mode_val})
 
-        # Trigger dashboard update to recalculate metrics immediately
-        emit_dashboard_full_update()
+        # Push the switched view to dashboards straight from the caches
+        emit_dashboard_full_update(from_cache=True)
         
     except Exception as e:
         logger.error(f"Error in on_toggle_game_mode: {str(e)}", exc_info=True)
@@ -439,9 +811,9 @@ def on_change_game_theme(*args, **kwargs) -> None:
         injected_state.game_theme = new_theme
         logger.info(f"Game theme changed to: {new_theme}")
 
-        # Clear caches if mode changed
+        # A theme-only change leaves the statistics alone; a linked mode change switches the cached view
         if mode_changed:
-            force_clear_all_caches()
+            apply_game_mode_change()
 
         # Emit
         if injected_call:
@@ -451,6 +823,8 @@ def on_change_game_theme(*args, **kwargs) -> None:
             if mode_changed:
                 socketio.emit('game_mode_changed', {'mode': state.game_mode})
             socketio.emit('game_state_sync', {'mode': state.game_mode, 'theme': state.game_theme})
+            if mode_changed:
+                emit_dashboard_full_update(from_cache=True)
 
     except Exception as e:
         logger.error(f"Error in on_change_game_theme: {str(e)}", exc_info=True)
@@ -499,9 +873,9 @@ def on_set_theme_and_mode(data: Dict[str, Any]) -> None:
         state.game_theme = final_theme
         logger.info(f"Set theme/mode atomically: theme={final_theme}, mode={final_mode}")
 
-        # Clear caches if mode changed
+        # A theme-only change leaves the statistics alone; a mode change switches the cached view
         if mode_changed:
-            force_clear_all_caches()
+            apply_game_mode_change()
 
         # Emit consolidated sync and per-field updates for compatibility
         if mode_changed:
@@ -510,8 +884,9 @@ def on_set_theme_and_mode(data: Dict[str, Any]) -> None:
             socketio.emit('game_theme_changed', {'theme': final_theme})
         socketio.emit('game_state_sync', {'mode': final_mode, 'theme': final_theme})
 
-        # Trigger dashboard update
-        emit_dashboard_full_update()
+        # Push the switched view to dashboards straight from the caches
+        if mode_changed:
+            emit_dashboard_full_update(from_cache=True)
 
     except Exception as e:
         logger.error(f"Error in on_set_theme_and_mode: {str(e)}", exc_info=True)
@@ -531,465 +906,47 @@ def compute_team_hashes(team_name: str) -> Tuple[str, str]:
         rounds = PairQuestionRounds.query.filter_by(team_id=team_id).order_by(PairQuestionRounds.timestamp_initiated).all()
         answers = Answers.query.filter_by(team_id=team_id).order_by(Answers.timestamp).all()
 
-        # Create history string containing both questions and answers
-        history = []
-        for round in rounds:
-            history.append(f"P1:{round.player1_item.value if round.player1_item else 'None'}")
-            history.append(f"P2:{round.player2_item.value if round.player2_item else 'None'}")
-        for answer in answers:
-            history.append(f"A:{answer.assigned_item.value}:{answer.response_value}")
-        
-        history_str = "|".join(history)
-
-        # logger.debug(f"History for team {team_id}: {history_str}")
-        # logger.debug(rounds)
-        
-        # Generate two different hashes
-        hash1 = hashlib.sha256(history_str.encode()).hexdigest()[:8]
-        hash2 = hashlib.md5(history_str.encode()).hexdigest()[:8]
-        
-        return hash1, hash2
+        # Replay the history into the same rolling chain hash the live game maintains
+        return TeamHistoryHash.from_rows(rounds, answers).hexdigests()
     except Exception as e:
         logger.error(f"Error computing team hashes: {str(e)}")
         return "ERROR", "ERROR"
 
-@selective_cache(_success_cache)
+@selective_cache(_success_cache, mode_dependent=True)
 def compute_success_metrics(team_name: str) -> Tuple[List[List[Tuple[int, int]]], List[str], float, float, Dict[Tuple[str, str], int], Dict[Tuple[str, str], int], Dict[str, Dict[str, int]]]:
     """
     Compute success metrics for new mode instead of correlation matrix.
-    Returns success rate matrix, overall success metrics, and individual player balance data.
+    Returns success rate matrix, overall success metrics, and individual player balance data,
+    read from the team's statistics accumulator under the current game mode.
     """
     try:
-        # Get team_id from team_name
-        team_id = _get_team_id_from_name(team_name)
-        if team_id is None:
-            logger.warning(f"Could not find team_id for team_name: {team_name}")
-            return ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {})
-        
-        # Get team data for session ID mapping
-        db_team = Teams.query.filter_by(team_name=team_name).first()
-        if not db_team:
-            logger.warning(f"Could not find team data for team_name: {team_name}")
+        accumulator = _get_team_accumulator_by_name(team_name)
+        if accumulator is None:
             return ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {})
-        
-        # Get all rounds and their corresponding answers for this team
-        rounds = PairQuestionRounds.query.filter_by(team_id=team_id).order_by(PairQuestionRounds.timestamp_initiated).all()
-        round_map = {round.round_id: round for round in rounds}
-        answers = Answers.query.filter_by(team_id=team_id).order_by(Answers.timestamp).all()
-        
-        # Group answers by round_id
-        answers_by_round: Dict[int, List[Any]] = {}
-        for answer in answers:
-            if answer.question_round_id not in answers_by_round:
-                answers_by_round[answer.question_round_id] = []
-            answers_by_round[answer.question_round_id].append(answer)
-        
-        # Initialize success metrics
-        item_values = ['A', 'B', 'X', 'Y']
-        success_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]  # (successful_rounds, total_rounds)
-        
-        # Count pairs for each item combination
-        pair_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        success_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        
-        # Track individual player responses for balance calculation
-        # NEW MODE: Track each player's responses to their assigned question types
-        player_responses: Dict[str, Dict[str, int]] = {}  # {item: {'true': count, 'false': count}}
-        for item in item_values:
-            player_responses[item] = {'true': 0, 'false': 0}
-        
-        total_rounds = 0
-        successful_rounds = 0
-        
-        # Analyze each round that has both player answers
-        for round_id, round_answers in answers_by_round.items():
-            # Skip if we don't have exactly 2 answers (one from each player)
-            if len(round_answers) != 2 or round_id not in round_map:
-                continue
-                
-            round_obj = round_map[round_id]
-            p1_item = round_obj.player1_item.value if round_obj.player1_item else None
-            p2_item = round_obj.player2_item.value if round_obj.player2_item else None
-            
-            # Skip if we don't have both items
-            if not p1_item or not p2_item:
-                continue
-                
-            # Get player responses using session ID matching to avoid duplicate item bug
-            p1_answer = None
-            p2_answer = None
-
-            # Match answers by player session ID instead of assigned item to handle duplicate items correctly
-            for answer in round_answers:
-                if answer.player_session_id == db_team.player1_session_id:
-                    p1_answer = answer.response_value
-                elif answer.player_session_id == db_team.player2_session_id:
-                    p2_answer = answer.response_value
-            
-            # Skip if we don't have both answers
-            if p1_answer is None or p2_answer is None:
-                continue
-                
-            # Track individual player responses for balance calculation
-            player_responses[p1_item]['true' if p1_answer else 'false'] += 1
-            player_responses[p2_item]['true' if p2_answer else 'false'] += 1
-                
-            # Apply success rules for new mode
-            # Success Rule: {B,Y} combinations require different answers; all others require same answers
-            is_by_combination = (p1_item == 'B' and p2_item == 'Y') or (p1_item == 'Y' and p2_item == 'B')
-            players_answered_differently = p1_answer != p2_answer
-            
-            if state.game_mode == 'aqmjoe':
-                is_successful = _is_aqmjoe_success(p1_item, p2_item, p1_answer, p2_answer)
-            else:
-                if is_by_combination:
-                    # B,Y combination: players should answer differently
-                    is_successful = players_answered_differently
-                else:
-                    # All other combinations: players should answer the same
-                    is_successful = not players_answered_differently
-            
-            # Update counts
-            total_rounds += 1
-            if is_successful:
-                successful_rounds += 1
-                success_counts[(p1_item, p2_item)] += 1
-            
-            pair_counts[(p1_item, p2_item)] += 1
-        
-        # Populate the success matrix with (successful, total) tuples
-        for i, row_item in enumerate(item_values):
-            for j, col_item in enumerate(item_values):
-                successful = success_counts.get((row_item, col_item), 0)
-                total = pair_counts.get((row_item, col_item), 0)
-                success_matrix[i][j] = (successful, total)
-        
-        # Calculate overall success rate and normalized score
-        overall_success_rate = successful_rounds / total_rounds if total_rounds > 0 else 0.0
-        
-        # Normalized cumulative score: +1 for success, -1 for failure, divided by total rounds
-        score_sum = successful_rounds - (total_rounds - successful_rounds)  # successful - failed
-        normalized_cumulative_score = score_sum / total_rounds if total_rounds > 0 else 0.0
-        
-        return (success_matrix, item_values, overall_success_rate, normalized_cumulative_score, success_counts, pair_counts, player_responses)
-        
+        return accumulator.success_result(_current_success_table())
     except Exception as e:
         logger.error(f"Error computing success metrics: {str(e)}", exc_info=True)
         return ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {})
 
 @selective_cache(_correlation_cache)
 def compute_correlation_matrix(team_name: str) -> Tuple[List[List[Tuple[int, int]]], List[str], float, Dict[str, float], Dict[str, Dict[str, int]], Dict[Tuple[str, str], int], Dict[Tuple[str, str], int]]:
+    """Correlation matrix and same-item balance of a team, read from its statistics accumulator."""
     try:
-        # Get team_id from team_name
-        team_id = _get_team_id_from_name(team_name)
-        if team_id is None:
-            logger.warning(f"Could not find team_id for team_name: {team_name}")
-            return ([[ (0,0) for _ in range(4) ] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {})
-        
-        # Get team data for session ID mapping
-        db_team = Teams.query.filter_by(team_name=team_name).first()
-        if not db_team:
-            logger.warning(f"Could not find team data for team_name: {team_name}")
+        accumulator = _get_team_accumulator_by_name(team_name)
+        if accumulator is None:
             return ([[ (0,0) for _ in range(4) ] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {})
-        
-        # Get all rounds and their corresponding answers for this team
-        # Use separate optimized queries with proper indexing
-        rounds = PairQuestionRounds.query.filter_by(team_id=team_id).order_by(PairQuestionRounds.timestamp_initiated).all()
-        
-        # Create a mapping from round_id to the round object for quick access
-        round_map = {round.round_id: round for round in rounds}
-        
-        # Get all answers for this team with optimized query
-        answers = Answers.query.filter_by(team_id=team_id).order_by(Answers.timestamp).all()
-        
-        # Group answers by round_id
-        answers_by_round: Dict[int, List[Any]] = {}
-        for answer in answers:
-            if answer.question_round_id not in answers_by_round:
-                answers_by_round[answer.question_round_id] = []
-            answers_by_round[answer.question_round_id].append(answer)
-        
-        # Prepare the 4x4 correlation matrix for A, B, X, Y combinations
-        item_values = ['A', 'B', 'X', 'Y']
-        # corr_matrix will store (numerator, denominator) tuples
-        corr_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]
-        
-        # Count pairs for each item combination
-        pair_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        correlation_sums: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        
-        # Track same-item responses for the new metric
-        same_item_responses: Dict[str, Dict[str, int]] = {}  # Will track {item: {'true': count, 'false': count}}
-        
-        # Analyze each round that has both player answers
-        for round_id, round_answers in answers_by_round.items():
-            # Skip if we don't have exactly 2 answers (one from each player)
-            if len(round_answers) != 2 or round_id not in round_map:
-                continue
-                
-            round_obj = round_map[round_id]
-            p1_item = round_obj.player1_item.value if round_obj.player1_item else None
-            p2_item = round_obj.player2_item.value if round_obj.player2_item else None
-            
-            # Skip if we don't have both items
-            if not p1_item or not p2_item:
-                continue
-                
-            # Get player responses using session ID matching to avoid duplicate item bug
-            p1_answer = None
-            p2_answer = None
-
-            # Match answers by player session ID instead of assigned item to handle duplicate items correctly
-            for answer in round_answers:
-                if answer.player_session_id == db_team.player1_session_id:
-                    p1_answer = answer.response_value
-                elif answer.player_session_id == db_team.player2_session_id:
-                    p2_answer = answer.response_value
-            
-            # Track responses for same-item balance metric only when both players have same item
-            if p1_item == p2_item and p1_answer is not None and p2_answer is not None:
-                if p1_item not in same_item_responses:
-                    same_item_responses[p1_item] = {'true': 0, 'false': 0}
-                
-                # Count each response separately
-                same_item_responses[p1_item]['true' if p1_answer else 'false'] += 1
-                same_item_responses[p1_item]['true' if p2_answer else 'false'] += 1
-            
-            # Skip if we don't have both answers (e.g., due to data inconsistency)
-            if p1_answer is None or p2_answer is None:
-                continue
-                
-            # Update counts
-            # p1_idx = item_values.index(p1_item) # Not needed here anymore
-            # p2_idx = item_values.index(p2_item) # Not needed here anymore
-            
-            # Calculate correlation: (T,T) or (F,F) count as 1, (T,F) or (F,T) count as -1
-            correlation = 1 if p1_answer == p2_answer else -1
-            
-            pair_counts[(p1_item, p2_item)] += 1
-            correlation_sums[(p1_item, p2_item)] += correlation
-        
-        # Populate the corr_matrix with (numerator, denominator) tuples
-        for i, row_item in enumerate(item_values):
-            for j, col_item in enumerate(item_values):
-                numerator = correlation_sums.get((row_item, col_item), 0)
-                denominator = pair_counts.get((row_item, col_item), 0)
-                corr_matrix[i][j] = (numerator, denominator)
-        
-        # Calculate the same-item balance metric
-        same_item_balance: Dict[str, float] = {}
-        for item, counts in same_item_responses.items():
-            total = counts['true'] + counts['false']
-            if total == 0:
-                same_item_balance[item] = 0.0
-            else:
-                diff = abs(counts['true'] - counts['false'])
-                same_item_balance[item] = 1.0 - diff / total
-        
-        # Calculate the average balance across all same items
-        if same_item_responses:
-            avg_same_item_balance = sum(same_item_balance.values()) / len(same_item_balance)
-        else:
-            avg_same_item_balance = 0.0  # Default if no same-item responses
-        
-        return (corr_matrix, item_values,
-                avg_same_item_balance, same_item_balance, same_item_responses,
-                correlation_sums, pair_counts)
+        return accumulator.correlation_result()
     except Exception as e:
         logger.error(f"Error computing correlation matrix: {str(e)}", exc_info=True)
         return ([[ (0,0) for _ in range(4) ] for _ in range(4)],
                 ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {})
 
-def compute_correlation_stats(team_name: str) -> Tuple[float, float, float]: # NOT USED
-    try:
-        # Get the correlation matrix and new metrics  
-        result = compute_correlation_matrix(team_name)  # type: ignore
-        corr_matrix, item_values = result[0], result[1]
-        same_item_balance_avg = result[2]
-        
-        # Validate matrix dimensions and contents
-        if not all(isinstance(row, list) and len(row) == 4 for row in corr_matrix) or len(corr_matrix) != 4:
-            logger.error(f"Invalid correlation matrix dimensions for team_name {team_name}")
-            return 0.0, 0.0, 0.0
-            
-        # Validate expected item values
-        expected_items = ['A', 'B', 'X', 'Y']
-        if not all(item in item_values for item in expected_items):
-            logger.error(f"Missing expected items in correlation matrix for team_name {team_name}")
-            return 0.0, 0.0, 0.0
-            
-        # Calculate first statistic: Trace(corr_matrix) / 4
-        try:
-            trace_sum = sum(corr_matrix[i][i] for i in range(4))
-            trace_average_statistic = trace_sum / 4
-        except (TypeError, IndexError) as e:
-            logger.error(f"Error calculating trace statistic: {e}")
-            trace_average_statistic = 0.0
-        
-        # Calculate second statistic using CHSH game formula
-        # corrAX + corrAY + corrBX - corrBY + corrXA + corrXB + corrYA - corrYB
-        # Get indices for A, B, X, Y from item_values
-        try:
-            A_idx = item_values.index('A')
-            B_idx = item_values.index('B')
-            X_idx = item_values.index('X')
-            Y_idx = item_values.index('Y')
-            
-            chsh_value_statistic = (
-                corr_matrix[A_idx][X_idx] + corr_matrix[A_idx][Y_idx] + 
-                corr_matrix[B_idx][X_idx] - corr_matrix[B_idx][Y_idx] +
-                corr_matrix[X_idx][A_idx] + corr_matrix[X_idx][B_idx] + 
-                corr_matrix[Y_idx][A_idx] - corr_matrix[Y_idx][B_idx]
-            )/2
-        except (ValueError, IndexError, TypeError) as e:
-            logger.error(f"Error calculating CHSH statistic: {e}")
-            chsh_value_statistic = 0.0
-        
-        return trace_average_statistic, chsh_value_statistic, same_item_balance_avg
-    except Exception as e:
-        logger.error(f"Error computing correlation statistics: {str(e)}", exc_info=True)
-        return 0.0, 0.0, 0.0
-
-
 @selective_cache(_classic_stats_cache)
 def _calculate_team_statistics(team_name: str) -> Dict[str, Optional[float]]:
-    """Calculate ufloat statistics from correlation matrix for the given team."""
-    try:
-        # Get correlation matrix data for this team
-        correlation_result = compute_correlation_matrix(team_name)
-        (corr_matrix_tuples, item_values,
-         same_item_balance_avg, same_item_balance, same_item_responses,
-         correlation_sums, pair_counts) = correlation_result
-        
-        # --- Calculate statistics with uncertainties using ufloat ---
-
-        # Stat1: Trace Average Statistic
-        sum_of_cii_ufloats: UFloat = ufloat(0, MIN_STD_DEV)  # Use small non-zero std_dev to avoid warning
-        if len(corr_matrix_tuples) == 4 and all(len(row) == 4 for row in corr_matrix_tuples):
-            for i in range(4):
-                num, den = corr_matrix_tuples[i][i]
-                if den > 0:
-                    c_ii_val = num / den
-                    c_ii_val = max(-1.0, min(1.0, c_ii_val))  # Clamp to valid range
-                    stdev_ii = 1 / math.sqrt(den)            # σ = 1/√N
-                    c_ii_ufloat = ufloat(c_ii_val, stdev_ii)
-                else:
-                    # No statistics → infinite uncertainty
-                    c_ii_ufloat = ufloat(0, float("inf"))
-                sum_of_cii_ufloats += c_ii_ufloat
-        # Average of the four diagonal correlations
-        raw_trace_avg_ufloat = (1 / 4) * sum_of_cii_ufloats
-        # Force the magnitude to be positive
-        # Handle absolute value without using abs() or um.fabs() which are deprecated
-        if raw_trace_avg_ufloat.nominal_value >= 0:
-            trace_average_statistic_ufloat = raw_trace_avg_ufloat
-        else:
-            # Create a new ufloat with positive nominal value but same std_dev
-            trace_average_statistic_ufloat = ufloat(-raw_trace_avg_ufloat.nominal_value, raw_trace_avg_ufloat.std_dev)
-
-        # Stat2: CHSH Value Statistic
-        chsh_sum_ufloat: UFloat = ufloat(0, MIN_STD_DEV)  # Use small non-zero std_dev to avoid warning
-        if len(corr_matrix_tuples) == 4 and all(len(row) == 4 for row in corr_matrix_tuples) and all(item in item_values for item in ['A', 'B', 'X', 'Y']):
-            try:
-                A_idx = item_values.index('A')
-                B_idx = item_values.index('B')
-                X_idx = item_values.index('X')
-                Y_idx = item_values.index('Y')
-
-                terms_indices_coeffs = [
-                    (A_idx, X_idx, 1), (A_idx, Y_idx, 1),
-                    (B_idx, X_idx, 1), (B_idx, Y_idx, -1),
-                    (X_idx, A_idx, 1), (X_idx, B_idx, 1),
-                    (Y_idx, A_idx, 1), (Y_idx, B_idx, -1)
-                ]
-
-                for r_idx, c_idx, coeff in terms_indices_coeffs:
-                    num, den = corr_matrix_tuples[r_idx][c_idx]
-                    if den > 0:
-                        c_ij_val = num / den
-                        c_ij_val = max(-1.0, min(1.0, c_ij_val))
-                        stdev_ij = 1 / math.sqrt(den)      # σ = 1/√N
-                        c_ij_ufloat = ufloat(c_ij_val, stdev_ij)
-                    else:
-                        c_ij_ufloat = ufloat(0, float("inf"))
-                    chsh_sum_ufloat += coeff * c_ij_ufloat
-            except ValueError:
-                pass  # Already handled by the outer condition check
-        chsh_value_statistic_ufloat = (1/2) * chsh_sum_ufloat
-
-        # Stat3: Cross-Term Combination Statistic
-        cross_term_sum_ufloat: UFloat = ufloat(0, MIN_STD_DEV)  # Use small non-zero std_dev to avoid warning
-        # Ensure item_values contains A,B,X,Y before proceeding
-        if all(item in item_values for item in ['A', 'B', 'X', 'Y']):
-            term_item_pairs_coeffs = [
-                ('A', 'X', 1), ('A', 'Y', 1),
-                ('B', 'X', 1), ('B', 'Y', -1)
-            ]
-            for item1, item2, coeff in term_item_pairs_coeffs:
-                M_ij = pair_counts.get((item1, item2), 0) + pair_counts.get((item2, item1), 0)
-                if M_ij > 0:
-                    N_ij_sum_prod = correlation_sums.get((item1, item2), 0) + correlation_sums.get((item2, item1), 0)
-                    t_ij_val = N_ij_sum_prod / M_ij
-                    t_ij_val = max(-1.0, min(1.0, t_ij_val))
-                    stdev_t_ij = 1 / math.sqrt(M_ij)       # σ = 1/√N
-                    t_ij_ufloat = ufloat(t_ij_val, stdev_t_ij)
-                else:
-                    t_ij_ufloat = ufloat(0, float("inf"))
-                cross_term_sum_ufloat += coeff * t_ij_ufloat
-        cross_term_combination_statistic_ufloat = cross_term_sum_ufloat
-
-        # --- Same‑item balance with uncertainty (ufloat) ---
-        same_item_balance_ufloats: List[UFloat] = []
-        for item, counts in (same_item_responses or {}).items():
-            T_count = counts.get('true', 0)
-            F_count = counts.get('false', 0)
-            total_tf = T_count + F_count
-            if total_tf > 0:
-                p_val = T_count / total_tf
-                var_p = 1 / total_tf  # simplified variance 1/N
-                p_true = ufloat(p_val, math.sqrt(var_p))
-                p_val2 = 2 * p_true - 1
-                if p_val2.nominal_value >= 0:
-                    abs_p_val2 = p_val2
-                else:
-                    abs_p_val2 = ufloat(-p_val2.nominal_value, p_val2.std_dev)
-                balance_ufloat = 1 - abs_p_val2
-                same_item_balance_ufloats.append(balance_ufloat)
-            else:
-                # Not enough statistics – propagate infinite uncertainty
-                balance_ufloat = ufloat(0, float("inf"))
-                same_item_balance_ufloats.append(balance_ufloat)
+    """Calculate statistics with uncertainties from the correlation matrix for the given team."""
+    return _calculate_team_statistics_from_data(compute_correlation_matrix(team_name))
 
-        if same_item_balance_ufloats:
-            avg_same_item_balance_ufloat = sum(same_item_balance_ufloats) / len(same_item_balance_ufloats)
-        else:
-            avg_same_item_balance_ufloat = ufloat(0, float("inf"))
-        
-        return {
-            'trace_average_statistic': trace_average_statistic_ufloat.nominal_value,
-            'trace_average_statistic_uncertainty': trace_average_statistic_ufloat.std_dev if not math.isinf(trace_average_statistic_ufloat.std_dev) else None,
-            'chsh_value_statistic': chsh_value_statistic_ufloat.nominal_value,
-            'chsh_value_statistic_uncertainty': chsh_value_statistic_ufloat.std_dev if not math.isinf(chsh_value_statistic_ufloat.std_dev) else None,
-            'cross_term_combination_statistic': cross_term_combination_statistic_ufloat.nominal_value,
-            'cross_term_combination_statistic_uncertainty': cross_term_combination_statistic_ufloat.std_dev if not math.isinf(cross_term_combination_statistic_ufloat.std_dev) else None,
-            'same_item_balance': avg_same_item_balance_ufloat.nominal_value,
-            'same_item_balance_uncertainty': (avg_same_item_balance_ufloat.std_dev
-                                              if not math.isinf(avg_same_item_balance_ufloat.std_dev) else None)
-        }
-    except Exception as e:
-        logger.error(f"Error calculating team statistics: {str(e)}", exc_info=True)
-        return {
-            'trace_average_statistic': 0.0,
-            'trace_average_statistic_uncertainty': None,
-            'chsh_value_statistic': 0.0,
-            'chsh_value_statistic_uncertainty': None,
-            'cross_term_combination_statistic': 0.0,
-            'cross_term_combination_statistic_uncertainty': None,
-            'same_item_balance': 0.0,
-            'same_item_balance_uncertainty': None
-        }
-
-@selective_cache(_new_stats_cache)
+@selective_cache(_new_stats_cache, mode_dependent=True)
 def _calculate_success_statistics(team_name: str) -> Dict[str, Optional[float]]:
     """Calculate success statistics for new mode from success metrics for the given team."""
     try:
@@ -998,7 +955,7 @@ def _calculate_success_statistics(team_name: str) -> Dict[str, Optional[float]]:
         (success_matrix_tuples, item_values, overall_success_rate, normalized_cumulative_score, 
          success_counts, pair_counts, player_responses) = success_result
         
-        # Calculate success statistics with uncertainties using ufloat
+        # Calculate success statistics with binomial uncertainties
         # Replace trace_average_statistic with overall_success_rate
         if overall_success_rate >= 0:
             # Calculate uncertainty based on total number of rounds
@@ -1099,29 +1056,23 @@ def _calculate_success_statistics(team_name: str) -> Dict[str, Optional[float]]:
         }
 
 def _compute_team_hashes_optimized(team_id: int, team_rounds: List[Any], team_answers: List[Any]) -> Tuple[str, str]:
-    """Generate unique history hashes for team data consistency checking using pre-fetched data."""
+    """
+    Generate unique history hashes for team data consistency checking using pre-fetched data.
+    Rebuilds the rolling chain hash from the rows; live teams keep it in their accumulator.
+    """
     try:
-        # Create history string containing both questions and answers using pre-fetched data
-        history = []
-        for round_obj in team_rounds:
-            history.append(f"P1:{round_obj.player1_item.value if round_obj.player1_item else 'None'}")
-            history.append(f"P2:{round_obj.player2_item.value if round_obj.player2_item else 'None'}")
-        for answer in team_answers:
-            history.append(f"A:{answer.assigned_item.value}:{answer.response_value}")
-        
-        history_str = "|".join(history)
-        
-        # Generate two different hashes
-        hash1 = hashlib.sha256(history_str.encode()).hexdigest()[:8]
-        hash2 = hashlib.md5(history_str.encode()).hexdigest()[:8]
-        
-        return hash1, hash2
+        return TeamHistoryHash.from_rows(team_rounds, team_answers).hexdigests()
     except Exception as e:
         logger.error(f"Error computing team hashes for team {team_id}: {str(e)}")
         return "ERROR", "ERROR"
 
-def _compute_correlation_matrix_optimized(team_id: int, team_rounds: List[Any], team_answers: List[Any], team_obj: Any = None) -> Tuple[List[List[Tuple[int, int]]], List[str], float, Dict[str, float], Dict[str, Dict[str, int]], Dict[Tuple[str, str], int], Dict[Tuple[str, str], int]]:
-    """Compute correlation matrix using pre-fetched rounds and answers data."""
+def _compute_team_metrics_fused(team_id: int, team_rounds: List[Any], team_answers: List[Any], team_obj: Any = None) -> Tuple[Tuple, Tuple]:
+    """
+    Compute the correlation matrix and success metrics together in a single pass.
+    Answers are grouped by round and matched to players once, into a per-team outcome table;
+    both results (same layouts as compute_correlation_matrix and compute_success_metrics)
+    are then reduced from that table.
+    """
     try:
         # Use pre-fetched team data to avoid N+1 queries
         if team_obj is None:
@@ -1129,282 +1080,62 @@ def _compute_correlation_matrix_optimized(team_id: int, team_rounds: List[Any],
             team_obj = Teams.query.get(team_id)
             if not team_obj:
                 logger.warning(f"Could not find team data for team_id: {team_id}")
-                return ([[ (0,0) for _ in range(4) ] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {})
+                return (([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {}),
+                        ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {}))
         
-        db_team = team_obj
+        # One grouping/matching pass fills the outcome table (no history hash needed here)
+        accumulator = TeamStatsAccumulator()
+        for _, p1_item, p2_item, p1_answer, p2_answer in iter_completed_rounds(team_rounds, team_answers, team_obj):
+            accumulator.record_round(p1_item, p2_item, p1_answer, p2_answer)
+        return accumulator.correlation_result(), accumulator.success_result(_current_success_table())
         
-        # Create a mapping from round_id to the round object for quick access
-        round_map = {round_obj.round_id: round_obj for round_obj in team_rounds}
-        
-        # Group answers by round_id
-        answers_by_round: Dict[int, List[Any]] = {}
-        for answer in team_answers:
-            if answer.question_round_id not in answers_by_round:
-                answers_by_round[answer.question_round_id] = []
-            answers_by_round[answer.question_round_id].append(answer)
-        
-        # Prepare the 4x4 correlation matrix for A, B, X, Y combinations
-        item_values = ['A', 'B', 'X', 'Y']
-        # corr_matrix will store (numerator, denominator) tuples
-        corr_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]
-        
-        # Count pairs for each item combination
-        pair_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        correlation_sums: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        
-        # Track same-item responses for the new metric
-        same_item_responses: Dict[str, Dict[str, int]] = {}
-        
-        # Analyze each round that has both player answers
-        for round_id, round_answers in answers_by_round.items():
-            # Skip if we don't have exactly 2 answers (one from each player)
-            if len(round_answers) != 2 or round_id not in round_map:
-                continue
-                
-            round_obj = round_map[round_id]
-            p1_item = round_obj.player1_item.value if round_obj.player1_item else None
-            p2_item = round_obj.player2_item.value if round_obj.player2_item else None
-            
-            # Skip if we don't have both items
-            if not p1_item or not p2_item:
-                continue
-                
-            # Get player responses using session ID matching to avoid duplicate item bug
-            p1_answer = None
-            p2_answer = None
-
-            # Match answers by player session ID instead of assigned item to handle duplicate items correctly
-            for answer in round_answers:
-                if answer.player_session_id == db_team.player1_session_id:
-                    p1_answer = answer.response_value
-                elif answer.player_session_id == db_team.player2_session_id:
-                    p2_answer = answer.response_value
-            
-            # Track responses for same-item balance metric only when both players have same item
-            if p1_item == p2_item and p1_answer is not None and p2_answer is not None:
-                if p1_item not in same_item_responses:
-                    same_item_responses[p1_item] = {'true': 0, 'false': 0}
-                
-                # Count each response separately
-                same_item_responses[p1_item]['true' if p1_answer else 'false'] += 1
-                same_item_responses[p1_item]['true' if p2_answer else 'false'] += 1
-            
-            # Skip if we don't have both answers
-            if p1_answer is None or p2_answer is None:
-                continue
-                
-            # Calculate correlation: (T,T) or (F,F) count as 1, (T,F) or (F,T) count as -1
-            correlation = 1 if p1_answer == p2_answer else -1
-            
-            pair_counts[(p1_item, p2_item)] += 1
-            correlation_sums[(p1_item, p2_item)] += correlation
-        
-        # Populate the corr_matrix with (numerator, denominator) tuples
-        for i, row_item in enumerate(item_values):
-            for j, col_item in enumerate(item_values):
-                numerator = correlation_sums.get((row_item, col_item), 0)
-                denominator = pair_counts.get((row_item, col_item), 0)
-                corr_matrix[i][j] = (numerator, denominator)
-        
-        # Calculate the same-item balance metric
-        same_item_balance: Dict[str, float] = {}
-        for item, counts in same_item_responses.items():
-            total = counts['true'] + counts['false']
-            if total == 0:
-                same_item_balance[item] = 0.0
-            else:
-                diff = abs(counts['true'] - counts['false'])
-                same_item_balance[item] = 1.0 - diff / total
-        
-        # Calculate the average balance across all same items
-        if same_item_responses:
-            avg_same_item_balance = sum(same_item_balance.values()) / len(same_item_balance)
-        else:
-            avg_same_item_balance = 0.0
-        
-        return (corr_matrix, item_values,
-                avg_same_item_balance, same_item_balance, same_item_responses,
-                correlation_sums, pair_counts)
     except Exception as e:
-        logger.error(f"Error computing correlation matrix for team {team_id}: {str(e)}", exc_info=True)
-        return ([[ (0,0) for _ in range(4) ] for _ in range(4)],
-                ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {})
-
-def _compute_success_metrics_optimized(team_id: int, team_rounds: List[Any], team_answers: List[Any], team_obj: Any = None) -> Tuple[List[List[Tuple[int, int]]], List[str], float, float, Dict[Tuple[str, str], int], Dict[Tuple[str, str], int], Dict[str, Dict[str, int]]]:
-    """Compute success metrics for new mode using pre-fetched rounds and answers data."""
-    try:
-        # Use pre-fetched team data to avoid N+1 queries
-        if team_obj is None:
-            # Fallback to database query if team_obj not provided (backward compatibility)
-            team_obj = Teams.query.get(team_id)
-            if not team_obj:
-                logger.warning(f"Could not find team data for team_id: {team_id}")
-                return ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {})
-        
-        db_team = team_obj
-        
-        # Create a mapping from round_id to the round object for quick access
-        round_map = {round_obj.round_id: round_obj for round_obj in team_rounds}
-        
-        # Group answers by round_id
-        answers_by_round: Dict[int, List[Any]] = {}
-        for answer in team_answers:
-            if answer.question_round_id not in answers_by_round:
-                answers_by_round[answer.question_round_id] = []
-            answers_by_round[answer.question_round_id].append(answer)
-        
-        # Initialize success metrics
-        item_values = ['A', 'B', 'X', 'Y']
-        success_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]  # (successful_rounds, total_rounds)
-        
-        # Count pairs for each item combination
-        pair_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        success_counts: Dict[Tuple[str, str], int] = {(i, j): 0 for i in item_values for j in item_values}
-        
-        # Track individual player responses for balance calculation
-        player_responses: Dict[str, Dict[str, int]] = {}
-        for item in item_values:
-            player_responses[item] = {'true': 0, 'false': 0}
-        
-        total_rounds = 0
-        successful_rounds = 0
-        
-        # Analyze each round that has both player answers
-        for round_id, round_answers in answers_by_round.items():
-            # Skip if we don't have exactly 2 answers (one from each player)
-            if len(round_answers) != 2 or round_id not in round_map:
-                continue
-                
-            round_obj = round_map[round_id]
-            p1_item = round_obj.player1_item.value if round_obj.player1_item else None
-            p2_item = round_obj.player2_item.value if round_obj.player2_item else None
-            
-            # Skip if we don't have both items
-            if not p1_item or not p2_item:
-                continue
-                
-            # Get player responses using session ID matching to avoid duplicate item bug
-            p1_answer = None
-            p2_answer = None
-
-            # Match answers by player session ID instead of assigned item to handle duplicate items correctly
-            for answer in round_answers:
-                if answer.player_session_id == db_team.player1_session_id:
-                    p1_answer = answer.response_value
-                elif answer.player_session_id == db_team.player2_session_id:
-                    p2_answer = answer.response_value
-            
-            # Skip if we don't have both answers
-            if p1_answer is None or p2_answer is None:
-                continue
-                
-            # Track individual player responses for balance calculation
-            player_responses[p1_item]['true' if p1_answer else 'false'] += 1
-            player_responses[p2_item]['true' if p2_answer else 'false'] += 1
-                
-            # Apply success rules for new mode
-            # Success Rule: {B,Y} combinations require different answers; all others require same answers
-            is_by_combination = (p1_item == 'B' and p2_item == 'Y') or (p1_item == 'Y' and p2_item == 'B')
-            players_answered_differently = p1_answer != p2_answer
-
-            if state.game_mode == 'aqmjoe':
-                is_successful = _is_aqmjoe_success(p1_item, p2_item, p1_answer, p2_answer)
-            else:
-                if is_by_combination:
-                    is_successful = players_answered_differently
-                else:
-                    is_successful = not players_answered_differently
-            
-            # Update counts
-            total_rounds += 1
-            if is_successful:
-                successful_rounds += 1
-                success_counts[(p1_item, p2_item)] += 1
-            
-            pair_counts[(p1_item, p2_item)] += 1
-        
-        # Populate the success matrix with (successful, total) tuples
-        for i, row_item in enumerate(item_values):
-            for j, col_item in enumerate(item_values):
-                successful = success_counts.get((row_item, col_item), 0)
-                total = pair_counts.get((row_item, col_item), 0)
-                success_matrix[i][j] = (successful, total)
-        
-        # Calculate overall success rate and normalized score
-        overall_success_rate = successful_rounds / total_rounds if total_rounds > 0 else 0.0
-        
-        # Normalized cumulative score: +1 for success, -1 for failure, divided by total rounds
-        score_sum = successful_rounds - (total_rounds - successful_rounds)
-        normalized_cumulative_score = score_sum / total_rounds if total_rounds > 0 else 0.0
-        
-        return (success_matrix, item_values, overall_success_rate, normalized_cumulative_score, success_counts, pair_counts, player_responses)
-        
-    except Exception as e:
-        logger.error(f"Error computing success metrics for team {team_id}: {str(e)}", exc_info=True)
-        return ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {})
+        logger.error(f"Error computing fused metrics for team {team_id}: {str(e)}", exc_info=True)
+        return (([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, {}, {}, {}, {}),
+                ([[(0, 0) for _ in range(4)] for _ in range(4)], ['A', 'B', 'X', 'Y'], 0.0, 0.0, {}, {}, {}))
 
 def _calculate_team_statistics_from_data(correlation_result: Tuple) -> Dict[str, Optional[float]]:
-    """Calculate ufloat statistics from pre-computed correlation matrix data."""
+    """
+    Calculate statistics with uncertainties from pre-computed correlation matrix data.
+    Uses closed-form propagation (src.uncertainty): every term is independent with σ = 1/√N.
+    """
     try:
         (corr_matrix_tuples, item_values,
          same_item_balance_avg, same_item_balance, same_item_responses,
          correlation_sums, pair_counts) = correlation_result
         
-        # Use the same logic as _calculate_team_statistics but with pre-computed data
-        # --- Calculate statistics with uncertainties using ufloat ---
-
         # Stat1: Trace Average Statistic
-        sum_of_cii_ufloats: UFloat = ufloat(0, MIN_STD_DEV)
+        sum_of_cii = Estimate(0, MIN_STD_DEV)  # Use small non-zero std_dev floor
         if len(corr_matrix_tuples) == 4 and all(len(row) == 4 for row in corr_matrix_tuples):
             for i in range(4):
                 num, den = corr_matrix_tuples[i][i]
-                if den > 0:
-                    c_ii_val = num / den
-                    c_ii_val = max(-1.0, min(1.0, c_ii_val))
-                    stdev_ii = 1 / math.sqrt(den)
-                    c_ii_ufloat = ufloat(c_ii_val, stdev_ii)
-                else:
-                    c_ii_ufloat = ufloat(0, float("inf"))
-                sum_of_cii_ufloats += c_ii_ufloat
-        
-        raw_trace_avg_ufloat = (1 / 4) * sum_of_cii_ufloats
-        if raw_trace_avg_ufloat.nominal_value >= 0:
-            trace_average_statistic_ufloat = raw_trace_avg_ufloat
-        else:
-            trace_average_statistic_ufloat = ufloat(-raw_trace_avg_ufloat.nominal_value, raw_trace_avg_ufloat.std_dev)
+                # No statistics → infinite uncertainty
+                sum_of_cii.add(Estimate.from_ratio(num, den))
+        # Average of the four diagonal correlations, forced to be positive
+        trace_average_statistic = sum_of_cii.scaled(1 / 4).magnitude()
 
         # Stat2: CHSH Value Statistic
-        chsh_sum_ufloat: UFloat = ufloat(0, MIN_STD_DEV)
+        chsh_sum = Estimate(0, MIN_STD_DEV)
         if len(corr_matrix_tuples) == 4 and all(len(row) == 4 for row in corr_matrix_tuples) and all(item in item_values for item in ['A', 'B', 'X', 'Y']):
-            try:
-                A_idx = item_values.index('A')
-                B_idx = item_values.index('B')
-                X_idx = item_values.index('X')
-                Y_idx = item_values.index('Y')
-
-                terms_indices_coeffs = [
-                    (A_idx, X_idx, 1), (A_idx, Y_idx, 1),
-                    (B_idx, X_idx, 1), (B_idx, Y_idx, -1),
-                    (X_idx, A_idx, 1), (X_idx, B_idx, 1),
-                    (Y_idx, A_idx, 1), (Y_idx, B_idx, -1)
-                ]
-
-                for r_idx, c_idx, coeff in terms_indices_coeffs:
-                    num, den = corr_matrix_tuples[r_idx][c_idx]
-                    if den > 0:
-                        c_ij_val = num / den
-                        c_ij_val = max(-1.0, min(1.0, c_ij_val))
-                        stdev_ij = 1 / math.sqrt(den)
-                        c_ij_ufloat = ufloat(c_ij_val, stdev_ij)
-                    else:
-                        c_ij_ufloat = ufloat(0, float("inf"))
-                    chsh_sum_ufloat += coeff * c_ij_ufloat
-            except ValueError:
-                pass
-        chsh_value_statistic_ufloat = (1/2) * chsh_sum_ufloat
+            A_idx = item_values.index('A')
+            B_idx = item_values.index('B')
+            X_idx = item_values.index('X')
+            Y_idx = item_values.index('Y')
+
+            terms_indices_coeffs = [
+                (A_idx, X_idx, 1), (A_idx, Y_idx, 1),
+                (B_idx, X_idx, 1), (B_idx, Y_idx, -1),
+                (X_idx, A_idx, 1), (X_idx, B_idx, 1),
+                (Y_idx, A_idx, 1), (Y_idx, B_idx, -1)
+            ]
+
+            for r_idx, c_idx, coeff in terms_indices_coeffs:
+                num, den = corr_matrix_tuples[r_idx][c_idx]
+                chsh_sum.add(Estimate.from_ratio(num, den), coeff)
+        chsh_value_statistic = chsh_sum.scaled(1 / 2)
 
         # Stat3: Cross-Term Combination Statistic
-        cross_term_sum_ufloat: UFloat = ufloat(0, MIN_STD_DEV)
+        cross_term_combination_statistic = Estimate(0, MIN_STD_DEV)
         if all(item in item_values for item in ['A', 'B', 'X', 'Y']):
             term_item_pairs_coeffs = [
                 ('A', 'X', 1), ('A', 'Y', 1),
@@ -1412,53 +1143,40 @@ def _calculate_team_statistics_from_data(correlation_result: Tuple) -> Dict[str,
             ]
             for item1, item2, coeff in term_item_pairs_coeffs:
                 M_ij = pair_counts.get((item1, item2), 0) + pair_counts.get((item2, item1), 0)
-                if M_ij > 0:
-                    N_ij_sum_prod = correlation_sums.get((item1, item2), 0) + correlation_sums.get((item2, item1), 0)
-                    t_ij_val = N_ij_sum_prod / M_ij
-                    t_ij_val = max(-1.0, min(1.0, t_ij_val))
-                    stdev_t_ij = 1 / math.sqrt(M_ij)
-                    t_ij_ufloat = ufloat(t_ij_val, stdev_t_ij)
-                else:
-                    t_ij_ufloat = ufloat(0, float("inf"))
-                cross_term_sum_ufloat += coeff * t_ij_ufloat
-        cross_term_combination_statistic_ufloat = cross_term_sum_ufloat
+                N_ij_sum_prod = correlation_sums.get((item1, item2), 0) + correlation_sums.get((item2, item1), 0)
+                cross_term_combination_statistic.add(Estimate.from_ratio(N_ij_sum_prod, M_ij), coeff)
 
-        # Same‑item balance with uncertainty (ufloat)
-        same_item_balance_ufloats: List[UFloat] = []
+        # Same‑item balance with uncertainty: 1 - |2p - 1| with σ_p = 1/√N
+        same_item_balances: List[Estimate] = []
         for item, counts in (same_item_responses or {}).items():
             T_count = counts.get('true', 0)
             F_count = counts.get('false', 0)
             total_tf = T_count + F_count
             if total_tf > 0:
-                p_val = T_count / total_tf
-                var_p = 1 / total_tf
-                p_true = ufloat(p_val, math.sqrt(var_p))
-                p_val2 = 2 * p_true - 1
-                if p_val2.nominal_value >= 0:
-                    abs_p_val2 = p_val2
-                else:
-                    abs_p_val2 = ufloat(-p_val2.nominal_value, p_val2.std_dev)
-                balance_ufloat = 1 - abs_p_val2
-                same_item_balance_ufloats.append(balance_ufloat)
+                p_true = Estimate(T_count / total_tf, math.sqrt(1 / total_tf))
+                p_val2 = Estimate(-1).add(p_true, 2).magnitude()
+                same_item_balances.append(Estimate(1).add(p_val2, -1))
             else:
-                balance_ufloat = ufloat(0, float("inf"))
-                same_item_balance_ufloats.append(balance_ufloat)
+                # Not enough statistics – propagate infinite uncertainty
+                same_item_balances.append(Estimate(0, float("inf")))
 
-        if same_item_balance_ufloats:
-            avg_same_item_balance_ufloat = sum(same_item_balance_ufloats) / len(same_item_balance_ufloats)
+        if same_item_balances:
+            balance_sum = Estimate()
+            for balance in same_item_balances:
+                balance_sum.add(balance)
+            avg_same_item_balance = balance_sum.scaled(1 / len(same_item_balances))
         else:
-            avg_same_item_balance_ufloat = ufloat(0, float("inf"))
+            avg_same_item_balance = Estimate(0, float("inf"))
         
         return {
-            'trace_average_statistic': trace_average_statistic_ufloat.nominal_value,
-            'trace_average_statistic_uncertainty': trace_average_statistic_ufloat.std_dev if not math.isinf(trace_average_statistic_ufloat.std_dev) else None,
-            'chsh_value_statistic': chsh_value_statistic_ufloat.nominal_value,
-            'chsh_value_statistic_uncertainty': chsh_value_statistic_ufloat.std_dev if not math.isinf(chsh_value_statistic_ufloat.std_dev) else None,
-            'cross_term_combination_statistic': cross_term_combination_statistic_ufloat.nominal_value,
-            'cross_term_combination_statistic_uncertainty': cross_term_combination_statistic_ufloat.std_dev if not math.isinf(cross_term_combination_statistic_ufloat.std_dev) else None,
-            'same_item_balance': avg_same_item_balance_ufloat.nominal_value,
-            'same_item_balance_uncertainty': (avg_same_item_balance_ufloat.std_dev
-                                              if not math.isinf(avg_same_item_balance_ufloat.std_dev) else None)
+            'trace_average_statistic': trace_average_statistic.nominal_value,
+            'trace_average_statistic_uncertainty': trace_average_statistic.std_dev_or_none(),
+            'chsh_value_statistic': chsh_value_statistic.nominal_value,
+            'chsh_value_statistic_uncertainty': chsh_value_statistic.std_dev_or_none(),
+            'cross_term_combination_statistic': cross_term_combination_statistic.nominal_value,
+            'cross_term_combination_statistic_uncertainty': cross_term_combination_statistic.std_dev_or_none(),
+            'same_item_balance': avg_same_item_balance.nominal_value,
+            'same_item_balance_uncertainty': avg_same_item_balance.std_dev_or_none()
         }
     except Exception as e:
         logger.error(f"Error calculating team statistics from data: {str(e)}", exc_info=True)
@@ -1479,7 +1197,7 @@ def _calculate_success_statistics_from_data(success_result: Tuple) -> Dict[str,
         (success_matrix_tuples, item_values, overall_success_rate, normalized_cumulative_score, 
          success_counts, pair_counts, player_responses) = success_result
         
-        # Calculate success statistics with uncertainties using ufloat
+        # Calculate success statistics with binomial uncertainties
         if overall_success_rate >= 0:
             total_rounds = sum(pair_counts.values())
             if total_rounds > 0:
@@ -1570,51 +1288,63 @@ def _calculate_success_statistics_from_data(success_result: Tuple) -> Dict[str,
             'same_item_balance_uncertainty': None
         }
 
-def _process_single_team_optimized(team_id: int, team_name: str, is_active: bool, created_at: Optional[str], current_round: int, player1_sid: Optional[str], player2_sid: Optional[str], team_rounds: List[Any], team_answers: List[Any], team_obj: Any = None) -> Optional[Dict[str, Any]]:
+def _team_min_stats_sig(team_info: Optional[Dict[str, Any]]) -> bool:
+    """Whether an active team has played every question combination often enough for its stats to count."""
+    if not team_info:
+        return False
+    
+    # Mode-specific combo calculation for min_stats_sig
+    if state.game_mode == 'new':
+        # New mode: Only A,B x X,Y combinations are possible (Player 1: A/B, Player 2: X/Y)
+        player1_items = [ItemEnum.A, ItemEnum.B]
+        player2_items = [ItemEnum.X, ItemEnum.Y]
+        all_combos = [(i1.value, i2.value) for i1 in player1_items for i2 in player2_items]
+    else:
+        # Classic mode: All combinations possible
+        all_combos = [(i1.value, i2.value) for i1 in QUESTION_ITEMS for i2 in QUESTION_ITEMS]
+        
+    combo_tracker = team_info.get('combo_tracker', {})
+    effective_combo_repeats = get_effective_combo_repeats(state.game_mode)
+    return all(combo_tracker.get(combo, 0) >= effective_combo_repeats for combo in all_combos)
+
+def _process_single_team_optimized(team_id: int, team_name: str, is_active: bool, created_at: Optional[str], current_round: int, player1_sid: Optional[str], player2_sid: Optional[str], team_rounds: List[Any], team_answers: List[Any], team_obj: Any = None, batch_result: Optional[TeamBatchResult] = None, history_hashes: Optional[Tuple[str, str]] = None) -> Optional[Dict[str, Any]]:
     """
     Process all heavy computation for a single team using pre-fetched data.
     OPTIMIZATION: Uses pre-fetched rounds and answers to avoid database queries.
+    When a batch_result from compute_team_statistics_batch and the accumulator's
+    history_hashes are given, they are used directly instead of re-walking the team's
+    rounds and answers.
     """
     try:
         # For active teams, check game progress
         team_info = state.active_teams.get(team_name)
         
-        # Mode-specific combo calculation for min_stats_sig
-        if state.game_mode == 'new':
-            # New mode: Only A,B x X,Y combinations are possible (Player 1: A/B, Player 2: X/Y)
-            player1_items = [ItemEnum.A, ItemEnum.B]
-            player2_items = [ItemEnum.X, ItemEnum.Y]
-            all_combos = [(i1.value, i2.value) for i1 in player1_items for i2 in player2_items]
-        else:
-            # Classic mode: All combinations possible
-            all_combos = [(i1.value, i2.value) for i1 in QUESTION_ITEMS for i2 in QUESTION_ITEMS]
-            
-        combo_tracker = team_info.get('combo_tracker', {}) if team_info else {}
-        effective_combo_repeats = get_effective_combo_repeats(state.game_mode)
-        min_stats_sig = all(combo_tracker.get(combo, 0) >= effective_combo_repeats
-                        for combo in all_combos) if team_info else False
+        min_stats_sig = _team_min_stats_sig(team_info)
         
         # Get players list
         players = team_info['players'] if team_info else []
 
-        # Compute hashes for the team using pre-fetched data
-        hash1, hash2 = _compute_team_hashes_optimized(team_id, team_rounds, team_answers)
+        # Compute hashes for the team using pre-fetched data unless the rolling hash was given
+        if history_hashes is not None:
+            hash1, hash2 = history_hashes
+        else:
+            hash1, hash2 = _compute_team_hashes_optimized(team_id, team_rounds, team_answers)
         
         # ALWAYS compute both classic and new statistics for details modal
-        # Get correlation matrix and success metrics data using pre-fetched data
-        # Pass team_obj to avoid N+1 queries
-        correlation_result = _compute_correlation_matrix_optimized(team_id, team_rounds, team_answers, team_obj)
-        (corr_matrix_tuples, item_values,
-         same_item_balance_avg, same_item_balance, same_item_responses,
-         correlation_sums, pair_counts) = correlation_result
-        
-        success_result = _compute_success_metrics_optimized(team_id, team_rounds, team_answers, team_obj)
-        (success_matrix_tuples, success_item_values, overall_success_rate, normalized_cumulative_score, 
-         success_counts, success_pair_counts, player_responses) = success_result
-        
-        # Calculate statistics using pre-computed correlation and success data
-        classic_stats = _calculate_team_statistics_from_data(correlation_result)
-        new_stats = _calculate_success_statistics_from_data(success_result)
+        if batch_result is not None:
+            # Matrices and statistics were computed for all teams at once by the batch engine
+            corr_matrix_tuples, success_matrix_tuples, classic_stats, new_stats = batch_result
+            item_values = success_item_values = list(ITEM_VALUES)
+        else:
+            # Get correlation matrix and success metrics data in one pass over the pre-fetched data
+            # Pass team_obj to avoid N+1 queries
+            correlation_result, success_result = _compute_team_metrics_fused(team_id, team_rounds, team_answers, team_obj)
+            corr_matrix_tuples, item_values = correlation_result[0], correlation_result[1]
+            success_matrix_tuples, success_item_values = success_result[0], success_result[1]
+
+            # Calculate statistics using pre-computed correlation and success data
+            classic_stats = _calculate_team_statistics_from_data(correlation_result)
+            new_stats = _calculate_success_statistics_from_data(success_result)
         
         # Determine which matrix and stats to use for the main display based on game mode
         if state.game_mode == 'new':
@@ -1662,27 +1392,14 @@ def _process_single_team_optimized(team_id: int, team_name: str, is_active: bool
         logger.error(f"Error processing team {team_id}: {str(e)}", exc_info=True)
         return None
 
-@selective_cache(_team_process_cache)
+@selective_cache(_team_process_cache, key=_process_team_cache_key, mode_dependent=True)
 def _process_single_team(team_id: int, team_name: str, is_active: bool, created_at: Optional[str], current_round: int, player1_sid: Optional[str], player2_sid: Optional[str]) -> Optional[Dict[str, Any]]:
     """Process all heavy computation for a single team."""
     try:
         # For active teams, check game progress
         team_info = state.active_teams.get(team_name)
         
-        # Mode-specific combo calculation for min_stats_sig
-        if state.game_mode == 'new':
-            # New mode: Only A,B x X,Y combinations are possible (Player 1: A/B, Player 2: X/Y)
-            player1_items = [ItemEnum.A, ItemEnum.B]
-            player2_items = [ItemEnum.X, ItemEnum.Y]
-            all_combos = [(i1.value, i2.value) for i1 in player1_items for i2 in player2_items]
-        else:
-            # Classic mode: All combinations possible
-            all_combos = [(i1.value, i2.value) for i1 in QUESTION_ITEMS for i2 in QUESTION_ITEMS]
-            
-        combo_tracker = team_info.get('combo_tracker', {}) if team_info else {}
-        effective_combo_repeats = get_effective_combo_repeats(state.game_mode)
-        min_stats_sig = all(combo_tracker.get(combo, 0) >= effective_combo_repeats
-                        for combo in all_combos) if team_info else False
+        min_stats_sig = _team_min_stats_sig(team_info)
         
         # Get players list
         players = team_info['players'] if team_info else []
@@ -1751,6 +1468,290 @@ def _process_single_team(team_id: int, team_name: str, is_active: bool, created_
         logger.error(f"Error processing team {team_id}: {str(e)}", exc_info=True)
         return None
 
+def _get_bootstrap_ci(team_id: int, team_name: str, accumulator: TeamStatsAccumulator) -> Optional[Dict[str, Any]]:
+    """
+    Bootstrap intervals for the team's completed rounds, or None before the first are ready.
+    The resampled outcome table only changes when a round completes, so results are
+    keyed on the round count. A missing or outdated result queues a background
+    computation and the previous intervals are served until it finishes; dashboards
+    are updated then.
+    """
+    version = accumulator.rounds_recorded
+    intervals = bootstrap.get_cached_intervals(team_id, version)
+    if intervals is None and version > 0:
+        bootstrap.schedule_intervals(
+            team_id, version, accumulator.outcome_counts(),
+            app.config['BOOTSTRAP_RESAMPLES'], app.config['BOOTSTRAP_TIME_BUDGET'],
+            socketio.start_background_task, partial(_on_bootstrap_done, team_name))
+        intervals = bootstrap.latest_intervals(team_id)
+    return intervals
+
+def _on_bootstrap_done(team_name: str) -> None:
+    """Push freshly computed bootstrap intervals to dashboards."""
+    invalidate_team_caches(team_name)
+    schedule_dashboard_team_update()
+
+def _leaderboard_scores(classic_stats: Dict[str, Optional[float]], new_stats: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    """Scores the dashboard awards 🏆 ('chsh') and 🎯 ('balanced') on in the current game mode."""
+    if state.game_mode == 'classic':
+        return {
+            'chsh': classic_stats['cross_term_combination_statistic'],
+            'balanced': (classic_stats['trace_average_statistic'] + classic_stats['same_item_balance']) / 2,
+        }
+    # Non-classic modes only award 🏆, on success rate
+    return {'chsh': new_stats['trace_average_statistic'], 'balanced': None}
+
+def _emit_leaderboard_events(events: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """Send rank_changed / leader_changed events to every dashboard client."""
+    for event, payload in events:
+        socketio.emit(event, payload, to=DASHBOARD_ROOM)  # type: ignore
+
+def update_team_leaderboard(team_name: str) -> None:
+    """
+    Re-rank one team after its statistics or min_stats_sig changed and publish any
+    rank or leader changes. Called by the game logic whenever a new round starts.
+    """
+    try:
+        team_info = state.active_teams.get(team_name)
+        if not team_info:
+            return
+        team_id = team_info['team_id']
+        accumulator = _get_team_accumulator(team_id)
+        if accumulator is None:
+            return
+        
+        _, _, classic_stats, new_stats = compute_team_statistics_batch([accumulator], _current_success_table())[0]
+        events = state.leaderboard.update(team_id, team_name, _leaderboard_scores(classic_stats, new_stats),
+                                          _team_min_stats_sig(team_info))
+        _emit_leaderboard_events(events)
+    except Exception as e:
+        logger.error(f"Error updating leaderboard for team {team_name}: {str(e)}", exc_info=True)
+
+def freeze_team_stats(team_id: int) -> None:
+    """
+    Compute the final statistics of a team that just went inactive. Its rounds can no
+    longer change, so dashboards serve these until the team is reactivated.
+    """
+    try:
+        accumulator = _get_team_accumulator(team_id)
+        if accumulator is not None:
+            state.frozen_teams[team_id] = freeze_team_statistics(accumulator, SUCCESS_TABLES)
+        # An inactive team leaves the class-wide pool
+        if team_id in state.class_stats.members:
+            state.class_stats.remove_team(team_id)
+            schedule_class_stats_update()
+    except Exception as e:
+        logger.error(f"Error freezing statistics of team {team_id}: {str(e)}", exc_info=True)
+
+def thaw_team_stats(team_id: int) -> None:
+    """Drop the frozen statistics of a team that is being reactivated."""
+    state.frozen_teams.pop(team_id, None)
+
+def rescore_leaderboard() -> None:
+    """Re-rank every team after a game mode change, which changes what the boards score on."""
+    try:
+        team_names = state.leaderboard.team_names()
+        team_ids = [team_id for team_id in team_names if team_id in state.team_stats]
+        batch_results = compute_team_statistics_batch([state.team_stats[team_id] for team_id in team_ids], _current_success_table())
+        events = state.leaderboard.rebuild(
+            (team_id, team_names[team_id], _leaderboard_scores(classic_stats, new_stats),
+             _team_min_stats_sig(state.active_teams.get(team_names[team_id])))
+            for team_id, (_, _, classic_stats, new_stats) in zip(team_ids, batch_results)
+        )
+        _emit_leaderboard_events(events)
+    except Exception as e:
+        logger.error(f"Error in rescore_leaderboard: {str(e)}", exc_info=True)
+
+def _compute_mode_views(team_ids: List[int], accumulators: List[TeamStatsAccumulator], batch_results: List[TeamBatchResult]) -> Dict[int, Dict[str, SuccessView]]:
+    """
+    Success view of every team under every game mode. The current mode's views come from
+    the batch already computed; each other distinct success table costs one more batch pass.
+    """
+    current_table = _current_success_table()
+    views_by_table: Dict[int, List[SuccessView]] = {
+        id(current_table): [(success_matrix, new_stats) for _, success_matrix, _, new_stats in batch_results]
+    }
+    mode_views: Dict[int, Dict[str, SuccessView]] = {team_id: {} for team_id in team_ids}
+    for mode, success_table in SUCCESS_TABLES.items():
+        if id(success_table) not in views_by_table:
+            views_by_table[id(success_table)] = compute_success_statistics_batch(accumulators, success_table)
+        for team_id, view in zip(team_ids, views_by_table[id(success_table)]):
+            mode_views[team_id][mode] = view
+    return mode_views
+
+def _apply_game_mode_to_cached_teams() -> int:
+    """
+    Switch the cached dashboard teams to the current game mode, using the per-mode views
+    kept by get_all_teams (falling back to the team's in-memory accumulator). Switched
+    teams are new dicts built outside the lock, so teams already sent or memoized keep
+    their fields; only the new references and data version are swapped in under the lock.
+    Caches that were current stay current. Returns the number of teams switched.
+    """
+    global _cached_teams_result, _cached_team_metrics, _cached_full_metrics, _team_entries, _cached_mode_views
+    global _cached_teams_version, _cached_team_metrics_version, _cached_full_metrics_version
+    game_mode = state.game_mode
+    with _safe_dashboard_operation():
+        teams_result, team_metrics, full_metrics = _cached_teams_result, _cached_team_metrics, _cached_full_metrics
+        entries, mode_views = _team_entries, _cached_mode_views
+    
+    # The throttling caches usually share the same team dicts; switch each one once
+    switched: Dict[int, Dict[str, Any]] = {}
+    new_views: Dict[int, SuccessView] = {}
+    
+    def switch_teams(teams: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        if teams is None:
+            return None
+        switched_teams = []
+        for team_data in teams:
+            if id(team_data) not in switched:
+                team_id = team_data.get('team_id')
+                view = mode_views.get(team_id, {}).get(game_mode) or new_views.get(team_id)
+                if view is None:
+                    accumulator = state.team_stats.get(team_id)
+                    if accumulator is None:
+                        switched_teams.append(team_data)
+                        continue
+                    view = new_views[team_id] = compute_success_statistics_batch([accumulator], _current_success_table())[0]
+                new_matrix, new_stats = view
+                switched[id(team_data)] = {
+                    **team_data,
+                    'new_matrix': new_matrix,
+                    'new_stats': new_stats,
+                    'min_stats_sig': _team_min_stats_sig(state.active_teams.get(team_data.get('team_name'))),
+                    'game_mode': game_mode,
+                }
+            switched_teams.append(switched[id(team_data)])
+        return switched_teams
+    
+    new_teams_result = switch_teams(teams_result)
+    new_team_metrics, new_full_metrics = (
+        metrics if metrics is None or metrics.get('cached_teams') is None
+        else {**metrics, 'cached_teams': switch_teams(metrics['cached_teams'])}
+        for metrics in (team_metrics, full_metrics))
+    new_entries = {team_id: entry._replace(team=switched[id(entry.team)]) if id(entry.team) in switched else entry
+                   for team_id, entry in entries.items()}
+    new_mode_views = dict(mode_views)
+    for team_id, view in new_views.items():
+        new_mode_views[team_id] = {**mode_views.get(team_id, {}), game_mode: view}
+    teams_bytes = _teams_list_size(new_teams_result) if new_teams_result is not None else None
+    
+    with _safe_dashboard_operation():
+        # A cache rebuilt or cleared meanwhile already reflects the current mode; leave it be
+        if _cached_teams_result is teams_result:
+            _cached_teams_result = new_teams_result
+            if teams_bytes is not None:
+                _throttle_cache_bytes['teams'] = teams_bytes
+        if _cached_team_metrics is team_metrics:
+            _cached_team_metrics = new_team_metrics
+        if _cached_full_metrics is full_metrics:
+            _cached_full_metrics = new_full_metrics
+        if _team_entries is entries:
+            _team_entries = new_entries
+        if _cached_mode_views is mode_views:
+            _cached_mode_views = new_mode_views
+        
+        previous_version = team_data_versions.global_version
+        new_version = team_data_versions.bump()
+        if _cached_teams_version == previous_version:
+            _cached_teams_version = new_version
+        if _cached_team_metrics_version == previous_version:
+            _cached_team_metrics_version = new_version
+        if _cached_full_metrics_version == previous_version:
+            _cached_full_metrics_version = new_version
+    return len(switched)
+
+def apply_game_mode_change() -> None:
+    """
+    Bring the dashboard in line with a new game mode without flushing any cache: the
+    cached teams switch to their precomputed views for the mode and the leaderboard is
+    re-scored from the in-memory accumulators. No database reads are needed.
+    """
+    updated = _apply_game_mode_to_cached_teams()
+    rescore_leaderboard()
+    logger.debug(f"Switched {updated} cached teams to game mode {state.game_mode}")
+
+def add_team_to_class_stats(team_id: int) -> None:
+    """
+    Pool a team that just became active (created or reactivated). Teams leave the pool
+    when they are frozen (freeze_team_stats).
+    """
+    try:
+        if team_id in state.class_stats.members:
+            return
+        accumulator = _get_team_accumulator(team_id)
+        if accumulator is not None:
+            state.class_stats.add_team(team_id, accumulator)
+            schedule_class_stats_update()
+    except Exception as e:
+        logger.error(f"Error adding team {team_id} to the class statistics: {str(e)}", exc_info=True)
+
+def _sync_class_stats_members() -> bool:
+    """
+    Pool exactly the active teams. Walks every active team, so it is only used to
+    rebuild the pool after a game reset. Returns True if membership changed.
+    """
+    pool = state.class_stats
+    active_team_ids = {team_info['team_id'] for team_info in state.active_teams.values()
+                       if team_info.get('team_id') is not None}
+    changed = False
+    for team_id in list(pool.members):
+        if team_id not in active_team_ids:
+            pool.remove_team(team_id)
+            changed = True
+    for team_id in active_team_ids:
+        if team_id not in pool.members:
+            accumulator = _get_team_accumulator(team_id)
+            if accumulator is not None:
+                pool.add_team(team_id, accumulator)
+                changed = True
+    return changed
+
+def compute_class_statistics() -> Dict[str, Any]:
+    """
+    Room-level statistics pooled over every active team's rounds. Pooled CHSH is the
+    cross-term combination of the summed matrix. The success rate is reported for every
+    game mode, so a mode switch only changes which one the dashboard shows.
+    """
+    pooled = state.class_stats.accumulator()
+    classic_stats = compute_classic_statistics_batch([pooled])[0]
+    success_rate_by_mode: Dict[str, Dict[str, Optional[float]]] = {}
+    for mode, success_table in SUCCESS_TABLES.items():
+        new_stats = compute_team_statistics_batch([pooled], success_table)[0][3]
+        success_rate_by_mode[mode] = {
+            'value': new_stats['trace_average_statistic'],
+            'uncertainty': new_stats['trace_average_statistic_uncertainty'],
+        }
+    
+    # Balanced |<Tr>| = (trace average + same-item balance) / 2, with independent uncertainties
+    trace_std = classic_stats['trace_average_statistic_uncertainty']
+    balance_std = classic_stats['same_item_balance_uncertainty']
+    balanced = Estimate(classic_stats['trace_average_statistic'], trace_std or 0)
+    balanced.add(Estimate(classic_stats['same_item_balance'], balance_std or 0))
+    balanced = balanced.scaled(0.5)
+    
+    return {
+        'teams_count': len(state.class_stats.members),
+        'rounds_count': pooled.rounds_recorded,
+        'chsh_value': classic_stats['cross_term_combination_statistic'],
+        'chsh_value_uncertainty': classic_stats['cross_term_combination_statistic_uncertainty'],
+        'balanced_trace': balanced.nominal_value,
+        'balanced_trace_uncertainty': balanced.std_dev if trace_std is not None and balance_std is not None else None,
+        'success_rate_by_mode': success_rate_by_mode,
+    }
+
+def emit_class_stats_update(client_sid: Optional[str] = None) -> None:
+    """
+    Push the pooled class statistics to dashboards as one small class_stats_update event.
+    Game handlers call schedule_class_stats_update instead; the scheduler sends it.
+    """
+    try:
+        if not state.dashboard_clients:
+            return
+        class_stats = compute_class_statistics()
+        socketio.emit('class_stats_update', class_stats, to=client_sid or DASHBOARD_ROOM)  # type: ignore
+    except Exception as e:
+        logger.error(f"Error in emit_class_stats_update: {str(e)}", exc_info=True)
+
 def get_all_teams() -> List[Dict[str, Any]]:
     """
     Retrieve and serialize all team data with throttling for performance.
@@ -1761,8 +1762,14 @@ def get_all_teams() -> List[Dict[str, Any]]:
     Uses computation flag to prevent race conditions where multiple threads
     perform duplicate expensive work.
     Uses "stale but usable" cache logic - returns stale data within throttling window.
+    
+    A refresh only recomputes teams whose data version moved (invalidate_team_caches) or
+    whose row changed; the others are served from their last entry. Inactive teams use
+    their frozen final statistics (state.frozen_teams). The Teams table is only queried
+    again after a membership change.
     """
-    global _last_refresh_time, _cached_teams_result, _cached_teams_is_stale, _teams_computation_in_progress
+    global _last_refresh_time, _cached_teams_result, _cached_teams_version, _teams_computation_in_progress
+    global _cached_mode_views, _cached_team_roster, _cached_team_roster_version, _team_entries
     
     try:
         # First, check cache and computation state under minimal lock
@@ -1772,97 +1779,196 @@ def get_all_teams() -> List[Dict[str, Any]]:
             
             # Return cached result (even if stale) if throttling applies
             if time_since_last_refresh < REFRESH_DELAY_QUICK and _cached_teams_result is not None:
+                _count_throttle_lookup('teams', _cached_teams_version)
                 return _cached_teams_result
             
             # If computation in progress, return current cache (avoid duplicate work)
             if _teams_computation_in_progress:
+                _count_throttle_lookup('teams', _cached_teams_version if _cached_teams_result is not None else None)
                 return _cached_teams_result if _cached_teams_result is not None else []
             
-            # Mark computation starting
+            # Mark computation starting; changes from here on make the result stale
+            _count_throttle_lookup('teams', None)
             _teams_computation_in_progress = True
+            computed_version = team_data_versions.global_version
+            roster_version = _team_roster_version
+            roster = _cached_team_roster if _cached_team_roster_version == roster_version else None
+            previous_entries = _team_entries
+            previous_mode_views = _cached_mode_views
         
         # === EXPENSIVE OPERATIONS OUTSIDE LOCK ===
         # These are thread-safe and don't need synchronization
         
-        # OPTIMIZATION: Bulk fetch all data to prevent N+1 queries
-        all_teams = Teams.query.all()
+        # The Teams table is only read again after a membership change
+        team_objs: Dict[int, Any] = {}
+        if roster is None:
+            team_objs = {team.team_id: team for team in Teams.query.all()}
+            roster = [TeamRow(team.team_id, team.team_name, team.is_active,
+                              team.created_at.isoformat() if team.created_at else None)
+                      for team in team_objs.values()]
         
-        if not all_teams:
+        if not roster:
             # Update cache under lock and return
             with _safe_dashboard_operation():
                 _cached_teams_result = []
-                _cached_teams_is_stale = False  # Fresh data is not stale
+                _throttle_cache_bytes['teams'] = sys.getsizeof(_cached_teams_result)
+                _cached_mode_views = {}
+                _cached_teams_version = computed_version
+                if _team_roster_version == roster_version:
+                    _cached_team_roster, _cached_team_roster_version = roster, roster_version
+                    _team_entries = {}
                 _last_refresh_time = time()  # Use fresh timestamp reflecting actual cache completion
                 _teams_computation_in_progress = False  # Clear computation flag
             return []
         
-        # Extract team IDs for bulk queries
-        team_ids = [team.team_id for team in all_teams]
-        
-        # Bulk fetch all rounds and answers for all teams
-        all_rounds = PairQuestionRounds.query.filter(
-            PairQuestionRounds.team_id.in_(team_ids)
-        ).order_by(PairQuestionRounds.team_id, PairQuestionRounds.timestamp_initiated).all()
+        # Reuse the entries of teams whose row and data version are unchanged. Versions are
+        # read before the statistics, so a change made meanwhile is picked up next refresh.
+        entries: Dict[int, TeamEntry] = {}
+        dirty_rows: List[TeamRow] = []
+        dirty_versions: List[int] = []
+        for row in roster:
+            version = team_data_versions.get(row.team_name)
+            entry = previous_entries.get(row.team_id)
+            if (entry is not None and entry.row == row and entry.data_version == version
+                    and entry.team.get('game_mode') == state.game_mode):
+                entries[row.team_id] = entry
+            else:
+                dirty_rows.append(row)
+                dirty_versions.append(version)
         
-        all_answers = Answers.query.filter(
-            Answers.team_id.in_(team_ids)
-        ).order_by(Answers.team_id, Answers.timestamp).all()
+        # Statistics and history hashes come from each team's in-memory accumulator, which
+        # the game handlers keep current; it is only rebuilt from the DB rows the first time
+        # a team is seen after startup or a game reset, so only those teams' rows are fetched.
+        # Inactive teams are served from their frozen final statistics instead.
+        live_rows = [row for row in dirty_rows if row.is_active or row.team_id not in state.frozen_teams]
+        missing_team_ids = [row.team_id for row in live_rows if row.team_id not in state.team_stats]
         
-        # Group data by team_id for efficient lookup
         rounds_by_team = {}
         answers_by_team = {}
         
-        for round_obj in all_rounds:
-            if round_obj.team_id not in rounds_by_team:
-                rounds_by_team[round_obj.team_id] = []
-            rounds_by_team[round_obj.team_id].append(round_obj)
-        
-        for answer in all_answers:
-            if answer.team_id not in answers_by_team:
-                answers_by_team[answer.team_id] = []
-            answers_by_team[answer.team_id].append(answer)
-        
-        # Process teams using pre-fetched data
-        teams_list = []
-        
-        for team in all_teams:
+        if missing_team_ids:
+            # Bulk fetch the teams (unless just loaded), rounds and answers for the teams being rebuilt
+            if any(team_id not in team_objs for team_id in missing_team_ids):
+                team_objs.update((team.team_id, team) for team in
+                                 Teams.query.filter(Teams.team_id.in_(missing_team_ids)).all())
+            
+            all_rounds = PairQuestionRounds.query.filter(
+                PairQuestionRounds.team_id.in_(missing_team_ids)
+            ).order_by(PairQuestionRounds.team_id, PairQuestionRounds.timestamp_initiated).all()
+            
+            all_answers = Answers.query.filter(
+                Answers.team_id.in_(missing_team_ids)
+            ).order_by(Answers.team_id, Answers.timestamp).all()
+            
+            # Group data by team_id for efficient lookup
+            for round_obj in all_rounds:
+                if round_obj.team_id not in rounds_by_team:
+                    rounds_by_team[round_obj.team_id] = []
+                rounds_by_team[round_obj.team_id].append(round_obj)
+            
+            for answer in all_answers:
+                if answer.team_id not in answers_by_team:
+                    answers_by_team[answer.team_id] = []
+                answers_by_team[answer.team_id].append(answer)
+        
+        accumulators = []
+        for row in live_rows:
+            accumulator = state.team_stats.get(row.team_id)
+            if accumulator is None:
+                accumulator = TeamStatsAccumulator.from_rows(
+                    rounds_by_team.get(row.team_id, []), answers_by_team.get(row.team_id, []), team_objs.get(row.team_id))
+                state.team_stats[row.team_id] = accumulator
+            accumulators.append(accumulator)
+        
+        # Compute matrices and statistics for the changed teams in a single batch pass
+        batch_results = compute_team_statistics_batch(accumulators, _current_success_table())
+        # Keep every mode's success view too, so a mode change needs no recomputation
+        mode_views = _compute_mode_views([row.team_id for row in live_rows], accumulators, batch_results)
+        
+        results: Dict[int, Tuple[TeamBatchResult, Tuple[str, str]]] = {}
+        for row, accumulator, batch_result in zip(live_rows, accumulators, batch_results):
+            results[row.team_id] = (batch_result, accumulator.history.hexdigests())
+            if not row.is_active:
+                # An inactive team without frozen statistics (e.g. first seen after startup) gets them now
+                state.frozen_teams[row.team_id] = FrozenTeamStats(
+                    results[row.team_id][1], batch_result[0], batch_result[2], mode_views[row.team_id])
+        for row in dirty_rows:
+            if row.team_id not in results:
+                frozen = state.frozen_teams[row.team_id]
+                results[row.team_id] = (frozen.batch_result(state.game_mode), frozen.history_hashes)
+                mode_views[row.team_id] = frozen.success_views
+        
+        # Process the changed teams using their precomputed statistics
+        bootstrap_enabled = app.config.get('BOOTSTRAP_CI_ENABLED', False)
+        leaderboard_events: List[Tuple[str, Dict[str, Any]]] = []
+        
+        for row, version in zip(dirty_rows, dirty_versions):
+            batch_result, history_hashes = results[row.team_id]
             # Get active team info from state if available (state reads are atomic)
-            team_info = state.active_teams.get(team.team_name)
+            team_info = state.active_teams.get(row.team_name)
             
-            # Get players from either active state or database
+            # Get players from active state
             players = team_info['players'] if team_info else []
             current_round = team_info.get('current_round_number', 0) if team_info else 0
             
-            # Get pre-fetched data for this team
-            team_rounds = rounds_by_team.get(team.team_id, [])
-            team_answers = answers_by_team.get(team.team_id, [])
-            
-            # Use optimized helper function with pre-fetched data
+            # Use optimized helper function with the precomputed batch results
             team_data = _process_single_team_optimized(
-                team.team_id,
-                team.team_name,
-                team.is_active,
-                team.created_at.isoformat() if team.created_at else None,
+                row.team_id,
+                row.team_name,
+                row.is_active,
+                row.created_at,
                 current_round,
                 players[0] if len(players) > 0 else None,
                 players[1] if len(players) > 1 else None,
-                team_rounds,
-                team_answers,
-                team  # Pass team object to avoid N+1 queries
+                [],  # No rows needed: statistics and hashes are precomputed
+                [],
+                None,
+                batch_result,
+                history_hashes
             )
             
             if team_data:
-                teams_list.append(team_data)
+                team_data['data_version'] = version
+                accumulator = state.team_stats.get(row.team_id)
+                if bootstrap_enabled and accumulator is not None:
+                    team_data['bootstrap_ci'] = _get_bootstrap_ci(row.team_id, row.team_name, accumulator)
+                entries[row.team_id] = TeamEntry(row, version, team_data)
+                # Keep the leaderboard in step (a no-op unless the team's scores or eligibility moved)
+                leaderboard_events.extend(state.leaderboard.update(
+                    row.team_id, row.team_name,
+                    _leaderboard_scores(team_data['classic_stats'], team_data['new_stats']),
+                    team_data['min_stats_sig']))
+        
+        # Serve the teams in roster order; reused teams keep their success views
+        teams_list = [entries[row.team_id].team for row in roster if row.team_id in entries]
+        for row in roster:
+            if row.team_id not in mode_views and row.team_id in previous_mode_views:
+                mode_views[row.team_id] = previous_mode_views[row.team_id]
+        
+        # Drop teams that no longer exist (e.g. inactive teams purged from the DB)
+        current_team_ids = {row.team_id for row in roster}
+        for team_id in state.leaderboard.team_names():
+            if team_id not in current_team_ids:
+                leaderboard_events.extend(state.leaderboard.remove(team_id))
         
         # === END EXPENSIVE OPERATIONS ===
         
+        teams_bytes = _teams_list_size(teams_list)
+        
         # Update cache under minimal lock
         with _safe_dashboard_operation():
             _cached_teams_result = teams_list
-            _cached_teams_is_stale = False  # Fresh data is not stale
+            _throttle_cache_bytes['teams'] = teams_bytes
+            _cached_mode_views = mode_views
+            _cached_teams_version = computed_version
+            # Keep the roster and entries unless a membership change or cache clear came meanwhile
+            if _team_roster_version == roster_version:
+                _cached_team_roster, _cached_team_roster_version = roster, roster_version
+                _team_entries = entries
             _last_refresh_time = time()  # Use fresh timestamp reflecting actual cache completion
             _teams_computation_in_progress = False  # Clear computation flag
         
+        _emit_leaderboard_events(leaderboard_events)
         return teams_list
         
     except Exception as e:
@@ -1876,14 +1982,23 @@ def invalidate_team_caches(team_name: str) -> None:
     """
     Selectively mark caches as stale for a specific team only.
     Preserves cached results for all other teams and allows throttling to return stale data.
-    Uses "stale but usable" invalidation - marks data as outdated without deleting it.
+    Uses "stale but usable" invalidation - bumps the team's data version, which makes every
+    value built from an older version outdated without deleting it.
+    A team that is not (or no longer) active, or not in the cached roster, was created,
+    deactivated or renamed, so the roster is reloaded on the next refresh.
     Thread-safe operation with proper error handling.
     """
-    global _cached_teams_result, _cached_team_metrics, _cached_full_metrics
-    global _cached_teams_is_stale, _cached_team_metrics_is_stale, _cached_full_metrics_is_stale
-    
+    global _team_roster_version
     try:
         with _safe_dashboard_operation():
+            # The throttling caches record the global version they were built from, so this
+            # bump is all it takes to mark them stale
+            _count_throttle_invalidations(only_current=True)
+            team_data_versions.bump(team_name)
+            if (team_name not in state.active_teams or _cached_team_roster is None
+                    or all(row.team_name != team_name for row in _cached_team_roster)):
+                _team_roster_version += 1
+            
             # Selectively mark team-specific caches as stale (not delete them)
             total_invalidated = 0
             total_invalidated += compute_team_hashes.cache_invalidate_team(team_name)
@@ -1893,33 +2008,24 @@ def invalidate_team_caches(team_name: str) -> None:
             total_invalidated += _calculate_success_statistics.cache_invalidate_team(team_name)
             total_invalidated += _process_single_team.cache_invalidate_team(team_name)
             
-            # Mark global throttling caches as stale if they contain this team's data
-            # but preserve the cached data for throttling
-            if _cached_teams_result is not None:
-                # Check if this team is in the cached result
-                team_in_cache = any(team.get('team_name') == team_name for team in _cached_teams_result)
-                if team_in_cache:
-                    _cached_teams_is_stale = True  # Mark as stale instead of clearing
-                    logger.debug(f"Marked get_all_teams cache as stale for team {team_name}")
-            
-            # Mark throttling caches as stale if they contained this team's data
-            if _cached_team_metrics is not None and 'cached_teams' in _cached_team_metrics:
-                cached_teams = _cached_team_metrics.get('cached_teams', [])
-                if any(team.get('team_name') == team_name for team in cached_teams):
-                    _cached_team_metrics_is_stale = True  # Mark as stale instead of clearing
-                    logger.debug(f"Marked team metrics cache as stale for team {team_name}")
-            
-            if _cached_full_metrics is not None and 'cached_teams' in _cached_full_metrics:
-                cached_teams = _cached_full_metrics.get('cached_teams', [])
-                if any(team.get('team_name') == team_name for team in cached_teams):
-                    _cached_full_metrics_is_stale = True  # Mark as stale instead of clearing
-                    logger.debug(f"Marked full metrics cache as stale for team {team_name}")
-            
             logger.debug(f"Selectively marked {total_invalidated} cache entries as stale for team {team_name}")
             
     except Exception as e:
         logger.error(f"Error invalidating team caches for {team_name}: {str(e)}", exc_info=True)
 
+def _count_throttle_invalidations(only_current: bool = False) -> None:
+    """Count an invalidation on each throttling cache holding data (only_current: data at the current version). Call under the dashboard lock."""
+    global_version = team_data_versions.global_version
+    for cache_name, cached, version in (('teams', _cached_teams_result, _cached_teams_version),
+                                        ('team_metrics', _cached_team_metrics, _cached_team_metrics_version),
+                                        ('full_metrics', _cached_full_metrics, _cached_full_metrics_version)):
+        if cached is not None and (not only_current or version == global_version):
+            _throttle_cache_stats[cache_name].invalidations += 1
+
+def is_teams_cache_stale() -> bool:
+    """Whether any team's data changed since the cached teams were built."""
+    return _cached_teams_version != team_data_versions.global_version
+
 def clear_team_caches() -> None:
     """
     Clear all team-related caches and throttling state to prevent stale data.
@@ -1928,9 +2034,8 @@ def clear_team_caches() -> None:
     Note: This function now clears ALL caches. For selective invalidation of
     specific teams, use invalidate_team_caches(team_name) instead.
     """
-    global _last_refresh_time, _cached_teams_result, _cached_teams_is_stale
+    global _last_refresh_time, _cached_teams_result, _cached_mode_views, _team_entries, _team_roster_version
     global _last_team_update_time, _last_full_update_time, _cached_team_metrics, _cached_full_metrics
-    global _cached_team_metrics_is_stale, _cached_full_metrics_is_stale
     global _teams_computation_in_progress, _team_update_computation_in_progress, _full_update_computation_in_progress
     
     try:
@@ -1942,11 +2047,20 @@ def clear_team_caches() -> None:
             _calculate_team_statistics.cache_clear()
             _calculate_success_statistics.cache_clear()
             _process_single_team.cache_clear()
+            _count_throttle_invalidations()
             
             # Clear get_all_teams cache since it depends on caches we just cleared
             _last_refresh_time = 0
             _cached_teams_result = None
-            _cached_teams_is_stale = False
+            _cached_mode_views = {}
+            _team_entries = {}
+            _team_roster_version += 1
+            _team_fragments.clear()
+            _team_msgpack_fragments.clear()
+            _teams_index.clear()
+            _team_entry_sizes.clear()
+            # Teams may have been created or removed: anything a dashboard holds is outdated
+            team_data_versions.bump()
             
             # Clear computation flags to prevent stuck state
             _teams_computation_in_progress = False
@@ -1960,13 +2074,11 @@ def clear_team_caches() -> None:
                 # Reset team update throttling to ensure consistency
                 _last_team_update_time = 0
                 _cached_team_metrics = None
-                _cached_team_metrics_is_stale = False
                 
             if _cached_full_metrics is not None and 'cached_teams' in _cached_full_metrics:
                 # Reset full update throttling to ensure consistency
                 _last_full_update_time = 0
                 _cached_full_metrics = None
-                _cached_full_metrics_is_stale = False
             
             logger.debug("Cleared all team caches, computation flags, and reset throttling state to ensure data consistency")
             
@@ -1982,9 +2094,8 @@ def force_clear_all_caches() -> None:
     Force clear ALL caches including throttling state. Use only when data integrity requires it.
     This is more aggressive than clear_team_caches() and should be used sparingly.
     """
-    global _last_refresh_time, _cached_teams_result, _cached_teams_is_stale
+    global _last_refresh_time, _cached_teams_result, _cached_mode_views, _team_entries, _team_roster_version
     global _last_team_update_time, _last_full_update_time, _cached_team_metrics, _cached_full_metrics
-    global _cached_team_metrics_is_stale, _cached_full_metrics_is_stale
     global _teams_computation_in_progress, _team_update_computation_in_progress, _full_update_computation_in_progress
     
     try:
@@ -1996,17 +2107,23 @@ def force_clear_all_caches() -> None:
             _calculate_team_statistics.cache_clear()
             _calculate_success_statistics.cache_clear()
             _process_single_team.cache_clear()
+            _count_throttle_invalidations()
             
             # Force clear ALL throttling state
             _last_refresh_time = 0
             _cached_teams_result = None
-            _cached_teams_is_stale = False
+            _cached_mode_views = {}
             _last_team_update_time = 0
             _last_full_update_time = 0
             _cached_team_metrics = None
-            _cached_team_metrics_is_stale = False
             _cached_full_metrics = None
-            _cached_full_metrics_is_stale = False
+            _team_entries = {}
+            _team_roster_version += 1
+            _team_fragments.clear()
+            _team_msgpack_fragments.clear()
+            _teams_index.clear()
+            _team_entry_sizes.clear()
+            team_data_versions.bump()
             
             # Clear computation flags to prevent stuck state
             _teams_computation_in_progress = False
@@ -2020,6 +2137,125 @@ def force_clear_all_caches() -> None:
     except Exception as e:
         logger.error(f"Error in force_clear_all_caches: {str(e)}", exc_info=True)
 
+def _team_fragment_entry(team_data: Dict[str, Any]) -> TeamFragment:
+    """The cached fragment of a team, encoded only when the team dict or its game mode changed."""
+    team_id = team_data.get('team_id')
+    fragment = _team_fragments.get(team_id)
+    if fragment is None or fragment.team is not team_data or fragment.game_mode != team_data.get('game_mode'):
+        fragment = TeamFragment(team_data, team_data.get('game_mode'), payload_json.encode(team_data), dict(team_data))
+        _team_fragments[team_id] = fragment
+    return fragment
+
+def _encoded_fragment(fragment: TeamFragment, codec: Any) -> Union[EncodedJSON, EncodedMsgPack]:
+    """A team's fragment in the given payload encoding."""
+    if codec is payload_json:
+        return fragment.json
+    team_id = fragment.fields.get('team_id')
+    cached = _team_msgpack_fragments.get(team_id)
+    if cached is None or cached[0] is not fragment:
+        cached = _team_msgpack_fragments[team_id] = (fragment, payload_msgpack.encode(fragment.fields))
+    return cached[1]
+
+def payload_codec(sid: str) -> Any:
+    """The payload encoding module (payload_json or payload_msgpack) of a dashboard client."""
+    return PAYLOAD_ENCODINGS[dashboard_client_encoding.get(sid, 'json')]
+
+def _team_fragment(team_data: Dict[str, Any]) -> EncodedJSON:
+    """The encoded dashboard entry of a team."""
+    return _team_fragment_entry(team_data).json
+
+def encode_teams(teams: List[Dict[str, Any]]) -> EncodedJSON:
+    """Encode a teams list by splicing the cached per-team fragments."""
+    return payload_json.encode_array(_team_fragment(team_data) for team_data in teams)
+
+def _team_patch(held: Optional[TeamFragment], fragment: TeamFragment, codec: Any = payload_json) -> Union[EncodedJSON, EncodedMsgPack]:
+    """A team's entry as a patch: the fields that differ from the held fragment (removed ones as null), or the whole entry."""
+    if held is None:
+        return _encoded_fragment(fragment, codec)
+    changed: Dict[str, Any] = {key: value for key, value in fragment.fields.items()
+                               if key not in held.fields or held.fields[key] != value}
+    changed.update((key, None) for key in held.fields if key not in fragment.fields)
+    return codec.encode({'team_id': fragment.fields.get('team_id'), **changed})
+
+def _team_window_scores(team_data: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """A team entry's 🏆/🎯 scores for the teams window sort keys; none for teams without statistics."""
+    try:
+        return _leaderboard_scores(team_data['classic_stats'], team_data['new_stats'])
+    except (KeyError, TypeError):
+        return {}
+
+# Sorted index of get_all_teams entries, for dashboard clients that asked for a teams window
+_teams_index = TeamsIndex(_team_window_scores)
+
+def client_teams(sid: str, teams: List[Dict[str, Any]],
+                 memo: Dict[Any, Any]) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    The teams a client is sent: every team, or the teams in its window (see
+    request_teams_window) with the window's description ('total' matching teams and
+    the team ids in sort 'order'). memo is shared by the recipients of one emit, so the
+    index is synced once per teams list and clients with the same window share a list.
+    """
+    window = dashboard_client_windows.get(sid)
+    if window is None:
+        return teams, None
+    key = ('window', id(teams), window)
+    cached = memo.get(key)
+    if cached is None:
+        # The sync walks every team, so it runs outside the dashboard lock (the index has its own)
+        if memo.get(('index', id(teams))) is None:
+            memo[('index', id(teams))] = teams
+            _teams_index.sync(teams)
+        with _safe_dashboard_operation():
+            total, window_teams = _teams_index.window(window.sort, window.filter, window.offset, window.limit)
+        cached = memo[key] = (window_teams, {
+            **window._asdict(),
+            'total': total,
+            'order': [team_data.get('team_id') for team_data in window_teams],
+        })
+    return cached
+
+def teams_update_fields(sid: str, teams: List[Dict[str, Any]], data_version: int,
+                        memo: Dict[Any, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The teams part of a payload for a streaming client, recorded as what the client now
+    holds: a full snapshot ('teams') the first time or after a resync, otherwise a
+    'teams_patch' with only the teams and fields changed since the version the client
+    holds, plus the ids of removed teams. memo is shared by the recipients of one emit,
+    so clients holding the same teams get the same (once encoded) fields. The fields are
+    encoded in the client's payload encoding (see payload_codec).
+    """
+    codec = payload_codec(sid)
+    memo_key = ('fragments', id(teams))
+    current = memo.get(memo_key)
+    if current is None:
+        current = memo[memo_key] = {team_data.get('team_id'): _team_fragment_entry(team_data) for team_data in teams}
+    with _safe_dashboard_operation():
+        held = dashboard_client_teams.get(sid)
+        dashboard_client_teams[sid] = ClientTeams(data_version, current)
+    
+    # Clients that were sent the same teams hold the same fragments dict
+    key = (codec.__name__, id(current), id(held.fragments) if held is not None else None,
+           held.data_version if held is not None else None)
+    fields = memo.get(key)
+    if fields is not None:
+        return fields
+    if held is None:
+        fields = {'teams': codec.encode_array(_encoded_fragment(fragment, codec) for fragment in current.values()),
+                  'data_version': data_version}
+    else:
+        fields = {
+            'teams_patch': codec.encode_object({
+                'base_version': held.data_version,
+                'changed': codec.encode_array(
+                    _team_patch(held.fragments.get(team_id), fragment, codec)
+                    for team_id, fragment in current.items() if held.fragments.get(team_id) is not fragment),
+                'removed': [team_id for team_id in held.fragments if team_id not in current],
+            }),
+            'data_version': data_version,
+        }
+    memo[key] = fields
+    return fields
+
 def emit_dashboard_team_update() -> None:
     """
     Send team status updates to dashboard clients with throttled metrics calculation.
@@ -2030,7 +2266,7 @@ def emit_dashboard_team_update() -> None:
     perform duplicate expensive work.
     Uses "stale but usable" cache logic - returns stale data within throttling window.
     """
-    global _last_team_update_time, _cached_team_metrics, _cached_team_metrics_is_stale, _team_update_computation_in_progress
+    global _last_team_update_time, _cached_team_metrics, _cached_team_metrics_version, _team_update_computation_in_progress
     
     try:
         # Early exit if no clients
@@ -2056,6 +2292,8 @@ def emit_dashboard_team_update() -> None:
                 cached_teams = _cached_team_metrics.get('cached_teams', [])
                 cached_active_count = _cached_team_metrics.get('active_teams_count', 0)
                 cached_ready_count = _cached_team_metrics.get('ready_players_count', 0)
+                cached_version = _cached_team_metrics_version
+                _count_throttle_lookup('team_metrics', cached_version)
             
             # If computation in progress, use current cache (avoid duplicate work)
             elif _team_update_computation_in_progress:
@@ -2063,6 +2301,8 @@ def emit_dashboard_team_update() -> None:
                     cached_teams = _cached_team_metrics.get('cached_teams', [])
                     cached_active_count = _cached_team_metrics.get('active_teams_count', 0)
                     cached_ready_count = _cached_team_metrics.get('ready_players_count', 0)
+                    cached_version = _cached_team_metrics_version
+                    _count_throttle_lookup('team_metrics', cached_version)
                     use_cached_data = True
                 else:
                     # No cache available, will need to compute lightweight metrics outside lock
@@ -2071,6 +2311,7 @@ def emit_dashboard_team_update() -> None:
             
             # Mark computation starting if needed  
             elif not use_cached_data and not locals().get('need_lightweight_fallback', False):
+                _count_throttle_lookup('team_metrics', None)
                 _team_update_computation_in_progress = True
         
         # === EXPENSIVE OPERATIONS OUTSIDE LOCK ===
@@ -2079,15 +2320,18 @@ def emit_dashboard_team_update() -> None:
         if locals().get('need_lightweight_fallback', False):
             # Lightweight metrics computation outside lock
             serialized_teams = []
+            data_version = team_data_versions.global_version
             active_teams = [team_info for team_info in state.active_teams.values() 
                           if team_info.get('status') in ['active', 'waiting_pair']]
             active_teams_count = len(active_teams)
             ready_players_count = sum(len(team_info.get('players', [])) for team_info in active_teams)
         elif not use_cached_data:
             # Compute fresh data outside lock
+            data_version = team_data_versions.global_version
             if streaming_clients:
                 # Get expensive teams data only if streaming clients need it
                 serialized_teams = get_all_teams()  # Already optimized to minimize locks
+                data_version = _cached_teams_version
                 active_teams = [team for team in serialized_teams if team.get('is_active', False) or team.get('status') == 'waiting_pair']
                 active_teams_count = len(active_teams)
                 ready_players_count = sum(
@@ -2109,7 +2353,8 @@ def emit_dashboard_team_update() -> None:
                     'active_teams_count': active_teams_count,
                     'ready_players_count': ready_players_count,
                 }
-                _cached_team_metrics_is_stale = False  # Fresh data is not stale
+                _cached_team_metrics_version = data_version
+                _throttle_cache_bytes['team_metrics'] = _metrics_cache_size(_cached_team_metrics)
                 _last_team_update_time = time()  # Use fresh timestamp reflecting actual cache completion
                 _team_update_computation_in_progress = False  # Clear computation flag
         else:
@@ -2117,21 +2362,32 @@ def emit_dashboard_team_update() -> None:
             serialized_teams = cached_teams
             active_teams_count = cached_active_count
             ready_players_count = cached_ready_count
+            data_version = cached_version
         
         # === SOCKET EMISSIONS OUTSIDE LOCK ===
         # SocketIO handles thread safety internally
         
-        # Send full teams data to streaming clients
+        # Send teams data to streaming clients: a snapshot to clients that hold none, otherwise a
+        # patch with only what changed. Clients holding the same teams share one encoded payload,
+        # normally all of them, so this is a single emit to the streaming room.
         if streaming_clients:
-            streaming_update_data = {
-                'teams': serialized_teams,
-                'connected_players_count': connected_players_count,
-                'active_teams_count': active_teams_count,
-                'ready_players_count': ready_players_count
-            }
-            
+            memo: Dict[Any, Any] = {}
+            groups: Dict[int, Tuple[Union[EncodedJSON, EncodedMsgPack], List[str]]] = {}
             for sid in streaming_clients:
-                socketio.emit('team_status_changed_for_dashboard', streaming_update_data, to=sid)  # type: ignore
+                sid_teams, teams_window = client_teams(sid, serialized_teams, memo)
+                teams_fields = teams_update_fields(sid, sid_teams, data_version, memo)
+                if teams_window is not None:
+                    teams_fields = memo.setdefault(('window_fields', id(teams_fields), id(teams_window)),
+                                                   {**teams_fields, 'teams_window': teams_window})
+                if id(teams_fields) not in groups:
+                    groups[id(teams_fields)] = (payload_codec(sid).encode_object({
+                        **teams_fields,
+                        'connected_players_count': connected_players_count,
+                        'active_teams_count': active_teams_count,
+                        'ready_players_count': ready_players_count
+                    }), [])
+                groups[id(teams_fields)][1].append(sid)
+            _emit_grouped('team_status_changed_for_dashboard', list(groups.values()), STREAMING_ROOM, [])
         
         # Send metrics-only updates to non-streaming clients
         if non_streaming_clients:
@@ -2141,9 +2397,7 @@ def emit_dashboard_team_update() -> None:
                 'active_teams_count': active_teams_count,
                 'ready_players_count': ready_players_count
             }
-            
-            for sid in non_streaming_clients:
-                socketio.emit('team_status_changed_for_dashboard', metrics_update_data, to=sid)  # type: ignore
+            socketio.emit('team_status_changed_for_dashboard', metrics_update_data, to=METRICS_ONLY_ROOM)  # type: ignore
                 
     except Exception as e:
         logger.error(f"Error in emit_dashboard_team_update: {str(e)}", exc_info=True)
@@ -2151,7 +2405,129 @@ def emit_dashboard_team_update() -> None:
         with _safe_dashboard_operation():
             _team_update_computation_in_progress = False
 
-def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Optional[str] = None) -> None:
+def schedule_dashboard_team_update() -> None:
+    """
+    Mark the dashboard teams view dirty. Game handlers call this instead of
+    emit_dashboard_team_update; the scheduler sends one update per tick however many
+    answers arrived, and always one after the last of them.
+    """
+    global _team_update_requested
+    _team_update_requested = True
+
+def schedule_class_stats_update() -> None:
+    """
+    Mark the pooled class statistics dirty; the scheduler sends one class_stats_update
+    per tick however many rounds completed or teams joined and left.
+    """
+    global _class_stats_update_requested
+    _class_stats_update_requested = True
+
+def run_scheduled_team_update() -> bool:
+    """
+    One scheduler tick: send a team update if one was requested. If the update was built
+    from data older than the latest changes (a throttled cache), another is requested for
+    the next tick, so the final state always reaches the dashboards. Returns whether an
+    update was sent.
+    """
+    global _team_update_requested
+    with _safe_dashboard_operation():
+        if not _team_update_requested:
+            return False
+        _team_update_requested = False
+    if not state.dashboard_clients:
+        return False
+    
+    emit_dashboard_team_update()
+    with _safe_dashboard_operation():
+        if _cached_team_metrics_version != team_data_versions.global_version:
+            _team_update_requested = True
+    return True
+
+def run_scheduled_class_stats_update() -> bool:
+    """One scheduler tick: send the class statistics if they changed. Returns whether they were sent."""
+    global _class_stats_update_requested
+    with _safe_dashboard_operation():
+        if not _class_stats_update_requested:
+            return False
+        _class_stats_update_requested = False
+    if not state.dashboard_clients:
+        return False
+    
+    emit_class_stats_update()
+    return True
+
+def _team_update_scheduler_loop(interval: float) -> None:
+    while True:
+        socketio.sleep(interval)
+        try:
+            run_scheduled_team_update()
+            run_scheduled_class_stats_update()
+        except Exception as e:
+            logger.error(f"Error in dashboard team update scheduler: {str(e)}", exc_info=True)
+
+def _start_team_update_scheduler() -> None:
+    """Start the dashboard team update scheduler (once)."""
+    global _team_update_scheduler_started
+    with _safe_dashboard_operation():
+        if _team_update_scheduler_started:
+            return
+        _team_update_scheduler_started = True
+    socketio.start_background_task(_team_update_scheduler_loop, REFRESH_DELAY_QUICK)
+
+def queue_dashboard_answer(team_id: int, team_name: str, player_sid: str, round_id: int, item: str, response: bool) -> None:
+    """
+    Queue an answer for the dashboard answer log. Answers are sent in batches
+    (see flush_dashboard_answers) instead of one event each.
+    """
+    if not state.dashboard_clients:
+        return
+    with _safe_dashboard_operation():
+        _pending_answers.append((time(), team_id, team_name, player_sid, round_id, item, response))
+        batch_full = len(_pending_answers) >= ANSWER_BATCH_MAX_SIZE
+    if batch_full:
+        flush_dashboard_answers()
+
+def flush_dashboard_answers() -> int:
+    """
+    Send the queued answers as one answers_batch event and return how many were sent.
+    The batch is {'time', 'teams', 'answers'}: time is the first answer's epoch time in ms,
+    teams maps the batch's team ids to names, and each answer is a
+    [ms after time, team_id, player, round_id, item, response] row, oldest first. player is
+    the first 8 characters of the session ID, all the answer log shows, and response is 1 or 0.
+    """
+    global _pending_answers
+    with _safe_dashboard_operation():
+        answers, _pending_answers = _pending_answers, []
+    if not answers:
+        return 0
+    
+    start = int(answers[0][0] * 1000)
+    teams: Dict[int, str] = {}
+    rows = []
+    for answer_time, team_id, team_name, player_sid, round_id, item, response in answers:
+        teams[team_id] = team_name
+        rows.append([int(answer_time * 1000) - start, team_id, player_sid[:8], round_id, item, int(response)])
+    socketio.emit('answers_batch', {'time': start, 'teams': teams, 'answers': rows}, to=DASHBOARD_ROOM)  # type: ignore
+    return len(rows)
+
+def _answer_batch_flusher_loop(interval: float) -> None:
+    while True:
+        socketio.sleep(interval)
+        try:
+            flush_dashboard_answers()
+        except Exception as e:
+            logger.error(f"Error flushing dashboard answers: {str(e)}", exc_info=True)
+
+def _start_answer_batch_flusher() -> None:
+    """Start the dashboard answer batch flusher (once)."""
+    global _answer_batch_flusher_started
+    with _safe_dashboard_operation():
+        if _answer_batch_flusher_started:
+            return
+        _answer_batch_flusher_started = True
+    socketio.start_background_task(_answer_batch_flusher_loop, ANSWER_BATCH_INTERVAL)
+
+def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Optional[str] = None, from_cache: bool = False) -> None:
     """
     Send complete dashboard data to clients with throttled expensive operations.
     Supports targeting specific clients or excluding clients to prevent duplicates.
@@ -2160,8 +2536,11 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
     Uses computation flag to prevent race conditions where multiple threads
     perform duplicate expensive work.
     Uses "stale but usable" cache logic - returns stale data within throttling window.
+    With from_cache, cached data is used regardless of the throttling window (e.g. after
+    a game mode change, which only re-derives the cached teams); the database is only
+    queried if nothing is cached yet.
     """
-    global _last_full_update_time, _cached_full_metrics, _cached_full_metrics_is_stale, _full_update_computation_in_progress
+    global _last_full_update_time, _cached_full_metrics, _cached_full_metrics_version, _full_update_computation_in_progress
     
     try:
         # Early exit if no clients
@@ -2176,18 +2555,27 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
         with _safe_dashboard_operation():
             if client_sid:
                 clients_needing_teams = [client_sid] if dashboard_teams_streaming.get(client_sid, False) else []
+                has_metrics_only_clients = not clients_needing_teams
             else:
                 clients_needing_teams = [sid for sid in state.dashboard_clients 
                                        if dashboard_teams_streaming.get(sid, False) and sid != exclude_sid]
+                has_metrics_only_clients = any(not dashboard_teams_streaming.get(sid, False) and sid != exclude_sid
+                                               for sid in state.dashboard_clients)
             
             time_since_last_update = current_time - _last_full_update_time
             
             # Check if we can use cached data (even if stale, as long as within throttling window)
-            use_cached_data = (time_since_last_update < REFRESH_DELAY_FULL and 
+            use_cached_data = ((from_cache or time_since_last_update < REFRESH_DELAY_FULL) and 
                              _cached_full_metrics is not None)
             
             if use_cached_data:
                 cached_teams = _cached_full_metrics.get('cached_teams', [])
+                cached_version = _cached_full_metrics_version
+                if from_cache and not cached_teams and clients_needing_teams and _cached_teams_result:
+                    # Metrics were cached while no client streamed teams; the teams cache has them
+                    cached_teams = _cached_teams_result
+                    cached_version = _cached_teams_version
+                _count_throttle_lookup('full_metrics', cached_version)
                 cached_total_answers = _cached_full_metrics.get('total_answers', 0)
                 cached_active_count = _cached_full_metrics.get('active_teams_count', 0)
                 cached_ready_count = _cached_full_metrics.get('ready_players_count', 0)
@@ -2199,6 +2587,8 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
                     cached_total_answers = _cached_full_metrics.get('total_answers', 0)
                     cached_active_count = _cached_full_metrics.get('active_teams_count', 0)
                     cached_ready_count = _cached_full_metrics.get('ready_players_count', 0)
+                    cached_version = _cached_full_metrics_version
+                    _count_throttle_lookup('full_metrics', cached_version)
                     use_cached_data = True
                 else:
                     # No cache available, will need to compute minimal data outside lock
@@ -2207,6 +2597,7 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
             
             # Mark computation starting if needed
             elif not use_cached_data and not locals().get('need_minimal_fallback', False):
+                _count_throttle_lookup('full_metrics', None)
                 _full_update_computation_in_progress = True
         
         # === EXPENSIVE OPERATIONS OUTSIDE LOCK ===
@@ -2216,6 +2607,7 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
             # Minimal data computation outside lock
             all_teams_for_metrics = []
             total_answers = 0  # No database query in fallback mode
+            data_version = team_data_versions.global_version
             active_teams = [team_info for team_info in state.active_teams.values() 
                           if team_info.get('status') in ['active', 'waiting_pair']]
             active_teams_count = len(active_teams)
@@ -2226,9 +2618,11 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
                 total_answers = Answers.query.count()
             
             # Compute fresh data outside lock
+            data_version = team_data_versions.global_version
             if clients_needing_teams:
                 # Get expensive teams data only if clients need it
                 all_teams_for_metrics = get_all_teams()  # Already optimized to minimize locks
+                data_version = _cached_teams_version
                 active_teams = [team for team in all_teams_for_metrics if team.get('is_active', False) or team.get('status') == 'waiting_pair']
                 active_teams_count = len(active_teams)
                 ready_players_count = sum(
@@ -2251,7 +2645,8 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
                     'active_teams_count': active_teams_count,
                     'ready_players_count': ready_players_count,
                 }
-                _cached_full_metrics_is_stale = False  # Fresh data is not stale
+                _cached_full_metrics_version = data_version
+                _throttle_cache_bytes['full_metrics'] = _metrics_cache_size(_cached_full_metrics)
                 _last_full_update_time = time()  # Use fresh timestamp reflecting actual cache completion
                 _full_update_computation_in_progress = False  # Clear computation flag
         else:
@@ -2260,6 +2655,7 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
             total_answers = cached_total_answers
             active_teams_count = cached_active_count
             ready_players_count = cached_ready_count
+            data_version = cached_version
 
         # Prepare base update data (outside lock)
         base_update_data = {
@@ -2279,27 +2675,30 @@ def emit_dashboard_full_update(client_sid: Optional[str] = None, exclude_sid: Op
         # === SOCKET EMISSIONS OUTSIDE LOCK ===
         # SocketIO handles thread safety internally
         
+        # Clients streaming teams get a snapshot or a patch of the teams they hold (see
+        # teams_update_fields), encoded once per distinct payload; the others get metrics only
+        memo: Dict[Any, Any] = {}
+        groups: Dict[int, Tuple[Union[EncodedJSON, EncodedMsgPack], List[str]]] = {}
+        for dash_sid in clients_needing_teams:
+            sid_teams, teams_window = client_teams(dash_sid, all_teams_for_metrics, memo)
+            teams_fields = teams_update_fields(dash_sid, sid_teams, data_version, memo)
+            if teams_window is not None:
+                teams_fields = memo.setdefault(('window_fields', id(teams_fields), id(teams_window)),
+                                               {**teams_fields, 'teams_window': teams_window})
+            if id(teams_fields) not in groups:
+                groups[id(teams_fields)] = (payload_codec(dash_sid).encode_object({**base_update_data, **teams_fields}), [])
+            groups[id(teams_fields)][1].append(dash_sid)
+        
+        metrics_update_data = {**base_update_data, 'teams': []} if has_metrics_only_clients else None
         if client_sid:
-            # For specific client, include teams only if they have streaming enabled
-            update_data = base_update_data.copy()
-            if dashboard_teams_streaming.get(client_sid, False):
-                update_data['teams'] = all_teams_for_metrics
-            else:
-                update_data['teams'] = []
+            # A specific client
+            update_data = next(iter(groups.values()))[0] if groups else metrics_update_data
             socketio.emit('dashboard_update', update_data, to=client_sid)  # type: ignore
         else:
-            # For all clients, send appropriate data based on their preferences
-            for dash_sid in state.dashboard_clients:
-                # Skip excluded client to prevent duplicate updates
-                if exclude_sid and dash_sid == exclude_sid:
-                    continue
-                    
-                update_data = base_update_data.copy()
-                if dashboard_teams_streaming.get(dash_sid, False):
-                    update_data['teams'] = all_teams_for_metrics
-                else:
-                    update_data['teams'] = []
-                socketio.emit('dashboard_update', update_data, to=dash_sid)  # type: ignore
+            # All clients except the excluded one (prevents duplicate updates), one emit per room
+            _emit_grouped('dashboard_update', list(groups.values()), STREAMING_ROOM, [exclude_sid] if exclude_sid else [])
+            if metrics_update_data is not None:
+                socketio.emit('dashboard_update', metrics_update_data, to=METRICS_ONLY_ROOM, skip_sid=exclude_sid)  # type: ignore
     except Exception as e:
         logger.error(f"Error in emit_dashboard_full_update: {str(e)}", exc_info=True)
         # Ensure computation flag is cleared even on exception
@@ -2333,12 +2732,32 @@ def on_dashboard_join(*args, **kwargs) -> None:
 
         # === Socket.IO handler path ===
         sid = request.sid  # type: ignore
+        _start_cache_stats_logger()
+        _start_team_update_scheduler()
+        _start_answer_batch_flusher()
+        
+        # A client may ask for MessagePack teams payloads, {'encoding': 'msgpack'}, and for
+        # a window of the teams list, {'teams_window': {...}} (see request_teams_window)
+        data = args[0] if args and isinstance(args[0], dict) else {}
+        encoding = 'msgpack' if data.get('encoding') == 'msgpack' else 'json'
+        try:
+            teams_window = _parse_teams_window(data.get('teams_window'))
+        except ValueError as e:
+            emit('error', {'message': str(e)})  # type: ignore
+            teams_window = None
+        with _safe_dashboard_operation():
+            dashboard_client_encoding[sid] = encoding
+            if teams_window is None:
+                dashboard_client_windows.pop(sid, None)
+            else:
+                dashboard_client_windows[sid] = teams_window
         
         # Add to dashboard clients with teams streaming disabled by default (only for new clients)
         state.dashboard_clients.add(sid)
         dashboard_last_activity[sid] = time()
         if sid not in dashboard_teams_streaming:
             dashboard_teams_streaming[sid] = False  # Teams streaming off by default for new clients
+        _join_dashboard_rooms(sid, dashboard_teams_streaming[sid])
         logger.info(f"Dashboard client connected: {sid}")
         
         # Notify OTHER dashboard clients about the new connection (exclude the joining client to prevent duplicates)
@@ -2351,6 +2770,7 @@ def on_dashboard_join(*args, **kwargs) -> None:
         # Only get expensive teams data if this client has streaming enabled
         if dashboard_teams_streaming.get(sid, False):
             all_teams_for_metrics = get_all_teams()
+            teams_data_version = _cached_teams_version
             # Calculate metrics from the teams data we just fetched
             active_teams = [team for team in all_teams_for_metrics if team.get('is_active', False) or team.get('status') == 'waiting_pair']
             active_teams_count = len(active_teams)
@@ -2377,9 +2797,25 @@ def on_dashboard_join(*args, **kwargs) -> None:
                 'streaming_enabled': state.answer_stream_enabled,
                 'mode': state.game_mode,  # Include current game mode
                 'theme': state.game_theme  # Include current game theme
-            }
+            },
+            # Current 🏆/🎯 holders; later changes arrive as leader_changed events
+            'leaders': {board: state.leaderboard.leader_payload(board) for board in LEADERBOARD_BOARDS},
+            # Encoding of the teams payloads that follow
+            'encoding': encoding
         }
         
+        if dashboard_teams_streaming.get(sid, False):
+            # A joining client gets a full snapshot (of its window, if it asked for one);
+            # updates after it are patches against it
+            sid_teams, teams_window_info = client_teams(sid, all_teams_for_metrics, {})
+            with _safe_dashboard_operation():
+                dashboard_client_teams[sid] = ClientTeams(teams_data_version, {
+                    team_data.get('team_id'): _team_fragment_entry(team_data) for team_data in sid_teams})
+            update_data['teams'] = sid_teams
+            update_data['data_version'] = teams_data_version
+            if teams_window_info is not None:
+                update_data['teams_window'] = teams_window_info
+        
         # If callback provided, use it to return data directly
         callback = args[1] if len(args) >= 2 else kwargs.get('callback')
         if callback:
@@ -2387,10 +2823,110 @@ def on_dashboard_join(*args, **kwargs) -> None:
         else:
             # Send update to the joining client only once
             socketio.emit('dashboard_update', update_data, to=sid)  # type: ignore
+        
+        # Current class-wide pooled statistics for the joining client
+        emit_class_stats_update(client_sid=sid)
     except Exception as e:
         logger.error(f"Error in on_dashboard_join: {str(e)}", exc_info=True)
         emit('error', {'message': 'An error occurred while joining the dashboard'})  # type: ignore
 
+def _get_team_accumulator(team_id: int) -> Optional[TeamStatsAccumulator]:
+    """Return the team's statistics accumulator, rebuilding it from the DB if it is not built yet."""
+    accumulator = state.team_stats.get(team_id)
+    if accumulator is not None:
+        return accumulator
+    
+    team = db.session.get(Teams, team_id)
+    if not team:
+        return None
+    team_rounds = PairQuestionRounds.query.filter_by(team_id=team_id).order_by(PairQuestionRounds.timestamp_initiated).all()
+    team_answers = Answers.query.filter_by(team_id=team_id).order_by(Answers.timestamp).all()
+    return state.team_stats.setdefault(team_id, TeamStatsAccumulator.from_rows(team_rounds, team_answers, team))
+
+def _get_team_accumulator_by_name(team_name: str) -> Optional[TeamStatsAccumulator]:
+    """Return the statistics accumulator of the team with this name, or None if there is no such team."""
+    team_id = _get_team_id_from_name(team_name)
+    if team_id is None:
+        logger.warning(f"Could not find team_id for team_name: {team_name}")
+        return None
+    accumulator = _get_team_accumulator(team_id)
+    if accumulator is None:
+        logger.warning(f"Could not find team data for team_name: {team_name}")
+    return accumulator
+
+def _parse_round_limit(value: Any, name: str, minimum: int) -> Optional[int]:
+    """Parse an optional window/as_of_round argument; raises ValueError for invalid values."""
+    if value is None or value == '':
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if isinstance(value, bool) or limit < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return limit
+
+def compute_team_range_statistics(team_id: int, window: Optional[int] = None, as_of_round: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Calculate a team's matrices and statistics over a range of its completed rounds.
+    window keeps only the last N rounds; as_of_round evaluates the team as it stood after round K.
+    Uses the accumulator's prefix sums, so the cost does not depend on the range or history length.
+    Returns None if the team does not exist.
+    """
+    accumulator = _get_team_accumulator(team_id)
+    if accumulator is None:
+        return None
+    
+    start, end = accumulator.round_range(window, as_of_round)
+    classic_matrix, new_matrix, classic_stats, new_stats = compute_team_statistics_batch(
+        [accumulator.range_view(start, end)], _current_success_table())[0]
+    
+    return {
+        'team_id': team_id,
+        'window': window,
+        'as_of_round': as_of_round,
+        'first_round': start + 1 if end > start else None,
+        'last_round': end if end > start else None,
+        'rounds_in_range': end - start,
+        'rounds_total': accumulator.rounds_recorded,
+        'classic_stats': classic_stats,
+        'new_stats': new_stats,
+        'classic_matrix': classic_matrix,
+        'new_matrix': new_matrix,
+        'correlation_labels': list(ITEM_VALUES),
+        'game_mode': state.game_mode
+    }
+
+@socketio.on('request_team_details')
+def on_request_team_details(data: Dict[str, Any]) -> None:
+    """Send one team's statistics, optionally for the last `window` rounds or `as_of_round`."""
+    try:
+        sid = request.sid  # type: ignore
+        if sid not in state.dashboard_clients:
+            emit('error', {'message': 'Unauthorized: Not a dashboard client'})  # type: ignore
+            return
+        
+        data = data or {}
+        try:
+            team_id = _parse_round_limit(data.get('team_id'), 'team_id', 1)
+            window = _parse_round_limit(data.get('window'), 'window', 1)
+            as_of_round = _parse_round_limit(data.get('as_of_round'), 'as_of_round', 0)
+        except ValueError as e:
+            emit('error', {'message': str(e)})  # type: ignore
+            return
+        if team_id is None:
+            emit('error', {'message': 'team_id is required'})  # type: ignore
+            return
+        
+        details = compute_team_range_statistics(team_id, window, as_of_round)
+        if details is None:
+            emit('error', {'message': 'Team not found'})  # type: ignore
+            return
+        socketio.emit('team_details', details, to=sid)  # type: ignore
+    except Exception as e:
+        logger.error(f"Error in on_request_team_details: {str(e)}", exc_info=True)
+        emit('error', {'message': 'An error occurred while retrieving team details'})  # type: ignore
+
 @socketio.on('start_game')
 def on_start_game(data: Optional[Dict[str, Any]] = None) -> None:
     try:
@@ -2402,8 +2938,7 @@ def on_start_game(data: Optional[Dict[str, Any]] = None) -> None:
                     socketio.emit('game_start', {'game_started': True}, to=team_name)  # type: ignore
             
             # Notify dashboard
-            for dashboard_sid in state.dashboard_clients:
-                socketio.emit('game_started', to=dashboard_sid)  # type: ignore
+            socketio.emit('game_started', to=DASHBOARD_ROOM)  # type: ignore
                 
             # Notify all clients about game state change
             socketio.emit('game_state_changed', {'game_started': True})  # type: ignore
@@ -2472,6 +3007,18 @@ def on_restart_game() -> None:
             PairQuestionRounds.query.delete()
             Answers.query.delete()
             db.session.commit()
+            # All rounds are gone, so drop the accumulators; they rebuild (empty) on next refresh
+            state.team_stats.clear()
+            state.frozen_teams.clear()
+            state.leaderboard.clear()
+            state.class_stats.clear()
+            bootstrap.clear_intervals()
+            # The teams still playing start the class-wide pool again from zero
+            _sync_class_stats_members()
+            schedule_class_stats_update()
+            # Answers still queued for the answer log were deleted too
+            with _safe_dashboard_operation():
+                _pending_answers.clear()
             # Force clear all caches after successful database commit since this is a complete reset
             force_clear_all_caches()
         except Exception as db_error:
@@ -2508,8 +3055,7 @@ def on_restart_game() -> None:
 
         # Notify dashboard clients that reset is complete
         logger.info("Emitting game_reset_complete to all dashboard clients")
-        for dash_sid in state.dashboard_clients:
-            socketio.emit('game_reset_complete', to=dash_sid)  # type: ignore
+        socketio.emit('game_reset_complete', to=DASHBOARD_ROOM)  # type: ignore
             
     except Exception as e:
         logger.error(f"Error in on_restart_game: {str(e)}", exc_info=True)
@@ -2544,6 +3090,94 @@ def get_dashboard_data():
         logger.error(f"Error in get_dashboard_data: {str(e)}", exc_info=True)
         return jsonify({'error': 'An error occurred while retrieving dashboard data'}), 500
 
+@app.route('/api/dashboard/teams/<int:team_id>/stats', methods=['GET'])
+def get_team_stats(team_id: int):
+    """Team statistics API; accepts optional ?window=N (last N rounds) and ?as_of_round=K."""
+    try:
+        try:
+            window = _parse_round_limit(request.args.get('window'), 'window', 1)
+            as_of_round = _parse_round_limit(request.args.get('as_of_round'), 'as_of_round', 0)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        details = compute_team_range_statistics(team_id, window, as_of_round)
+        if details is None:
+            return jsonify({'error': 'Team not found'}), 404
+        return jsonify(details), 200
+    except Exception as e:
+        logger.error(f"Error in get_team_stats: {str(e)}", exc_info=True)
+        return jsonify({'error': 'An error occurred while retrieving team statistics'}), 500
+
+def get_cache_statistics() -> Dict[str, Any]:
+    """
+    Counters, entry counts and approximate sizes of every dashboard cache. Sizes are the
+    estimates recorded when each cache was written, so this never walks the cached data.
+    """
+    selective = {cache.name: cache.snapshot() for cache in SELECTIVE_CACHES}
+    with _safe_dashboard_operation():
+        throttling = {}
+        for cache_name, cached, version in (('teams', _cached_teams_result, _cached_teams_version),
+                                            ('team_metrics', _cached_team_metrics, _cached_team_metrics_version),
+                                            ('full_metrics', _cached_full_metrics, _cached_full_metrics_version)):
+            throttling[cache_name] = {
+                **_throttle_cache_stats[cache_name].as_dict(),
+                'entries': 0 if cached is None else 1,
+                'stale': cached is not None and version != team_data_versions.global_version,
+                'approx_bytes': _throttle_cache_bytes[cache_name] if cached is not None else 0,
+            }
+    return {
+        'data_version': team_data_versions.global_version,
+        'approx_bytes': sum(cache['approx_bytes'] for cache in (*selective.values(), *throttling.values())),
+        'selective_max_bytes': sum(cache.max_bytes or 0 for cache in SELECTIVE_CACHES),
+        'selective': selective,
+        'throttling': throttling,
+    }
+
+def _format_cache_line(name: str, stats: Dict[str, Any]) -> str:
+    hit_rate = stats['hit_rate']
+    rate = f"{hit_rate:.0%}" if hit_rate is not None else "-"
+    return (f"{name} {rate} hit ({stats['hits']}+{stats['stale_hits']} stale/{stats['misses']} miss) "
+            f"{stats['entries']} entries {stats['approx_bytes'] / 1024:.1f}KB")
+
+def log_cache_statistics() -> None:
+    """Log one line summarising every dashboard cache."""
+    try:
+        stats = get_cache_statistics()
+        caches = {**stats['selective'], **stats['throttling']}
+        logger.info(f"Dashboard caches ({stats['approx_bytes'] / 1024:.0f}KB, selective budget "
+                    f"{stats['selective_max_bytes'] / 1024:.0f}KB): " + "; ".join(_format_cache_line(name, cache_stats)
+                                                     for name, cache_stats in caches.items()))
+    except Exception as e:
+        logger.error(f"Error logging cache statistics: {str(e)}", exc_info=True)
+
+_cache_stats_logger_started = False
+
+def _cache_stats_logger_loop(interval: float) -> None:
+    while True:
+        socketio.sleep(interval)
+        log_cache_statistics()
+
+def _start_cache_stats_logger() -> None:
+    """Start the periodic cache statistics log line (once; CACHE_STATS_LOG_INTERVAL <= 0 disables it)."""
+    global _cache_stats_logger_started
+    interval = app.config.get('CACHE_STATS_LOG_INTERVAL', 0)
+    with _safe_dashboard_operation():
+        if _cache_stats_logger_started or interval <= 0:
+            return
+        _cache_stats_logger_started = True
+    socketio.start_background_task(_cache_stats_logger_loop, interval)
+
+@app.route('/api/debug/cache_stats', methods=['GET'])
+def get_cache_stats():
+    """Dashboard cache counters for diagnosing cache effectiveness; off unless DEBUG_ENDPOINTS_ENABLED is set."""
+    if not app.config.get('DEBUG_ENDPOINTS_ENABLED', False):
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        return jsonify(get_cache_statistics()), 200
+    except Exception as e:
+        logger.error(f"Error in get_cache_stats: {str(e)}", exc_info=True)
+        return jsonify({'error': 'An error occurred while retrieving cache statistics'}), 500
+
 @app.route('/download', methods=['GET'])
 def download_csv():
     try:
@@ -2600,35 +3234,14 @@ def download_csv():
 # Disconnect handler is now consolidated in team_management.py
 # The handle_dashboard_disconnect function is called from there
 
-# AQM Joe helpers
+def _current_success_table() -> SuccessTable:
+    """Precompiled success table of the current game mode."""
+    return success_table_for_mode(state.game_mode)
 
-def _aqmjoe_label(item: str, ans: bool) -> str:
-    if item in ('A', 'B'):
-        return 'Green' if ans else 'Red'
-    return 'Peas' if ans else 'Carrots'
+def _is_round_successful(p1_item: str, p2_item: str, p1_answer: bool, p2_answer: bool) -> bool:
+    """Success rule for one round under the current game mode."""
+    return is_successful(_current_success_table(), p1_item, p2_item, p1_answer, p2_answer)
 
 def _is_aqmjoe_success(p1_item: str, p2_item: str, p1_bool: bool, p2_bool: bool) -> bool:
-    l1 = _aqmjoe_label(p1_item, p1_bool)
-    l2 = _aqmjoe_label(p2_item, p2_bool)
-
-    p1_is_color = p1_item in ('A', 'B')
-    p2_is_color = p2_item in ('A', 'B')
-    p1_is_food = not p1_is_color
-    p2_is_food = not p2_is_color
-
-    # Food–Food: success if NOT both Peas
-    if p1_is_food and p2_is_food:
-        return not (l1 == 'Peas' and l2 == 'Peas')
-
-    # Mixed Color–Food: Green -> Peas (symmetric), Red <-> Carrots succeeds
-    if p1_is_color and p2_is_food:
-        if l1 == 'Green':
-            return l2 == 'Peas'
-        return l2 == 'Carrots'
-    if p2_is_color and p1_is_food:
-        if l2 == 'Green':
-            return l1 == 'Peas'
-        return l1 == 'Carrots'
-
-    # Color–Color: neutral (success for purposes of success rate metric)
-    return True
+    """AQM Joe success rule for one round (see AQMJOE_TABLE)."""
+    return is_successful(AQMJOE_TABLE, p1_item, p2_item, p1_bool, p2_bool)
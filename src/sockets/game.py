@@ -80,27 +80,21 @@ def on_submit_answer(data: Dict[str, Any]) -> None:
             round_db_entry.p2_answered_at = datetime.utcnow()
 
         db.session.commit()
+        # Extend the team's rolling history hash (if built yet; otherwise it is rebuilt from the DB)
+        accumulator = state.team_stats.get(team_info['team_id'])
+        if accumulator is not None:
+            accumulator.history.record_answer(assigned_item_str, response_bool)
         # Selectively invalidate caches for the affected team only
         _, _, _, _, invalidate_team_caches = _import_dashboard_functions()
         invalidate_team_caches(team_name)
         emit('answer_confirmed', {'message': f'Round {team_info["current_round_number"]} answer received'}, to=sid)  # type: ignore
 
-        # Emit to dashboard
-        answer_for_dash = {
-            'timestamp': new_answer_db.timestamp.isoformat(),
-            'team_name': team_name,
-            'team_id': team_info['team_id'],
-            'player_session_id': sid,
-            'question_round_id': round_id,
-            'assigned_item': assigned_item_str,
-            'response_value': response_bool
-        }
-        for dash_sid in state.dashboard_clients:
-            socketio.emit('new_answer_for_dashboard', answer_for_dash, to=dash_sid)  # type: ignore
+        # Queue for the dashboard answer log, which gets answers in batches
+        from src.sockets.dashboard import queue_dashboard_answer, schedule_dashboard_team_update
+        queue_dashboard_answer(team_info['team_id'], team_name, sid, round_id, assigned_item_str, response_bool)
         
-        # Only emit team update, not full dashboard refresh
-        emit_dashboard_team_update, _, _, _, _ = _import_dashboard_functions()
-        emit_dashboard_team_update()
+        # Only schedule a team update (sent on the scheduler's next tick), not a full dashboard refresh
+        schedule_dashboard_team_update()
 
         if len(team_info['answered_current_round']) == 2:
             # Get the completed round details from database
@@ -125,7 +119,19 @@ def on_submit_answer(data: Dict[str, Any]) -> None:
                             p1_answer = answer.response_value
                         elif answer.player_session_id == db_team.player2_session_id:
                             p2_answer = answer.response_value
-                    
+
+                    # Fold the completed round into the team's statistics accumulator. Use the one
+                    # looked up right after the commit: if it did not exist then, any accumulator built
+                    # since (e.g. by a scheduled dashboard refresh rebuilding it in get_all_teams while
+                    # this handler waited on the DB) was read from the DB and already includes this round.
+                    if accumulator is not None and p1_item and p2_item and p1_answer is not None and p2_answer is not None:
+                        accumulator.record_round(p1_item, p2_item, p1_answer, p2_answer)
+                        # Keep the class-wide pool in step with the team's accumulator
+                        state.class_stats.record_round(team_info['team_id'], p1_item, p2_item, p1_answer, p2_answer)
+                        # Sent on the scheduler's next tick, like the team update
+                        from src.sockets.dashboard import schedule_class_stats_update
+                        schedule_class_stats_update()
+
                     # Emit enhanced round_complete event with detailed results
                     # Note: Client safely handles None values in answers via generateLastRoundMessage()
                     socketio.emit('round_complete', {
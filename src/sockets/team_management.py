@@ -85,6 +85,9 @@ def _reactivate_team_internal(team_name: str, sid: str) -> bool:
         team.is_active = True
         team.player1_session_id = sid
         db.session.commit()
+        # The team plays again: its frozen final statistics no longer hold
+        from src.sockets.dashboard import thaw_team_stats
+        thaw_team_stats(team.team_id)
         # Clear caches after team state change
         _, _, clear_team_caches, _, _ = _import_dashboard_functions()
         clear_team_caches()
@@ -106,6 +109,8 @@ def _reactivate_team_internal(team_name: str, sid: str) -> bool:
         }
         state.player_to_team[sid] = team_name
         state.team_id_to_name[team.team_id] = team_name
+        from src.sockets.dashboard import add_team_to_class_stats
+        add_team_to_class_stats(team.team_id)
         
         join_room(team_name, sid=sid)  # type: ignore
         
@@ -245,6 +250,8 @@ def handle_disconnect() -> None:
                             if existing_inactive:
                                 db_team.team_name = f"{team_name}_{db_team.team_id}"
                             db_team.is_active = False
+                            from src.sockets.dashboard import freeze_team_stats
+                            freeze_team_stats(db_team.team_id)
                             # Remove from active_teams state only if it exists
                             if team_name in state.active_teams:
                                 del state.active_teams[team_name]
@@ -334,6 +341,8 @@ def on_create_team(data: Dict[str, Any]) -> None:
         }
         state.player_to_team[sid] = team_name
         state.team_id_to_name[new_team_db.team_id] = team_name
+        from src.sockets.dashboard import add_team_to_class_stats
+        add_team_to_class_stats(new_team_db.team_id)
         join_room(team_name, sid=sid)  # type: ignore
         
         emit('team_created', {
@@ -614,6 +623,8 @@ def on_leave_team(data: Dict[str, Any]) -> None:
                     if existing_inactive_with_same_name:
                         db_team.team_name = f"{team_name}_{db_team.team_id}"
                     db_team.is_active = False
+                    from src.sockets.dashboard import freeze_team_stats
+                    freeze_team_stats(db_team.team_id)
             
             if db_team: # Commit changes if db_team was involved
                 db.session.commit()
@@ -1,5 +1,8 @@
 import logging
 
+from src.leaderboard import Leaderboard
+from src.team_stats import PooledOutcomes
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +22,14 @@ class AppState:
         self.team_id_to_name = {} # {team_id: team_name}
         # Track disconnected players for reconnection - maps team_name to disconnected player info
         self.disconnected_players = {}  # {team_name: {'player_session_id': old_sid, 'player_slot': 1|2, 'disconnect_time': timestamp}}
+        # Per-team statistics accumulators, rebuilt lazily from the DB after startup/reset
+        self.team_stats = {}  # {team_id: TeamStatsAccumulator}
+        # Final statistics of inactive teams, computed once when they go inactive
+        self.frozen_teams = {}  # {team_id: FrozenTeamStats}
+        # Teams ordered by CHSH value and balanced |<Tr>|, updated as their statistics change
+        self.leaderboard = Leaderboard()
+        # Outcome table pooled over all active teams, for the class-wide statistics
+        self.class_stats = PooledOutcomes()
 
     @property
     def game_mode(self):
@@ -43,6 +54,10 @@ class AppState:
         self.dashboard_clients.clear()
         self.team_id_to_name.clear()
         self.disconnected_players.clear()
+        self.team_stats.clear()
+        self.frozen_teams.clear()
+        self.leaderboard.clear()
+        self.class_stats.clear()
         self.game_started = False
         self.game_paused = False
         self.answer_stream_enabled = False
@@ -5,6 +5,33 @@ const socket = io(window.location.origin, {
 });
 const connectionStatusDiv = document.getElementById("connection-status-dash");
 
+// Teams payloads can be sent as MessagePack instead of JSON, opted into with
+// ?encoding=msgpack. The decoder is loaded only then; until it is, the dashboard joins with JSON.
+const msgpackRequested = new URLSearchParams(window.location.search).get('encoding') === 'msgpack';
+if (msgpackRequested) {
+    const msgpackScript = document.createElement('script');
+    msgpackScript.src = 'https://unpkg.com/@msgpack/msgpack@2.8.0/dist.es5+umd/msgpack.min.js';
+    msgpackScript.onload = () => {
+        if (socket.connected) {
+            joinDashboard();
+        }
+    };
+    document.head.appendChild(msgpackScript);
+}
+
+function joinDashboard() {
+    const encoding = msgpackRequested && window.MessagePack ? 'msgpack' : 'json';
+    socket.emit('dashboard_join', { encoding: encoding, teams_window: currentTeamsWindow() });
+}
+
+// MessagePack payloads arrive as binary; JSON ones are already decoded
+function decodePayload(data) {
+    if (data instanceof ArrayBuffer || ArrayBuffer.isView(data)) {
+        return window.MessagePack.decode(data);
+    }
+    return data;
+}
+
 // Event delegation for theme dropdown (since it's in hidden advanced controls)
 document.addEventListener('change', (event) => {
     if (event.target.id === 'theme-dropdown') {
@@ -18,11 +45,36 @@ let currentGameMode = 'simplified';
 // Theme state  
 let currentGameTheme = 'food';
 
+// The server sends one page of the teams list, already sorted and filtered, and then
+// updates only for the teams on that page (request_teams_window)
+const TEAMS_PAGE_SIZE = 50;
+const TEAMS_WINDOW_SORTS = { 'success-rate': 'chsh', 'balanced': 'balanced', 'name': 'name', 'date': 'created_at' };
+let teamsWindowOffset = 0;
+let teamsWindowInfo = null;
+
+function currentTeamsWindow() {
+    return {
+        sort: TEAMS_WINDOW_SORTS[document.getElementById('sort-teams').value] || 'chsh',
+        filter: document.getElementById('show-inactive').checked ? 'all' : 'active',
+        offset: teamsWindowOffset,
+        limit: TEAMS_PAGE_SIZE
+    };
+}
+
+function requestTeamsWindow() {
+    socket.emit('request_teams_window', currentTeamsWindow());
+}
+
+function moveTeamsWindow(pages) {
+    teamsWindowOffset = Math.max(0, teamsWindowOffset + pages * TEAMS_PAGE_SIZE);
+    requestTeamsWindow();
+}
+
 // Handle page visibility changes
 document.addEventListener('visibilitychange', () => {
     if (document.visibilityState === 'visible') {
         console.log('Page became visible - requesting update');
-        socket.emit('dashboard_join');
+        joinDashboard();
     }
 });
 
@@ -45,6 +97,9 @@ const noAnswersLogMsg = document.getElementById("no-answers-log");
 
 let currentAnswersCount = 0;
 
+// Current 🏆 ('chsh') and 🎯 ('balanced') holders, maintained by the server's leaderboard
+const leaders = { chsh: null, balanced: null };
+
 // Game Mode Functions
 function updateTableHeaders(mode) {
     const header1 = document.getElementById('header-stat1');
@@ -79,6 +134,8 @@ function updateTableHeaders(mode) {
 
 function updateGameModeDisplay(mode) {
     currentGameMode = mode;
+    updateLeaderDisplay();
+    updateClassStatsDisplay();
     const modeIndicator = document.getElementById('current-game-mode');
     const toggleBtn = document.getElementById('toggle-mode-btn');
     const modeDescription = document.getElementById('mode-description-text');
@@ -327,6 +384,16 @@ function formatStatWithUncertainty(magnitude, uncertainty, precision = 2) {
     return `${magStr}<span style="font-size: 0.8em; vertical-align: baseline; opacity: 0.5;">±${uncStr}</span>`;
 }
 
+// Bootstrap confidence interval suffix (only present when the server has bootstrap CIs enabled)
+function formatBootstrapInterval(bootstrapCi, key, precision = 2) {
+    const interval = bootstrapCi && bootstrapCi[key];
+    if (!Array.isArray(interval) || interval.length !== 2) {
+        return "";
+    }
+    const confidence = Math.round((bootstrapCi.confidence || 0.95) * 100);
+    return ` <span style="font-size: 0.8em; opacity: 0.5;" title="${confidence}% bootstrap CI (${bootstrapCi.resamples} resamples)">[${interval[0].toFixed(precision)}, ${interval[1].toFixed(precision)}]</span>`;
+}
+
 // Utility function to reset button to initial state
 function resetButtonToInitialState(btn) {
     if (!btn) return;
@@ -372,14 +439,14 @@ socket.on("connect", async () => {
     // Reset game button state on reconnect
     const startBtn = document.getElementById("start-game-btn");
     resetButtonToInitialState(startBtn);
-    socket.emit("dashboard_join"); // Notify backend that a dashboard client has joined
+    joinDashboard(); // Notify backend that a dashboard client has joined
     
     // Notify server about teams streaming preference immediately after connecting
     socket.emit('set_teams_streaming', { enabled: teamsStreamEnabled });
     
     // If teams streaming is enabled by default, request current teams data
     if (teamsStreamEnabled) {
-        socket.emit('request_teams_update');
+        socket.emit('request_teams_update', { version: teamsDataVersion });
     }
 });
 
@@ -615,7 +682,7 @@ socket.on("game_reset_complete", () => {
     localStorage.removeItem('game_paused');
     localStorage.removeItem('game_state_last_update');
     
-    socket.emit('dashboard_join');
+    joinDashboard();
 });
 
 function handleResetGame() {
@@ -729,9 +796,132 @@ socket.on("error", (data) => {
     }
 });
 
+function applyLeaderChange(data) {
+    if (!data || !(data.board in leaders)) return;
+    leaders[data.board] = data.team_id === null || data.team_id === undefined ? null : data;
+    updateLeaderDisplay();
+}
+
+function updateLeaderDisplay() {
+    const leaderDisplayEl = document.getElementById("leaderboard-leaders");
+    if (!leaderDisplayEl) return;
+    const parts = [];
+    if (leaders.chsh) parts.push(`🏆 ${leaders.chsh.team_name}`);
+    if (leaders.balanced && currentGameMode === 'classic') parts.push(`🎯 ${leaders.balanced.team_name}`);
+    leaderDisplayEl.textContent = parts.join('   ');
+    leaderDisplayEl.style.display = parts.length ? "block" : "none";
+}
+
+// Class-wide statistics pooled over all active teams
+let lastClassStats = null;
+
+function updateClassStatsDisplay() {
+    const classStatsEl = document.getElementById("class-stats");
+    if (!classStatsEl) return;
+    const data = lastClassStats;
+    if (!data || !data.rounds_count) {
+        classStatsEl.style.display = "none";
+        return;
+    }
+    let summary;
+    if (currentGameMode === 'classic') {
+        summary = `Class CHSH ${formatStatWithUncertainty(data.chsh_value, data.chsh_value_uncertainty)}` +
+            ` · Balanced ⏐⟨Tr⟩⏐ ${formatStatWithUncertainty(data.balanced_trace, data.balanced_trace_uncertainty)}`;
+    } else {
+        const successRate = (data.success_rate_by_mode || {})[currentGameMode];
+        if (!successRate) {
+            classStatsEl.style.display = "none";
+            return;
+        }
+        summary = `Class success rate ${(successRate.value * 100).toFixed(1)}%` +
+            (successRate.uncertainty ? ` ± ${(successRate.uncertainty * 100).toFixed(1)}%` : '');
+    }
+    classStatsEl.innerHTML = `${summary} <span style="opacity: 0.6;">(${data.teams_count} teams, ${data.rounds_count} rounds)</span>`;
+    classStatsEl.style.display = "block";
+}
+
+socket.on("class_stats_update", (data) => {
+    lastClassStats = data;
+    updateClassStatsDisplay();
+});
+
+socket.on("leader_changed", (data) => {
+    applyLeaderChange(data);
+    // Move the awards in the teams table without waiting for the next teams payload
+    if (teamsStreamEnabled && window.lastReceivedTeams) {
+        updateActiveTeams(window.lastReceivedTeams);
+    }
+});
+
+function applyTeamsPatch(data) {
+    // Between snapshots the server sends only the teams (and fields) that changed since
+    // the version we hold; merge them into a new teams array
+    const patch = data.teams_patch;
+    if (!patch) {
+        if (data.data_version !== undefined) {
+            teamsResyncPending = false; // A snapshot
+        }
+        return;
+    }
+    if (teamsStreamEnabled && teamsDataVersionTeams && patch.base_version === teamsDataVersion) {
+        const teamsById = new Map(teamsDataVersionTeams.map(team => [team.team_id, team]));
+        patch.removed.forEach(teamId => teamsById.delete(teamId));
+        patch.changed.forEach(changes => {
+            const team = teamsById.get(changes.team_id);
+            teamsById.set(changes.team_id, team ? { ...team, ...changes } : changes);
+        });
+        data.teams = Array.from(teamsById.values());
+    } else {
+        // Out of step with the server: keep showing what we have and ask for a snapshot
+        console.warn(`Teams patch for version ${patch.base_version} does not apply to version ${teamsDataVersion}; resyncing`);
+        data.teams = teamsDataVersionTeams || [];
+        delete data.data_version;
+        if (teamsStreamEnabled && !teamsResyncPending) {
+            teamsResyncPending = true;
+            socket.emit('request_teams_update', { version: null });
+        }
+    }
+}
+
+function applyTeamsWindow(data) {
+    // A windowed payload lists the team ids of its page in sort order; patches only carry
+    // the teams that changed, so put the merged teams in that order
+    if (!data.teams_window) {
+        return;
+    }
+    teamsWindowInfo = data.teams_window;
+    teamsWindowOffset = teamsWindowInfo.offset;
+    const teamsById = new Map((data.teams || []).map(team => [team.team_id, team]));
+    data.teams = teamsWindowInfo.order.map(teamId => teamsById.get(teamId)).filter(Boolean);
+    updateTeamsPager();
+}
+
+function updateTeamsPager() {
+    const { offset, limit, total } = teamsWindowInfo;
+    const first = total === 0 ? 0 : Math.min(offset + 1, total);
+    document.getElementById('teams-range').textContent = `${first}–${Math.min(offset + limit, total)} of ${total}`;
+    document.getElementById('teams-prev').disabled = offset === 0;
+    document.getElementById('teams-next').disabled = offset + limit >= total;
+}
+
+function recordTeamsDataVersion(data) {
+    // Only payloads carrying teams have a data version
+    if (teamsStreamEnabled && data.data_version !== undefined) {
+        teamsDataVersion = data.data_version;
+        teamsDataVersionTeams = data.teams;
+    }
+}
+
 socket.on("dashboard_update", (data) => {
+    data = decodePayload(data);
     console.log("Dashboard update received:", data);
+    applyTeamsPatch(data);
+    applyTeamsWindow(data);
     lastReceivedTeams = data.teams;
+    recordTeamsDataVersion(data);
+    if (data.leaders) {
+        Object.values(data.leaders).forEach(applyLeaderChange);
+    }
     let modeChanged = false;
     if (data.game_state) {
         console.log(`Game state update - started: ${data.game_state.started}, paused: ${data.game_state.paused}, streaming: ${data.game_state.streaming_enabled}, mode: ${data.game_state.mode}`);
@@ -824,28 +1014,39 @@ socket.on("dashboard_update", (data) => {
     }
 });
 
-socket.on("new_answer_for_dashboard", (data) => {
-    console.log("New answer for dashboard:", data);
-    currentAnswersCount++;
+// Answers arrive in batches: {time, teams, answers}, each answer a
+// [ms after time, team_id, player, round_id, item, response] row, oldest first
+socket.on("answers_batch", (batch) => {
+    const answers = batch.answers.map(([offset, teamId, player, roundId, item, response]) => ({
+        timestamp: batch.time + offset,
+        team_id: teamId,
+        team_name: batch.teams[teamId],
+        player_session_id: player,
+        question_round_id: roundId,
+        assigned_item: item,
+        response_value: response === 1
+    }));
+    currentAnswersCount += answers.length;
     totalResponsesCountEl.textContent = currentAnswersCount;
     
     if (answerStreamEnabled) {
-        // The answer data is directly in the data object, not nested under 'answer'
-        addAnswerToLog(data);
-    } else {
-        console.log("Answer received but streaming is disabled - not showing in log");
+        addAnswersToLog(answers);
     }
 
-    // Refresh team details if this answer is from the currently viewed team
-    if (data.team_id === currentlyViewedTeamId) {
+    // Refresh team details if the batch has answers from the currently viewed team
+    if (answers.some(answer => answer.team_id === currentlyViewedTeamId)) {
         // Get fresh team data
-        socket.emit('dashboard_join');
+        joinDashboard();
     }
 });
 
 socket.on("team_status_changed_for_dashboard", (data) => {
+    data = decodePayload(data);
     console.log("Team status changed for dashboard:", data);
+    applyTeamsPatch(data);
+    applyTeamsWindow(data);
     lastReceivedTeams = data.teams;
+    recordTeamsDataVersion(data);
     
     // Only update teams if streaming is enabled
     if (teamsStreamEnabled) {
@@ -901,20 +1102,15 @@ function updateMetrics(activeTeamsCount, readyPlayersCount, totalAnswers, connec
 }
 
 
-// Add event listener for show-inactive toggle
+// The server filters and sorts the teams: a new filter or sort asks it for the first page
 document.getElementById('show-inactive').addEventListener('change', () => {
-    if (lastReceivedTeams && teamsStreamEnabled) {
-        // User-initiated changes should be immediate
-        updateTeamsImmediate(lastReceivedTeams);
-    }
+    teamsWindowOffset = 0;
+    requestTeamsWindow();
 });
 
-// Add event listener for sort teams dropdown
 document.getElementById('sort-teams').addEventListener('change', () => {
-    if (lastReceivedTeams && teamsStreamEnabled) {
-        // User-initiated changes should be immediate
-        updateTeamsImmediate(lastReceivedTeams);
-    }
+    teamsWindowOffset = 0;
+    requestTeamsWindow();
 });
 
 // Helper function to capture current team positions for animations
@@ -1061,17 +1257,14 @@ function updateTeamsImmediate(teams) {
     // Capture current team positions for animation
     const oldPositions = captureTeamPositions();
     
-    // Filter teams based on status
-    let filteredTeams = showInactive ? teams : teams.filter(team =>
+    // A teams window arrives filtered and sorted by the server
+    let filteredTeams = teamsWindowInfo ? teams : showInactive ? teams : teams.filter(team =>
         team.is_active || team.status === 'waiting_pair'
     );
     
     // Sort teams
-    filteredTeams.sort((a, b) => {
-        if (sortBy === 'status') {
-            if (a.is_active === b.is_active) return 0;
-            return a.is_active ? -1 : 1;
-        } else if (sortBy === 'date') {
+    if (!teamsWindowInfo) filteredTeams.sort((a, b) => {
+        if (sortBy === 'date') {
             return new Date(b.created_at || 0) - new Date(a.created_at || 0);
         } else if (sortBy === 'success-rate') {
             // Sort by success rate in non-classic modes, CHSH value in classic mode
@@ -1099,53 +1292,9 @@ function updateTeamsImmediate(teams) {
     noActiveTeamsMsg.style.display = filteredTeams.length === 0 ? "block" : "none";
     activeTeamsTableBody.innerHTML = ""; // Clear existing rows
 
-    // --- BEGIN MODIFICATION: Determine top performers ---
-    let highestBalancedTrTeamId = null;
-    let maxBalancedTrValue = -Infinity;
-    let highestChshTeamId = null;
-    let maxChshValue = -Infinity;
-
-    const eligibleTeams = teams.filter(team => team.min_stats_sig === true);
-
-    eligibleTeams.forEach(team => {
-        if (currentGameMode === 'classic') {
-            // Classic mode: Use classic_stats
-            const stats = team.classic_stats;
-
-            // Calculate Balanced |Tr|
-            if (stats && typeof stats.trace_average_statistic === 'number' && typeof stats.same_item_balance === 'number') {
-                const traceAvg = stats.trace_average_statistic;
-                const balance = stats.same_item_balance;
-                const balancedTr = (traceAvg + balance) / 2;
-                if (balancedTr > maxBalancedTrValue) {
-                    maxBalancedTrValue = balancedTr;
-                    highestBalancedTrTeamId = team.team_id;
-                }
-            }
-
-            // Calculate CHSH Value
-            if (stats && typeof stats.cross_term_combination_statistic === 'number') {
-                const chshValue = stats.cross_term_combination_statistic;
-                if (chshValue > maxChshValue) {
-                    maxChshValue = chshValue;
-                    highestChshTeamId = team.team_id;
-                }
-            }
-        } else {
-            // Non-classic modes: Only award 🏆 based on success rate (no 🎯 award)
-            const stats = team.new_stats;
-            if (stats && typeof stats.trace_average_statistic === 'number') {
-                const successRate = stats.trace_average_statistic;
-                if (successRate > maxChshValue) {
-                    maxChshValue = successRate;
-                    highestChshTeamId = team.team_id;
-                }
-            }
-            // No 🎯 award in non-classic modes
-            highestBalancedTrTeamId = null;
-        }
-    });
-    // --- END MODIFICATION ---
+    // Top performers come from the server's leaderboard (eligible teams only, 🎯 in classic mode only)
+    const highestChshTeamId = leaders.chsh ? leaders.chsh.team_id : null;
+    const highestBalancedTrTeamId = currentGameMode === 'classic' && leaders.balanced ? leaders.balanced.team_id : null;
     
     filteredTeams.forEach(team => {
         const row = activeTeamsTableBody.insertRow();
@@ -1329,45 +1478,59 @@ function updateTeamsImmediate(teams) {
     animateTeamPositions(oldPositions);
 }
 
-function addAnswerToLog(answer) {
-    if (!answer) {
-        console.error("Received null or undefined answer object");
-        return;
-    }
+function createAnswerRow(answer) {
+    const row = document.createElement("tr");
+    
+    // Handle timestamp with fallback to current time
+    const timestamp = answer.timestamp ? new Date(answer.timestamp) : new Date();
+    row.insertCell().textContent = timestamp.toLocaleTimeString();
     
+    // Add other fields with null checks
+    row.insertCell().textContent = answer.team_name || '—';
+    row.insertCell().textContent = (answer.player_session_id || '').substring(0, 8) + "...";
+    row.insertCell().textContent = answer.question_round_id || '—';
+    row.insertCell().textContent = answer.assigned_item || '—';
+    row.insertCell().textContent = answer.response_value !== undefined ? answer.response_value : '—';
+    return row;
+}
+
+// Adds answers (oldest first) to the top of the log in one DOM insertion
+function addAnswersToLog(answers) {
+    const maxRows = 100; // Keep last 100 answers
     try {
+        const fragment = document.createDocumentFragment();
+        // Newest on top; answers that would be trimmed straight away are not rendered
+        for (let i = answers.length - 1; i >= Math.max(0, answers.length - maxRows); i--) {
+            if (answers[i]) {
+                fragment.appendChild(createAnswerRow(answers[i]));
+            }
+        }
+        if (!fragment.childNodes.length) {
+            return;
+        }
         noAnswersLogMsg.style.display = "none";
-        const row = answerLogTableBody.insertRow(0); // Add to top
-        
-        // Handle timestamp with fallback to current time
-        const timestamp = answer.timestamp ? new Date(answer.timestamp) : new Date();
-        row.insertCell().textContent = timestamp.toLocaleTimeString();
-        
-        // Add other fields with null checks
-        row.insertCell().textContent = answer.team_name || '—';
-        row.insertCell().textContent = (answer.player_session_id || '').substring(0, 8) + "...";
-        row.insertCell().textContent = answer.question_round_id || '—';
-        row.insertCell().textContent = answer.assigned_item || '—';
-        row.insertCell().textContent = answer.response_value !== undefined ? answer.response_value : '—';
+        answerLogTableBody.insertBefore(fragment, answerLogTableBody.firstChild);
         
         // Limit log size if needed
-        if (answerLogTableBody.rows.length > 100) { // Keep last 100 answers
+        while (answerLogTableBody.rows.length > maxRows) {
             answerLogTableBody.deleteRow(-1);
         }
     } catch (error) {
-        console.error("Error adding answer to log:", error, "Answer:", answer);
+        console.error("Error adding answers to log:", error, "Answers:", answers);
     }
 }
 
 function updateAnswerLog(answers) {
     if (answers && answers.length > 0) {
-        noAnswersLogMsg.style.display = "none";
-        answers.forEach(addAnswerToLog);
+        addAnswersToLog(answers);
     }
 }
 
 let answerStreamEnabled = false;
 let teamsStreamEnabled = true; // Default to ON
+let teamsDataVersion = null; // Server data version of the last teams received while streaming
+let teamsDataVersionTeams = null; // The teams of that version
+let teamsResyncPending = false; // Asked for a snapshot after a patch that did not apply
 let advancedControlsEnabled = false;
 const answerTable = document.getElementById('answer-log-table');
 const noAnswersMsg = document.getElementById('no-answers-log');
@@ -1466,9 +1629,13 @@ function toggleTeamsStream() {
     socket.emit('set_teams_streaming', { enabled: teamsStreamEnabled });
     
     // If enabling, ensure headers are correct and request current teams data
+    // The server sends nothing if the teams of our data version are still current
     if (teamsStreamEnabled) {
         updateTableHeaders(currentGameMode);
-        socket.emit('request_teams_update');
+        if (teamsDataVersionTeams) {
+            updateActiveTeams(teamsDataVersionTeams);
+        }
+        socket.emit('request_teams_update', { version: teamsDataVersion });
     }
 }
 
@@ -1614,7 +1781,8 @@ function updateModalContent(team) {
         // Calculate balanced classic
         if (team.classic_stats.trace_average_statistic !== undefined && team.classic_stats.same_item_balance !== undefined) {
             const balanced = (team.classic_stats.trace_average_statistic + team.classic_stats.same_item_balance) / 2;
-            modalClassicBalanced.innerHTML = balanced.toFixed(3);
+            modalClassicBalanced.innerHTML = balanced.toFixed(3) +
+                formatBootstrapInterval(team.bootstrap_ci, 'balanced_trace_interval');
         } else {
             modalClassicBalanced.textContent = "—";
         }
@@ -1622,7 +1790,7 @@ function updateModalContent(team) {
         modalClassicChsh.innerHTML = formatStatWithUncertainty(
             team.classic_stats.cross_term_combination_statistic,
             team.classic_stats.cross_term_combination_statistic_uncertainty
-        );
+        ) + formatBootstrapInterval(team.bootstrap_ci, 'chsh_value_interval');
     } else {
         modalClassicTrace.textContent = "—";
         modalClassicBalance.textContent = "—";
@@ -0,0 +1,288 @@
+"""
+Batch statistics engine for the dashboard.
+
+Instead of computing statistics term by term for one team at a time, the
+engine lays the counters of every team out as (teams x 16) tables - one
+row per team, one column per (row item, column item) cell of the 4x4 matrix -
+and computes each statistic column-wise across all teams in a single pass.
+
+Uncertainties use the same closed-form propagation as ``src.uncertainty``.
+The results match ``_calculate_team_statistics_from_data`` and
+``_calculate_success_statistics_from_data`` in ``src.sockets.dashboard``,
+including the infinite-uncertainty (reported as ``None``) cases.
+"""
+import math
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.success_rules import NEVER_TABLE
+from src.team_stats import ITEM_VALUES, SuccessTable, TeamStatsAccumulator
+from src.uncertainty import MIN_STD_DEV, ratio_term, std_dev_or_none
+
+logger = logging.getLogger(__name__)
+
+_A, _B, _X, _Y = (ITEM_VALUES.index(item) for item in ('A', 'B', 'X', 'Y'))
+
+# Flattened 4x4 cell indices (row * 4 + col) and coefficients of each statistic
+_TRACE_CELLS = [i * 4 + i for i in range(4)]
+_CHSH_TERMS = [
+    (_A * 4 + _X, 1), (_A * 4 + _Y, 1),
+    (_B * 4 + _X, 1), (_B * 4 + _Y, -1),
+    (_X * 4 + _A, 1), (_X * 4 + _B, 1),
+    (_Y * 4 + _A, 1), (_Y * 4 + _B, -1),
+]
+# Cross terms pool each cell with its transpose
+_CROSS_TERMS = [
+    (_A * 4 + _X, _X * 4 + _A, 1), (_A * 4 + _Y, _Y * 4 + _A, 1),
+    (_B * 4 + _X, _X * 4 + _B, 1), (_B * 4 + _Y, _Y * 4 + _B, -1),
+]
+
+# One result row per team: (classic_matrix, success_matrix, classic_stats, new_stats)
+TeamBatchResult = Tuple[List[List[Tuple[int, int]]], List[List[Tuple[int, int]]], Dict[str, Optional[float]], Dict[str, Optional[float]]]
+# The success-table dependent part of a result row: (success_matrix, new_stats)
+SuccessView = Tuple[List[List[Tuple[int, int]]], Dict[str, Optional[float]]]
+
+
+class BatchTensors:
+    """Struct-of-arrays view over many teams' outcome tables."""
+
+    __slots__ = ('pair_counts', 'correlation_sums', 'success_counts',
+                 'same_true', 'same_false', 'player_true', 'player_false')
+
+    def __init__(self, accumulators: Sequence[TeamStatsAccumulator], success_table: SuccessTable) -> None:
+        # Flatten the success table to one (ff, ft, tf, tt) row per cell
+        success_rows = [(rule[0][0], rule[0][1], rule[1][0], rule[1][1])
+                        for row in success_table for rule in row]
+
+        # teams x 16 tables
+        self.pair_counts: List[List[int]] = []
+        self.correlation_sums: List[List[int]] = []
+        self.success_counts: List[List[int]] = []
+        # teams x 4 tables
+        self.same_true: List[List[int]] = []
+        self.same_false: List[List[int]] = []
+        self.player_true: List[List[int]] = []
+        self.player_false: List[List[int]] = []
+
+        for accumulator in accumulators:
+            counts = [0] * 16
+            sums = [0] * 16
+            successes = [0] * 16
+            same_true = [0] * 4
+            same_false = [0] * 4
+            player_true = [0] * 4
+            player_false = [0] * 4
+            for cell in range(16):
+                i, j = divmod(cell, 4)
+                (ff, ft), (tf, tt) = accumulator.outcomes[i][j]
+                counts[cell] = ff + ft + tf + tt
+                if not counts[cell]:
+                    continue
+                sums[cell] = ff + tt - ft - tf
+                rule = success_rows[cell]
+                successes[cell] = ff * rule[0] + ft * rule[1] + tf * rule[2] + tt * rule[3]
+                player_true[i] += tf + tt
+                player_false[i] += ff + ft
+                player_true[j] += ft + tt
+                player_false[j] += ff + tf
+                if i == j:
+                    same_true[i] = 2 * tt + ft + tf
+                    same_false[i] = 2 * ff + ft + tf
+            self.pair_counts.append(counts)
+            self.correlation_sums.append(sums)
+            self.success_counts.append(successes)
+            self.same_true.append(same_true)
+            self.same_false.append(same_false)
+            self.player_true.append(player_true)
+            self.player_false.append(player_false)
+
+    def __len__(self) -> int:
+        return len(self.pair_counts)
+
+
+def _classic_stats_column(tensors: BatchTensors) -> List[Dict[str, Optional[float]]]:
+    """Trace average, CHSH value, cross-term combination and same-item balance for every team."""
+    min_var = MIN_STD_DEV ** 2
+    results: List[Dict[str, Optional[float]]] = []
+
+    for counts, sums, same_true, same_false in zip(tensors.pair_counts, tensors.correlation_sums,
+                                                   tensors.same_true, tensors.same_false):
+        # Stat1: |(1/4) * sum of diagonal correlations|
+        trace_sum = 0.0
+        trace_var = min_var
+        for cell in _TRACE_CELLS:
+            value, variance = ratio_term(sums[cell], counts[cell])
+            trace_sum += value
+            trace_var += variance
+        trace_avg = abs(trace_sum / 4)
+        trace_var = trace_var / 16
+
+        # Stat2: (1/2) * signed sum of the eight CHSH cells
+        chsh_sum = 0.0
+        chsh_var = min_var
+        for cell, coeff in _CHSH_TERMS:
+            value, variance = ratio_term(sums[cell], counts[cell])
+            chsh_sum += coeff * value
+            chsh_var += variance
+        chsh_value = chsh_sum / 2
+        chsh_var = chsh_var / 4
+
+        # Stat3: signed sum of symmetrised cross terms
+        cross_sum = 0.0
+        cross_var = min_var
+        for cell, transposed, coeff in _CROSS_TERMS:
+            value, variance = ratio_term(sums[cell] + sums[transposed], counts[cell] + counts[transposed])
+            cross_sum += coeff * value
+            cross_var += variance
+
+        # Same-item balance: mean of 1 - |2p - 1| over items asked to both players
+        balance_sum = 0.0
+        balance_var = 0.0
+        balance_items = 0
+        for t_count, f_count in zip(same_true, same_false):
+            total_tf = t_count + f_count
+            if total_tf > 0:
+                balance_sum += 1 - abs(2 * (t_count / total_tf) - 1)
+                balance_var += 4 / total_tf
+                balance_items += 1
+        if balance_items:
+            balance_avg = balance_sum / balance_items
+            balance_std: Optional[float] = math.sqrt(balance_var) / balance_items
+        else:
+            balance_avg = 0.0
+            balance_std = None
+
+        results.append({
+            'trace_average_statistic': trace_avg,
+            'trace_average_statistic_uncertainty': std_dev_or_none(trace_var),
+            'chsh_value_statistic': chsh_value,
+            'chsh_value_statistic_uncertainty': std_dev_or_none(chsh_var),
+            'cross_term_combination_statistic': cross_sum,
+            'cross_term_combination_statistic_uncertainty': std_dev_or_none(cross_var),
+            'same_item_balance': balance_avg,
+            'same_item_balance_uncertainty': balance_std,
+        })
+
+    return results
+
+
+def _success_stats_column(tensors: BatchTensors) -> List[Dict[str, Optional[float]]]:
+    """Success rate, normalized score, cross-term success and individual balance for every team."""
+    results: List[Dict[str, Optional[float]]] = []
+
+    for counts, successes, player_true, player_false in zip(tensors.pair_counts, tensors.success_counts,
+                                                            tensors.player_true, tensors.player_false):
+        total_rounds = sum(counts)
+        successful_rounds = sum(successes)
+        if total_rounds > 0:
+            success_rate = successful_rounds / total_rounds
+            score = (successful_rounds - (total_rounds - successful_rounds)) / total_rounds
+            success_rate_std: Optional[float] = math.sqrt(success_rate * (1 - success_rate) / total_rounds)
+            score_std: Optional[float] = 2 / math.sqrt(total_rounds)
+        else:
+            success_rate = 0.0
+            score = 0.0
+            success_rate_std = None
+            score_std = None
+
+        cross_rates: List[float] = []
+        cross_variance_sum = 0.0
+        for cell, transposed, _ in _CROSS_TERMS:
+            total_pair = counts[cell] + counts[transposed]
+            if total_pair > 0:
+                pair_rate = (successes[cell] + successes[transposed]) / total_pair
+                cross_rates.append(pair_rate)
+                cross_variance_sum += math.sqrt(pair_rate * (1 - pair_rate) / total_pair) ** 2
+        if cross_rates:
+            cross_avg = sum(cross_rates) / len(cross_rates)
+            cross_std: Optional[float] = math.sqrt(cross_variance_sum) / len(cross_rates)
+        else:
+            cross_avg = 0.0
+            cross_std = None
+
+        balances: List[float] = []
+        for true_count, false_count in zip(player_true, player_false):
+            total_responses = true_count + false_count
+            if total_responses > 0:
+                balances.append(min(true_count, false_count) / total_responses * 2)
+        if balances:
+            balance_avg = sum(balances) / len(balances)
+            if len(balances) > 1:
+                balance_std: Optional[float] = math.sqrt(
+                    sum((b - balance_avg) ** 2 for b in balances) / len(balances))
+            else:
+                balance_std = None
+        else:
+            balance_avg = 0.0
+            balance_std = None
+
+        results.append({
+            'trace_average_statistic': success_rate,
+            'trace_average_statistic_uncertainty': success_rate_std,
+            'chsh_value_statistic': score,
+            'chsh_value_statistic_uncertainty': score_std,
+            'cross_term_combination_statistic': cross_avg,
+            'cross_term_combination_statistic_uncertainty': cross_std,
+            'same_item_balance': balance_avg,
+            'same_item_balance_uncertainty': balance_std,
+        })
+
+    return results
+
+
+def _matrices(tensors: BatchTensors, numerators: List[List[int]]) -> List[List[List[Tuple[int, int]]]]:
+    return [[[(nums[i * 4 + j], counts[i * 4 + j]) for j in range(4)] for i in range(4)]
+            for nums, counts in zip(numerators, tensors.pair_counts)]
+
+
+def compute_team_statistics_batch(accumulators: Sequence[TeamStatsAccumulator], success_table: SuccessTable) -> List[TeamBatchResult]:
+    """
+    Compute classic and success statistics for every team in one pass.
+    Returns one (classic_matrix, success_matrix, classic_stats, new_stats) tuple per accumulator, in order.
+    """
+    tensors = BatchTensors(accumulators, success_table)
+    return list(zip(_matrices(tensors, tensors.correlation_sums),
+                    _matrices(tensors, tensors.success_counts),
+                    _classic_stats_column(tensors),
+                    _success_stats_column(tensors)))
+
+
+def compute_success_statistics_batch(accumulators: Sequence[TeamStatsAccumulator], success_table: SuccessTable) -> List[SuccessView]:
+    """Success matrix and statistics only (the mode-dependent part) for every accumulator, in order."""
+    tensors = BatchTensors(accumulators, success_table)
+    return list(zip(_matrices(tensors, tensors.success_counts), _success_stats_column(tensors)))
+
+
+def compute_classic_statistics_batch(accumulators: Sequence[TeamStatsAccumulator]) -> List[Dict[str, Optional[float]]]:
+    """Classic statistics only (no matrices or success metrics) for every accumulator, in order."""
+    return _classic_stats_column(BatchTensors(accumulators, NEVER_TABLE))
+
+
+class FrozenTeamStats(NamedTuple):
+    """
+    Final statistics of a team that can no longer play, computed once for every game
+    mode so they can be served without touching its rounds again.
+    """
+    history_hashes: Tuple[str, str]
+    classic_matrix: List[List[Tuple[int, int]]]
+    classic_stats: Dict[str, Optional[float]]
+    success_views: Dict[str, SuccessView]  # {game mode: (success_matrix, new_stats)}
+
+    def batch_result(self, game_mode: str) -> TeamBatchResult:
+        """The team's result row as compute_team_statistics_batch returns it under game_mode."""
+        success_matrix, new_stats = self.success_views[game_mode]
+        return self.classic_matrix, success_matrix, self.classic_stats, new_stats
+
+
+def freeze_team_statistics(accumulator: TeamStatsAccumulator, success_tables: Dict[str, SuccessTable]) -> FrozenTeamStats:
+    """Compute a team's final statistics under every game mode of success_tables."""
+    views_by_table: Dict[int, SuccessView] = {}
+    classic_matrix: List[List[Tuple[int, int]]] = []
+    classic_stats: Dict[str, Optional[float]] = {}
+    for success_table in success_tables.values():
+        if id(success_table) not in views_by_table:
+            classic_matrix, success_matrix, classic_stats, new_stats = compute_team_statistics_batch([accumulator], success_table)[0]
+            views_by_table[id(success_table)] = (success_matrix, new_stats)
+    return FrozenTeamStats(
+        accumulator.history.hexdigests(), classic_matrix, classic_stats,
+        {mode: views_by_table[id(success_table)] for mode, success_table in success_tables.items()})
@@ -0,0 +1,64 @@
+"""
+Success rules for every game mode, as precompiled lookup tables.
+
+A rule is a 4x4x2x2 table of booleans indexed by
+``[p1 item index][p2 item index][p1 answer][p2 answer]`` (item indices follow
+``ITEM_VALUES``; answers index as 0/1). Evaluating a round is then a single
+lookup, with no string comparisons and no per-round mode checks, and the
+batch engine can fold a team's whole outcome table against it.
+
+Adding a game mode means adding its table to ``SUCCESS_TABLES``.
+"""
+from src.team_stats import ITEM_INDEX, AnswerRule, SuccessTable
+
+# 2x2 answer patterns, indexed [p1 answer][p2 answer]
+SAME: AnswerRule = ((True, False), (False, True))
+DIFFERENT: AnswerRule = ((False, True), (True, False))
+NOT_BOTH_TRUE: AnswerRule = ((True, True), (True, False))
+ALWAYS: AnswerRule = ((True, True), (True, True))
+NEVER: AnswerRule = ((False, False), (False, False))
+
+# CHSH rule (classic and simplified modes): {B,Y} combinations require different
+# answers; all others require the same answer.
+#            p2: A     B          X     Y
+CHSH_TABLE: SuccessTable = (
+    (SAME, SAME,      SAME, SAME),       # p1: A
+    (SAME, SAME,      SAME, DIFFERENT),  # p1: B
+    (SAME, SAME,      SAME, SAME),       # p1: X
+    (SAME, DIFFERENT, SAME, SAME),       # p1: Y
+)
+
+# AQM Joe rule. A/B are colours (True = Green, False = Red), X/Y are foods
+# (True = Peas, False = Carrots):
+# - Food-Food: success unless both say Peas
+# - Colour-Food: Green goes with Peas, Red with Carrots
+# - Colour-Colour: neutral, counted as a success
+#            p2: A       B       X              Y
+AQMJOE_TABLE: SuccessTable = (
+    (ALWAYS, ALWAYS, SAME,          SAME),           # p1: A
+    (ALWAYS, ALWAYS, SAME,          SAME),           # p1: B
+    (SAME,   SAME,   NOT_BOTH_TRUE, NOT_BOTH_TRUE),  # p1: X
+    (SAME,   SAME,   NOT_BOTH_TRUE, NOT_BOTH_TRUE),  # p1: Y
+)
+
+# Correlation contribution of a round, indexed [p1 answer][p2 answer]: +1 agree, -1 disagree
+CORRELATION_SIGN = ((1, -1), (-1, 1))
+
+# No round succeeds; used where only the classic correlation statistics are needed
+NEVER_TABLE: SuccessTable = tuple(tuple(NEVER for _ in range(4)) for _ in range(4))
+
+SUCCESS_TABLES = {
+    'classic': CHSH_TABLE,
+    'simplified': CHSH_TABLE,
+    'aqmjoe': AQMJOE_TABLE,
+}
+
+
+def success_table_for_mode(game_mode: str) -> SuccessTable:
+    """The success table of a game mode (unknown modes and the deprecated 'new' alias use the CHSH rule)."""
+    return SUCCESS_TABLES.get(game_mode, CHSH_TABLE)
+
+
+def is_successful(table: SuccessTable, p1_item: str, p2_item: str, p1_answer: bool, p2_answer: bool) -> bool:
+    """Look up one round in a success table."""
+    return table[ITEM_INDEX[p1_item]][ITEM_INDEX[p2_item]][p1_answer][p2_answer]
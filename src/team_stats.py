@@ -0,0 +1,313 @@
+"""
+In-memory per-team statistics accumulators.
+
+Every completed round is folded into a 4x4x2x2 outcome table indexed by
+(player 1 item, player 2 item, player 1 answer, player 2 answer). All of the
+dashboard statistics - pair counts, correlation sums, success counts, same-item
+and per-player True/False counts - are fixed-size reductions over that table,
+so refreshing a team costs O(1) no matter how many rounds it has played.
+
+Each accumulator also carries a rolling chain hash of the team's history
+(round starts and answers), used for the dashboard's history_hash1/hash2
+consistency check.
+
+Alongside the running table, the accumulator keeps prefix sums: a flat
+array with one 64-count snapshot of the table per completed round. The
+table for any range of rounds is then the difference of two snapshots,
+so "last N rounds" and "as of round K" statistics cost O(1) as well.
+"""
+import hashlib
+import logging
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ITEM_VALUES = ['A', 'B', 'X', 'Y']
+ITEM_INDEX = {item: idx for idx, item in enumerate(ITEM_VALUES)}
+
+# Success rule of a game mode as a 4x4x2x2 lookup table, indexed
+# [p1 item index][p2 item index][p1 answer][p2 answer] (see src.success_rules)
+AnswerRule = Tuple[Tuple[bool, bool], Tuple[bool, bool]]
+SuccessTable = Tuple[Tuple[AnswerRule, ...], ...]
+
+
+def iter_completed_rounds(team_rounds: List[Any], team_answers: List[Any], team_obj: Any) -> Iterator[Tuple[Any, str, str, bool, bool]]:
+    """
+    Yield (round_obj, p1_item, p2_item, p1_answer, p2_answer) for every round with both answers.
+    Answers are matched to players by session ID, exactly like the dashboard queries.
+    """
+    round_map = {round_obj.round_id: round_obj for round_obj in team_rounds}
+
+    answers_by_round: Dict[int, List[Any]] = {}
+    for answer in team_answers:
+        answers_by_round.setdefault(answer.question_round_id, []).append(answer)
+
+    for round_id, round_answers in answers_by_round.items():
+        if len(round_answers) != 2 or round_id not in round_map:
+            continue
+
+        round_obj = round_map[round_id]
+        p1_item = round_obj.player1_item.value if round_obj.player1_item else None
+        p2_item = round_obj.player2_item.value if round_obj.player2_item else None
+        if not p1_item or not p2_item:
+            continue
+
+        p1_answer = None
+        p2_answer = None
+        for answer in round_answers:
+            if answer.player_session_id == team_obj.player1_session_id:
+                p1_answer = answer.response_value
+            elif answer.player_session_id == team_obj.player2_session_id:
+                p2_answer = answer.response_value
+
+        if p1_answer is None or p2_answer is None:
+            continue
+
+        yield round_obj, p1_item, p2_item, p1_answer, p2_answer
+
+
+class TeamHistoryHash:
+    """
+    Rolling SHA-256 and MD5 chains over a team's history.
+    Each event extends the digests as digest = H(previous digest + event), so an update
+    costs O(1). Events are ordered round by round: the round start, then its answers.
+    """
+
+    __slots__ = ('_sha256', '_md5', 'events')
+
+    def __init__(self) -> None:
+        # An empty history hashes like an empty history string always has
+        self._sha256 = hashlib.sha256(b'').digest()
+        self._md5 = hashlib.md5(b'').digest()
+        self.events = 0
+
+    @classmethod
+    def from_rows(cls, team_rounds: List[Any], team_answers: List[Any]) -> 'TeamHistoryHash':
+        """Replay rounds (in initiation order) and answers (in submission order) from database rows."""
+        history = cls()
+        answers_by_round: Dict[int, List[Any]] = {}
+        for answer in team_answers:
+            answers_by_round.setdefault(answer.question_round_id, []).append(answer)
+
+        for round_obj in team_rounds:
+            history.record_round_started(
+                round_obj.player1_item.value if round_obj.player1_item else None,
+                round_obj.player2_item.value if round_obj.player2_item else None)
+            for answer in answers_by_round.get(round_obj.round_id, []):
+                history.record_answer(answer.assigned_item.value, answer.response_value)
+        return history
+
+    def _extend(self, event: str) -> None:
+        data = event.encode()
+        self._sha256 = hashlib.sha256(self._sha256 + data).digest()
+        self._md5 = hashlib.md5(self._md5 + data).digest()
+        self.events += 1
+
+    def record_round_started(self, p1_item: Optional[str], p2_item: Optional[str]) -> None:
+        self._extend(f"P1:{p1_item or 'None'}|P2:{p2_item or 'None'}")
+
+    def record_answer(self, item: str, response_value: bool) -> None:
+        self._extend(f"A:{item}:{response_value}")
+
+    def hexdigests(self) -> Tuple[str, str]:
+        """Short (history_hash1, history_hash2) pair shown on the dashboard."""
+        return self._sha256.hex()[:8], self._md5.hex()[:8]
+
+
+# Cells in one flattened outcome table snapshot (4 x 4 items x 2 x 2 answers)
+_TABLE_SIZE = 64
+
+
+class TeamStatsAccumulator:
+    """Running outcome counts and history hash for one team, updated as the game is played."""
+
+    __slots__ = ('outcomes', 'rounds_recorded', 'history', '_prefix')
+
+    def __init__(self) -> None:
+        # outcomes[p1_idx][p2_idx][p1_answer][p2_answer] -> number of rounds
+        self.outcomes: List[List[List[List[int]]]] = [[[[0, 0], [0, 0]] for _ in range(4)] for _ in range(4)]
+        self.rounds_recorded = 0
+        self.history = TeamHistoryHash()
+        # Snapshot k (cells [64k, 64k + 64)) holds the flattened table after k completed rounds
+        self._prefix = array('I', bytes(4 * _TABLE_SIZE))
+
+    @classmethod
+    def from_rows(cls, team_rounds: List[Any], team_answers: List[Any], team_obj: Any) -> 'TeamStatsAccumulator':
+        """Rebuild the accumulator from database rows (startup, reset or first sight of a team)."""
+        accumulator = cls()
+        accumulator.history = TeamHistoryHash.from_rows(team_rounds, team_answers)
+        if team_obj is None:
+            return accumulator
+        for _, p1_item, p2_item, p1_answer, p2_answer in iter_completed_rounds(team_rounds, team_answers, team_obj):
+            accumulator.record_round(p1_item, p2_item, p1_answer, p2_answer)
+        return accumulator
+
+    @classmethod
+    def from_outcome_counts(cls, counts: List[int]) -> 'TeamStatsAccumulator':
+        """Read-only accumulator for a flattened 64-cell outcome table (see outcome_counts)."""
+        accumulator = cls()
+        accumulator.outcomes = [[[[counts[((i * 4 + j) * 2 + a1) * 2 + a2] for a2 in range(2)] for a1 in range(2)]
+                                 for j in range(4)] for i in range(4)]
+        accumulator.rounds_recorded = sum(counts)
+        return accumulator
+
+    def outcome_counts(self) -> List[int]:
+        """
+        The current outcome table flattened to 64 counts, indexed ((p1 * 4 + p2) * 2 + a1) * 2 + a2.
+        Read from outcomes, which read-only views fill without prefix sums.
+        """
+        return [count for row in self.outcomes for cell in row for answers in cell for count in answers]
+
+    def record_round(self, p1_item: str, p2_item: str, p1_answer: bool, p2_answer: bool) -> None:
+        """Fold one completed round into the counters."""
+        i, j = ITEM_INDEX[p1_item], ITEM_INDEX[p2_item]
+        a1, a2 = (1 if p1_answer else 0), (1 if p2_answer else 0)
+        self.outcomes[i][j][a1][a2] += 1
+        self.rounds_recorded += 1
+        self._prefix.extend(self._prefix[-_TABLE_SIZE:])
+        self._prefix[len(self._prefix) - _TABLE_SIZE + ((i * 4 + j) * 2 + a1) * 2 + a2] += 1
+
+    def round_range(self, window: Optional[int] = None, as_of_round: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Resolve the half-open range [start, end) of completed rounds for a query.
+        as_of_round limits the range to the first K rounds; window keeps only the last N of those.
+        Both are clamped to the rounds recorded so far.
+        """
+        end = self.rounds_recorded if as_of_round is None else max(0, min(as_of_round, self.rounds_recorded))
+        start = 0 if window is None else max(0, end - max(0, window))
+        return start, end
+
+    def range_view(self, start: int, end: int) -> 'TeamStatsAccumulator':
+        """
+        Read-only accumulator holding only rounds [start, end), from two prefix snapshots in O(1).
+        The view has no prefix sums or history hash of its own.
+        """
+        view = TeamStatsAccumulator()
+        lo, hi = start * _TABLE_SIZE, end * _TABLE_SIZE
+        prefix = self._prefix
+        for i in range(4):
+            for j in range(4):
+                cell = (i * 4 + j) * 4
+                view.outcomes[i][j] = [
+                    [prefix[hi + cell] - prefix[lo + cell], prefix[hi + cell + 1] - prefix[lo + cell + 1]],
+                    [prefix[hi + cell + 2] - prefix[lo + cell + 2], prefix[hi + cell + 3] - prefix[lo + cell + 3]],
+                ]
+        view.rounds_recorded = end - start
+        return view
+
+    def correlation_result(self) -> Tuple[List[List[Tuple[int, int]]], List[str], float, Dict[str, float], Dict[str, Dict[str, int]], Dict[Tuple[str, str], int], Dict[Tuple[str, str], int]]:
+        """Correlation matrix and same-item balance (the dashboard's compute_correlation_matrix layout), derived from the counters."""
+        corr_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]
+        pair_counts: Dict[Tuple[str, str], int] = {}
+        correlation_sums: Dict[Tuple[str, str], int] = {}
+        same_item_responses: Dict[str, Dict[str, int]] = {}
+
+        for i, row_item in enumerate(ITEM_VALUES):
+            for j, col_item in enumerate(ITEM_VALUES):
+                (ff, ft), (tf, tt) = self.outcomes[i][j]
+                agree = ff + tt
+                disagree = ft + tf
+                pair_counts[(row_item, col_item)] = agree + disagree
+                correlation_sums[(row_item, col_item)] = agree - disagree
+                corr_matrix[i][j] = (agree - disagree, agree + disagree)
+
+                # Same-item balance counts both players' responses
+                if i == j and agree + disagree > 0:
+                    same_item_responses[row_item] = {
+                        'true': 2 * tt + ft + tf,
+                        'false': 2 * ff + ft + tf,
+                    }
+
+        same_item_balance: Dict[str, float] = {}
+        for item, counts in same_item_responses.items():
+            total = counts['true'] + counts['false']
+            same_item_balance[item] = 1.0 - abs(counts['true'] - counts['false']) / total
+
+        avg_same_item_balance = (sum(same_item_balance.values()) / len(same_item_balance)
+                                 if same_item_balance else 0.0)
+
+        return (corr_matrix, list(ITEM_VALUES),
+                avg_same_item_balance, same_item_balance, same_item_responses,
+                correlation_sums, pair_counts)
+
+    def success_result(self, success_table: SuccessTable) -> Tuple[List[List[Tuple[int, int]]], List[str], float, float, Dict[Tuple[str, str], int], Dict[Tuple[str, str], int], Dict[str, Dict[str, int]]]:
+        """Success matrix, rates and player balance (the dashboard's compute_success_metrics layout), judged by the given success table."""
+        success_matrix = [[(0, 0) for _ in range(4)] for _ in range(4)]
+        pair_counts: Dict[Tuple[str, str], int] = {}
+        success_counts: Dict[Tuple[str, str], int] = {}
+        player_responses: Dict[str, Dict[str, int]] = {item: {'true': 0, 'false': 0} for item in ITEM_VALUES}
+
+        total_rounds = 0
+        successful_rounds = 0
+        for i, row_item in enumerate(ITEM_VALUES):
+            for j, col_item in enumerate(ITEM_VALUES):
+                pair_total = 0
+                pair_successes = 0
+                rule = success_table[i][j]
+                for p1_answer in (False, True):
+                    for p2_answer in (False, True):
+                        count = self.outcomes[i][j][int(p1_answer)][int(p2_answer)]
+                        if not count:
+                            continue
+                        pair_total += count
+                        player_responses[row_item]['true' if p1_answer else 'false'] += count
+                        player_responses[col_item]['true' if p2_answer else 'false'] += count
+                        if rule[p1_answer][p2_answer]:
+                            pair_successes += count
+                pair_counts[(row_item, col_item)] = pair_total
+                success_counts[(row_item, col_item)] = pair_successes
+                success_matrix[i][j] = (pair_successes, pair_total)
+                total_rounds += pair_total
+                successful_rounds += pair_successes
+
+        overall_success_rate = successful_rounds / total_rounds if total_rounds > 0 else 0.0
+        # Normalized cumulative score: +1 for success, -1 for failure, divided by total rounds
+        score_sum = successful_rounds - (total_rounds - successful_rounds)
+        normalized_cumulative_score = score_sum / total_rounds if total_rounds > 0 else 0.0
+
+        return (success_matrix, list(ITEM_VALUES), overall_success_rate, normalized_cumulative_score,
+                success_counts, pair_counts, player_responses)
+
+
+class PooledOutcomes:
+    """
+    Class-wide outcome table: the sum of the member teams' tables (the dashboard pools
+    every active team). Members are added or removed in O(64) and each completed round
+    of a member is mirrored in O(1), so the pooled statistics never re-sum every team.
+    """
+
+    __slots__ = ('counts', 'members')
+
+    def __init__(self) -> None:
+        self.counts = [0] * _TABLE_SIZE
+        self.members: Dict[int, TeamStatsAccumulator] = {}
+
+    def add_team(self, team_id: int, accumulator: TeamStatsAccumulator) -> None:
+        if team_id in self.members:
+            return
+        self.members[team_id] = accumulator
+        for cell, count in enumerate(accumulator.outcome_counts()):
+            self.counts[cell] += count
+
+    def remove_team(self, team_id: int) -> None:
+        accumulator = self.members.pop(team_id, None)
+        if accumulator is None:
+            return
+        for cell, count in enumerate(accumulator.outcome_counts()):
+            self.counts[cell] -= count
+
+    def record_round(self, team_id: int, p1_item: str, p2_item: str, p1_answer: bool, p2_answer: bool) -> None:
+        """Mirror a round just recorded on a member team's accumulator (ignored for non-members)."""
+        if team_id not in self.members:
+            return
+        i, j = ITEM_INDEX[p1_item], ITEM_INDEX[p2_item]
+        self.counts[((i * 4 + j) * 2 + (1 if p1_answer else 0)) * 2 + (1 if p2_answer else 0)] += 1
+
+    def accumulator(self) -> TeamStatsAccumulator:
+        """Read-only accumulator over the pooled table, for the statistics engine."""
+        return TeamStatsAccumulator.from_outcome_counts(self.counts)
+
+    def clear(self) -> None:
+        self.counts = [0] * _TABLE_SIZE
+        self.members.clear()
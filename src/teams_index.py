@@ -0,0 +1,120 @@
+"""
+Sorted index of the dashboard's teams, for serving a window of them (a sort key, a
+filter and an offset/limit) without sorting every team on every update.
+
+Every sort key keeps two ordered lists: of all teams, and of the active ones (active,
+or waiting for a pair). ``sync`` takes the teams list get_all_teams returns, which hands
+out the same dict while a team is unchanged (and updates it in place only on a game
+mode change), so only teams with a new dict or game mode are re-keyed, each in
+O(log n) plus the shift of the sorted lists.
+
+Sort keys:
+
+- ``chsh``: the CHSH value in classic mode, the success rate otherwise; highest first.
+- ``balanced``: balanced |<Tr>| in classic mode; highest first, unscored otherwise.
+- ``name``: team name, case-insensitive.
+- ``created_at``: newest team first.
+
+Teams without a score sort after the scored ones; ties go by team name, then team id.
+
+The index has its own lock, so syncing it never holds the dashboard lock.
+"""
+import bisect
+import math
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+SORT_KEYS = ('chsh', 'balanced', 'name', 'created_at')
+FILTERS = ('active', 'all')
+
+_Key = Tuple[Any, ...]
+
+
+class _Entry(NamedTuple):
+    team: Dict[str, Any]
+    game_mode: Optional[str]
+    keys: Dict[str, _Key]
+    active: bool
+
+
+def _score_key(value: Optional[float], team_name: str, team_id: int) -> _Key:
+    if value is None or not math.isfinite(value):
+        return (1, 0.0, team_name, team_id)
+    return (0, -value, team_name, team_id)
+
+
+def _created_at(team: Dict[str, Any]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(team['created_at']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TeamsIndex:
+    """Ordered indexes of dashboard team entries by every sort key, for all and for active teams."""
+
+    def __init__(self, scores: Callable[[Dict[str, Any]], Dict[str, Optional[float]]]) -> None:
+        """scores gives a team's {'chsh': ..., 'balanced': ...} scores (None if unscored)."""
+        self._scores = scores
+        self._entries: Dict[int, _Entry] = {}
+        self._order: Dict[Tuple[str, str], List[_Key]] = {(sort, filter_): [] for sort in SORT_KEYS for filter_ in FILTERS}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, teams: Iterable[Dict[str, Any]]) -> None:
+        """Bring the index in line with the current team entries; unchanged teams are not re-keyed."""
+        with self._lock:
+            seen = set()
+            for team in teams:
+                team_id = team.get('team_id')
+                seen.add(team_id)
+                entry = self._entries.get(team_id)
+                if entry is None or entry.team is not team or entry.game_mode != team.get('game_mode'):
+                    self._set(team_id, team)
+            for team_id in [team_id for team_id in self._entries if team_id not in seen]:
+                self._remove(team_id)
+
+    def window(self, sort: str, filter_: str, offset: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """(number of teams matching the filter, team entries at [offset, offset + limit) in sort order)."""
+        with self._lock:
+            order = self._order[(sort, filter_)]
+            return len(order), [self._entries[key[-1]].team for key in order[offset:offset + limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for order in self._order.values():
+                order.clear()
+
+    def _keys(self, team_id: int, team: Dict[str, Any]) -> Dict[str, _Key]:
+        team_name = team.get('team_name') or ''
+        scores = self._scores(team)
+        created_at = _created_at(team)
+        return {
+            'chsh': _score_key(scores.get('chsh'), team_name, team_id),
+            'balanced': _score_key(scores.get('balanced'), team_name, team_id),
+            'name': (team_name.casefold(), team_name, team_id),
+            'created_at': _score_key(created_at, team_name, team_id),
+        }
+
+    def _set(self, team_id: int, team: Dict[str, Any]) -> None:
+        self._remove(team_id)
+        entry = _Entry(team, team.get('game_mode'), self._keys(team_id, team),
+                       bool(team.get('is_active')) or team.get('status') == 'waiting_pair')
+        self._entries[team_id] = entry
+        for sort, key in entry.keys.items():
+            bisect.insort(self._order[(sort, 'all')], key)
+            if entry.active:
+                bisect.insort(self._order[(sort, 'active')], key)
+
+    def _remove(self, team_id: int) -> None:
+        entry = self._entries.pop(team_id, None)
+        if entry is None:
+            return
+        for sort, key in entry.keys.items():
+            for filter_ in (('all', 'active') if entry.active else ('all',)):
+                order = self._order[(sort, filter_)]
+                del order[bisect.bisect_left(order, key)]
@@ -0,0 +1,70 @@
+"""
+Closed-form uncertainty propagation for the dashboard statistics.
+
+Every dashboard statistic is a linear combination of independent terms,
+each a clamped ratio num/den with sigma = 1/sqrt(den). For such sums the
+propagated variance is simply sum(coeff**2 * sigma**2), so there is no need
+to build ``uncertainties.ufloat`` objects on the hot path. ``uncertainties``
+is kept as a test-only oracle (see tests/unit/test_uncertainty.py).
+
+An empty term (den == 0) contributes value 0 with infinite sigma, which
+makes the whole combination's sigma infinite, exactly like ufloat(0, inf).
+"""
+import math
+from typing import Optional, Tuple
+
+MIN_STD_DEV = 1e-10  # Minimum standard deviation to avoid zero uncertainty warnings
+
+
+def ratio_term(num: float, den: float) -> Tuple[float, float]:
+    """(value, variance) of a correlation-style ratio clamped to [-1, 1], with variance 1/den."""
+    if den > 0:
+        return max(-1.0, min(1.0, num / den)), 1 / den
+    return 0.0, math.inf
+
+
+def std_dev_or_none(variance: float) -> Optional[float]:
+    """Standard deviation for display; infinite uncertainty is reported as None."""
+    return math.sqrt(variance) if not math.isinf(variance) else None
+
+
+class Estimate:
+    """A nominal value with the variance of a linear combination of independent terms."""
+
+    __slots__ = ('nominal_value', 'variance')
+
+    def __init__(self, nominal_value: float = 0.0, std_dev: float = 0.0) -> None:
+        self.nominal_value = nominal_value
+        self.variance = std_dev * std_dev
+
+    @classmethod
+    def from_ratio(cls, num: float, den: float) -> 'Estimate':
+        estimate = cls()
+        estimate.nominal_value, estimate.variance = ratio_term(num, den)
+        return estimate
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def add(self, other: 'Estimate', coeff: float = 1) -> 'Estimate':
+        """In-place self += coeff * other, for independent terms."""
+        self.nominal_value += coeff * other.nominal_value
+        self.variance += coeff * coeff * other.variance
+        return self
+
+    def scaled(self, factor: float) -> 'Estimate':
+        estimate = Estimate(factor * self.nominal_value)
+        estimate.variance = factor * factor * self.variance
+        return estimate
+
+    def magnitude(self) -> 'Estimate':
+        """|x| with the same uncertainty (sign flip only, as the dashboard has always done)."""
+        if self.nominal_value >= 0:
+            return self
+        estimate = Estimate(-self.nominal_value)
+        estimate.variance = self.variance
+        return estimate
+
+    def std_dev_or_none(self) -> Optional[float]:
+        return std_dev_or_none(self.variance)
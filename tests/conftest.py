@@ -327,3 +327,60 @@ def mock_request():
     mock = MagicMock()
     mock.sid = "test_sid"
     return mock
+
+# Dashboard team factories
+@pytest.fixture
+def make_accumulator():
+    """make_accumulator(seed=0, n_rounds=40, rng=None): a TeamStatsAccumulator of random completed rounds."""
+    import random
+    from src.team_stats import ITEM_VALUES, TeamStatsAccumulator
+
+    def make(seed=0, n_rounds=40, rng=None):
+        rng = rng or random.Random(seed)
+        accumulator = TeamStatsAccumulator()
+        for _ in range(n_rounds):
+            accumulator.record_round(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES), rng.random() < 0.5, rng.random() < 0.5)
+        return accumulator
+    return make
+
+@pytest.fixture
+def make_team_row():
+    """make_team_row(team_id=1, team_name=None, **attributes): a mock Teams row, active and without a creation time."""
+    def make(team_id=1, team_name=None, **attributes):
+        team = MagicMock()
+        team.team_id = team_id
+        team.team_name = team_name or f'Team{team_id}'
+        team.is_active = True
+        team.created_at = None
+        for name, value in attributes.items():
+            setattr(team, name, value)
+        return team
+    return make
+
+@pytest.fixture
+def make_team_payload(make_accumulator):
+    """
+    make_team_payload(team_id, accumulator=None, rng=None, n_rounds=40, **fields): a team entry
+    as get_all_teams builds it, with the classic-mode statistics of the accumulator (by default
+    n_rounds random rounds drawn from rng). fields override entries of the dict.
+    """
+    from src.stats_engine import compute_team_statistics_batch
+    from src.success_rules import CHSH_TABLE
+    from src.team_stats import ITEM_VALUES
+
+    def make(team_id, accumulator=None, rng=None, n_rounds=40, **fields):
+        if accumulator is None:
+            accumulator = make_accumulator(team_id, n_rounds, rng)
+        corr_matrix, success_matrix, classic_stats, new_stats = compute_team_statistics_batch([accumulator], CHSH_TABLE)[0]
+        return {
+            'team_name': f'Team {team_id}', 'team_id': team_id, 'is_active': True,
+            'player1_sid': f'sid-{team_id}-a', 'player2_sid': f'sid-{team_id}-b',
+            'current_round_number': accumulator.rounds_recorded, 'history_hash1': 'a1b2c3d4', 'history_hash2': 'e5f6a7b8',
+            'min_stats_sig': True, 'correlation_matrix': corr_matrix, 'correlation_labels': list(ITEM_VALUES),
+            'correlation_stats': classic_stats, 'classic_stats': classic_stats, 'new_stats': new_stats,
+            'classic_matrix': corr_matrix, 'new_matrix': success_matrix,
+            'created_at': '2026-01-01T00:00:00', 'game_mode': 'classic', 'status': 'active',
+            'data_version': accumulator.rounds_recorded,
+            **fields,
+        }
+    return make
@@ -0,0 +1,105 @@
+"""
+Tests for the dashboard answer log receiving answers in batches (answers_batch events)
+instead of one new_answer_for_dashboard event per answer.
+"""
+import json
+import random
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.state import state
+from src.sockets import dashboard
+from src.sockets.dashboard import (
+    ANSWER_BATCH_INTERVAL,
+    ANSWER_BATCH_MAX_SIZE,
+    flush_dashboard_answers,
+    queue_dashboard_answer,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    dashboard._pending_answers.clear()
+    with patch.object(state, 'dashboard_clients', {'dash1'}), \
+         patch('src.sockets.dashboard.socketio') as mock_socketio:
+        yield mock_socketio
+    dashboard._pending_answers.clear()
+
+
+class TestAnswerBatches:
+
+    def test_queued_answers_are_sent_as_one_compact_batch(self, clean_state):
+        mock_socketio = clean_state
+        with patch('src.sockets.dashboard.time', side_effect=[1000.0, 1000.25, 1000.5]):
+            queue_dashboard_answer(1, 'Alpha', 'abcdefgh12345678', 11, 'A', True)
+            queue_dashboard_answer(2, 'Bravo', 'ijklmnop12345678', 12, 'X', False)
+            queue_dashboard_answer(1, 'Alpha', 'qrstuvwx12345678', 11, 'B', True)
+        mock_socketio.emit.assert_not_called()
+
+        assert flush_dashboard_answers() == 3
+        mock_socketio.emit.assert_called_once_with('answers_batch', {
+            'time': 1000000,
+            'teams': {1: 'Alpha', 2: 'Bravo'},
+            'answers': [
+                [0, 1, 'abcdefgh', 11, 'A', 1],
+                [250, 2, 'ijklmnop', 12, 'X', 0],
+                [500, 1, 'qrstuvwx', 11, 'B', 1],
+            ],
+        }, to='dashboards')
+
+        # Nothing queued since: nothing to send
+        assert flush_dashboard_answers() == 0
+        assert mock_socketio.emit.call_count == 1
+
+    def test_full_batch_is_sent_right_away(self, clean_state):
+        mock_socketio = clean_state
+        for i in range(ANSWER_BATCH_MAX_SIZE):
+            queue_dashboard_answer(1, 'Alpha', f'player{i}', i, 'A', True)
+        event, batch = mock_socketio.emit.call_args[0]
+        assert event == 'answers_batch'
+        assert len(batch['answers']) == ANSWER_BATCH_MAX_SIZE
+        assert dashboard._pending_answers == []
+
+    def test_no_dashboards_queues_nothing(self):
+        with patch.object(state, 'dashboard_clients', set()):
+            queue_dashboard_answer(1, 'Alpha', 'player', 1, 'A', True)
+        assert dashboard._pending_answers == []
+
+    def test_flusher_is_started_once(self, clean_state):
+        mock_socketio = clean_state
+        with patch.object(dashboard, '_answer_batch_flusher_started', False):
+            dashboard._start_answer_batch_flusher()
+            dashboard._start_answer_batch_flusher()
+        mock_socketio.start_background_task.assert_called_once_with(
+            dashboard._answer_batch_flusher_loop, ANSWER_BATCH_INTERVAL)
+
+    def test_messages_and_bytes_at_200_players(self, clean_state):
+        mock_socketio = clean_state
+        rng = random.Random(200)
+        teams = {team_id: f'Team {team_id}' for team_id in range(100)}
+        # 200 players each answering every 2 s: 100 answers/s, here one second's worth
+        answers = [(rng.randrange(100), f'{rng.getrandbits(80):020x}', rng.randrange(1, 500), rng.choice('ABXY'), rng.random() < 0.5)
+                   for _ in range(100)]
+
+        # Before: one event per answer
+        single_bytes = sum(len(json.dumps({
+            'timestamp': datetime.now().isoformat(), 'team_name': teams[team_id], 'team_id': team_id,
+            'player_session_id': player, 'question_round_id': round_id, 'assigned_item': item, 'response_value': response,
+        })) for team_id, player, round_id, item, response in answers)
+
+        # After: answers queued over the second go out every ANSWER_BATCH_INTERVAL
+        per_flush = round(len(answers) * ANSWER_BATCH_INTERVAL)
+        for start in range(0, len(answers), per_flush):
+            for team_id, player, round_id, item, response in answers[start:start + per_flush]:
+                queue_dashboard_answer(team_id, teams[team_id], player, round_id, item, response)
+            flush_dashboard_answers()
+        batches = [c[0][1] for c in mock_socketio.emit.call_args_list]
+        batch_bytes = sum(len(json.dumps(batch)) for batch in batches)
+
+        print(f"\n200 players, {len(answers)} answers/s per dashboard: {len(answers)} events {single_bytes / 1024:.1f} KiB/s "
+              f"-> {len(batches)} batches {batch_bytes / 1024:.1f} KiB/s")
+        assert sum(len(batch['answers']) for batch in batches) == len(answers)
+        assert len(batches) == 1 / ANSWER_BATCH_INTERVAL
+        assert batch_bytes < single_bytes / 3
@@ -0,0 +1,166 @@
+"""
+Tests for the bootstrap confidence intervals and their dashboard integration.
+"""
+import random
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src import bootstrap
+from src.config import app
+from src.state import state
+from src.team_stats import TeamStatsAccumulator, ITEM_VALUES
+from src.stats_engine import compute_classic_statistics_batch
+from src.sockets.dashboard import get_all_teams, force_clear_all_caches
+
+
+def _accumulator(n_rounds, seed=0, correlated=0.85):
+    rng = random.Random(seed)
+    accumulator = TeamStatsAccumulator()
+    for _ in range(n_rounds):
+        p1_answer = rng.random() < 0.5
+        p2_answer = p1_answer if rng.random() < correlated else not p1_answer
+        accumulator.record_round(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES), p1_answer, p2_answer)
+    return accumulator
+
+
+@pytest.fixture(autouse=True)
+def clean_bootstrap_state():
+    bootstrap.clear_intervals()
+    bootstrap._worker_started = False
+    yield
+    bootstrap.clear_intervals()
+    bootstrap._worker_started = False
+
+
+class TestBootstrapIntervals:
+
+    def test_interval_brackets_point_estimate(self):
+        accumulator = _accumulator(200, seed=1)
+        stats = compute_classic_statistics_batch([accumulator])[0]
+        intervals = bootstrap.bootstrap_intervals(accumulator.outcome_counts(), 400, 10.0, seed=3)
+
+        assert intervals['resamples'] == 400
+        assert not intervals['truncated']
+        lo, hi = intervals['chsh_value_interval']
+        assert lo <= stats['cross_term_combination_statistic'] <= hi
+        balanced = (stats['trace_average_statistic'] + stats['same_item_balance']) / 2
+        lo, hi = intervals['balanced_trace_interval']
+        assert lo <= balanced <= hi
+
+    def test_interval_narrows_with_more_rounds(self):
+        small = bootstrap.bootstrap_intervals(_accumulator(40, seed=2).outcome_counts(), 300, 10.0, seed=1)
+        large = bootstrap.bootstrap_intervals(_accumulator(800, seed=2).outcome_counts(), 300, 10.0, seed=1)
+        width = lambda interval: interval[1] - interval[0]
+        assert width(large['chsh_value_interval']) < width(small['chsh_value_interval'])
+
+    def test_seeded_runs_are_reproducible(self):
+        counts = _accumulator(60, seed=4).outcome_counts()
+        assert bootstrap.bootstrap_intervals(counts, 100, 10.0, seed=9) == \
+            bootstrap.bootstrap_intervals(counts, 100, 10.0, seed=9)
+
+    def test_time_budget_truncates(self):
+        counts = _accumulator(100, seed=5).outcome_counts()
+        intervals = bootstrap.bootstrap_intervals(counts, 1_000_000, 0.0)
+        assert intervals['truncated']
+        assert intervals['resamples'] == bootstrap.RESAMPLE_CHUNK
+
+    def test_percentiles_interpolate_symmetrically(self):
+        values = [float(value) for value in range(11)]
+        assert bootstrap._percentile_interval(values, 0.9) == pytest.approx((0.5, 9.5))
+        assert bootstrap._percentile_interval(values, 0.8) == pytest.approx((1.0, 9.0))
+        assert bootstrap._percentile_interval([3.0], 0.95) == (3.0, 3.0)
+
+    def test_no_rounds(self):
+        assert bootstrap.bootstrap_intervals(TeamStatsAccumulator().outcome_counts(), 100, 1.0) is None
+
+
+class TestBootstrapCache:
+
+    def test_schedule_caches_by_version_and_deduplicates(self):
+        counts = _accumulator(50, seed=6).outcome_counts()
+        spawned = []
+        on_done = MagicMock()
+
+        assert bootstrap.schedule_intervals(1, 1, counts, 50, 5.0, spawned.append, on_done)
+        # Already queued for this version
+        assert not bootstrap.schedule_intervals(1, 1, counts, 50, 5.0, spawned.append, on_done)
+        assert spawned == [bootstrap._worker]
+
+        spawned[0]()
+        on_done.assert_called_once_with()
+        assert bootstrap.get_cached_intervals(1, 1)['resamples'] == 50
+        # Another completed round changes the version, so the cached result no longer applies
+        assert bootstrap.get_cached_intervals(1, 2) is None
+        assert bootstrap.latest_intervals(1)['resamples'] == 50
+
+    def test_one_worker_runs_queued_jobs_one_at_a_time(self):
+        counts = _accumulator(50, seed=8).outcome_counts()
+        spawned = []
+        running = []
+
+        def _execute(func, *args):
+            running.append(bootstrap._running)
+            return func(*args)
+
+        for team_id in range(5):
+            bootstrap.schedule_intervals(team_id, 1, counts, 20, 5.0, spawned.append, MagicMock())
+        # A newer version replaces the team's queued job
+        bootstrap.schedule_intervals(0, 2, counts, 20, 5.0, spawned.append, MagicMock())
+        assert len(spawned) == 1
+
+        with patch.object(bootstrap.tpool, 'execute', side_effect=_execute):
+            spawned[0]()
+        assert running == [(0, 2), (1, 1), (2, 1), (3, 1), (4, 1)]
+        assert bootstrap.get_cached_intervals(0, 2) is not None
+        assert not bootstrap._worker_started
+
+        # The next job starts a new worker
+        bootstrap.schedule_intervals(0, 3, counts, 20, 5.0, spawned.append, MagicMock())
+        assert len(spawned) == 2
+
+    def test_get_all_teams_attaches_intervals_when_enabled(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        team = MagicMock(team_id=1, team_name='Team1', is_active=True, created_at=None)
+        state.team_stats[1] = _accumulator(30, seed=7)
+
+        try:
+            with patch.dict(app.config, {'BOOTSTRAP_CI_ENABLED': True, 'BOOTSTRAP_RESAMPLES': 40}), \
+                 patch('src.sockets.dashboard.Teams') as mock_teams, \
+                 patch('src.sockets.dashboard.socketio') as mock_socketio, \
+                 patch('src.sockets.dashboard.schedule_dashboard_team_update') as mock_update:
+                mock_teams.query.all.return_value = [team]
+
+                first = get_all_teams()
+                assert first[0]['bootstrap_ci'] is None
+                func, *args = mock_socketio.start_background_task.call_args[0]
+                func(*args)
+                mock_update.assert_called_once()
+
+                force_clear_all_caches()
+                second = get_all_teams()
+                assert second[0]['bootstrap_ci']['resamples'] == 40
+                assert mock_socketio.start_background_task.call_count == 1
+
+                # A new round keeps the previous intervals on the dashboard while they are recomputed
+                state.team_stats[1].record_round('A', 'X', True, True)
+                force_clear_all_caches()
+                third = get_all_teams()
+                assert third[0]['bootstrap_ci'] is second[0]['bootstrap_ci']
+                assert bootstrap._queue[1][0] == 31
+        finally:
+            force_clear_all_caches()
+            state.team_stats.clear()
+
+    def test_disabled_by_default(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.team_stats[1] = _accumulator(10)
+        team = MagicMock(team_id=1, team_name='Team1', is_active=True, created_at=None)
+        try:
+            with patch('src.sockets.dashboard.Teams') as mock_teams:
+                mock_teams.query.all.return_value = [team]
+                assert 'bootstrap_ci' not in get_all_teams()[0]
+        finally:
+            force_clear_all_caches()
+            state.team_stats.clear()
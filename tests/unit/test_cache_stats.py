@@ -0,0 +1,169 @@
+"""
+Tests for the dashboard cache counters and their debug surfaces.
+"""
+import logging
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import app
+from src.sockets.dashboard import (
+    CacheKey,
+    SelectiveCache,
+    force_clear_all_caches,
+    get_all_teams,
+    get_cache_statistics,
+    invalidate_team_caches,
+    log_cache_statistics,
+    _approx_size,
+    _throttle_cache_stats,
+)
+
+
+class TestSelectiveCacheCounters:
+
+    def test_counts_every_outcome(self):
+        cache = SelectiveCache(maxsize=2, name='test')
+        cache.set(CacheKey('Team1'), 'a')
+        cache.set(CacheKey('Team2'), 'b')
+
+        assert cache.get(CacheKey('Team1')) == 'a'
+        assert cache.get(CacheKey('Team3')) is None
+        assert cache.invalidate_by_team('Team1') == 1
+        assert cache.get(CacheKey('Team1')) == 'a'  # stale but usable
+        assert cache.get(CacheKey('Team1'), allow_stale=False) is None
+        cache.set(CacheKey('Team3'), 'c')  # evicts Team2
+
+        stats = cache.snapshot()
+        assert (stats['hits'], stats['stale_hits'], stats['misses']) == (1, 1, 2)
+        assert (stats['evictions'], stats['invalidations']) == (1, 1)
+        assert stats['hit_rate'] == pytest.approx(0.5)
+        assert stats['entries'] == 2
+
+    def test_approx_bytes_follows_contents(self):
+        cache = SelectiveCache(name='test')
+        empty = cache.snapshot()['approx_bytes']
+        for team in range(20):
+            cache.set(CacheKey(f'Team{team}'), {'matrix': [[team] * 4 for _ in range(4)], 'name': f'Team{team}'})
+        assert cache.snapshot()['approx_bytes'] > empty + 20 * 200
+
+        cache.clear_all()
+        assert cache.snapshot()['invalidations'] == 20
+        assert cache.snapshot()['entries'] == 0
+
+
+class TestByteBudget:
+
+    @staticmethod
+    def _payload(team):
+        return {'matrix': [[float(team + i) for i in range(4)] for _ in range(4)], 'name': f'Team{team}'}
+
+    def test_evicts_least_recently_used_to_stay_within_budget(self, caplog):
+        probe = SelectiveCache()
+        probe.set(CacheKey('Team0'), self._payload(0))
+        entry_bytes = probe.snapshot()['approx_bytes']
+
+        cache = SelectiveCache(name='budgeted', max_bytes=int(entry_bytes * 5.5))
+        with caplog.at_level(logging.WARNING, logger='src.sockets.dashboard'):
+            for team in range(5):
+                cache.set(CacheKey(f'Team{team}'), self._payload(team))
+            cache.get(CacheKey('Team0'))  # Team0 becomes most recently used
+            for team in range(5, 8):
+                cache.set(CacheKey(f'Team{team}'), self._payload(team))
+
+        stats = cache.snapshot()
+        assert stats['approx_bytes'] <= stats['max_bytes']
+        assert stats['entries'] == 5 and stats['evictions'] == 3
+        assert cache.get(CacheKey('Team0')) is not None
+        assert all(cache.get(CacheKey(f'Team{team}')) is None for team in (1, 2, 3))
+        assert cache.invalidate_by_team('Team1') == 0  # evicted keys left the index
+
+        # Eviction pressure is reported, once per interval
+        warnings = [r.getMessage() for r in caplog.records if 'over its' in r.getMessage()]
+        assert len(warnings) == 1 and 'budgeted' in warnings[0]
+
+    def test_footprint_tracks_replacements_and_removals(self):
+        cache = SelectiveCache(max_bytes=10 ** 6)
+        cache.set(CacheKey('Team1'), self._payload(1))
+        single = cache.snapshot()['approx_bytes']
+        cache.set(CacheKey('Team1'), self._payload(2))
+        assert cache.snapshot()['approx_bytes'] == single
+
+        cache.set(CacheKey('Team2'), self._payload(2))
+        cache.invalidate_by_team('Team2')
+        cache.remove_stale_entries()
+        assert cache.snapshot()['approx_bytes'] == single
+        cache.clear_all()
+        assert cache.snapshot()['approx_bytes'] == 0
+
+    def test_entry_larger_than_budget_is_not_cached(self):
+        cache = SelectiveCache(max_bytes=200)
+        cache.set(CacheKey('Team1'), self._payload(1))
+        assert cache.get(CacheKey('Team1')) is None
+        assert cache.snapshot()['approx_bytes'] == 0
+        assert cache.invalidate_by_team('Team1') == 0
+
+
+class TestDashboardCacheStatistics:
+
+    @pytest.fixture(autouse=True)
+    def clean_caches(self):
+        force_clear_all_caches()
+        for stats in _throttle_cache_stats.values():
+            stats.reset()
+        yield
+        force_clear_all_caches()
+
+    def test_throttled_teams_cache_counts_hits_and_stale_hits(self):
+        team = MagicMock(team_id=1, team_name='Alpha', is_active=False, created_at=None)
+        with patch('src.sockets.dashboard.Teams') as mock_teams, \
+             patch('src.sockets.dashboard.PairQuestionRounds'), \
+             patch('src.sockets.dashboard.Answers'):
+            mock_teams.query.all.return_value = [team]
+            get_all_teams()
+            get_all_teams()
+            invalidate_team_caches('Alpha')
+            get_all_teams()
+
+        teams_stats = get_cache_statistics()['throttling']['teams']
+        assert (teams_stats['misses'], teams_stats['hits'], teams_stats['stale_hits']) == (1, 1, 1)
+        assert teams_stats['invalidations'] == 1
+        assert teams_stats['entries'] == 1 and teams_stats['stale']
+
+    def test_sizes_are_recorded_when_caches_are_written(self):
+        teams = [MagicMock(team_id=team_id, team_name=f'Team{team_id}', is_active=False, created_at=None)
+                 for team_id in range(3)]
+        with patch('src.sockets.dashboard.Teams') as mock_teams, \
+             patch('src.sockets.dashboard.PairQuestionRounds'), \
+             patch('src.sockets.dashboard.Answers'):
+            mock_teams.query.all.return_value = teams
+            teams_list = get_all_teams()
+
+        # Statistics read the recorded estimate instead of walking the cached teams
+        with patch('src.sockets.dashboard._approx_size', side_effect=AssertionError('walked the cache')):
+            teams_stats = get_cache_statistics()['throttling']['teams']
+        # Each team is measured on its own, so objects shared between teams count once per team
+        assert teams_stats['approx_bytes'] == sys.getsizeof(teams_list) + sum(_approx_size(team) for team in teams_list)
+        assert teams_stats['approx_bytes'] >= _approx_size(teams_list)
+
+    def test_debug_endpoint_is_off_by_default(self):
+        with patch.dict(app.config, {'DEBUG_ENDPOINTS_ENABLED': False}):
+            assert app.test_client().get('/api/debug/cache_stats').status_code == 404
+
+    def test_debug_endpoint_and_log_line(self, caplog):
+        with patch.dict(app.config, {'DEBUG_ENDPOINTS_ENABLED': True}):
+            response = app.test_client().get('/api/debug/cache_stats')
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert set(payload['selective']) == {'team_hashes', 'correlation_matrix', 'success_metrics',
+                                             'classic_stats', 'success_stats', 'team_process'}
+        assert set(payload['throttling']) == {'teams', 'team_metrics', 'full_metrics'}
+        assert {'hits', 'stale_hits', 'misses', 'evictions', 'invalidations', 'entries', 'approx_bytes'} <= \
+            set(payload['selective']['team_process'])
+
+        with caplog.at_level(logging.INFO, logger='src.sockets.dashboard'):
+            log_cache_statistics()
+        lines = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Dashboard caches')]
+        assert len(lines) == 1
+        assert 'team_process' in lines[0] and 'full_metrics' in lines[0]
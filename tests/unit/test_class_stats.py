@@ -0,0 +1,152 @@
+"""
+Tests for the class-wide pooled statistics.
+"""
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.state import state
+from src.stats_engine import compute_team_statistics_batch
+from src.success_rules import CHSH_TABLE
+from src.team_stats import ITEM_VALUES, PooledOutcomes, TeamStatsAccumulator
+from src.sockets.dashboard import (
+    add_team_to_class_stats,
+    compute_class_statistics,
+    emit_class_stats_update,
+    freeze_team_stats,
+    run_scheduled_class_stats_update,
+    schedule_class_stats_update,
+)
+
+
+def _random_rounds(rng, n_rounds):
+    return [(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES), rng.random() < 0.6, rng.random() < 0.5)
+            for _ in range(n_rounds)]
+
+
+def _accumulator(rounds):
+    accumulator = TeamStatsAccumulator()
+    for round_data in rounds:
+        accumulator.record_round(*round_data)
+    return accumulator
+
+
+class TestPooledOutcomes:
+
+    def test_pool_is_sum_of_members(self):
+        rng = random.Random(1)
+        accumulators = {team_id: _accumulator(_random_rounds(rng, 30)) for team_id in range(5)}
+        pool = PooledOutcomes()
+        for team_id, accumulator in accumulators.items():
+            pool.add_team(team_id, accumulator)
+
+        # Live rounds on members are mirrored; rounds of non-members are ignored
+        for round_data in _random_rounds(rng, 40):
+            team_id = rng.randrange(6)
+            if team_id in accumulators:
+                accumulators[team_id].record_round(*round_data)
+            pool.record_round(team_id, *round_data)
+
+        pool.remove_team(3)
+        expected = [sum(cells) for cells in zip(*(acc.outcome_counts() for team_id, acc in accumulators.items() if team_id != 3))]
+        assert pool.counts == expected
+        assert pool.accumulator().rounds_recorded == sum(expected)
+
+        pool.add_team(3, accumulators[3])
+        pool.add_team(3, accumulators[3])  # adding twice is a no-op
+        assert pool.counts == [sum(cells) for cells in zip(*(acc.outcome_counts() for acc in accumulators.values()))]
+
+    def test_round_update_is_constant_time(self):
+        rng = random.Random(2)
+        small, large = PooledOutcomes(), PooledOutcomes()
+        small.add_team(1, _accumulator(_random_rounds(rng, 10)))
+        for team_id in range(200):
+            large.add_team(team_id, _accumulator(_random_rounds(rng, 50)))
+        rounds = _random_rounds(rng, 5000)
+
+        def _timed(pool):
+            start = time.perf_counter()
+            for round_data in rounds:
+                pool.record_round(1, *round_data)
+            return time.perf_counter() - start
+
+        small_time, large_time = min(_timed(small) for _ in range(3)), min(_timed(large) for _ in range(3))
+        print(f"\n5000 pooled round updates: 1 team {small_time * 1000:.1f}ms, 200 teams {large_time * 1000:.1f}ms")
+        assert large_time < small_time * 5
+
+
+class TestClassStatistics:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.class_stats.clear()
+        yield
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.class_stats.clear()
+        with patch('src.sockets.dashboard.emit_class_stats_update'):
+            run_scheduled_class_stats_update()
+
+    def test_pools_active_teams_only(self):
+        rng = random.Random(3)
+        rounds_a, rounds_b, rounds_c = (_random_rounds(rng, 25) for _ in range(3))
+        state.team_stats.update({1: _accumulator(rounds_a), 2: _accumulator(rounds_b), 3: _accumulator(rounds_c)})
+
+        with patch.object(state, '_game_mode', 'classic'):
+            # Teams join the pool as they become active; team 3 never did
+            add_team_to_class_stats(1)
+            add_team_to_class_stats(2)
+            stats = compute_class_statistics()
+            expected_stats = compute_team_statistics_batch([_accumulator(rounds_a + rounds_b)], CHSH_TABLE)[0][2]
+            assert stats['teams_count'] == 2
+            assert stats['rounds_count'] == 50
+            assert stats['chsh_value'] == pytest.approx(expected_stats['cross_term_combination_statistic'])
+            assert stats['balanced_trace'] == pytest.approx(
+                (expected_stats['trace_average_statistic'] + expected_stats['same_item_balance']) / 2)
+            # Success rates for every mode ride along, so a mode switch needs no recomputation
+            assert set(stats['success_rate_by_mode']) == {'classic', 'simplified', 'aqmjoe'}
+            assert stats['success_rate_by_mode']['classic']['value'] == pytest.approx(
+                compute_team_statistics_batch([_accumulator(rounds_a + rounds_b)], CHSH_TABLE)[0][3]['trace_average_statistic'])
+
+            # Bravo goes inactive: its rounds drop out of the pool without touching the others
+            freeze_team_stats(2)
+            assert compute_class_statistics()['rounds_count'] == 25
+
+    def test_emits_one_event_to_the_dashboards_room(self):
+        state.team_stats[1] = _accumulator([('A', 'X', True, True)] * 4)
+        add_team_to_class_stats(1)
+        with patch.object(state, 'dashboard_clients', {'dash1', 'dash2'}), \
+             patch('src.sockets.dashboard.socketio') as mock_socketio:
+            emit_class_stats_update()
+            assert mock_socketio.emit.call_count == 1
+            assert mock_socketio.emit.call_args[1] == {'to': 'dashboards'}
+            event, payload = mock_socketio.emit.call_args[0]
+            assert event == 'class_stats_update'
+            assert payload['rounds_count'] == 4
+
+    def test_scheduler_sends_one_update_per_tick(self):
+        state.team_stats[1] = _accumulator([('A', 'X', True, True)] * 4)
+        with patch.object(state, 'dashboard_clients', {'dash1'}), \
+             patch('src.sockets.dashboard.socketio') as mock_socketio:
+            # Joining the pool marks the class statistics dirty
+            add_team_to_class_stats(1)
+            assert run_scheduled_class_stats_update()
+            assert not run_scheduled_class_stats_update()
+
+            # Completed rounds only mark them dirty; one event covers them all
+            for _ in range(10):
+                state.class_stats.record_round(1, 'A', 'X', True, True)
+                schedule_class_stats_update()
+            assert mock_socketio.emit.call_count == 1
+            assert run_scheduled_class_stats_update()
+            assert not run_scheduled_class_stats_update()
+            assert mock_socketio.emit.call_count == 2
+            assert mock_socketio.emit.call_args[0][1]['rounds_count'] == 14
+
+            # Re-adding a pooled team is not a change
+            add_team_to_class_stats(1)
+            assert not run_scheduled_class_stats_update()
@@ -194,8 +194,10 @@ class TestMultiClientPerformance:
             elapsed_time = end_time - start_time
             assert elapsed_time < 1.0, f"Emit functions took too long with many clients: {elapsed_time}s"
             
-            # Should emit to all clients
-            assert mock_socketio.emit.call_count >= len(many_clients)
+            # Should reach all clients with one emit per room, not one per client
+            rooms = {c[1]['to'] for c in mock_socketio.emit.call_args_list}
+            assert rooms <= {'dashboards', 'dashboards_streaming', 'dashboards_metrics_only'}
+            assert mock_socketio.emit.call_count <= 5
             
             # get_all_teams should be called minimal times (cached after first call)
             assert mock_get_teams.call_count <= 2, f"get_all_teams called too many times: {mock_get_teams.call_count}"
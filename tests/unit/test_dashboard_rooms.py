@@ -0,0 +1,151 @@
+"""
+Tests for dashboard broadcasts going out as one emit per Socket.IO room instead of
+one emit (and one packet encode) per dashboard client.
+"""
+import json
+import random
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import socketio
+from src.state import state
+from src.sockets.dashboard import (
+    DASHBOARD_ROOM,
+    METRICS_ONLY_ROOM,
+    STREAMING_ROOM,
+    _team_fragments,
+    dashboard_client_teams,
+    emit_dashboard_team_update,
+    force_clear_all_caches,
+    handle_dashboard_disconnect,
+    on_set_teams_streaming,
+    teams_update_fields,
+)
+
+
+def _members(room):
+    return set(socketio.server.manager.rooms.get('/', {}).get(room, {}))
+
+
+@pytest.fixture
+def dashboards():
+    """Connects n fake dashboard sockets; yields connect(n, streaming) -> sids."""
+    manager = socketio.server.manager
+    connected = []
+
+    def connect(n, streaming=True):
+        sids = [manager.connect(f'eio-dash-{len(connected) + i}', '/') for i in range(n)]
+        for sid in sids:
+            state.dashboard_clients.add(sid)
+            with patch('src.sockets.dashboard.request', MagicMock(sid=sid)):
+                on_set_teams_streaming({'enabled': streaming})
+        connected.extend(sids)
+        return sids
+
+    force_clear_all_caches()
+    yield connect
+    for sid in connected:
+        handle_dashboard_disconnect(sid)
+        manager.disconnect(sid, '/')
+    force_clear_all_caches()
+    dashboard_client_teams.clear()
+    _team_fragments.clear()
+
+
+@pytest.fixture
+def deliveries():
+    """Records (eio_sid, payload) for every packet the server sends, and counts packet encodes."""
+    sent = []
+    encode = socketio.server.packet_class.encode
+    with patch.object(socketio.server, '_send_eio_packet', side_effect=lambda eio_sid, pkt: sent.append((eio_sid, pkt.data))), \
+         patch.object(socketio.server.packet_class, 'encode', autospec=True, side_effect=encode) as encodes:
+        yield sent, encodes
+
+
+class TestDashboardRooms:
+
+    def test_rooms_follow_the_streaming_preference(self, dashboards):
+        sid, = dashboards(1, streaming=False)
+        assert sid in _members(DASHBOARD_ROOM) and sid in _members(METRICS_ONLY_ROOM)
+        assert sid not in _members(STREAMING_ROOM)
+
+        with patch('src.sockets.dashboard.request', MagicMock(sid=sid)):
+            on_set_teams_streaming({'enabled': True})
+        assert sid in _members(STREAMING_ROOM) and sid not in _members(METRICS_ONLY_ROOM)
+
+        socketio.server.manager.disconnect(sid, '/')
+        assert sid not in _members(DASHBOARD_ROOM)
+
+    def test_each_client_gets_one_update(self, dashboards, deliveries, make_team_payload):
+        sent, _ = deliveries
+        rng = random.Random(3)
+        teams = [make_team_payload(team_id, rng=rng) for team_id in range(10)]
+        streaming = dashboards(3)
+        metrics_only = dashboards(2, streaming=False)
+        # Two streaming clients already hold the teams; the third needs a snapshot
+        for sid in streaming[:2]:
+            teams_update_fields(sid, teams, 1, {})
+
+        with patch.object(state, 'connected_players', set()), \
+             patch('src.sockets.dashboard.REFRESH_DELAY_QUICK', 0), \
+             patch('src.sockets.dashboard.get_all_teams', return_value=teams), \
+             patch('src.sockets.dashboard.emit_class_stats_update'):
+            emit_dashboard_team_update()
+
+        eio_sids = {sid: socketio.server.manager.eio_sid_from_sid(sid, '/') for sid in streaming + metrics_only}
+        received = {sid: [json.loads(data[1:])[1] for eio_sid, data in sent if eio_sid == eio_sids[sid]]
+                    for sid in eio_sids}
+        assert all(len(payloads) == 1 for payloads in received.values())
+        assert 'teams_patch' in received[streaming[0]][0] and 'teams_patch' in received[streaming[1]][0]
+        assert len(received[streaming[2]][0]['teams']) == 10
+        assert all(received[sid][0]['teams'] == [] for sid in metrics_only)
+
+    @pytest.mark.parametrize('n_dashboards', [1, 5, 20])
+    def test_broadcast_cost(self, dashboards, deliveries, n_dashboards, make_team_payload):
+        sent, encodes = deliveries
+        rng = random.Random(n_dashboards)
+        teams = [make_team_payload(team_id, rng=rng) for team_id in range(100)]
+        sids = dashboards(n_dashboards)
+        answers = {'time': 0, 'teams': {1: 'Team 1'}, 'answers': [[0, 1, 'a1b2c3d4', 1, 'A', 1]]}
+        rounds = 50
+
+        def _emit_per_client(event, groups, room, skip_sids):
+            for payload, group_sids in groups:
+                for sid in group_sids:
+                    socketio.emit(event, payload, to=sid)
+
+        def _per_client():
+            # Before: one emit, and one packet encode, per dashboard
+            with patch('src.sockets.dashboard._emit_grouped', side_effect=_emit_per_client):
+                for _ in range(rounds):
+                    for sid in sids:
+                        socketio.emit('answers_batch', answers, to=sid)
+                    emit_dashboard_team_update()
+
+        def _per_room():
+            for _ in range(rounds):
+                socketio.emit('answers_batch', answers, to=DASHBOARD_ROOM)
+                emit_dashboard_team_update()
+
+        with patch.object(state, 'connected_players', set()), \
+             patch('src.sockets.dashboard.REFRESH_DELAY_QUICK', 0), \
+             patch('src.sockets.dashboard.get_all_teams', return_value=teams), \
+             patch('src.sockets.dashboard.emit_class_stats_update'):
+            emit_dashboard_team_update()  # snapshots; updates after this are patches
+
+            results = {}
+            for name, func in (('per client', _per_client), ('per room', _per_room)):
+                encodes.reset_mock()
+                sent.clear()
+                start = time.perf_counter()
+                func()
+                results[name] = (time.perf_counter() - start, encodes.call_count, len(sent))
+
+        (before, before_encodes, before_sent), (after, after_encodes, after_sent) = results.values()
+        print(f"\n{n_dashboards} dashboards, {rounds} answers: per-client emits {before * 1000:.1f}ms "
+              f"({before_encodes} encodes), room emits {after * 1000:.1f}ms ({after_encodes} encodes)")
+        assert before_sent == after_sent == 2 * rounds * n_dashboards
+        assert before_encodes == 2 * rounds * n_dashboards
+        assert after_encodes == 2 * rounds
@@ -0,0 +1,168 @@
+"""
+Tests for get_all_teams recomputing only the teams whose data changed, and serving
+inactive teams from their frozen final statistics.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.state import state
+from src.sockets import dashboard
+from src.sockets.dashboard import (
+    clear_team_caches,
+    force_clear_all_caches,
+    freeze_team_stats,
+    get_all_teams,
+    invalidate_team_caches,
+    thaw_team_stats,
+)
+
+
+class TestDirtyTeamRefresh:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.leaderboard.clear()
+        yield
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.leaderboard.clear()
+
+    @pytest.fixture
+    def teams(self, make_team_row, make_accumulator):
+        """Three active teams with accumulators; yields the mocked Teams model and a batch spy."""
+        state.team_stats.update({team_id: make_accumulator(team_id) for team_id in (1, 2, 3)})
+        active_teams = {name: {'team_id': team_id, 'players': [f'{name}-1', f'{name}-2'], 'status': 'active'}
+                        for team_id, name in ((1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie'))}
+        batch = MagicMock(side_effect=dashboard.compute_team_statistics_batch)
+        with patch.object(state, 'active_teams', active_teams), \
+             patch.object(state, '_game_mode', 'classic'), \
+             patch('src.sockets.dashboard.REFRESH_DELAY_QUICK', 0), \
+             patch('src.sockets.dashboard.compute_team_statistics_batch', batch), \
+             patch('src.sockets.dashboard.Teams') as mock_teams:
+            mock_teams.query.all.return_value = [make_team_row(1, 'Alpha'), make_team_row(2, 'Bravo'), make_team_row(3, 'Charlie')]
+            yield mock_teams, batch
+
+    def test_only_invalidated_teams_are_recomputed(self, teams):
+        mock_teams, batch = teams
+        first = {team['team_name']: team for team in get_all_teams()}
+        assert len(batch.call_args[0][0]) == 3
+
+        state.team_stats[2].record_round('A', 'X', True, False)
+        invalidate_team_caches('Bravo')
+        second = {team['team_name']: team for team in get_all_teams()}
+
+        # Only Bravo went through the batch engine; the others are the very same dicts
+        assert batch.call_args[0][0] == [state.team_stats[2]]
+        assert second['Alpha'] is first['Alpha']
+        assert second['Charlie'] is first['Charlie']
+        assert second['Bravo'] is not first['Bravo']
+        assert second['Bravo']['data_version'] == first['Bravo']['data_version'] + 1
+        assert [team['team_name'] for team in get_all_teams()] == ['Alpha', 'Bravo', 'Charlie']
+        # The roster was not reloaded for a round
+        assert mock_teams.query.all.call_count == 1
+
+    def test_unchanged_refresh_recomputes_nothing(self, teams):
+        mock_teams, batch = teams
+        first = get_all_teams()
+        second = get_all_teams()
+        assert batch.call_args[0][0] == []
+        assert all(a is b for a, b in zip(first, second))
+        assert mock_teams.query.all.call_count == 1
+
+    def test_membership_change_reloads_the_roster(self, teams, make_team_row, make_accumulator):
+        mock_teams, batch = teams
+        get_all_teams()
+
+        # A new team is invalidated before it is registered as active
+        mock_teams.query.all.return_value = mock_teams.query.all.return_value + [make_team_row(4, 'Delta')]
+        state.team_stats[4] = make_accumulator(4)
+        invalidate_team_caches('Delta')
+        names = [team['team_name'] for team in get_all_teams()]
+
+        assert names == ['Alpha', 'Bravo', 'Charlie', 'Delta']
+        assert mock_teams.query.all.call_count == 2
+        assert batch.call_args[0][0] == [state.team_stats[4]]
+
+    def test_deactivated_team_is_recomputed_from_its_new_row(self, teams, make_team_row):
+        mock_teams, _ = teams
+        get_all_teams()
+
+        del state.active_teams['Charlie']
+        inactive = make_team_row(3, 'Charlie', is_active=False)
+        mock_teams.query.all.return_value = mock_teams.query.all.return_value[:2] + [inactive]
+        invalidate_team_caches('Charlie')
+
+        charlie = {team['team_name']: team for team in get_all_teams()}['Charlie']
+        assert charlie['is_active'] is False
+        assert charlie['status'] == 'inactive'
+
+    def test_clear_recomputes_every_team(self, teams):
+        mock_teams, batch = teams
+        get_all_teams()
+        clear_team_caches()
+        get_all_teams()
+        assert len(batch.call_args[0][0]) == 3
+        assert mock_teams.query.all.call_count == 2
+
+
+class TestFrozenInactiveTeams:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.leaderboard.clear()
+        yield
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.frozen_teams.clear()
+        state.leaderboard.clear()
+
+    @pytest.fixture
+    def teams(self, make_team_row, make_accumulator):
+        """An active team and an inactive one; yields the mocked Teams model and a batch spy."""
+        state.team_stats.update({1: make_accumulator(1), 2: make_accumulator(2)})
+        inactive = make_team_row(2, 'Bravo', is_active=False)
+        batch = MagicMock(side_effect=dashboard.compute_team_statistics_batch)
+        with patch.object(state, 'active_teams', {'Alpha': {'team_id': 1, 'players': ['a1', 'a2'], 'status': 'active'}}), \
+             patch.object(state, '_game_mode', 'classic'), \
+             patch('src.sockets.dashboard.REFRESH_DELAY_QUICK', 0), \
+             patch('src.sockets.dashboard.compute_team_statistics_batch', batch), \
+             patch('src.sockets.dashboard.Teams') as mock_teams:
+            mock_teams.query.all.return_value = [make_team_row(1, 'Alpha'), inactive]
+            yield mock_teams, batch
+
+    def test_inactive_team_is_served_from_its_frozen_statistics(self, teams):
+        _, batch = teams
+        freeze_team_stats(2)
+        frozen = state.frozen_teams[2]
+        clear_team_caches()
+
+        bravo = {team['team_name']: team for team in get_all_teams()}['Bravo']
+        assert batch.call_args[0][0] == [state.team_stats[1]]
+        assert bravo['classic_stats'] is frozen.classic_stats
+        assert (bravo['new_matrix'], bravo['new_stats']) == frozen.success_views['classic']
+        assert (bravo['history_hash1'], bravo['history_hash2']) == frozen.history_hashes
+
+    def test_inactive_team_seen_first_is_frozen_once(self, teams):
+        _, batch = teams
+        get_all_teams()
+        assert 2 in state.frozen_teams and 1 not in state.frozen_teams
+
+        clear_team_caches()
+        get_all_teams()
+        assert batch.call_args[0][0] == [state.team_stats[1]]
+
+    def test_thawed_team_is_recomputed(self, teams):
+        _, batch = teams
+        freeze_team_stats(2)
+        thaw_team_stats(2)
+        assert 2 not in state.frozen_teams
+        get_all_teams()
+        assert state.team_stats[2] in batch.call_args[0][0]
@@ -6,6 +6,7 @@ from unittest.mock import patch, MagicMock
 from src.sockets.dashboard import _process_single_team, _calculate_team_statistics, _calculate_success_statistics
 from src.models.quiz_models import ItemEnum
 from src.game_logic import QUESTION_ITEMS, TARGET_COMBO_REPEATS
+from src.state import state
 
 
 class TestDynamicStatistics:
@@ -288,15 +289,13 @@ class TestDynamicStatistics:
         # Mock the database queries
         with patch('src.sockets.dashboard.PairQuestionRounds') as mock_rounds_model, \
              patch('src.sockets.dashboard.Answers') as mock_answers_model, \
-             patch('src.sockets.dashboard.Teams') as mock_teams_model:
+             patch('src.sockets.dashboard.db') as mock_db:
             
-            # Mock Teams table for session ID mapping
+            # Mock the team row for session ID mapping
             mock_team = MagicMock()
             mock_team.player1_session_id = 'player1_session'
             mock_team.player2_session_id = 'player2_session'
-            mock_teams_query = MagicMock()
-            mock_teams_query.filter_by.return_value.first.return_value = mock_team
-            mock_teams_model.query = mock_teams_query
+            mock_db.session.get.return_value = mock_team
             
             # Mock rounds data - NEW mode pattern (Player 1: A,B; Player 2: X,Y)
             mock_round_1 = MagicMock()
@@ -351,7 +350,8 @@ class TestDynamicStatistics:
             mock_answers_model.query = mock_answers_query
             
             # Call the function with team name and mock the lookup
-            with patch('src.sockets.dashboard._get_team_id_from_name') as mock_get_id:
+            with patch('src.sockets.dashboard._get_team_id_from_name') as mock_get_id, \
+                 patch.object(state, 'team_stats', {}):
                 mock_get_id.return_value = 1
                 result = compute_success_metrics("test_team")
             
@@ -7,6 +7,7 @@ from datetime import datetime
 from flask import request
 from src.config import app, socketio
 from src.sockets.game import on_submit_answer
+from src.sockets.dashboard import flush_dashboard_answers
 from src.state import state
 from src.models.quiz_models import Teams, PairQuestionRounds, Answers, ItemEnum
 from typing import Dict, Any
@@ -211,7 +212,7 @@ def test_dashboard_notifications_on_answer(mock_request_context):
          patch('src.sockets.game.socketio.emit') as mock_socketio_emit, \
          patch('src.sockets.game.db.session') as mock_session, \
          patch('src.sockets.game.PairQuestionRounds') as mock_rounds, \
-         patch('src.sockets.dashboard.emit_dashboard_team_update') as mock_dashboard_update:
+         patch('src.sockets.dashboard.schedule_dashboard_team_update') as mock_dashboard_update:
         
         # Set up valid team state
         test_team = 'Test Team'
@@ -241,33 +242,13 @@ def test_dashboard_notifications_on_answer(mock_request_context):
         }
         on_submit_answer(data)
         
-        # Verify dashboard notifications
-        mock_socketio_emit.assert_any_call(
-            'new_answer_for_dashboard',
-            {
-                'timestamp': ANY,  # We can't predict exact timestamp
-                'team_name': test_team,
-                'team_id': 1,
-                'player_session_id': 'test_sid',
-                'question_round_id': test_round_id,
-                'assigned_item': 'A',
-                'response_value': True
-            },
-            to='dash1'
-        )
-        
-        mock_socketio_emit.assert_any_call(
-            'new_answer_for_dashboard',
-            {
-                'timestamp': ANY,
-                'team_name': test_team,
-                'team_id': 1,
-                'player_session_id': 'test_sid',
-                'question_round_id': test_round_id,
-                'assigned_item': 'A',
-                'response_value': True
-            },
-            to='dash2'
+        # The answer is queued for the dashboards' next answers batch, not emitted on its own
+        assert 'answers_batch' not in [c[0][0] for c in mock_socketio_emit.call_args_list]
+        assert flush_dashboard_answers() == 1
+        mock_socketio_emit.assert_called_with(
+            'answers_batch',
+            {'time': ANY, 'teams': {1: test_team}, 'answers': [[0, 1, 'test_sid', test_round_id, 'A', 1]]},
+            to='dashboards'
         )
         
         # Verify dashboard team update was called
@@ -0,0 +1,177 @@
+"""
+Tests for the incrementally maintained dashboard leaderboard.
+"""
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.leaderboard import Leaderboard
+from src.state import state
+from src.team_stats import TeamStatsAccumulator
+from src.sockets.dashboard import (
+    update_team_leaderboard,
+    rescore_leaderboard,
+    _leaderboard_scores,
+)
+
+
+def _events(events, name):
+    return [payload for event, payload in events if event == name]
+
+
+class TestLeaderboard:
+
+    def test_ranks_follow_scores(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 1.5, 'balanced': 0.4}, True)
+        board.update(2, 'Bravo', {'chsh': 2.1, 'balanced': 0.9}, True)
+        board.update(3, 'Charlie', {'chsh': 0.2, 'balanced': None}, True)
+
+        assert [team_id for team_id, _, _ in board.ordered('chsh')] == [2, 1, 3]
+        assert board.rank('chsh', 3) == 3
+        assert board.rank('balanced', 3) is None
+        assert board.leader('balanced')['team_id'] == 2
+
+    def test_ties_break_on_team_name(self):
+        board = Leaderboard()
+        board.update(1, 'Zulu', {'chsh': 1.0}, True)
+        board.update(2, 'Alpha', {'chsh': 1.0}, True)
+        assert board.leader('chsh')['team_name'] == 'Alpha'
+
+    def test_unchanged_score_produces_no_events(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 1.5}, True)
+        assert board.update(1, 'Alpha', {'chsh': 1.5}, True) == []
+
+    def test_rank_and_leader_events(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 1.5}, True)
+        board.update(2, 'Bravo', {'chsh': 1.0}, True)
+
+        events = board.update(2, 'Bravo', {'chsh': 2.0}, True)
+        assert _events(events, 'rank_changed') == [{
+            'board': 'chsh', 'team_id': 2, 'team_name': 'Bravo',
+            'rank': 1, 'previous_rank': 2, 'value': 2.0,
+        }]
+        assert _events(events, 'leader_changed') == [{
+            'board': 'chsh', 'team_id': 2, 'team_name': 'Bravo', 'value': 2.0, 'previous_team_id': 1,
+        }]
+
+        # A score change that keeps the order reports nothing
+        assert board.update(1, 'Alpha', {'chsh': 1.7}, True) == []
+
+    def test_leader_requires_min_stats_sig(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 1.0}, True)
+        events = board.update(2, 'Bravo', {'chsh': 2.5}, False)
+        # Bravo outranks Alpha but is not eligible for the award yet
+        assert _events(events, 'rank_changed')[0]['rank'] == 1
+        assert _events(events, 'leader_changed') == []
+        assert board.leader('chsh')['team_id'] == 1
+
+        events = board.update(2, 'Bravo', {'chsh': 2.5}, True)
+        assert _events(events, 'rank_changed') == []
+        assert _events(events, 'leader_changed')[0]['team_id'] == 2
+
+    def test_remove(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 1.0}, True)
+        board.update(2, 'Bravo', {'chsh': 2.0}, True)
+
+        events = board.remove(2)
+        assert _events(events, 'rank_changed')[0]['rank'] is None
+        assert _events(events, 'leader_changed')[0]['team_id'] == 1
+        assert 2 not in board
+        assert board.remove(2) == []
+
+    def test_rebuild_reports_leader_changes_only(self):
+        board = Leaderboard()
+        board.update(1, 'Alpha', {'chsh': 2.0, 'balanced': 0.5}, True)
+        board.update(2, 'Bravo', {'chsh': 1.0, 'balanced': 0.9}, True)
+
+        events = board.rebuild([(1, 'Alpha', {'chsh': 0.3, 'balanced': None}, True),
+                                (2, 'Bravo', {'chsh': 0.8, 'balanced': None}, True)])
+        assert _events(events, 'rank_changed') == []
+        assert {payload['board']: payload['team_id'] for _, payload in events} == {'chsh': 2, 'balanced': None}
+
+    def test_matches_full_sort_under_random_updates(self):
+        rng = random.Random(3)
+        board = Leaderboard()
+        scores = {}
+        for _ in range(2000):
+            team_id = rng.randrange(50)
+            scores[team_id] = round(rng.uniform(-2, 3), 2)
+            board.update(team_id, f'Team{team_id:02d}', {'chsh': scores[team_id]}, team_id % 3 == 0)
+
+        expected = sorted(scores, key=lambda team_id: (-scores[team_id], f'Team{team_id:02d}'))
+        assert [team_id for team_id, _, _ in board.ordered('chsh')] == expected
+        assert board.leader('chsh')['team_id'] == next(team_id for team_id in expected if team_id % 3 == 0)
+
+
+class TestDashboardLeaderboard:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        state.team_stats.clear()
+        state.leaderboard.clear()
+        yield
+        state.team_stats.clear()
+        state.leaderboard.clear()
+
+    def _team_info(self, team_id, eligible=True):
+        # Every combination seen often enough (or none at all) for min_stats_sig
+        combos = {(a, b): 10 for a in 'ABXY' for b in 'ABXY'} if eligible else {}
+        return {'team_id': team_id, 'players': ['p1', 'p2'], 'combo_tracker': combos}
+
+    def _accumulator(self, correlated_rounds, anti_rounds=0):
+        accumulator = TeamStatsAccumulator()
+        for _ in range(correlated_rounds):
+            accumulator.record_round('A', 'X', True, True)
+        for _ in range(anti_rounds):
+            accumulator.record_round('B', 'Y', True, True)
+        return accumulator
+
+    def test_scores_follow_game_mode(self):
+        classic = {'cross_term_combination_statistic': 2.2, 'trace_average_statistic': 0.6, 'same_item_balance': 0.8}
+        new = {'trace_average_statistic': 0.75}
+        with patch('src.sockets.dashboard.state', MagicMock(game_mode='classic')):
+            assert _leaderboard_scores(classic, new) == {'chsh': 2.2, 'balanced': pytest.approx(0.7)}
+        with patch('src.sockets.dashboard.state', MagicMock(game_mode='simplified')):
+            assert _leaderboard_scores(classic, new) == {'chsh': 0.75, 'balanced': None}
+
+    def test_update_emits_only_small_events(self):
+        state.team_stats[1] = self._accumulator(10)
+        state.team_stats[2] = self._accumulator(10, anti_rounds=10)
+        active_teams = {'Alpha': self._team_info(1), 'Bravo': self._team_info(2)}
+
+        with patch.object(state, 'active_teams', active_teams), \
+             patch.object(state, 'dashboard_clients', {'dash1'}), \
+             patch.object(state, '_game_mode', 'classic'), \
+             patch('src.sockets.dashboard.socketio') as mock_socketio:
+            update_team_leaderboard('Alpha')
+            update_team_leaderboard('Bravo')
+            events = [c[0][0] for c in mock_socketio.emit.call_args_list]
+            assert set(events) == {'rank_changed', 'leader_changed'}
+            assert all(c[1] == {'to': 'dashboards'} for c in mock_socketio.emit.call_args_list)
+            assert state.leaderboard.leader('chsh')['team_name'] == 'Alpha'
+
+            # Recomputing an unchanged team publishes nothing
+            mock_socketio.emit.reset_mock()
+            update_team_leaderboard('Alpha')
+            mock_socketio.emit.assert_not_called()
+
+            # Switching mode re-scores everyone and reports the new leaders
+            state._game_mode = 'simplified'
+            rescore_leaderboard()
+            assert state.leaderboard.leader('balanced') is None
+            assert state.leaderboard.rank('chsh', 1) is not None
+
+    def test_ineligible_team_gets_no_award(self):
+        state.team_stats[1] = self._accumulator(10)
+        with patch.object(state, 'active_teams', {'Alpha': self._team_info(1, eligible=False)}), \
+             patch.object(state, 'dashboard_clients', set()), \
+             patch.object(state, '_game_mode', 'classic'):
+            update_team_leaderboard('Alpha')
+        assert state.leaderboard.rank('chsh', 1) == 1
+        assert state.leaderboard.leader('chsh') is None
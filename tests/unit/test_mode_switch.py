@@ -0,0 +1,171 @@
+"""
+Tests for switching the game mode without flushing the dashboard caches.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.state import state
+from src.stats_engine import compute_team_statistics_batch
+from src.success_rules import AQMJOE_TABLE, CHSH_TABLE
+from src.sockets.dashboard import (
+    dashboard_client_teams,
+    dashboard_teams_streaming,
+    emit_dashboard_full_update,
+    force_clear_all_caches,
+    get_all_teams,
+    on_change_game_theme,
+    on_set_theme_and_mode,
+    on_toggle_game_mode,
+    team_data_versions,
+)
+
+
+def _dashboard_updates(mock_socketio):
+    """Payloads of the dashboard_update events sent (pre-encoded ones decoded)."""
+    return [json.loads(c[0][1]) if isinstance(c[0][1], str) else c[0][1]
+            for c in mock_socketio.emit.call_args_list if c[0][0] == 'dashboard_update']
+
+
+def _as_sent(value):
+    """A value as the dashboard receives it (tuples become lists)."""
+    return json.loads(json.dumps(value))
+
+
+def _dashboard_teams(mock_socketio):
+    """Teams the dashboard holds after the dashboard_updates sent (a snapshot, then patches)."""
+    updates = _dashboard_updates(mock_socketio)
+    assert updates, 'no dashboard_update was sent'
+    teams = {}
+    for update in updates:
+        if 'teams' in update:
+            teams = {team['team_id']: team for team in update['teams']}
+        else:
+            patch = update['teams_patch']
+            for team_id in patch['removed']:
+                del teams[team_id]
+            for changes in patch['changed']:
+                teams[changes['team_id']] = {**teams.get(changes['team_id'], {}), **changes}
+    return {team['team_name']: team for team in teams.values()}
+
+
+class TestModeSwitch:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.leaderboard.clear()
+        dashboard_teams_streaming['dash1'] = True
+        yield
+        force_clear_all_caches()
+        state.team_stats.clear()
+        state.leaderboard.clear()
+        dashboard_teams_streaming.pop('dash1', None)
+
+    @pytest.fixture
+    def warm_dashboard(self, make_team_row, make_accumulator):
+        """Two teams with accumulators, and dashboard caches filled in classic mode."""
+        state.team_stats.update({1: make_accumulator(1, 60), 2: make_accumulator(2, 60)})
+        active_teams = {
+            'Alpha': {'team_id': 1, 'players': ['p1', 'p2'], 'status': 'active', 'combo_tracker': {}},
+            'Bravo': {'team_id': 2, 'players': ['p3', 'p4'], 'status': 'active', 'combo_tracker': {}},
+        }
+        with patch.object(state, 'active_teams', active_teams), \
+             patch.object(state, 'dashboard_clients', {'dash1'}), \
+             patch.object(state, '_game_mode', 'classic'), \
+             patch.object(state, 'game_theme', 'classic'), \
+             patch('src.sockets.dashboard.request', MagicMock(sid='dash1')), \
+             patch('src.sockets.dashboard.socketio') as mock_socketio, \
+             patch('src.sockets.dashboard.Teams') as mock_teams, \
+             patch('src.sockets.dashboard.Answers') as mock_answers, \
+             patch('src.sockets.dashboard.PairQuestionRounds') as mock_rounds:
+            mock_teams.query.all.return_value = [make_team_row(1, 'Alpha'), make_team_row(2, 'Bravo')]
+            mock_answers.query.count.return_value = 120
+            get_all_teams()
+            emit_dashboard_full_update()
+            assert _dashboard_teams(mock_socketio)['Alpha']['game_mode'] == 'classic'
+
+            for model in (mock_teams, mock_answers, mock_rounds):
+                model.reset_mock()
+            mock_socketio.reset_mock()
+            # The dashboard resyncs, so the next update is a snapshot and later ones patch it
+            dashboard_client_teams.pop('dash1', None)
+            yield mock_socketio, (mock_teams, mock_answers, mock_rounds)
+
+    def test_toggle_reads_nothing_from_the_database(self, warm_dashboard):
+        mock_socketio, models = warm_dashboard
+
+        on_toggle_game_mode()
+        assert state.game_mode == 'simplified'
+        on_set_theme_and_mode({'theme': 'aqmjoe', 'mode': 'aqmjoe'})
+        assert state.game_mode == 'aqmjoe'
+
+        for model in models:
+            assert model.mock_calls == [], model
+
+        # The dashboards still got the view of the new mode, matching a full recomputation
+        teams = _dashboard_teams(mock_socketio)
+        for team_id, team_name in ((1, 'Alpha'), (2, 'Bravo')):
+            expected = compute_team_statistics_batch([state.team_stats[team_id]], AQMJOE_TABLE)[0]
+            assert teams[team_name]['game_mode'] == 'aqmjoe'
+            assert teams[team_name]['new_matrix'] == _as_sent(expected[1])
+            assert teams[team_name]['new_stats'] == _as_sent(expected[3])
+            assert teams[team_name]['classic_stats'] == _as_sent(expected[2])
+
+        # And back again
+        on_set_theme_and_mode({'theme': 'food', 'mode': 'classic'})
+        teams = _dashboard_teams(mock_socketio)
+        expected = compute_team_statistics_batch([state.team_stats[1]], CHSH_TABLE)[0]
+        assert teams['Alpha']['game_mode'] == 'classic'
+        assert teams['Alpha']['new_stats'] == _as_sent(expected[3])
+        for model in models:
+            assert model.mock_calls == [], model
+
+    def test_toggle_moves_the_data_version(self, warm_dashboard):
+        mock_socketio, _ = warm_dashboard
+        version_before = team_data_versions.global_version
+
+        on_toggle_game_mode()
+
+        updates = _dashboard_updates(mock_socketio)
+        assert team_data_versions.global_version > version_before
+        # The switched cache is current under the new version
+        assert updates[-1]['data_version'] == team_data_versions.global_version
+
+    def test_toggle_leaves_earlier_team_dicts_alone(self, warm_dashboard):
+        teams_before = get_all_teams()
+        fields_before = [dict(team) for team in teams_before]
+
+        on_toggle_game_mode()
+
+        # Emits and memos holding the classic teams keep them as they were
+        assert teams_before == fields_before
+        teams_after = get_all_teams()
+        assert [team['game_mode'] for team in teams_after] == ['simplified', 'simplified']
+        assert all(after is not before for after, before in zip(teams_after, teams_before))
+        # The switched teams are reused by the next refresh rather than recomputed
+        with patch('src.sockets.dashboard._last_refresh_time', 0):
+            teams_refreshed = get_all_teams()
+        assert teams_refreshed is not teams_after
+        assert all(refreshed is after for refreshed, after in zip(teams_refreshed, teams_after))
+
+    def test_theme_only_change_leaves_statistics_alone(self, warm_dashboard):
+        mock_socketio, models = warm_dashboard
+
+        with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
+             patch('src.sockets.dashboard.get_all_teams') as mock_get_all_teams:
+            on_change_game_theme({'theme': 'food'})
+            on_set_theme_and_mode({'theme': 'classic', 'mode': 'classic'})
+
+            mock_apply_mode.assert_not_called()
+            mock_get_all_teams.assert_not_called()
+
+        assert state.game_theme == 'classic'
+        assert state.game_mode == 'classic'
+        events = [c[0][0] for c in mock_socketio.emit.call_args_list]
+        assert 'dashboard_update' not in events
+        assert 'game_mode_changed' not in events
+        for model in models:
+            assert model.mock_calls == [], model
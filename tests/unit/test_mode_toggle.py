@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock, call
-from src.sockets.dashboard import on_toggle_game_mode, clear_team_caches, emit_dashboard_full_update, force_clear_all_caches
+from src.sockets.dashboard import on_toggle_game_mode, clear_team_caches, emit_dashboard_full_update
 from src.state import state
 import warnings
 
@@ -78,7 +78,7 @@ def test_toggle_game_mode_new_to_classic(mock_request, mock_state, mock_socketio
     # Setup: Start with new mode
     mock_state.game_mode = 'new'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call the function
@@ -87,11 +87,11 @@ def test_toggle_game_mode_new_to_classic(mock_request, mock_state, mock_socketio
         # Verify mode was changed to classic
         assert mock_state.game_mode == 'classic'
         
-        # FIXED: Verify logger was called with expected message (may have additional calls from force_clear_all_caches)
+        # FIXED: Verify logger was called with expected message
         assert any("Game mode toggled to: classic" in str(call) for call in mock_logger.info.call_args_list)
         
-        # FIXED: Verify force_clear_all_caches was called instead of clear_team_caches
-        mock_clear_cache.assert_called_once()
+        # Verify the cached view was switched to the new mode (no cache flush)
+        mock_apply_mode.assert_called_once()
         
         # Verify all dashboard clients were notified
         mock_socketio.emit.assert_called_with('game_mode_changed', {'mode': 'classic'})
@@ -104,7 +104,7 @@ def test_toggle_game_mode_classic_to_new(mock_request, mock_state, mock_socketio
     # Setup: Start with classic mode
     mock_state.game_mode = 'classic'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call the function
@@ -113,11 +113,11 @@ def test_toggle_game_mode_classic_to_new(mock_request, mock_state, mock_socketio
         # Verify mode was changed to simplified
         assert mock_state.game_mode == 'simplified'
         
-        # FIXED: Verify logger was called with expected message (may have additional calls from force_clear_all_caches)
+        # FIXED: Verify logger was called with expected message
         assert any("Game mode toggled to: simplified" in str(call) for call in mock_logger.info.call_args_list)
         
-        # FIXED: Verify force_clear_all_caches was called instead of clear_team_caches
-        mock_clear_cache.assert_called_once()
+        # Verify the cached view was switched to the new mode (no cache flush)
+        mock_apply_mode.assert_called_once()
         
         # Verify all dashboard clients were notified
         mock_socketio.emit.assert_called_with('game_mode_changed', {'mode': 'simplified'})
@@ -187,9 +187,9 @@ def test_toggle_game_mode_error_handling(mock_request, mock_state, mock_socketio
     """Test error handling during mode toggle"""
     mock_state.game_mode = 'new'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache:
-        # Mock force_clear_all_caches to raise an exception
-        mock_clear_cache.side_effect = Exception("Cache clear failed")
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode:
+        # Mock apply_game_mode_change to raise an exception
+        mock_apply_mode.side_effect = Exception("Cache clear failed")
         
         # Call the function - should handle the exception gracefully
         on_toggle_game_mode()
@@ -243,7 +243,7 @@ def test_game_mode_state_persistence(mock_request, mock_state, mock_socketio, mo
     initial_mode = 'simplified'
     mock_state.game_mode = initial_mode
     
-    with patch('src.sockets.dashboard.force_clear_all_caches'), \
+    with patch('src.sockets.dashboard.apply_game_mode_change'), \
          patch('src.sockets.dashboard.emit_dashboard_full_update'):
         
         # First toggle: simplified -> classic
@@ -258,7 +258,7 @@ def test_game_mode_state_persistence(mock_request, mock_state, mock_socketio, mo
         on_toggle_game_mode()
         assert mock_state.game_mode == 'classic'
         
-        # FIXED: When mocking force_clear_all_caches, only the mode toggle logs are generated (3 calls)
+        # FIXED: When mocking apply_game_mode_change, only the mode toggle logs are generated (3 calls)
         assert mock_logger.info.call_count == 3
         
         # Verify the correct modes were logged
@@ -276,7 +276,7 @@ def test_toggle_game_mode_with_active_teams(mock_request, mock_state, mock_socke
     }
     mock_state.game_mode = 'new'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call the function
@@ -285,8 +285,8 @@ def test_toggle_game_mode_with_active_teams(mock_request, mock_state, mock_socke
         # Verify mode was changed
         assert mock_state.game_mode == 'classic'
         
-        # FIXED: Verify force_clear_all_caches was called (important for recalculating metrics with new mode)
-        mock_clear_cache.assert_called_once()
+        # Verify the cached view was switched (per-mode statistics are kept live)
+        mock_apply_mode.assert_called_once()
         
         # Verify dashboard update was triggered (will recalculate all team metrics)
         mock_full_update.assert_called_once()
@@ -298,16 +298,16 @@ def test_toggle_game_mode_integration_with_dashboard_updates(mock_request, mock_
     # Track if functions were called in correct order
     call_order = []
     
-    def track_clear_cache():
-        call_order.append('clear_cache')
+    def track_apply_mode():
+        call_order.append('apply_mode')
     
     def track_socket_emit(*args, **kwargs):
         call_order.append('socket_emit')
     
-    def track_dashboard_update():
+    def track_dashboard_update(**kwargs):
         call_order.append('dashboard_update')
     
-    with patch('src.sockets.dashboard.force_clear_all_caches', side_effect=track_clear_cache), \
+    with patch('src.sockets.dashboard.apply_game_mode_change', side_effect=track_apply_mode), \
          patch('src.sockets.dashboard.emit_dashboard_full_update', side_effect=track_dashboard_update):
         
         mock_socketio.emit.side_effect = track_socket_emit
@@ -316,14 +316,14 @@ def test_toggle_game_mode_integration_with_dashboard_updates(mock_request, mock_
         on_toggle_game_mode()
         
         # Verify operations happened in correct order
-        assert call_order == ['clear_cache', 'socket_emit', 'dashboard_update']
+        assert call_order == ['apply_mode', 'socket_emit', 'dashboard_update']
 
 def test_toggle_game_mode_invalid_initial_state(mock_request, mock_state, mock_socketio, mock_emit, mock_logger):
     """Test mode toggle with invalid initial state"""
     # Setup with invalid mode
     mock_state.game_mode = 'invalid_mode'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call the function
@@ -332,7 +332,7 @@ def test_toggle_game_mode_invalid_initial_state(mock_request, mock_state, mock_s
         # Should default to 'classic' since it's not 'classic'
         assert mock_state.game_mode == 'classic'
         
-        # FIXED: Verify logger was called with expected message (may have additional calls from force_clear_all_caches)
+        # FIXED: Verify logger was called with expected message
         assert any("Game mode toggled to: classic" in str(call) for call in mock_logger.info.call_args_list)
 
 def test_toggle_game_mode_concurrent_requests(mock_request, mock_state, mock_socketio, mock_emit, mock_logger):
@@ -340,7 +340,7 @@ def test_toggle_game_mode_concurrent_requests(mock_request, mock_state, mock_soc
     # This test simulates rapid successive calls
     mock_state.game_mode = 'new'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call multiple times rapidly
@@ -351,10 +351,10 @@ def test_toggle_game_mode_concurrent_requests(mock_request, mock_state, mock_soc
         # Final state should be classic
         assert mock_state.game_mode == 'classic'
         
-        # FIXED: All operations should have been called multiple times (using force_clear_all_caches)
-        assert mock_clear_cache.call_count == 3
+        # FIXED: All operations should have been called multiple times 
+        assert mock_apply_mode.call_count == 3
         assert mock_full_update.call_count == 3
-        # FIXED: When mocking force_clear_all_caches, only the mode toggle logs are generated (3 calls)
+        # FIXED: When mocking apply_game_mode_change, only the mode toggle logs are generated (3 calls)
         assert mock_logger.info.call_count == 3
         # Updated: expect three broadcast emits
         assert mock_socketio.emit.call_count == 3
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock, call
-from src.sockets.dashboard import on_toggle_game_mode, clear_team_caches, emit_dashboard_full_update, force_clear_all_caches
+from src.sockets.dashboard import on_toggle_game_mode, clear_team_caches, emit_dashboard_full_update
 from src.state import state
 import time
 
@@ -100,7 +100,7 @@ def test_multi_dashboard_mode_sync_immediate_response(mock_request, mock_state,
     mock_state.dashboard_clients = MockSet(['test_dashboard_sid', 'client2', 'client3'])
     mock_state.game_mode = 'simplified'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Call the function
@@ -112,7 +112,7 @@ def test_multi_dashboard_mode_sync_immediate_response(mock_request, mock_state,
         # Verify all clients were notified simultaneously
         mock_socketio.emit.assert_called_with('game_mode_changed', {'mode': 'classic'})
         
-        # FIXED: When mocking force_clear_all_caches, only mode toggle logs occur (1 call)
+        # FIXED: When mocking apply_game_mode_change, only mode toggle logs occur (1 call)
         assert mock_logger.info.call_count == 1
         assert any("Game mode toggled to: classic" in str(call) for call in mock_logger.info.call_args_list)
 
@@ -120,7 +120,7 @@ def test_mode_toggle_race_condition_prevention(mock_request, mock_state, mock_so
     """Test that race conditions are prevented in mode toggle"""
     mock_state.game_mode = 'simplified'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # Simulate rapid successive calls
@@ -130,21 +130,21 @@ def test_mode_toggle_race_condition_prevention(mock_request, mock_state, mock_so
         
         # Each call should process independently without timeout interference
         assert mock_state.game_mode == 'classic'
-        assert mock_clear_cache.call_count == 3
+        assert mock_apply_mode.call_count == 3
         assert mock_full_update.call_count == 3
         
-        # FIXED: When mocking force_clear_all_caches, only mode toggle logs occur (3 calls)
+        # FIXED: When mocking apply_game_mode_change, only mode toggle logs occur (3 calls)
         assert mock_logger.info.call_count == 3
 
 def test_mode_toggle_error_recovery(mock_request, mock_state, mock_socketio, mock_emit, mock_logger):
     """Test error recovery in mode toggle"""
     mock_state.game_mode = 'simplified'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # First call fails
-        mock_clear_cache.side_effect = Exception("Cache error")
+        mock_apply_mode.side_effect = Exception("Cache error")
         on_toggle_game_mode()
         
         # FIXED: Verify error was handled (may have multiple error calls due to internal operations)
@@ -155,7 +155,7 @@ def test_mode_toggle_error_recovery(mock_request, mock_state, mock_socketio, moc
         # Reset mocks and try again - should work
         mock_logger.reset_mock()
         mock_emit.reset_mock()
-        mock_clear_cache.side_effect = None  # Remove error
+        mock_apply_mode.side_effect = None  # Remove error
         
         on_toggle_game_mode()
         
@@ -221,18 +221,18 @@ def test_mode_toggle_idempotency(mock_request, mock_state, mock_socketio, mock_e
     """Test that mode toggle operations are idempotent"""
     mock_state.game_mode = 'simplified'
     
-    with patch('src.sockets.dashboard.force_clear_all_caches') as mock_clear_cache, \
+    with patch('src.sockets.dashboard.apply_game_mode_change') as mock_apply_mode, \
          patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
         
         # First toggle: simplified -> classic
         on_toggle_game_mode()
         first_mode = mock_state.game_mode
-        first_call_count = mock_clear_cache.call_count
+        first_call_count = mock_apply_mode.call_count
         
         # Second toggle: classic -> simplified
         on_toggle_game_mode()
         second_mode = mock_state.game_mode
-        second_call_count = mock_clear_cache.call_count
+        second_call_count = mock_apply_mode.call_count
         
         # Third toggle: simplified -> classic (back to first state)
         on_toggle_game_mode()
@@ -246,7 +246,7 @@ def test_mode_toggle_idempotency(mock_request, mock_state, mock_socketio, mock_e
         
         # Each operation should have called cache clear
         assert second_call_count == first_call_count * 2
-        assert mock_clear_cache.call_count == 3
+        assert mock_apply_mode.call_count == 3
 
         # Updated: expect three broadcast emits
         assert mock_socketio.emit.call_count == 3
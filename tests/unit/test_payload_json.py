@@ -0,0 +1,91 @@
+"""
+Tests for pre-encoded dashboard payloads.
+"""
+import json
+import random
+import time
+
+from socketio import packet
+
+from src import payload_json
+from src.sockets.dashboard import encode_teams, _team_fragment, _team_fragments
+
+
+def _packet(data):
+    return packet.Packet(packet.EVENT, data=['team_status_changed_for_dashboard', data]).encode()
+
+
+class TestPayloadJSON:
+
+    def test_spliced_packets_decode_like_plain_ones(self, make_team_payload):
+        payload_json_module = packet.Packet.json
+        packet.Packet.json = payload_json
+        try:
+            teams = [make_team_payload(team_id, n_rounds=80) for team_id in range(3)]
+            fields = {'teams': teams, 'data_version': 7, 'connected_players_count': 6}
+            encoded = payload_json.encode_object({**fields, 'teams': payload_json.encode_array(
+                payload_json.encode(team) for team in teams)})
+            assert json.loads(_packet(encoded)[1:]) == json.loads(_packet(fields)[1:])
+            # Ordinary payloads are unaffected
+            assert _packet({'a': [1, 2]}) == '2["team_status_changed_for_dashboard",{"a":[1,2]}]'
+        finally:
+            packet.Packet.json = payload_json_module
+
+    def test_team_fragments_are_encoded_once_per_team_dict(self, make_team_payload):
+        _team_fragments.clear()
+        team = make_team_payload(1, n_rounds=80)
+        fragment = _team_fragment(team)
+        assert _team_fragment(team) is fragment
+
+        # A recomputed team is a new dict, encoded afresh
+        recomputed = dict(team, current_round_number=81)
+        assert json.loads(_team_fragment(recomputed))['current_round_number'] == 81
+
+        # A dict whose game mode changed is encoded afresh
+        recomputed['game_mode'] = 'simplified'
+        assert json.loads(_team_fragment(recomputed))['game_mode'] == 'simplified'
+        assert json.loads(encode_teams([team])) == [json.loads(json.dumps(team))]
+        _team_fragments.clear()
+
+    def test_encode_cost_200_teams_5_dashboards(self, make_team_payload):
+        rng = random.Random(5)
+        teams = [make_team_payload(team_id, rng=rng, n_rounds=80) for team_id in range(200)]
+        fields = {'data_version': 7, 'connected_players_count': 400, 'active_teams_count': 200, 'ready_players_count': 400}
+        dashboards = 5
+
+        def _before():
+            # Socket.IO encodes the payload again for every recipient
+            for _ in range(dashboards):
+                _packet({'teams': teams, **fields})
+
+        def _after(changed_teams):
+            # Changed teams are re-encoded; the payload is assembled once and spliced into each packet
+            for team in teams[:changed_teams]:
+                _team_fragments.pop(team['team_id'], None)
+            data = payload_json.encode_object({'teams': encode_teams(teams), **fields})
+            for _ in range(dashboards):
+                _packet(data)
+
+        def _timed(func, *args):
+            best = float('inf')
+            for _ in range(3):
+                start = time.perf_counter()
+                func(*args)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        payload_json_module = packet.Packet.json
+        packet.Packet.json = payload_json
+        try:
+            _team_fragments.clear()
+            before = _timed(_before)
+            cold = _timed(_after, 200)
+            warm = _timed(_after, 5)
+        finally:
+            packet.Packet.json = payload_json_module
+            _team_fragments.clear()
+
+        print(f"\n200 teams x 5 dashboards: per-client encode {before * 1000:.1f}ms, "
+              f"shared payload {cold * 1000:.1f}ms (all teams changed), {warm * 1000:.1f}ms (5 teams changed)")
+        assert cold < before / 2
+        assert warm < before / 5
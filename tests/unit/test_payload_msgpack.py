@@ -0,0 +1,117 @@
+"""
+Tests for the opt-in MessagePack encoding of dashboard teams payloads.
+"""
+import json
+import random
+import time
+from unittest.mock import patch
+
+import msgpack
+import pytest
+from socketio import packet
+
+from src import payload_json, payload_msgpack
+from src.state import state
+from src.sockets.dashboard import (
+    _team_fragments,
+    _team_msgpack_fragments,
+    dashboard_client_encoding,
+    dashboard_client_teams,
+    dashboard_teams_streaming,
+    emit_dashboard_team_update,
+    force_clear_all_caches,
+    teams_update_fields,
+)
+
+
+def _as_sent(value):
+    """A value as a JSON client receives it (tuples become lists)."""
+    return json.loads(json.dumps(value))
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    force_clear_all_caches()
+    dashboard_client_teams.clear()
+    dashboard_client_encoding.clear()
+    yield
+    force_clear_all_caches()
+    dashboard_client_teams.clear()
+    dashboard_client_encoding.clear()
+
+
+class TestPayloadMsgPack:
+
+    @pytest.mark.parametrize('size', [3, 40, 70000])
+    def test_spliced_values_decode_like_plain_ones(self, size):
+        items = list(range(size))
+        fields = {f'key{i}': [i, 0.5, None] for i in range(size)}
+        spliced = payload_msgpack.encode_array(payload_msgpack.encode(item) if item % 2 else item for item in items)
+        assert msgpack.unpackb(spliced) == items
+        spliced = payload_msgpack.encode_object({key: payload_msgpack.encode(value) for key, value in fields.items()})
+        assert msgpack.unpackb(spliced) == fields
+        assert payload_msgpack.encode_object({1: 'a'}) == msgpack.packb({'1': 'a'})
+
+    def test_payload_is_sent_as_a_binary_attachment(self):
+        data = payload_msgpack.encode_object({'teams': payload_msgpack.encode_array([]), 'data_version': 3})
+        encoded = packet.Packet(packet.EVENT, data=['team_status_changed_for_dashboard', data]).encode()
+        assert isinstance(encoded, list) and encoded[1] == data
+        assert msgpack.unpackb(encoded[1]) == {'teams': [], 'data_version': 3}
+
+    def test_clients_get_their_own_encoding(self, make_team_payload):
+        rng = random.Random(4)
+        teams = [make_team_payload(team_id, rng=rng) for team_id in range(5)]
+        dashboard_client_encoding['dash2'] = 'msgpack'
+        with patch.object(state, 'dashboard_clients', {'dash1', 'dash2'}), \
+             patch.object(state, 'connected_players', set()), \
+             patch.dict(dashboard_teams_streaming, {'dash1': True, 'dash2': True}), \
+             patch('src.sockets.dashboard.REFRESH_DELAY_QUICK', 0), \
+             patch('src.sockets.dashboard.get_all_teams', return_value=teams), \
+             patch('src.sockets.dashboard.emit_class_stats_update'), \
+             patch('src.sockets.dashboard.socketio') as mock_socketio:
+            emit_dashboard_team_update()
+            snapshot = list(teams)
+            teams[2] = make_team_payload(2, rng=rng, n_rounds=41)
+            emit_dashboard_team_update()
+
+        sent = {}
+        for c in mock_socketio.emit.call_args_list:
+            payload = c[0][1]
+            decoded = msgpack.unpackb(payload) if isinstance(payload, bytes) else json.loads(payload)
+            sent.setdefault('msgpack' if isinstance(payload, bytes) else 'json', []).append(decoded)
+        # Same snapshot, then the same patch, in either encoding
+        assert sent['msgpack'] == sent['json']
+        assert sent['json'][0]['teams'] == _as_sent(snapshot)
+        changed, = sent['msgpack'][1]['teams_patch']['changed']
+        assert changed['team_id'] == 2 and changed['current_round_number'] == 41
+
+    def test_encode_cost_and_bytes_100_teams(self, make_team_payload):
+        rng = random.Random(100)
+        teams = [make_team_payload(team_id, rng=rng) for team_id in range(100)]
+
+        def _timed(func):
+            best = float('inf')
+            for _ in range(5):
+                _team_fragments.clear()
+                _team_msgpack_fragments.clear()
+                dashboard_client_teams.clear()
+                start = time.perf_counter()
+                payload = func()
+                best = min(best, time.perf_counter() - start)
+            return best, payload
+
+        codecs = {'json-client': payload_json, 'msgpack-client': payload_msgpack}
+        dashboard_client_encoding['msgpack-client'] = 'msgpack'
+
+        def _snapshot(sid):
+            fields = teams_update_fields(sid, teams, 1, {})
+            return codecs[sid].encode_object({**fields, 'connected_players_count': 200})
+
+        json_time, json_payload = _timed(lambda: _snapshot('json-client'))
+        msgpack_time, msgpack_payload = _timed(lambda: _snapshot('msgpack-client'))
+
+        json_bytes = len(json_payload.encode())
+        print(f"\n100-team snapshot: JSON {json_bytes / 1024:.1f} KiB in {json_time * 1000:.1f}ms, "
+              f"MessagePack {len(msgpack_payload) / 1024:.1f} KiB in {msgpack_time * 1000:.1f}ms")
+        assert msgpack.unpackb(msgpack_payload) == json.loads(json_payload)
+        assert len(msgpack_payload) < json_bytes
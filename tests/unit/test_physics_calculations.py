@@ -12,6 +12,7 @@ from src.sockets.dashboard import (
     clear_team_caches
 )
 from src.models.quiz_models import ItemEnum, PairQuestionRounds, Answers
+from src.state import state
 
 try:
     from datetime import UTC
@@ -68,16 +69,16 @@ class TestPhysicsCalculations:
 
     def _compute_correlation_matrix_by_id(self, team_id):
         """Helper method to call compute_correlation_matrix with team_id for backward compatibility"""
+        # The team's accumulator is rebuilt from the mocked rows, not taken from other tests
         with patch('src.sockets.dashboard._get_team_id_from_name') as mock_get_id, \
-             patch('src.sockets.dashboard.Teams') as mock_teams_model:
+             patch('src.sockets.dashboard.db') as mock_db, \
+             patch.object(state, 'team_stats', {}):
             
-            # Mock Teams table for session ID mapping
+            # Mock the team row for session ID mapping
             mock_team = MagicMock()
             mock_team.player1_session_id = 'player1_session'
             mock_team.player2_session_id = 'player2_session'
-            mock_teams_query = MagicMock()
-            mock_teams_query.filter_by.return_value.first.return_value = mock_team
-            mock_teams_model.query = mock_teams_query
+            mock_db.session.get.return_value = mock_team
             
             mock_get_id.return_value = team_id
             return compute_correlation_matrix(f"test_team_{team_id}")
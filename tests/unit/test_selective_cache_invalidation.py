@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import time
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
@@ -11,8 +12,21 @@ from src.sockets.dashboard import (
     selective_cache,
     invalidate_team_caches,
     clear_team_caches,
-    _make_cache_key
+    CacheKey,
+    _make_cache_key,
+    _process_team_cache_key,
+    TeamVersions,
+    team_data_versions,
+    is_teams_cache_stale,
+    on_request_teams_update,
+    dashboard_teams_streaming,
 )
+from src.state import state
+
+
+def _key(team_name, *args):
+    """Cache key of a team-name-first function called with these arguments."""
+    return CacheKey(team_name, args)
 
 
 class TestSelectiveCache:
@@ -66,140 +80,188 @@ class TestSelectiveCache:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
         assert len(cache._cache) == 0
-        assert len(cache._access_order) == 0
-        assert len(cache._stale_keys) == 0
+        assert len(cache._team_keys) == 0
     
     def test_stale_but_usable_behavior(self):
         """Test the new stale-but-usable cache behavior."""
         cache = SelectiveCache()
         
         # Populate cache
-        cache.set("('Team1',)", "data1")
-        cache.set("('Team2',)", "data2")
+        cache.set(_key('Team1'), "data1")
+        cache.set(_key('Team2'), "data2")
         
         # Mark Team1 as stale
         cache.invalidate_by_team("Team1")
         
         # Should return stale data by default
-        assert cache.get("('Team1',)") == "data1"
-        assert cache.get("('Team1',)", allow_stale=True) == "data1"
+        assert cache.get(_key('Team1')) == "data1"
+        assert cache.get(_key('Team1'), allow_stale=True) == "data1"
         
         # Should return None when stale not allowed
-        assert cache.get("('Team1',)", allow_stale=False) is None
+        assert cache.get(_key('Team1'), allow_stale=False) is None
         
         # Should be marked as stale
-        assert cache.is_stale("('Team1',)") == True
+        assert cache.is_stale(_key('Team1')) == True
         
         # Non-stale entries should work normally
-        assert cache.get("('Team2',)") == "data2"
-        assert cache.is_stale("('Team2',)") == False
+        assert cache.get(_key('Team2')) == "data2"
+        assert cache.is_stale(_key('Team2')) == False
     
     def test_remove_stale_entries(self):
         """Test the remove_stale_entries method."""
         cache = SelectiveCache()
         
         # Populate cache
-        cache.set("('Team1',)", "data1")
-        cache.set("('Team2',)", "data2")
-        cache.set("('Team3',)", "data3")
+        cache.set(_key('Team1'), "data1")
+        cache.set(_key('Team2'), "data2")
+        cache.set(_key('Team3'), "data3")
         
         # Mark some as stale
         cache.invalidate_by_team("Team1")
         cache.invalidate_by_team("Team3")
         
         # Verify stale entries exist but are marked stale
-        assert cache.get("('Team1',)") == "data1"  # Stale but returned
-        assert cache.get("('Team3',)") == "data3"  # Stale but returned
-        assert cache.is_stale("('Team1',)") == True
-        assert cache.is_stale("('Team3',)") == True
+        assert cache.get(_key('Team1')) == "data1"  # Stale but returned
+        assert cache.get(_key('Team3')) == "data3"  # Stale but returned
+        assert cache.is_stale(_key('Team1')) == True
+        assert cache.is_stale(_key('Team3')) == True
         
         # Remove stale entries
         removed_count = cache.remove_stale_entries()
         assert removed_count == 2
         
         # Now stale entries should be actually gone
-        assert cache.get("('Team1',)") is None
-        assert cache.get("('Team3',)") is None
+        assert cache.get(_key('Team1')) is None
+        assert cache.get(_key('Team3')) is None
         
         # Non-stale entry should be preserved
-        assert cache.get("('Team2',)") == "data2"
-        assert cache.is_stale("('Team2',)") == False
+        assert cache.get(_key('Team2')) == "data2"
+        assert cache.is_stale(_key('Team2')) == False
         
-        # Stale keys set should be empty
-        assert len(cache._stale_keys) == 0
+        # Nothing stale is left to remove
+        assert cache.remove_stale_entries() == 0
 
 
-class TestTeamKeyMatching:
-    """Test the _is_team_key method for precise team matching."""
+class TestSelectiveCacheIndex:
+    """Test the team index that backs O(1) hits and O(team keys) invalidation."""
     
-    def test_simple_team_name_keys(self):
-        """Test matching simple team name keys."""
-        cache = SelectiveCache()
+    def test_evicted_keys_leave_the_index(self):
+        """Evicted entries can no longer be invalidated or counted."""
+        cache = SelectiveCache(maxsize=2)
+        cache.set(_key('Team1'), "data1")
+        cache.set(_key('Team1', 'extra'), "data1b")
+        cache.set(_key('Team2'), "data2")  # Evicts Team1's first key
         
-        # Exact matches should work
-        assert cache._is_team_key("Team1", "Team1") == True
-        assert cache._is_team_key("TeamAlpha", "TeamAlpha") == True
+        assert cache.invalidate_by_team("Team1") == 1
+        assert cache.is_stale(_key('Team1', 'extra')) == True
+        assert cache._team_keys["Team1"] == {_key('Team1', 'extra')}
         
-        # Substring matches should NOT work
-        assert cache._is_team_key("Team11", "Team1") == False
-        assert cache._is_team_key("Team1_backup", "Team1") == False
-        assert cache._is_team_key("MyTeam1", "Team1") == False
+        cache.remove_stale_entries()
+        assert "Team1" not in cache._team_keys
+        assert cache.invalidate_by_team("Team1") == 0
     
-    def test_function_cache_keys_first_parameter(self):
-        """Test matching function cache keys where team_name is first parameter."""
+    def test_only_the_team_field_indexes_a_key(self):
+        """Other key fields (arguments, game mode) never tie a key to a team."""
         cache = SelectiveCache()
-        
-        # Should match when team_name is first parameter
-        assert cache._is_team_key("('Team1',)", "Team1") == True
-        assert cache._is_team_key("('Team1', 'arg2')", "Team1") == True
-        assert cache._is_team_key("('Team1', 123, True)", "Team1") == True
-        
-        # Should NOT match similar team names
-        assert cache._is_team_key("('Team11',)", "Team1") == False
-        assert cache._is_team_key("('Team11', 'arg2')", "Team1") == False
-        assert cache._is_team_key("('MyTeam1', 'arg2')", "Team1") == False
+        cache.set(CacheKey('Team1', ('Team2',), game_mode='classic'), "data")
+        assert cache.invalidate_by_team("classic") == 0
+        assert cache.invalidate_by_team("Team2") == 0
+        assert cache.invalidate_by_team("Team1") == 1
     
-    def test_function_cache_keys_other_parameters(self):
-        """Test matching function cache keys where team_name is not first parameter."""
+    def test_operations_do_not_scale_with_cache_size(self):
+        """Microbenchmark: hits, misses and invalidations with 1024 entries vs 64 entries."""
+        def _filled(n_entries):
+            cache = SelectiveCache(maxsize=n_entries)
+            for i in range(n_entries):
+                # Four cached functions' worth of keys per team
+                cache.set(_key(f"Team{i // 4}", i % 4), i)
+            return cache
+        
+        def _timed(cache, n_entries):
+            n_teams = n_entries // 4
+            start = time.perf_counter()
+            for i in range(5000):
+                cache.get(_key(f"Team{i % n_teams}", i % 4))  # hit
+                cache.get(_key(f"Missing{i}"))  # miss
+                cache.invalidate_by_team(f"Team{i % n_teams}")
+            return time.perf_counter() - start
+        
+        small, large = _filled(64), _filled(1024)
+        small_time = min(_timed(small, 64) for _ in range(3))
+        large_time = min(_timed(large, 1024) for _ in range(3))
+        print(f"\n5000 hit/miss/invalidate rounds: 64 entries {small_time * 1000:.1f}ms, "
+              f"1024 entries {large_time * 1000:.1f}ms")
+        assert large_time < small_time * 3
+
+
+class TestTeamVersions:
+    """Test the per-team data version counters."""
+    
+    def test_versions_only_increase(self):
+        versions = TeamVersions(initial_global_version=100)
+        assert versions.get('Team1') == 0
+        assert versions.get(None) == 0
+        
+        assert versions.bump('Team1') == 101
+        assert versions.bump('Team1') == 102
+        assert versions.bump('Team2') == 103
+        assert versions.get('Team1') == 2
+        assert versions.get('Team2') == 1
+        
+        # Without a team only the global version moves
+        assert versions.bump() == 104
+        assert versions.get('Team1') == 2
+        
+        versions.clear()
+        assert versions.get('Team1') == 0
+        assert versions.global_version == 105
+    
+    def test_entry_is_current_again_once_rebuilt(self):
+        """A stale entry becomes current when it is set again from fresh data."""
         cache = SelectiveCache()
-        
-        # Should match when team_name appears as other parameters
-        assert cache._is_team_key("('arg1', 'Team1')", "Team1") == True
-        assert cache._is_team_key("('arg1', 'Team1', 'arg3')", "Team1") == True
-        assert cache._is_team_key("(123, 'Team1', True)", "Team1") == True
-        
-        # Should NOT match substring cases
-        assert cache._is_team_key("('arg1', 'Team11')", "Team1") == False
-        assert cache._is_team_key("('arg1', 'MyTeam1')", "Team1") == False
-        assert cache._is_team_key("('arg1', 'Team1_backup')", "Team1") == False
+        cache.set(_key('Team1'), "old")
+        cache.invalidate_by_team('Team1')
+        cache.invalidate_by_team('Team1')
+        assert cache.is_stale(_key('Team1'))
+        
+        cache.set(_key('Team1'), "new")
+        assert not cache.is_stale(_key('Team1'))
+        assert cache.get(_key('Team1'), allow_stale=False) == "new"
+
+
+class TestTeamKeyMatching:
+    """Test that invalidation matches the explicit team field exactly."""
     
-    def test_edge_cases_with_special_characters(self):
-        """Test team names with special characters."""
+    def test_simple_team_name_keys(self):
+        """A plain string key is a simple team_name key."""
         cache = SelectiveCache()
-        
-        # Team names with special regex characters
-        assert cache._is_team_key("('Team.1',)", "Team.1") == True
-        assert cache._is_team_key("('Team+1',)", "Team+1") == True
-        assert cache._is_team_key("('Team[1]',)", "Team[1]") == True
-        assert cache._is_team_key("('Team(1)',)", "Team(1)") == True
-        
-        # Should not match similar names with special chars
-        assert cache._is_team_key("('Team.11',)", "Team.1") == False
-        assert cache._is_team_key("('Team+11',)", "Team+1") == False
+        cache.set("Team1", "data")
+        cache.set("Team11", "data")
+        assert cache.invalidate_by_team("Team1") == 1
+        assert cache.is_stale("Team11") == False
     
-    def test_whitespace_handling(self):
-        """Test handling of whitespace in cache keys."""
+    def test_team_names_with_quotes_and_commas(self):
+        """Names that broke repr()-string matching are just values in a typed key."""
         cache = SelectiveCache()
-        
-        # Should handle whitespace around commas
-        assert cache._is_team_key("('arg1',  'Team1')", "Team1") == True
-        assert cache._is_team_key("('arg1', 'Team1'  )", "Team1") == True
-        assert cache._is_team_key("('Team1'  ,  'arg2')", "Team1") == True
-        
-        # Should not match with whitespace differences in team name
-        assert cache._is_team_key("('Team 1',)", "Team1") == False
-        assert cache._is_team_key("('Team1 ',)", "Team1") == False
-
+        names = ["Team', 'X", 'Team "1"', "Team1,", "Team1)", "O'Brien", "Team1"]
+        for name in names:
+            cache.set(_key(name), name)
+            cache.set(_key(name, 'extra'), name)
+        
+        for name in names:
+            assert cache.invalidate_by_team(name) == 2
+            assert cache.is_stale(_key(name)) == True
+        # Each invalidation touched only its own team
+        assert cache.invalidate_by_team("X") == 0
+        assert cache.invalidate_by_team("Team") == 0
+    
+    def test_keys_without_a_team(self):
+        """Keys with no team are cached but never invalidated by team."""
+        cache = SelectiveCache()
+        cache.set(CacheKey(None, (1, 2)), "data")
+        cache.set(("raw", "tuple"), "data")
+        assert cache.get(CacheKey(None, (1, 2))) == "data"
+        assert cache._team_keys == {}
 
 class TestSelectiveCacheInvalidation:
     """Test the selective cache invalidation functionality."""
@@ -209,40 +271,40 @@ class TestSelectiveCacheInvalidation:
         cache = SelectiveCache()
         
         # Populate cache with different teams
-        cache.set("('Team1',)", "result1")
-        cache.set("('Team2',)", "result2")
-        cache.set("('Team11',)", "result11")  # Similar name that should NOT be invalidated
-        cache.set("('OtherTeam',)", "other")
+        cache.set(_key('Team1'), "result1")
+        cache.set(_key('Team2'), "result2")
+        cache.set(_key('Team11'), "result11")  # Similar name that should NOT be invalidated
+        cache.set(_key('OtherTeam'), "other")
         
         # Invalidate Team1 - should only affect Team1, not Team11
         invalidated = cache.invalidate_by_team("Team1")
         
         assert invalidated == 1
         # With stale-but-usable cache: invalidated entries return stale data by default
-        assert cache.get("('Team1',)") == "result1"  # Returns stale data
-        assert cache.get("('Team1',)", allow_stale=False) is None  # But None when stale not allowed
-        assert cache.is_stale("('Team1',)") == True  # Marked as stale
+        assert cache.get(_key('Team1')) == "result1"  # Returns stale data
+        assert cache.get(_key('Team1'), allow_stale=False) is None  # But None when stale not allowed
+        assert cache.is_stale(_key('Team1')) == True  # Marked as stale
         
         # Non-invalidated entries should work normally and not be stale
-        assert cache.get("('Team2',)") == "result2"  # Preserved
-        assert cache.is_stale("('Team2',)") == False  # Not stale
-        assert cache.get("('Team11',)") == "result11"  # Preserved (this is the key test!)
-        assert cache.is_stale("('Team11',)") == False  # Not stale
-        assert cache.get("('OtherTeam',)") == "other"  # Preserved
-        assert cache.is_stale("('OtherTeam',)") == False  # Not stale
+        assert cache.get(_key('Team2')) == "result2"  # Preserved
+        assert cache.is_stale(_key('Team2')) == False  # Not stale
+        assert cache.get(_key('Team11')) == "result11"  # Preserved (this is the key test!)
+        assert cache.is_stale(_key('Team11')) == False  # Not stale
+        assert cache.get(_key('OtherTeam')) == "other"  # Preserved
+        assert cache.is_stale(_key('OtherTeam')) == False  # Not stale
     
     def test_invalidate_by_team_multiple_entries(self):
         """Test invalidating multiple entries for the same team."""
         cache = SelectiveCache()
         
         # Multiple entries for Team1
-        cache.set("('Team1',)", "hash_result")
-        cache.set("('Team1', 'correlation')", "correlation_result")
-        cache.set("('Team1', 'stats')", "stats_result")
+        cache.set(_key('Team1'), "hash_result")
+        cache.set(_key('Team1', 'correlation'), "correlation_result")
+        cache.set(_key('Team1', 'stats'), "stats_result")
         
         # Entries for other teams
-        cache.set("('Team2',)", "team2_result")
-        cache.set("('Team11', 'stats')", "team11_result")
+        cache.set(_key('Team2'), "team2_result")
+        cache.set(_key('Team11', 'stats'), "team11_result")
         
         # Invalidate Team1
         invalidated = cache.invalidate_by_team("Team1")
@@ -250,25 +312,25 @@ class TestSelectiveCacheInvalidation:
         assert invalidated == 3  # Should invalidate 3 Team1 entries
         
         # With stale-but-usable cache: invalidated entries return stale data by default
-        assert cache.get("('Team1',)") == "hash_result"  # Returns stale data
-        assert cache.get("('Team1', 'correlation')") == "correlation_result"  # Returns stale data
-        assert cache.get("('Team1', 'stats')") == "stats_result"  # Returns stale data
+        assert cache.get(_key('Team1')) == "hash_result"  # Returns stale data
+        assert cache.get(_key('Team1', 'correlation')) == "correlation_result"  # Returns stale data
+        assert cache.get(_key('Team1', 'stats')) == "stats_result"  # Returns stale data
         
         # But return None when stale not allowed
-        assert cache.get("('Team1',)", allow_stale=False) is None
-        assert cache.get("('Team1', 'correlation')", allow_stale=False) is None
-        assert cache.get("('Team1', 'stats')", allow_stale=False) is None
+        assert cache.get(_key('Team1'), allow_stale=False) is None
+        assert cache.get(_key('Team1', 'correlation'), allow_stale=False) is None
+        assert cache.get(_key('Team1', 'stats'), allow_stale=False) is None
         
         # Verify they are marked as stale
-        assert cache.is_stale("('Team1',)") == True
-        assert cache.is_stale("('Team1', 'correlation')") == True
-        assert cache.is_stale("('Team1', 'stats')") == True
+        assert cache.is_stale(_key('Team1')) == True
+        assert cache.is_stale(_key('Team1', 'correlation')) == True
+        assert cache.is_stale(_key('Team1', 'stats')) == True
         
         # Other teams should be preserved and not stale
-        assert cache.get("('Team2',)") == "team2_result"
-        assert cache.is_stale("('Team2',)") == False
-        assert cache.get("('Team11', 'stats')") == "team11_result"
-        assert cache.is_stale("('Team11', 'stats')") == False
+        assert cache.get(_key('Team2')) == "team2_result"
+        assert cache.is_stale(_key('Team2')) == False
+        assert cache.get(_key('Team11', 'stats')) == "team11_result"
+        assert cache.is_stale(_key('Team11', 'stats')) == False
     
     def test_substring_matching_bug_fix(self):
         """
@@ -289,8 +351,8 @@ class TestSelectiveCacheInvalidation:
         
         # Populate cache
         for team_name, description in test_cases:
-            cache.set(f"('{team_name}',)", description)
-            cache.set(f"('{team_name}', 'extra')", f"{description} - extra")
+            cache.set(_key(team_name), description)
+            cache.set(_key(team_name, 'extra'), f"{description} - extra")
         
         # Invalidate Team1
         invalidated = cache.invalidate_by_team("Team1")
@@ -299,23 +361,23 @@ class TestSelectiveCacheInvalidation:
         assert invalidated == 2
         
         # Verify Team1 entries are marked as stale but still return stale data
-        assert cache.get("('Team1',)") == "Team1 should be invalidated"  # Returns stale data
-        assert cache.get("('Team1', 'extra')") == "Team1 should be invalidated - extra"  # Returns stale data
+        assert cache.get(_key('Team1')) == "Team1 should be invalidated"  # Returns stale data
+        assert cache.get(_key('Team1', 'extra')) == "Team1 should be invalidated - extra"  # Returns stale data
         
         # But return None when stale not allowed
-        assert cache.get("('Team1',)", allow_stale=False) is None
-        assert cache.get("('Team1', 'extra')", allow_stale=False) is None
+        assert cache.get(_key('Team1'), allow_stale=False) is None
+        assert cache.get(_key('Team1', 'extra'), allow_stale=False) is None
         
         # Verify they are marked as stale
-        assert cache.is_stale("('Team1',)") == True
-        assert cache.is_stale("('Team1', 'extra')") == True
+        assert cache.is_stale(_key('Team1')) == True
+        assert cache.is_stale(_key('Team1', 'extra')) == True
         
         # Verify all other teams are preserved and NOT stale
         for team_name, description in test_cases[1:]:  # Skip Team1
-            assert cache.get(f"('{team_name}',)") == description
-            assert cache.get(f"('{team_name}', 'extra')") == f"{description} - extra"
-            assert cache.is_stale(f"('{team_name}',)") == False  # Not stale
-            assert cache.is_stale(f"('{team_name}', 'extra')") == False  # Not stale
+            assert cache.get(_key(team_name)) == description
+            assert cache.get(_key(team_name, 'extra')) == f"{description} - extra"
+            assert cache.is_stale(_key(team_name)) == False  # Not stale
+            assert cache.is_stale(_key(team_name, 'extra')) == False  # Not stale
     
     def test_special_characters_in_team_names(self):
         """Test invalidation works correctly with special characters in team names."""
@@ -332,33 +394,33 @@ class TestSelectiveCacheInvalidation:
         
         # Populate cache
         for team in special_teams:
-            cache.set(f"('{team}',)", f"result_{team}")
+            cache.set(_key(team), f"result_{team}")
         
         # Also add similar teams that should NOT be invalidated
-        cache.set("('Team.11',)", "should_not_be_invalidated")
-        cache.set("('Team+11',)", "should_not_be_invalidated")
+        cache.set(_key('Team.11'), "should_not_be_invalidated")
+        cache.set(_key('Team+11'), "should_not_be_invalidated")
         
         # Invalidate Team.1
         invalidated = cache.invalidate_by_team("Team.1")
         assert invalidated == 1
         # With stale-but-usable cache: returns stale data by default
-        assert cache.get("('Team.1',)") == "result_Team.1"  # Returns stale data
-        assert cache.get("('Team.1',)", allow_stale=False) is None  # None when stale not allowed
-        assert cache.is_stale("('Team.1',)") == True  # Marked as stale
+        assert cache.get(_key('Team.1')) == "result_Team.1"  # Returns stale data
+        assert cache.get(_key('Team.1'), allow_stale=False) is None  # None when stale not allowed
+        assert cache.is_stale(_key('Team.1')) == True  # Marked as stale
         # Other team should be preserved and not stale
-        assert cache.get("('Team.11',)") == "should_not_be_invalidated"
-        assert cache.is_stale("('Team.11',)") == False
+        assert cache.get(_key('Team.11')) == "should_not_be_invalidated"
+        assert cache.is_stale(_key('Team.11')) == False
         
         # Invalidate Team+1  
         invalidated = cache.invalidate_by_team("Team+1")
         assert invalidated == 1
         # With stale-but-usable cache: returns stale data by default
-        assert cache.get("('Team+1',)") == "result_Team+1"  # Returns stale data
-        assert cache.get("('Team+1',)", allow_stale=False) is None  # None when stale not allowed
-        assert cache.is_stale("('Team+1',)") == True  # Marked as stale
+        assert cache.get(_key('Team+1')) == "result_Team+1"  # Returns stale data
+        assert cache.get(_key('Team+1'), allow_stale=False) is None  # None when stale not allowed
+        assert cache.is_stale(_key('Team+1')) == True  # Marked as stale
         # Other team should be preserved and not stale
-        assert cache.get("('Team+11',)") == "should_not_be_invalidated"
-        assert cache.is_stale("('Team+11',)") == False
+        assert cache.get(_key('Team+11')) == "should_not_be_invalidated"
+        assert cache.is_stale(_key('Team+11')) == False
 
 
 class TestSelectiveCacheDecorator:
@@ -439,22 +501,42 @@ class TestMakeCacheKey:
     def test_string_arguments(self):
         """Test cache key generation with string arguments."""
         key = _make_cache_key("Team1", "arg2")
-        assert key == "('Team1', 'arg2')"
+        assert key == _key('Team1', 'arg2')
+        assert key.team_name == "Team1"
     
     def test_mixed_arguments(self):
         """Test cache key generation with mixed argument types."""
         key = _make_cache_key("Team1", 123, True, None)
-        assert key == "('Team1', 123, True, None)"
+        assert key == _key('Team1', 123, True, None)
     
     def test_keyword_arguments(self):
         """Test cache key generation with keyword arguments."""
         key = _make_cache_key("Team1", value=123, flag=True)
-        assert key == "('Team1', flag=True, value=123)"
+        assert key == _key('Team1', ('flag', True), ('value', 123))
     
     def test_special_characters(self):
         """Test cache key generation with special characters."""
         key = _make_cache_key("Team.1", "arg+2")
-        assert key == "('Team.1', 'arg+2')"
+        assert key == _key('Team.1', 'arg+2')
+    
+    def test_non_string_first_argument(self):
+        """Without a leading team name the key has no team."""
+        assert _make_cache_key(1, "Team1") == CacheKey(None, (1, "Team1"))
+    
+    def test_custom_key_function(self):
+        """A key function names the team argument explicitly, wherever it is."""
+        positional = _process_team_cache_key(1, 'Team1', True, None, 3, 'p1', 'p2')
+        keyword = _process_team_cache_key(team_id=1, team_name='Team1', is_active=True)
+        assert positional.team_name == keyword.team_name == 'Team1'
+        
+        test_cache = SelectiveCache()
+        
+        @selective_cache(test_cache, key=lambda team_id, team_name: CacheKey(team_name, (team_id,)))
+        def by_id_and_name(team_id, team_name):
+            return f"{team_id}:{team_name}"
+        
+        by_id_and_name(1, 'Team1')
+        assert by_id_and_name.cache_invalidate_team('Team1') == 1
 
 
 class TestIntegrationWithDashboardFunctions:
@@ -477,42 +559,69 @@ class TestIntegrationWithDashboardFunctions:
         from src.sockets.dashboard import _hash_cache, _correlation_cache
         
         # Manually populate some cache entries
-        _hash_cache.set("('Team1',)", ("hash1", "hash2"))
-        _hash_cache.set("('Team11',)", ("hash11", "hash22"))
-        _correlation_cache.set("('Team1',)", "correlation_data")
-        _correlation_cache.set("('Team2',)", "correlation_data_2")
+        _hash_cache.set(_key('Team1'), ("hash1", "hash2"))
+        _hash_cache.set(_key('Team11'), ("hash11", "hash22"))
+        _correlation_cache.set(_key('Team1'), "correlation_data")
+        _correlation_cache.set(_key('Team2'), "correlation_data_2")
         
         # Test selective invalidation
         invalidate_team_caches("Team1")
         
         # With stale-but-usable cache: Team1 caches return stale data by default
-        assert _hash_cache.get("('Team1',)") == ("hash1", "hash2")  # Returns stale data
-        assert _hash_cache.get("('Team1',)", allow_stale=False) is None  # None when stale not allowed
-        assert _hash_cache.is_stale("('Team1',)") == True  # Marked as stale
+        assert _hash_cache.get(_key('Team1')) == ("hash1", "hash2")  # Returns stale data
+        assert _hash_cache.get(_key('Team1'), allow_stale=False) is None  # None when stale not allowed
+        assert _hash_cache.is_stale(_key('Team1')) == True  # Marked as stale
         
-        assert _correlation_cache.get("('Team1',)") == "correlation_data"  # Returns stale data
-        assert _correlation_cache.get("('Team1',)", allow_stale=False) is None  # None when stale not allowed
-        assert _correlation_cache.is_stale("('Team1',)") == True  # Marked as stale
+        assert _correlation_cache.get(_key('Team1')) == "correlation_data"  # Returns stale data
+        assert _correlation_cache.get(_key('Team1'), allow_stale=False) is None  # None when stale not allowed
+        assert _correlation_cache.is_stale(_key('Team1')) == True  # Marked as stale
         
         # Team11 and Team2 should be preserved and not stale
-        assert _hash_cache.get("('Team11',)") == ("hash11", "hash22")  # Should be preserved!
-        assert _hash_cache.is_stale("('Team11',)") == False  # Not stale
-        assert _correlation_cache.get("('Team2',)") == "correlation_data_2"  # Should be preserved!
-        assert _correlation_cache.is_stale("('Team2',)") == False  # Not stale
+        assert _hash_cache.get(_key('Team11')) == ("hash11", "hash22")  # Should be preserved!
+        assert _hash_cache.is_stale(_key('Team11')) == False  # Not stale
+        assert _correlation_cache.get(_key('Team2')) == "correlation_data_2"  # Should be preserved!
+        assert _correlation_cache.is_stale(_key('Team2')) == False  # Not stale
     
     def test_clear_team_caches_function(self):
         """Test the global clear_team_caches function."""
         from src.sockets.dashboard import _hash_cache, _correlation_cache
         
         # Populate caches
-        _hash_cache.set("('Team1',)", "data1")
-        _hash_cache.set("('Team2',)", "data2")
-        _correlation_cache.set("('Team1',)", "corr1")
+        _hash_cache.set(_key('Team1'), "data1")
+        _hash_cache.set(_key('Team2'), "data2")
+        _correlation_cache.set(_key('Team1'), "corr1")
         
         # Clear all caches
         clear_team_caches()
         
         # Verify all caches are empty
-        assert _hash_cache.get("('Team1',)") is None
-        assert _hash_cache.get("('Team2',)") is None
-        assert _correlation_cache.get("('Team1',)") is None
\ No newline at end of file
+        assert _hash_cache.get(_key('Team1')) is None
+        assert _hash_cache.get(_key('Team2')) is None
+        assert _correlation_cache.get(_key('Team1')) is None    
+    def test_invalidate_team_caches_bumps_data_versions(self):
+        """Answers, rounds and membership changes all go through invalidate_team_caches."""
+        team_version = team_data_versions.get('Team1')
+        global_version = team_data_versions.global_version
+        
+        invalidate_team_caches('Team1')
+        
+        assert team_data_versions.get('Team1') == team_version + 1
+        assert team_data_versions.global_version == global_version + 1
+        assert is_teams_cache_stale()
+    
+    def test_request_teams_update_skips_current_version(self):
+        """A dashboard that already has the current data version is sent nothing."""
+        dashboard_teams_streaming['dash1'] = True
+        try:
+            with patch.object(state, 'dashboard_clients', {'dash1'}), \
+                 patch('src.sockets.dashboard.request', MagicMock(sid='dash1')), \
+                 patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
+                on_request_teams_update({'version': team_data_versions.global_version})
+                mock_full_update.assert_not_called()
+                
+                on_request_teams_update({'version': team_data_versions.global_version - 1})
+                on_request_teams_update({'version': None})
+                on_request_teams_update()
+                assert mock_full_update.call_count == 3
+        finally:
+            dashboard_teams_streaming.pop('dash1', None)
@@ -0,0 +1,112 @@
+"""
+Tests for the batch statistics engine: parity with the per-team ufloat
+calculations and a timing comparison at 10/100/1000 teams.
+"""
+import random
+import time
+import pytest
+from unittest.mock import patch
+
+from src.team_stats import TeamStatsAccumulator, ITEM_VALUES
+from src.stats_engine import compute_team_statistics_batch, freeze_team_statistics
+from src.success_rules import SUCCESS_TABLES
+from src.sockets.dashboard import (
+    _calculate_team_statistics_from_data,
+    _calculate_success_statistics_from_data,
+    _current_success_table,
+)
+
+
+def _random_accumulator(rng, n_rounds, items1=ITEM_VALUES, items2=ITEM_VALUES):
+    accumulator = TeamStatsAccumulator()
+    for _ in range(n_rounds):
+        accumulator.record_round(rng.choice(items1), rng.choice(items2),
+                                 rng.random() < 0.5, rng.random() < 0.5)
+    return accumulator
+
+
+def _random_accumulators(n_teams, seed=0):
+    rng = random.Random(seed)
+    accumulators = [TeamStatsAccumulator()]  # a team with no completed rounds
+    accumulators.append(_random_accumulator(rng, 1))  # a single round: most cells empty
+    accumulators.append(_random_accumulator(rng, 40, ['A', 'B'], ['X', 'Y']))  # no same-item rounds
+    while len(accumulators) < n_teams:
+        accumulators.append(_random_accumulator(rng, rng.randint(1, 200)))
+    return accumulators[:n_teams]
+
+
+def _per_team_statistics(accumulators):
+    return [(_calculate_team_statistics_from_data(acc.correlation_result()),
+             _calculate_success_statistics_from_data(acc.success_result(_current_success_table())))
+            for acc in accumulators]
+
+
+def _assert_stats_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, expected_value in expected.items():
+        if expected_value is None:
+            assert actual[key] is None, key
+        else:
+            assert actual[key] == pytest.approx(expected_value, rel=1e-9, abs=1e-12), key
+
+
+class TestBatchParity:
+
+    @pytest.mark.parametrize('game_mode', ['classic', 'simplified', 'aqmjoe'])
+    def test_matches_per_team_calculations(self, game_mode):
+        accumulators = _random_accumulators(60, seed=11)
+
+        with patch('src.sockets.dashboard.state') as mock_state:
+            mock_state.game_mode = game_mode
+            expected = _per_team_statistics(accumulators)
+            results = compute_team_statistics_batch(accumulators, _current_success_table())
+            success_results = [acc.success_result(_current_success_table()) for acc in accumulators]
+
+        assert len(results) == len(accumulators)
+        for acc, success_result, (classic_matrix, success_matrix, classic_stats, new_stats), (exp_classic, exp_new) \
+                in zip(accumulators, success_results, results, expected):
+            assert classic_matrix == acc.correlation_result()[0]
+            assert success_matrix == success_result[0]
+            _assert_stats_equal(classic_stats, exp_classic)
+            _assert_stats_equal(new_stats, exp_new)
+
+    def test_empty_team_reports_infinite_uncertainties_as_none(self):
+        (_, _, classic_stats, new_stats), = compute_team_statistics_batch([TeamStatsAccumulator()], _current_success_table())
+        assert classic_stats['trace_average_statistic'] == 0.0
+        assert classic_stats['trace_average_statistic_uncertainty'] is None
+        assert classic_stats['chsh_value_statistic_uncertainty'] is None
+        assert classic_stats['same_item_balance_uncertainty'] is None
+        assert new_stats['trace_average_statistic_uncertainty'] is None
+        assert new_stats['chsh_value_statistic'] == 0.0
+
+    def test_no_teams(self):
+        assert compute_team_statistics_batch([], _current_success_table()) == []
+
+    def test_frozen_statistics_match_every_mode(self):
+        accumulator = _random_accumulator(random.Random(3), 120)
+        frozen = freeze_team_statistics(accumulator, SUCCESS_TABLES)
+        assert frozen.history_hashes == accumulator.history.hexdigests()
+        for mode, success_table in SUCCESS_TABLES.items():
+            assert frozen.batch_result(mode) == compute_team_statistics_batch([accumulator], success_table)[0]
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+class TestBatchBenchmark:
+
+    @pytest.mark.parametrize('n_teams', [10, 100, 1000])
+    def test_batch_faster_than_per_team_ufloat(self, n_teams):
+        accumulators = _random_accumulators(n_teams, seed=n_teams)
+
+        # Best of three runs, so a GC pause under a loaded test run does not flip the comparison
+        per_team_time = min(_timed(_per_team_statistics, accumulators) for _ in range(3))
+        batch_time = min(_timed(compute_team_statistics_batch, accumulators, _current_success_table()) for _ in range(3))
+
+        print(f"\n{n_teams} teams: per-team {per_team_time * 1000:.1f}ms, "
+              f"batch {batch_time * 1000:.1f}ms ({per_team_time / batch_time:.1f}x)")
+        if n_teams >= 100:
+            assert batch_time < per_team_time
@@ -0,0 +1,76 @@
+"""
+Tests for the precompiled success-rule tables, checked against the
+string-based rules they replace.
+"""
+import itertools
+from unittest.mock import patch
+
+import pytest
+
+from src.success_rules import (
+    AQMJOE_TABLE,
+    CHSH_TABLE,
+    CORRELATION_SIGN,
+    SUCCESS_TABLES,
+    is_successful,
+    success_table_for_mode,
+)
+from src.team_stats import ITEM_VALUES
+from src.sockets.dashboard import _is_round_successful
+
+ALL_ROUNDS = list(itertools.product(ITEM_VALUES, ITEM_VALUES, (False, True), (False, True)))
+
+
+def _reference_chsh(p1_item, p2_item, p1_answer, p2_answer):
+    is_by_combination = (p1_item == 'B' and p2_item == 'Y') or (p1_item == 'Y' and p2_item == 'B')
+    return (p1_answer != p2_answer) if is_by_combination else (p1_answer == p2_answer)
+
+
+def _reference_aqmjoe(p1_item, p2_item, p1_answer, p2_answer):
+    def label(item, answer):
+        if item in ('A', 'B'):
+            return 'Green' if answer else 'Red'
+        return 'Peas' if answer else 'Carrots'
+
+    l1, l2 = label(p1_item, p1_answer), label(p2_item, p2_answer)
+    p1_is_color, p2_is_color = p1_item in ('A', 'B'), p2_item in ('A', 'B')
+    if not p1_is_color and not p2_is_color:
+        return not (l1 == 'Peas' and l2 == 'Peas')
+    if p1_is_color and not p2_is_color:
+        return l2 == 'Peas' if l1 == 'Green' else l2 == 'Carrots'
+    if p2_is_color and not p1_is_color:
+        return l1 == 'Peas' if l2 == 'Green' else l1 == 'Carrots'
+    return True
+
+
+@pytest.mark.parametrize('table,reference', [(CHSH_TABLE, _reference_chsh), (AQMJOE_TABLE, _reference_aqmjoe)])
+def test_tables_match_reference_rules(table, reference):
+    for round_data in ALL_ROUNDS:
+        assert is_successful(table, *round_data) == reference(*round_data), round_data
+
+
+def test_every_mode_has_a_complete_table():
+    for mode, table in SUCCESS_TABLES.items():
+        assert len(table) == 4 and all(len(row) == 4 for row in table), mode
+        assert all(isinstance(rule[a1][a2], bool) for row in table for rule in row
+                   for a1 in (0, 1) for a2 in (0, 1)), mode
+
+
+def test_mode_lookup():
+    assert success_table_for_mode('classic') is CHSH_TABLE
+    assert success_table_for_mode('simplified') is CHSH_TABLE
+    assert success_table_for_mode('aqmjoe') is AQMJOE_TABLE
+    assert success_table_for_mode('new') is CHSH_TABLE
+
+
+def test_correlation_sign():
+    for a1, a2 in itertools.product((False, True), repeat=2):
+        assert CORRELATION_SIGN[a1][a2] == (1 if a1 == a2 else -1)
+
+
+@pytest.mark.parametrize('game_mode,reference', [('classic', _reference_chsh), ('aqmjoe', _reference_aqmjoe)])
+def test_dashboard_rule_follows_game_mode(game_mode, reference):
+    with patch('src.sockets.dashboard.state') as mock_state:
+        mock_state.game_mode = game_mode
+        for round_data in ALL_ROUNDS:
+            assert _is_round_successful(*round_data) == reference(*round_data)
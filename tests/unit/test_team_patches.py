@@ -0,0 +1,150 @@
+"""
+Tests for delta-encoded dashboard team updates: a snapshot first, then patches with
+only the changed teams and fields.
+"""
+import json
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.state import state
+from src.team_stats import ITEM_VALUES, TeamStatsAccumulator
+from src import payload_json
+from src.sockets.dashboard import (
+    _team_fragments,
+    dashboard_client_teams,
+    dashboard_teams_streaming,
+    on_request_teams_update,
+    teams_update_fields,
+)
+
+
+def _play(accumulator, rng, n_rounds=1):
+    for _ in range(n_rounds):
+        accumulator.record_round(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES), rng.random() < 0.5, rng.random() < 0.5)
+
+
+def _decoded(fields):
+    return json.loads(payload_json.encode_object(fields))
+
+
+def _apply(held, fields):
+    """What dashboard.js does with a payload: replace on a snapshot, merge a patch."""
+    if 'teams' in fields:
+        return {team['team_id']: team for team in fields['teams']}
+    teams_patch = fields['teams_patch']
+    teams = {team_id: team for team_id, team in held.items() if team_id not in teams_patch['removed']}
+    for changes in teams_patch['changed']:
+        teams[changes['team_id']] = {**teams.get(changes['team_id'], {}), **changes}
+    return teams
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    dashboard_client_teams.clear()
+    _team_fragments.clear()
+    yield
+    dashboard_client_teams.clear()
+    _team_fragments.clear()
+
+
+@pytest.fixture
+def game(make_team_payload):
+    rng = random.Random(7)
+    accumulators = {team_id: TeamStatsAccumulator() for team_id in range(1, 6)}
+    for accumulator in accumulators.values():
+        _play(accumulator, rng, 30)
+    teams = [make_team_payload(team_id, accumulator) for team_id, accumulator in accumulators.items()]
+    return rng, accumulators, teams
+
+
+class TestTeamPatches:
+
+    def test_snapshot_then_patch_of_changed_fields(self, game, make_team_payload):
+        rng, accumulators, teams = game
+        first = _decoded(teams_update_fields('dash1', teams, 10, {}))
+        assert first['data_version'] == 10
+        held = _apply({}, first)
+        assert list(held) == [1, 2, 3, 4, 5]
+
+        # Team 3 plays a round and is recomputed into a new dict
+        _play(accumulators[3], rng)
+        teams = teams[:2] + [make_team_payload(3, accumulators[3])] + teams[3:]
+        second = _decoded(teams_update_fields('dash1', teams, 11, {}))
+
+        assert 'teams' not in second
+        assert second['data_version'] == 11
+        assert second['teams_patch']['base_version'] == 10
+        changed, = second['teams_patch']['changed']
+        assert changed['team_id'] == 3
+        assert 'team_name' not in changed and 'created_at' not in changed
+        assert changed['current_round_number'] == 31
+        assert _apply(held, second) == {team['team_id']: json.loads(json.dumps(team)) for team in teams}
+
+    def test_nothing_changed_sends_an_empty_patch(self, game):
+        _, _, teams = game
+        teams_update_fields('dash1', teams, 10, {})
+        fields = _decoded(teams_update_fields('dash1', teams, 10, {}))
+        assert fields['teams_patch'] == {'base_version': 10, 'changed': [], 'removed': []}
+
+    def test_removed_and_new_teams(self, game, make_team_payload):
+        rng, accumulators, teams = game
+        held = _apply({}, _decoded(teams_update_fields('dash1', teams, 10, {})))
+
+        accumulators[6] = TeamStatsAccumulator()
+        teams = teams[1:] + [make_team_payload(6, accumulators[6])]
+        fields = _decoded(teams_update_fields('dash1', teams, 11, {}))
+        assert fields['teams_patch']['removed'] == [1]
+        assert [team['team_id'] for team in fields['teams_patch']['changed']] == [6]
+        assert list(_apply(held, fields)) == [2, 3, 4, 5, 6]
+
+    def test_clients_holding_the_same_teams_share_a_payload(self, game, make_team_payload):
+        rng, accumulators, teams = game
+        memo = {}
+        assert teams_update_fields('dash1', teams, 10, memo) is teams_update_fields('dash2', teams, 10, memo)
+
+        # dash3 joins late and gets a snapshot; the others get the same patch
+        _play(accumulators[1], rng)
+        teams = [make_team_payload(1, accumulators[1])] + teams[1:]
+        memo = {}
+        patch_1 = teams_update_fields('dash1', teams, 11, memo)
+        assert teams_update_fields('dash2', teams, 11, memo) is patch_1
+        assert 'teams' in teams_update_fields('dash3', teams, 11, memo)
+
+    def test_resync_request_gets_a_snapshot(self, game):
+        _, _, teams = game
+        teams_update_fields('dash1', teams, 10, {})
+        with patch.object(state, 'dashboard_clients', {'dash1'}), \
+             patch.dict(dashboard_teams_streaming, {'dash1': True}), \
+             patch('src.sockets.dashboard.request', MagicMock(sid='dash1')), \
+             patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
+            on_request_teams_update({'version': None})
+        mock_full_update.assert_called_once_with(client_sid='dash1')
+        assert 'dash1' not in dashboard_client_teams
+        assert 'teams' in teams_update_fields('dash1', teams, 11, {})
+
+    def test_bytes_per_second_at_100_teams(self, make_team_payload):
+        rng = random.Random(100)
+        accumulators = {team_id: TeamStatsAccumulator() for team_id in range(100)}
+        for accumulator in accumulators.values():
+            _play(accumulator, rng, 40)
+        teams = [make_team_payload(team_id, accumulator) for team_id, accumulator in accumulators.items()]
+        teams_update_fields('dash1', teams, 0, {})
+
+        # Every answer changes one team's statistics and triggers an update
+        answers = 200
+        snapshot_bytes = patch_bytes = 0
+        for version in range(1, answers + 1):
+            team_id = rng.randrange(100)
+            _play(accumulators[team_id], rng)
+            teams[team_id] = make_team_payload(team_id, accumulators[team_id])
+            snapshot_bytes += len(payload_json.encode_object({'teams': payload_json.encode_array(teams), 'data_version': version}))
+            patch_bytes += len(payload_json.encode_object(teams_update_fields('dash1', teams, version, {})))
+
+        answers_per_second = 10
+        before = snapshot_bytes / answers * answers_per_second
+        after = patch_bytes / answers * answers_per_second
+        print(f"\n100 teams at {answers_per_second} answers/s, per streaming dashboard: "
+              f"full snapshots {before / 1024:.0f} KiB/s, patches {after / 1024:.1f} KiB/s")
+        assert after < before / 20
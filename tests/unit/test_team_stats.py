@@ -0,0 +1,388 @@
+"""
+Tests for the in-memory per-team statistics accumulators.
+"""
+import hashlib
+import random
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.config import app
+from src.state import state
+from src.team_stats import TeamStatsAccumulator, TeamHistoryHash, ITEM_VALUES
+from src.stats_engine import compute_team_statistics_batch
+from src.success_rules import CHSH_TABLE, is_successful, success_table_for_mode
+from src.sockets.dashboard import (
+    _compute_team_hashes_optimized,
+    _compute_team_metrics_fused,
+    get_all_teams,
+    force_clear_all_caches,
+    compute_team_range_statistics,
+    on_request_team_details,
+)
+
+
+@pytest.fixture
+def team(make_team_row):
+    """A mock Teams row whose players are the 'p1'/'p2' sessions of _make_rows."""
+    return make_team_row(player1_session_id='p1', player2_session_id='p2')
+
+
+def _make_rows(n_rounds, seed=0, team_id=1):
+    """Random rounds/answers, including a few incomplete rounds that must be skipped."""
+    rng = random.Random(seed)
+    rounds, answers = [], []
+    for round_id in range(1, n_rounds + 1):
+        round_obj = MagicMock()
+        round_obj.round_id = round_id
+        round_obj.team_id = team_id
+        round_obj.player1_item.value = rng.choice(ITEM_VALUES)
+        round_obj.player2_item.value = rng.choice(ITEM_VALUES)
+        rounds.append(round_obj)
+        for sid in ('p1', 'p2'):
+            if sid == 'p2' and round_id % 7 == 0:
+                continue  # incomplete round
+            answer = MagicMock()
+            answer.question_round_id = round_id
+            answer.team_id = team_id
+            answer.player_session_id = sid
+            answer.assigned_item.value = (round_obj.player1_item if sid == 'p1' else round_obj.player2_item).value
+            answer.response_value = rng.random() < 0.5
+            answers.append(answer)
+    return rounds, answers
+
+
+class TestTeamStatsAccumulator:
+
+    @pytest.mark.parametrize('game_mode', ['classic', 'simplified', 'aqmjoe'])
+    def test_matches_full_history_computation(self, game_mode, team):
+        rounds, answers = _make_rows(300, seed=42)
+        success_table = success_table_for_mode(game_mode)
+
+        # Tally the completed rounds straight from the rows
+        responses = {}
+        for answer in answers:
+            responses.setdefault(answer.question_round_id, {})[answer.player_session_id] = answer.response_value
+        pair_counts = {(i, j): 0 for i in ITEM_VALUES for j in ITEM_VALUES}
+        correlation_sums, success_counts = dict(pair_counts), dict(pair_counts)
+        for round_obj in rounds:
+            answered = responses.get(round_obj.round_id, {})
+            if len(answered) != 2:
+                continue
+            pair = (round_obj.player1_item.value, round_obj.player2_item.value)
+            pair_counts[pair] += 1
+            correlation_sums[pair] += 1 if answered['p1'] == answered['p2'] else -1
+            success_counts[pair] += is_successful(success_table, *pair, answered['p1'], answered['p2'])
+
+        accumulator = TeamStatsAccumulator.from_rows(rounds, answers, team)
+        corr = accumulator.correlation_result()
+        success = accumulator.success_result(success_table)
+        assert corr[5] == correlation_sums
+        assert corr[6] == pair_counts
+        assert success[4] == success_counts
+        assert success[5] == pair_counts
+        assert success[2] == pytest.approx(sum(success_counts.values()) / sum(pair_counts.values()))
+
+        # The batch kernel reads the same counters
+        classic_matrix, success_matrix, _, _ = compute_team_statistics_batch([accumulator], success_table)[0]
+        assert classic_matrix == corr[0]
+        assert success_matrix == success[0]
+
+    def test_incremental_updates_equal_rebuild(self, team):
+        rounds, answers = _make_rows(50, seed=7)
+        rebuilt = TeamStatsAccumulator.from_rows(rounds, answers, team)
+
+        incremental = TeamStatsAccumulator()
+        by_round = {}
+        for answer in answers:
+            by_round.setdefault(answer.question_round_id, {})[answer.player_session_id] = answer.response_value
+        for round_obj in rounds:
+            responses = by_round.get(round_obj.round_id, {})
+            if len(responses) == 2:
+                incremental.record_round(round_obj.player1_item.value, round_obj.player2_item.value,
+                                         responses['p1'], responses['p2'])
+
+        assert incremental.outcomes == rebuilt.outcomes
+        assert incremental.rounds_recorded == rebuilt.rounds_recorded
+
+    def test_outcome_counts_of_read_only_views(self, make_accumulator):
+        accumulator = make_accumulator(seed=11, n_rounds=60)
+        counts = accumulator.outcome_counts()
+        assert sum(counts) == 60
+
+        view = TeamStatsAccumulator.from_outcome_counts(counts)
+        assert view.outcome_counts() == counts
+        assert accumulator.range_view(0, 60).outcome_counts() == counts
+        assert sum(accumulator.range_view(20, 50).outcome_counts()) == 30
+
+    def test_empty_accumulator(self):
+        accumulator = TeamStatsAccumulator()
+        corr = accumulator.correlation_result()
+        assert corr[0] == [[(0, 0)] * 4 for _ in range(4)]
+        assert corr[2] == 0.0
+        assert corr[4] == {}
+        success = accumulator.success_result(CHSH_TABLE)
+        assert success[2] == 0.0
+        assert success[3] == 0.0
+
+
+class TestTeamHistoryHash:
+
+    def test_empty_history_matches_empty_string_hashes(self):
+        assert TeamHistoryHash().hexdigests() == (hashlib.sha256(b'').hexdigest()[:8],
+                                                  hashlib.md5(b'').hexdigest()[:8])
+
+    def test_live_updates_equal_rebuild_from_rows(self):
+        rounds, answers = _make_rows(30, seed=5)
+        live = TeamHistoryHash()
+        for round_obj in rounds:
+            live.record_round_started(round_obj.player1_item.value, round_obj.player2_item.value)
+            for answer in answers:
+                if answer.question_round_id == round_obj.round_id:
+                    live.record_answer(answer.assigned_item.value, answer.response_value)
+
+        rebuilt = TeamHistoryHash.from_rows(rounds, answers)
+        assert live.hexdigests() == rebuilt.hexdigests()
+        assert live.events == len(rounds) + len(answers)
+        assert _compute_team_hashes_optimized(1, rounds, answers) == rebuilt.hexdigests()
+
+    def test_each_event_changes_both_hashes(self):
+        history = TeamHistoryHash()
+        seen = {history.hexdigests()}
+        history.record_round_started('A', 'X')
+        seen.add(history.hexdigests())
+        history.record_answer('A', True)
+        seen.add(history.hexdigests())
+        assert len(seen) == 3
+        assert len({h1 for h1, _ in seen}) == 3 and len({h2 for _, h2 in seen}) == 3
+
+    def test_order_matters(self):
+        first, second = TeamHistoryHash(), TeamHistoryHash()
+        first.record_answer('A', True)
+        first.record_answer('X', False)
+        second.record_answer('X', False)
+        second.record_answer('A', True)
+        assert first.hexdigests() != second.hexdigests()
+
+
+class TestGetAllTeamsUsesAccumulators:
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        force_clear_all_caches()
+        state.team_stats.clear()
+        yield
+        force_clear_all_caches()
+        state.team_stats.clear()
+
+    def test_rebuilds_once_then_reuses_counters(self, team):
+        rounds, answers = _make_rows(20, seed=3)
+
+        with patch('src.sockets.dashboard.Teams') as mock_teams, \
+             patch('src.sockets.dashboard.PairQuestionRounds') as mock_rounds, \
+             patch('src.sockets.dashboard.Answers') as mock_answers, \
+             patch('src.sockets.dashboard._compute_team_metrics_fused') as mock_fused:
+            mock_teams.query.all.return_value = [team]
+            mock_rounds.query.filter.return_value.order_by.return_value.all.return_value = rounds
+            mock_answers.query.filter.return_value.order_by.return_value.all.return_value = answers
+
+            first = get_all_teams()
+            assert 1 in state.team_stats
+            accumulator = state.team_stats[1]
+            assert mock_rounds.query.filter.call_count == 1
+            assert (first[0]['history_hash1'], first[0]['history_hash2']) == accumulator.history.hexdigests()
+
+            # A new completed round only touches the counters and the rolling hash
+            accumulator.history.record_round_started('A', 'X')
+            accumulator.history.record_answer('A', True)
+            accumulator.history.record_answer('X', True)
+            accumulator.record_round('A', 'X', True, True)
+            force_clear_all_caches()
+            second = get_all_teams()
+
+            mock_fused.assert_not_called()
+            # No rows are fetched for teams that already have an accumulator
+            assert mock_rounds.query.filter.call_count == 1
+            assert mock_answers.query.filter.call_count == 1
+            assert state.team_stats[1] is accumulator
+            assert (second[0]['history_hash1'], second[0]['history_hash2']) == accumulator.history.hexdigests()
+            assert second[0]['history_hash1'] != first[0]['history_hash1']
+
+        a_idx, x_idx = ITEM_VALUES.index('A'), ITEM_VALUES.index('X')
+        first_num, first_den = first[0]['classic_matrix'][a_idx][x_idx]
+        second_num, second_den = second[0]['classic_matrix'][a_idx][x_idx]
+        assert (second_num, second_den) == (first_num + 1, first_den + 1)
+
+    def test_state_reset_drops_accumulators(self):
+        state.team_stats[1] = TeamStatsAccumulator()
+        state.reset()
+        assert state.team_stats == {}
+
+
+class TestFusedMetricsKernel:
+
+    @pytest.mark.parametrize('game_mode', ['classic', 'simplified', 'aqmjoe'])
+    def test_matches_accumulator(self, game_mode, team):
+        rounds, answers = _make_rows(200, seed=9)
+
+        with patch('src.sockets.dashboard.state') as mock_state:
+            mock_state.game_mode = game_mode
+            correlation_result, success_result = _compute_team_metrics_fused(1, rounds, answers, team)
+
+        accumulator = TeamStatsAccumulator.from_rows(rounds, answers, team)
+        assert correlation_result == accumulator.correlation_result()
+        assert success_result == accumulator.success_result(success_table_for_mode(game_mode))
+
+    def test_missing_team_returns_empty_results(self):
+        with patch('src.sockets.dashboard.Teams') as mock_teams:
+            mock_teams.query.get.return_value = None
+            correlation_result, success_result = _compute_team_metrics_fused(99, [], [])
+        assert correlation_result[0] == [[(0, 0)] * 4 for _ in range(4)]
+        assert success_result[2] == 0.0
+
+    @pytest.mark.parametrize('game_mode', ['simplified', 'aqmjoe'])
+    def test_benchmark_fused_vs_accumulator(self, game_mode):
+        # Plain objects rather than MagicMocks, so attribute access costs what ORM rows do
+        team = SimpleNamespace(team_id=1, player1_session_id='p1', player2_session_id='p2')
+        mock_rounds, mock_answers = _make_rows(2000, seed=1)
+        rounds = [SimpleNamespace(round_id=r.round_id, team_id=1,
+                                  player1_item=SimpleNamespace(value=r.player1_item.value),
+                                  player2_item=SimpleNamespace(value=r.player2_item.value))
+                  for r in mock_rounds]
+        answers = [SimpleNamespace(question_round_id=a.question_round_id, team_id=1,
+                                   player_session_id=a.player_session_id, response_value=a.response_value,
+                                   assigned_item=SimpleNamespace(value=a.assigned_item.value))
+                   for a in mock_answers]
+
+        with patch('src.sockets.dashboard.state') as mock_state:
+            mock_state.game_mode = game_mode
+            start = time.perf_counter()
+            for _ in range(5):
+                _compute_team_metrics_fused(1, rounds, answers, team)
+            fused_time = time.perf_counter() - start
+
+        # The dashboard keeps the accumulator, so a refresh only reduces its counters
+        accumulator = TeamStatsAccumulator.from_rows(rounds, answers, team)
+        success_table = success_table_for_mode(game_mode)
+        start = time.perf_counter()
+        for _ in range(5):
+            compute_team_statistics_batch([accumulator], success_table)
+        accumulator_time = time.perf_counter() - start
+
+        print(f"\n{game_mode}, 2000 rounds: fused row walk {fused_time * 1000:.1f}ms, "
+              f"accumulator {accumulator_time * 1000:.1f}ms ({fused_time / accumulator_time:.2f}x)")
+        assert accumulator_time < fused_time
+
+
+class TestPrefixSumRanges:
+
+    @staticmethod
+    def _recorded_rounds(n_rounds, seed=4):
+        rng = random.Random(seed)
+        return [(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES), rng.random() < 0.5, rng.random() < 0.5)
+                for _ in range(n_rounds)]
+
+    def test_range_view_matches_accumulating_the_range(self):
+        played = self._recorded_rounds(80)
+        accumulator = TeamStatsAccumulator()
+        for round_data in played:
+            accumulator.record_round(*round_data)
+
+        for start, end in [(0, 80), (0, 0), (10, 30), (79, 80), (50, 80)]:
+            expected = TeamStatsAccumulator()
+            for round_data in played[start:end]:
+                expected.record_round(*round_data)
+            view = accumulator.range_view(start, end)
+            assert view.outcomes == expected.outcomes
+            assert view.rounds_recorded == end - start
+
+    def test_full_range_view_equals_running_table(self, team):
+        accumulator = TeamStatsAccumulator.from_rows(*_make_rows(40, seed=2), team)
+        assert accumulator.range_view(0, accumulator.rounds_recorded).outcomes == accumulator.outcomes
+
+    def test_round_range_resolution_and_clamping(self):
+        accumulator = TeamStatsAccumulator()
+        for round_data in self._recorded_rounds(20):
+            accumulator.record_round(*round_data)
+
+        assert accumulator.round_range() == (0, 20)
+        assert accumulator.round_range(window=5) == (15, 20)
+        assert accumulator.round_range(as_of_round=8) == (0, 8)
+        assert accumulator.round_range(window=5, as_of_round=8) == (3, 8)
+        assert accumulator.round_range(window=50) == (0, 20)
+        assert accumulator.round_range(as_of_round=500) == (0, 20)
+        assert accumulator.round_range(as_of_round=0) == (0, 0)
+
+
+class TestTeamRangeStatisticsApi:
+
+    @pytest.fixture(autouse=True)
+    def accumulator(self):
+        state.team_stats.clear()
+        accumulator = TeamStatsAccumulator()
+        # Ten perfectly correlated A/X rounds followed by ten anti-correlated ones
+        for _ in range(10):
+            accumulator.record_round('A', 'X', True, True)
+        for _ in range(10):
+            accumulator.record_round('A', 'X', True, False)
+        state.team_stats[7] = accumulator
+        yield accumulator
+        state.team_stats.clear()
+
+    def test_window_and_as_of_round(self):
+        a_idx, x_idx = ITEM_VALUES.index('A'), ITEM_VALUES.index('X')
+
+        full = compute_team_range_statistics(7)
+        assert full['rounds_in_range'] == 20
+        assert full['classic_matrix'][a_idx][x_idx] == (0, 20)
+
+        recent = compute_team_range_statistics(7, window=5)
+        assert (recent['first_round'], recent['last_round']) == (16, 20)
+        assert recent['classic_matrix'][a_idx][x_idx] == (-5, 5)
+
+        earlier = compute_team_range_statistics(7, as_of_round=10)
+        assert earlier['classic_matrix'][a_idx][x_idx] == (10, 10)
+        assert earlier['rounds_total'] == 20
+
+    def test_unknown_team(self):
+        with patch('src.sockets.dashboard.db') as mock_db:
+            mock_db.session.get.return_value = None
+            assert compute_team_range_statistics(12345) is None
+
+    def test_http_endpoint(self):
+        client = app.test_client()
+        response = client.get('/api/dashboard/teams/7/stats?window=5')
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['rounds_in_range'] == 5
+        assert body['window'] == 5
+
+        assert client.get('/api/dashboard/teams/7/stats?window=0').status_code == 400
+        assert client.get('/api/dashboard/teams/7/stats?as_of_round=abc').status_code == 400
+
+    def test_socket_handler_emits_team_details(self):
+        with patch('src.sockets.dashboard.request', MagicMock(sid='dash1')), \
+             patch('src.sockets.dashboard.state') as mock_state, \
+             patch('src.sockets.dashboard.socketio') as mock_socketio, \
+             patch('src.sockets.dashboard.emit') as mock_emit:
+            mock_state.dashboard_clients = {'dash1'}
+            mock_state.team_stats = state.team_stats
+            mock_state.game_mode = 'classic'
+
+            on_request_team_details({'team_id': 7, 'as_of_round': 10})
+
+            mock_emit.assert_not_called()
+            event, details = mock_socketio.emit.call_args[0]
+            assert event == 'team_details'
+            assert details['last_round'] == 10
+            assert mock_socketio.emit.call_args[1] == {'to': 'dash1'}
+
+            on_request_team_details({'team_id': 7, 'window': -1})
+            mock_emit.assert_called_with('error', {'message': 'window must be at least 1'})
+
+    def test_socket_handler_rejects_non_dashboard_clients(self):
+        with patch('src.sockets.dashboard.request', MagicMock(sid='player1')), \
+             patch('src.sockets.dashboard.emit') as mock_emit:
+            on_request_team_details({'team_id': 7})
+            mock_emit.assert_called_once_with('error', {'message': 'Unauthorized: Not a dashboard client'})
@@ -0,0 +1,228 @@
+"""
+Tests for the sorted, paginated teams window dashboard clients can ask for
+(request_teams_window) instead of receiving every team.
+"""
+import json
+import random
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import payload_json
+from src.state import state
+from src.teams_index import TeamsIndex
+from src.sockets import dashboard
+from src.sockets.dashboard import (
+    TEAMS_WINDOW_MAX_LIMIT,
+    TeamsWindow,
+    _team_window_scores,
+    client_teams,
+    dashboard_client_teams,
+    dashboard_client_windows,
+    dashboard_teams_streaming,
+    force_clear_all_caches,
+    on_request_teams_window,
+    teams_update_fields,
+)
+
+
+def _entry(team_id, chsh=None, name=None, active=True, created_at='2026-01-01T00:00:00'):
+    return {
+        'team_id': team_id, 'team_name': name or f'Team {team_id:03d}', 'is_active': active,
+        'status': 'active' if active else 'inactive', 'created_at': created_at, 'game_mode': 'classic',
+        'chsh': chsh,
+    }
+
+
+def _index():
+    return TeamsIndex(lambda team: {'chsh': team['chsh'], 'balanced': None})
+
+
+def _sent(fields):
+    """Teams fields as the client receives them."""
+    return json.loads(payload_json.encode_object(fields))
+
+
+def _ids(teams):
+    return [team['team_id'] for team in teams]
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    force_clear_all_caches()
+    dashboard_client_teams.clear()
+    dashboard_client_windows.clear()
+    yield
+    force_clear_all_caches()
+    dashboard_client_teams.clear()
+    dashboard_client_windows.clear()
+
+
+class TestTeamsIndex:
+
+    def test_sort_keys_and_filters(self):
+        teams = [
+            _entry(1, chsh=1.5, name='bravo', created_at='2026-01-01T10:00:00'),
+            _entry(2, chsh=2.5, name='Alpha', active=False, created_at='2026-01-01T12:00:00'),
+            _entry(3, chsh=None, name='charlie', created_at='2026-01-01T11:00:00'),
+            _entry(4, chsh=float('nan'), name='delta', created_at=None),
+            _entry(5, chsh=1.5, name='echo', created_at='2026-01-01T09:00:00'),
+        ]
+        index = _index()
+        index.sync(teams)
+
+        assert index.window('chsh', 'all', 0, 10) == (5, [teams[1], teams[0], teams[4], teams[2], teams[3]])
+        assert _ids(index.window('chsh', 'active', 0, 10)[1]) == [1, 5, 3, 4]
+        assert _ids(index.window('name', 'all', 0, 10)[1]) == [2, 1, 3, 4, 5]
+        # Newest first; teams without a creation time last
+        assert _ids(index.window('created_at', 'all', 0, 10)[1]) == [2, 3, 1, 5, 4]
+        # Unscored teams sort by name
+        assert _ids(index.window('balanced', 'active', 0, 10)[1]) == [1, 3, 4, 5]
+        assert index.window('name', 'active', 1, 2) == (4, [teams[2], teams[3]])
+        assert index.window('name', 'active', 10, 2) == (4, [])
+
+    def test_sync_rekeys_only_changed_teams(self):
+        teams = [_entry(team_id, chsh=team_id / 10) for team_id in range(10)]
+        scored = []
+        index = TeamsIndex(lambda team: scored.append(team['team_id']) or {'chsh': team['chsh']})
+        index.sync(teams)
+        assert len(scored) == 10
+
+        scored.clear()
+        teams[2] = _entry(2, chsh=5.0)
+        teams[7] = _entry(7, chsh=0.0, active=False)
+        del teams[5]
+        index.sync(teams)
+        assert scored == [2, 7]
+        assert len(index) == 9
+        assert _ids(index.window('chsh', 'all', 0, 3)[1]) == [2, 9, 8]
+        assert _ids(index.window('chsh', 'active', 0, 10)[1]) == [2, 9, 8, 6, 4, 3, 1, 0]
+
+        # A team whose game mode changed is re-keyed
+        scored.clear()
+        teams[0]['game_mode'] = 'simplified'
+        index.sync(teams)
+        assert scored == [0]
+
+
+class TestWindowedUpdates:
+
+    def _teams(self, make_team_payload, n):
+        rng = random.Random(n)
+        return [make_team_payload(team_id, rng=rng) for team_id in range(n)]
+
+    def _by_chsh(self, teams):
+        scores = {team['team_id']: _team_window_scores(team)['chsh'] for team in teams}
+        return sorted(scores, key=lambda team_id: (-scores[team_id], f'Team {team_id}'))
+
+    def test_window_patches_follow_teams_in_and_out(self, make_team_payload):
+        teams = self._teams(make_team_payload, 20)
+        dashboard_client_windows['dash'] = TeamsWindow('chsh', 'active', 0, 5)
+        with patch.object(state, '_game_mode', 'classic'):
+            window_teams, info = client_teams('dash', teams, {})
+            order = self._by_chsh(teams)
+            assert info == {'sort': 'chsh', 'filter': 'active', 'offset': 0, 'limit': 5, 'total': 20, 'order': order[:5]}
+            snapshot = _sent(teams_update_fields('dash', window_teams, 1, {}))
+            assert _ids(snapshot['teams']) == order[:5]
+
+            # The fifth team drops off the first page, and the sixth moves onto it
+            teams[order[4]] = {**teams[order[4]], 'is_active': False, 'status': 'inactive'}
+            window_teams, info = client_teams('dash', teams, {})
+            assert info['order'] == order[:4] + [order[5]] and info['total'] == 19
+            patch_fields = _sent(teams_update_fields('dash', window_teams, 2, {}))['teams_patch']
+            assert patch_fields['removed'] == [order[4]]
+            changed, = patch_fields['changed']
+            assert changed == json.loads(json.dumps(teams[order[5]]))
+
+            # Changes outside the window are not sent
+            teams[order[10]] = {**teams[order[10]], 'current_round_number': 41}
+            window_teams, _ = client_teams('dash', teams, {})
+            patch_fields = _sent(teams_update_fields('dash', window_teams, 3, {}))['teams_patch']
+            assert patch_fields == {'base_version': 2, 'changed': [], 'removed': []}
+
+    def test_index_syncs_outside_the_dashboard_lock(self, make_team_payload):
+        teams = self._teams(make_team_payload, 5)
+        dashboard_client_windows['dash'] = TeamsWindow('chsh', 'active', 0, 5)
+        held = []
+
+        @contextmanager
+        def recording_lock():
+            held.append(True)
+            yield
+            held.pop()
+
+        def sync(teams_):
+            assert not held
+            real_sync(teams_)
+
+        real_sync = dashboard._teams_index.sync
+        with patch.object(state, '_game_mode', 'classic'), \
+             patch('src.sockets.dashboard._safe_dashboard_operation', recording_lock), \
+             patch.object(dashboard._teams_index, 'sync', side_effect=sync) as mock_sync:
+            window_teams, info = client_teams('dash', teams, {})
+        mock_sync.assert_called_once_with(teams)
+        assert info['total'] == 5 and len(window_teams) == 5
+
+    def test_clients_without_a_window_get_every_team(self, make_team_payload):
+        teams = self._teams(make_team_payload, 3)
+        assert client_teams('dash', teams, {}) == (teams, None)
+
+    def test_payload_size_at_500_teams(self, make_team_payload):
+        teams = self._teams(make_team_payload, 500)
+        dashboard_client_windows['windowed'] = TeamsWindow('chsh', 'active', 0, 50)
+        with patch.object(state, '_game_mode', 'classic'):
+            sizes = {}
+            for sid in ('all', 'windowed'):
+                sid_teams, _ = client_teams(sid, teams, {})
+                sizes[sid] = len(teams_update_fields(sid, sid_teams, 1, {})['teams'])
+        print(f"\n500-team snapshot: every team {sizes['all'] / 1024:.1f} KiB, "
+              f"50-team window {sizes['windowed'] / 1024:.1f} KiB")
+        assert sizes['windowed'] < sizes['all'] / 8
+
+
+class TestRequestTeamsWindow:
+
+    def _request(self, data, sid='dash', streaming=True):
+        with patch('src.sockets.dashboard.request', MagicMock(sid=sid)), \
+             patch.object(state, 'dashboard_clients', {'dash'}), \
+             patch.dict(dashboard_teams_streaming, {'dash': streaming}), \
+             patch('src.sockets.dashboard.emit') as mock_emit, \
+             patch('src.sockets.dashboard.emit_dashboard_full_update') as mock_full_update:
+            on_request_teams_window(data)
+        return mock_emit, mock_full_update
+
+    def test_sets_the_window_and_sends_a_snapshot(self):
+        dashboard_client_teams['dash'] = MagicMock()
+        mock_emit, mock_full_update = self._request({'sort': 'name', 'filter': 'all', 'offset': 50, 'limit': 25})
+        assert dashboard_client_windows['dash'] == TeamsWindow('name', 'all', 50, 25)
+        assert 'dash' not in dashboard_client_teams
+        mock_full_update.assert_called_once_with(client_sid='dash')
+        mock_emit.assert_not_called()
+
+        # No window: every team again
+        self._request(None, streaming=False)
+        assert 'dash' not in dashboard_client_windows
+
+    def test_defaults(self):
+        self._request({'sort': 'created_at'})
+        assert dashboard_client_windows['dash'] == TeamsWindow('created_at', 'active', 0, TEAMS_WINDOW_MAX_LIMIT)
+
+    @pytest.mark.parametrize('data, message', [
+        ({'sort': 'status'}, 'sort must be one of chsh, balanced, name, created_at'),
+        ({'filter': 'inactive'}, 'filter must be one of active, all'),
+        ({'offset': -1}, 'offset must be at least 0'),
+        ({'limit': 0}, 'limit must be at least 1'),
+        ({'limit': TEAMS_WINDOW_MAX_LIMIT + 1}, f'limit must be at most {TEAMS_WINDOW_MAX_LIMIT}'),
+        ('chsh', 'teams window must be an object'),
+    ])
+    def test_invalid_requests(self, data, message):
+        mock_emit, mock_full_update = self._request(data)
+        mock_emit.assert_called_once_with('error', {'message': message})
+        mock_full_update.assert_not_called()
+        assert 'dash' not in dashboard_client_windows
+
+    def test_unauthorized(self):
+        mock_emit, _ = self._request({'sort': 'name'}, sid='player')
+        mock_emit.assert_called_once_with('error', {'message': 'Unauthorized: Not a dashboard client'})
+        assert 'player' not in dashboard_client_windows
@@ -0,0 +1,161 @@
+"""
+Parity tests for the closed-form uncertainty propagation, using the
+`uncertainties` package as the oracle, plus a timing comparison.
+"""
+import math
+import random
+import subprocess
+import sys
+import time
+import pytest
+from uncertainties import ufloat
+
+from src.uncertainty import MIN_STD_DEV, Estimate, ratio_term
+from src.team_stats import TeamStatsAccumulator, ITEM_VALUES
+from src.sockets.dashboard import _calculate_team_statistics_from_data
+
+
+def _ufloat_ratio(num, den):
+    if den > 0:
+        return ufloat(max(-1.0, min(1.0, num / den)), 1 / math.sqrt(den))
+    return ufloat(0, float("inf"))
+
+
+def _ufloat_magnitude(value):
+    if value.nominal_value >= 0:
+        return value
+    return ufloat(-value.nominal_value, value.std_dev)
+
+
+def _ufloat_statistics(correlation_result):
+    """Reference implementation: the ufloat-based calculation the dashboard used to run."""
+    (corr_matrix_tuples, item_values, _, _, same_item_responses,
+     correlation_sums, pair_counts) = correlation_result
+
+    trace_sum = ufloat(0, MIN_STD_DEV)
+    for i in range(4):
+        trace_sum += _ufloat_ratio(*corr_matrix_tuples[i][i])
+    trace_avg = _ufloat_magnitude((1 / 4) * trace_sum)
+
+    a, b, x, y = (item_values.index(item) for item in ('A', 'B', 'X', 'Y'))
+    chsh_sum = ufloat(0, MIN_STD_DEV)
+    for r_idx, c_idx, coeff in [(a, x, 1), (a, y, 1), (b, x, 1), (b, y, -1),
+                                (x, a, 1), (x, b, 1), (y, a, 1), (y, b, -1)]:
+        chsh_sum += coeff * _ufloat_ratio(*corr_matrix_tuples[r_idx][c_idx])
+    chsh_value = (1 / 2) * chsh_sum
+
+    cross_sum = ufloat(0, MIN_STD_DEV)
+    for item1, item2, coeff in [('A', 'X', 1), ('A', 'Y', 1), ('B', 'X', 1), ('B', 'Y', -1)]:
+        m_ij = pair_counts.get((item1, item2), 0) + pair_counts.get((item2, item1), 0)
+        n_ij = correlation_sums.get((item1, item2), 0) + correlation_sums.get((item2, item1), 0)
+        cross_sum += coeff * _ufloat_ratio(n_ij, m_ij)
+
+    balances = []
+    for counts in (same_item_responses or {}).values():
+        total_tf = counts['true'] + counts['false']
+        if total_tf > 0:
+            p_true = ufloat(counts['true'] / total_tf, math.sqrt(1 / total_tf))
+            balances.append(1 - _ufloat_magnitude(2 * p_true - 1))
+        else:
+            balances.append(ufloat(0, float("inf")))
+    balance_avg = sum(balances) / len(balances) if balances else ufloat(0, float("inf"))
+
+    def _std(value):
+        return value.std_dev if not math.isinf(value.std_dev) else None
+
+    return {
+        'trace_average_statistic': trace_avg.nominal_value,
+        'trace_average_statistic_uncertainty': _std(trace_avg),
+        'chsh_value_statistic': chsh_value.nominal_value,
+        'chsh_value_statistic_uncertainty': _std(chsh_value),
+        'cross_term_combination_statistic': cross_sum.nominal_value,
+        'cross_term_combination_statistic_uncertainty': _std(cross_sum),
+        'same_item_balance': balance_avg.nominal_value,
+        'same_item_balance_uncertainty': _std(balance_avg),
+    }
+
+
+def _random_correlation_results(n, seed=0):
+    rng = random.Random(seed)
+    results = [TeamStatsAccumulator().correlation_result()]
+    while len(results) < n:
+        accumulator = TeamStatsAccumulator()
+        for _ in range(rng.randint(1, 150)):
+            accumulator.record_round(rng.choice(ITEM_VALUES), rng.choice(ITEM_VALUES),
+                                     rng.random() < 0.7, rng.random() < 0.5)
+        results.append(accumulator.correlation_result())
+    return results
+
+
+class TestEstimate:
+
+    @pytest.mark.parametrize('num,den', [(3, 4), (-5, 5), (0, 1), (7, 3), (2, 0)])
+    def test_ratio_term_matches_ufloat(self, num, den):
+        value, variance = ratio_term(num, den)
+        expected = _ufloat_ratio(num, den)
+        assert value == expected.nominal_value
+        assert math.sqrt(variance) == pytest.approx(expected.std_dev)
+
+    def test_linear_combination_matches_ufloat(self):
+        terms = [(3, 10, 1), (-4, 9, 1), (1, 2, -1), (5, 16, 2)]
+        estimate = Estimate(0, MIN_STD_DEV)
+        expected = ufloat(0, MIN_STD_DEV)
+        for num, den, coeff in terms:
+            estimate.add(Estimate.from_ratio(num, den), coeff)
+            expected += coeff * _ufloat_ratio(num, den)
+        estimate = estimate.scaled(0.5).magnitude()
+        expected = _ufloat_magnitude(0.5 * expected)
+        assert estimate.nominal_value == pytest.approx(expected.nominal_value)
+        assert estimate.std_dev == pytest.approx(expected.std_dev)
+
+    def test_empty_term_makes_uncertainty_infinite(self):
+        estimate = Estimate(0, MIN_STD_DEV).add(Estimate.from_ratio(1, 4)).add(Estimate.from_ratio(0, 0), -1)
+        assert math.isinf(estimate.variance)
+        assert estimate.std_dev_or_none() is None
+        assert estimate.nominal_value == 0.25
+
+    def test_magnitude_keeps_uncertainty(self):
+        estimate = Estimate(-0.3, 0.1).magnitude()
+        assert estimate.nominal_value == 0.3
+        assert estimate.std_dev == pytest.approx(0.1)
+
+
+class TestStatisticsParity:
+
+    def test_matches_ufloat_oracle(self):
+        for correlation_result in _random_correlation_results(200, seed=5):
+            actual = _calculate_team_statistics_from_data(correlation_result)
+            expected = _ufloat_statistics(correlation_result)
+            for key, expected_value in expected.items():
+                if expected_value is None:
+                    assert actual[key] is None, key
+                else:
+                    assert actual[key] == pytest.approx(expected_value, rel=1e-9, abs=1e-12), key
+
+    def test_zero_count_same_item_entry_is_infinite(self):
+        correlation_result = TeamStatsAccumulator().correlation_result()
+        correlation_result = correlation_result[:4] + ({'A': {'true': 0, 'false': 0}},) + correlation_result[5:]
+        actual = _calculate_team_statistics_from_data(correlation_result)
+        assert actual == _ufloat_statistics(correlation_result)
+        assert actual['same_item_balance_uncertainty'] is None
+
+    def test_dashboard_does_not_import_uncertainties(self):
+        code = "import sys, src.sockets.dashboard; sys.exit('uncertainties' in sys.modules)"
+        assert subprocess.run([sys.executable, '-c', code], capture_output=True).returncode == 0
+
+    def test_timing_against_ufloat(self):
+        correlation_results = _random_correlation_results(300, seed=9)
+
+        start = time.perf_counter()
+        for correlation_result in correlation_results:
+            _ufloat_statistics(correlation_result)
+        ufloat_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for correlation_result in correlation_results:
+            _calculate_team_statistics_from_data(correlation_result)
+        closed_form_time = time.perf_counter() - start
+
+        print(f"\n300 teams: ufloat {ufloat_time * 1000:.1f}ms, "
+              f"closed form {closed_form_time * 1000:.1f}ms ({ufloat_time / closed_form_time:.1f}x)")
+        assert closed_form_time < ufloat_time
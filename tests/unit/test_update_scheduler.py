@@ -0,0 +1,93 @@
+"""
+Tests for the fixed-rate dashboard team update scheduler.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from src.state import state
+from src.sockets import dashboard
+from src.sockets.dashboard import (
+    force_clear_all_caches,
+    invalidate_team_caches,
+    run_scheduled_team_update,
+    schedule_dashboard_team_update,
+    team_data_versions,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    force_clear_all_caches()
+    dashboard._team_update_requested = False
+    yield
+    force_clear_all_caches()
+    dashboard._team_update_requested = False
+
+
+@pytest.fixture
+def mock_emit():
+    """emit_dashboard_team_update, sending the current data version unless served_version is set."""
+    sent_versions = []
+    served_version = {}
+
+    def _emit():
+        version = served_version.get('version', team_data_versions.global_version)
+        dashboard._cached_team_metrics_version = version
+        sent_versions.append(version)
+
+    with patch.object(state, 'dashboard_clients', {'dash1'}), \
+         patch('src.sockets.dashboard.emit_dashboard_team_update', side_effect=_emit) as emit:
+        yield emit, sent_versions, served_version
+
+
+class TestUpdateScheduler:
+
+    def test_burst_of_answers_sends_one_update_per_tick(self, mock_emit):
+        emit, _, _ = mock_emit
+        for _ in range(10):
+            invalidate_team_caches('Alpha')
+            schedule_dashboard_team_update()
+
+        assert run_scheduled_team_update() is True
+        assert emit.call_count == 1
+        # Nothing new since: idle ticks send nothing
+        assert run_scheduled_team_update() is False
+        assert emit.call_count == 1
+
+    def test_stale_update_is_followed_by_a_trailing_one(self, mock_emit):
+        _, sent_versions, served_version = mock_emit
+        invalidate_team_caches('Alpha')
+        schedule_dashboard_team_update()
+        latest = team_data_versions.global_version
+
+        # The first tick is served from a throttled cache built before the last answer
+        served_version['version'] = latest - 1
+        assert run_scheduled_team_update() is True
+
+        # With no further activity the next tick still delivers the final state
+        del served_version['version']
+        assert run_scheduled_team_update() is True
+        assert sent_versions == [latest - 1, latest]
+        assert run_scheduled_team_update() is False
+
+    def test_no_dashboards_sends_nothing(self, mock_emit):
+        emit, _, _ = mock_emit
+        schedule_dashboard_team_update()
+        with patch.object(state, 'dashboard_clients', set()):
+            assert run_scheduled_team_update() is False
+        emit.assert_not_called()
+
+    def test_answers_only_schedule_an_update(self):
+        with patch('src.sockets.dashboard.emit_dashboard_team_update') as emit, \
+             patch('src.sockets.dashboard.socketio') as mock_socketio:
+            schedule_dashboard_team_update()
+            emit.assert_not_called()
+            assert dashboard._team_update_requested is True
+
+            # The scheduler is started once, by the first dashboard to join
+            with patch.object(dashboard, '_team_update_scheduler_started', False):
+                dashboard._start_team_update_scheduler()
+                dashboard._start_team_update_scheduler()
+            mock_socketio.start_background_task.assert_called_once_with(
+                dashboard._team_update_scheduler_loop, dashboard.REFRESH_DELAY_QUICK)